@@ -15,6 +15,7 @@
 #include "button.h"
 #include "config.h"
 #include "comms.h"
+#include "trajectory.h"
 
 // ======================== Global Button Instance ========================
 ButtonState userBtn;
@@ -50,6 +51,7 @@ void handleButtonAction() {
     // Exit position mode, return to previous
     motor.controller = MotionControlType::torque;
     currentMode = previousMode;
+    trajectoryStop();
     Serial.println(F("Exited position mode"));
   } else {
     toggleMode();
@@ -8,12 +8,14 @@
 #include "comms.h"
 #include "config.h"
 #include "haptics.h"
+#include "trajectory.h"
 
 // ======================== Mode Commands ========================
 
 void doHaptic(char* cmd) {
   motor.controller = MotionControlType::torque;
   currentMode = MODE_HAPTIC;
+  trajectoryStop();  // A streamed move must not pull the knob back into POSITION
   report_interval_ms = DEFAULT_REPORT_INTERVAL_MS;
   Serial.println(F("A:H"));
   Serial.print(F("Mode: HAPTIC | Detents: ")); Serial.print(detent_count);
@@ -23,6 +25,7 @@ void doHaptic(char* cmd) {
 void doInertia(char* cmd) {
   motor.controller = MotionControlType::torque;
   currentMode = MODE_INERTIA;
+  trajectoryStop();
   report_interval_ms = INERTIA_REPORT_INTERVAL_MS;
   resetInertiaState();
   Serial.println(F("A:I"));
@@ -34,6 +37,7 @@ void doInertia(char* cmd) {
 void doSpring(char* cmd) {
   motor.controller = MotionControlType::torque;
   currentMode = MODE_SPRING;
+  trajectoryStop();
   report_interval_ms = DEFAULT_REPORT_INTERVAL_MS;
   spring_center = motor.shaft_angle;
   Serial.println(F("A:C"));
@@ -45,6 +49,7 @@ void doSpring(char* cmd) {
 void doBounded(char* cmd) {
   motor.controller = MotionControlType::torque;
   currentMode = MODE_BOUNDED;
+  trajectoryStop();
   report_interval_ms = DEFAULT_REPORT_INTERVAL_MS;
   Serial.println(F("A:O"));
   Serial.print(F("Mode: BOUNDED | Range: "));
@@ -148,8 +153,10 @@ void doSeekPosition(char* cmd) {
     previousMode = currentMode;
   }
   currentMode = MODE_POSITION;
+  trajectoryStop();
   seek_settle_start = 0;
   seek_start_time = millis();
+  seek_streamed = false;
 
   // Switch to SimpleFOC angle control
   motor.controller = MotionControlType::angle;
@@ -159,6 +166,38 @@ void doSeekPosition(char* cmd) {
   Serial.print(F("Seeking to: ")); Serial.print(target_deg); Serial.println(F(" deg"));
 }
 
+void doTrajectory(char* cmd) {
+  // Y<deg>[,<deg>] → A:Y<free>  (append waypoints TRAJ_PERIOD_MS apart; the
+  //                               first Y of a stream enters position mode)
+  // YE             → A:YE       (end: settle at the last waypoint, then A:SEEK_DONE)
+  // Two waypoints per line keep within Commander's line buffer.
+  if (cmd == nullptr || strlen(cmd) == 0) {
+    Serial.print(F("A:Y")); Serial.println(trajectoryFree());
+    return;
+  }
+  if (cmd[0] == 'E') {
+    trajectoryEnd();
+    Serial.println(F("A:YE"));
+    return;
+  }
+  if (currentMode != MODE_POSITION || !traj_active) {
+    if (currentMode != MODE_POSITION) {
+      previousMode = currentMode;
+    }
+    currentMode = MODE_POSITION;
+    motor.controller = MotionControlType::angle;
+    seek_settle_start = 0;
+    trajectoryStart();
+  }
+  char* next = cmd;
+  while (next != nullptr) {
+    trajectoryPush(atof(next) * _PI / 180.0f);
+    next = strchr(next, ',');
+    if (next != nullptr) next++;
+  }
+  Serial.print(F("A:Y")); Serial.println(trajectoryFree());
+}
+
 void doQueryState(char* cmd) {
   const char* modeNames[] = {"HAPTIC", "INERTIA", "SPRING", "BOUNDED", "POSITION"};
   Serial.println(F("=== State ==="));
@@ -208,6 +247,62 @@ void doMotor(char* cmd) {
   }
 }
 
+// ======================== Clock Sync ========================
+
+void doTime(char* cmd) {
+  // T      → T<micros>  (sync ping: host pairs it with its send/receive times)
+  // TS<0|1> → A:TS<0|1> (append @<micros> to position reports)
+  if (cmd == nullptr || strlen(cmd) == 0) {
+    Serial.print(F("T")); Serial.println(micros());
+    return;
+  }
+  if (cmd[0] == 'S') {
+    report_timestamps = (atoi(cmd + 1) != 0);
+    Serial.print(F("A:TS")); Serial.println(report_timestamps ? 1 : 0);
+  }
+}
+
+// ======================== Baud Negotiation ========================
+
+static const unsigned long SUPPORTED_BAUDS[] = {115200, 230400, 460800, 921600};
+
+static void switchBaud(unsigned long baud) {
+  Serial.flush();  // Let the ack leave at the old rate
+  Serial.end();
+  Serial.begin(baud);
+  current_baud = baud;
+}
+
+void doBaud(char* cmd) {
+  // R        → R<baud>   (probe: confirms the current rate)
+  // R<baud>  → A:R<baud> then switch, or A:R0 if unsupported
+  if (cmd == nullptr || strlen(cmd) == 0) {
+    baud_probe_pending = false;
+    Serial.print(F("R")); Serial.println(current_baud);
+    return;
+  }
+  unsigned long requested = strtoul(cmd, nullptr, 10);
+  bool supported = false;
+  for (unsigned int i = 0; i < sizeof(SUPPORTED_BAUDS) / sizeof(SUPPORTED_BAUDS[0]); i++) {
+    if (SUPPORTED_BAUDS[i] == requested) supported = true;
+  }
+  if (!supported) {
+    Serial.println(F("A:R0"));
+    return;
+  }
+  Serial.print(F("A:R")); Serial.println(requested);
+  switchBaud(requested);
+  baud_probe_deadline = millis() + BAUD_PROBE_TIMEOUT_MS;  // May wrap: compared by difference
+  baud_probe_pending = (requested != BAUD_DEFAULT);
+}
+
+void checkBaudProbe() {
+  if (baud_probe_pending && (int32_t)(millis() - baud_probe_deadline) >= 0) {
+    baud_probe_pending = false;
+    switchBaud(BAUD_DEFAULT);
+  }
+}
+
 // ======================== Position Reporting ========================
 
 void reportPosition() {
@@ -220,7 +315,13 @@ void reportPosition() {
   float delta = current_angle - last_reported_angle;
 
   if (fabs(delta) >= report_threshold_deg) {
-    Serial.print(F("P")); Serial.println(current_angle, 2);
+    Serial.print(F("P"));
+    if (report_timestamps) {
+      Serial.print(current_angle, 2);
+      Serial.print(F("@")); Serial.println(now_us);
+    } else {
+      Serial.println(current_angle, 2);
+    }
     last_reported_angle = current_angle;
     last_report_us = now_us;
   }
@@ -248,7 +349,10 @@ void setupCommander() {
   command.add('P', doQueryPosition,  "query position");
   command.add('Q', doQueryState,     "query state");
   command.add('Z', doSeekPosition,   "seek to position (degrees)");
+  command.add('Y', doTrajectory,     "stream trajectory waypoints (degrees) / YE = end");
   command.add('M', doMotor,          "motor config");
+  command.add('T', doTime,           "clock sync ping / TS<0|1> timestamps");
+  command.add('R', doBaud,           "baud rate switch / probe");
 }
 
 void printBanner() {
@@ -257,5 +361,8 @@ void printBanner() {
   Serial.println(F("S<n> = detent count, D<v> = strength"));
   Serial.println(F("J/B/F/K = inertia, W/E/G = spring params"));
   Serial.println(F("P = position, Q = state, Z<deg> = seek"));
+  Serial.println(F("Y<deg>,<deg> = stream waypoints, YE = end"));
+  Serial.println(F("T = clock ping, TS<0|1> = timestamped positions"));
+  Serial.println(F("R<baud> = switch baud, R = probe"));
   Serial.println();
 }
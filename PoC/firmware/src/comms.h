@@ -4,7 +4,7 @@
  * Declares all serial command handlers (doXxx), position reporting,
  * and the Commander setup function.
  *
- * Protocol: ASCII text at 115200 baud, '\n'-terminated
+ * Protocol: ASCII text at 115200 baud (R<baud> negotiates higher), '\n'-terminated
  *   PC → STM32: Single-letter commands with optional value
  *   STM32 → PC: "A:<cmd>" acknowledgements, "P<angle>" position updates
  */
@@ -35,8 +35,18 @@ void doWallStrength(char* cmd);
 // ======================== Query/Action Handlers ========================
 void doQueryPosition(char* cmd);
 void doSeekPosition(char* cmd);
+void doTrajectory(char* cmd);
 void doQueryState(char* cmd);
 void doMotor(char* cmd);
+void doTime(char* cmd);
+void doBaud(char* cmd);
+
+// ======================== Baud Negotiation ========================
+/**
+ * Revert to BAUD_DEFAULT if a rate switch was not confirmed by a probe
+ * within BAUD_PROBE_TIMEOUT_MS. Call every loop iteration.
+ */
+void checkBaudProbe();
 
 // ======================== Position Reporting ========================
 void reportPosition();
@@ -40,8 +40,15 @@ float last_reported_angle  = 0.0f;
 unsigned long last_report_us = 0;
 float report_interval_ms   = DEFAULT_REPORT_INTERVAL_MS;
 float report_threshold_deg = DEFAULT_REPORT_THRESHOLD_DEG;
+bool  report_timestamps    = false;
+
+// ======================== Serial Link ========================
+unsigned long current_baud        = BAUD_DEFAULT;
+unsigned long baud_probe_deadline = 0;
+bool          baud_probe_pending  = false;
 
 // ======================== Position Seek ========================
 float seek_tolerance_rad      = 0.06f;   // ~3.4° — relaxed for reliable completion
 unsigned long seek_settle_start = 0;
 unsigned long seek_start_time   = 0;
+bool seek_streamed              = false;
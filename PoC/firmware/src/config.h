@@ -71,6 +71,17 @@ const unsigned long DEBOUNCE_MS = 200;  // Min ms between accepted presses
 const unsigned long SEEK_SETTLE_MS  = 200;    // Hold at target before returning
 const unsigned long SEEK_TIMEOUT_MS = 10000;  // 10 second timeout
 
+// --- Streamed trajectories (Y) ---
+const unsigned int  TRAJ_BUFFER_SIZE       = 64;   // Waypoint ring capacity
+const float         TRAJ_PERIOD_MS         = 10.0f; // Time between consecutive waypoints
+const unsigned long TRAJ_SETTLE_MS         = 50;   // Hold at the last waypoint before SEEK_DONE
+const float         TRAJ_SETTLE_VELOCITY   = 0.5f; // rad/s — and be this slow while holding
+const unsigned long TRAJ_STARVE_TIMEOUT_MS = 500;  // Host went quiet mid-stream: finish in place
+
+// --- Serial link ---
+const unsigned long BAUD_DEFAULT          = 115200;  // Boot rate; fallback after a failed switch
+const unsigned long BAUD_PROBE_TIMEOUT_MS = 1000;    // Revert unless the host probes at the new rate
+
 // --- Reporting defaults ---
 const float DEFAULT_REPORT_INTERVAL_MS  = 20.0f;   // Position report throttle
 const float DEFAULT_REPORT_THRESHOLD_DEG = 0.5f;   // Min change to report
@@ -106,11 +117,18 @@ extern float last_reported_angle;
 extern unsigned long last_report_us;
 extern float report_interval_ms;
 extern float report_threshold_deg;
+extern bool  report_timestamps;  // Default: false (append "@<micros>" to P lines)
+
+// --- Serial link (runtime state) ---
+extern unsigned long current_baud;
+extern unsigned long baud_probe_deadline;  // millis() deadline while baud_probe_pending
+extern bool          baud_probe_pending;   // Switched rate awaiting the host's probe
 
 // --- Position Seek (runtime state) ---
 extern float seek_tolerance_rad;
 extern unsigned long seek_settle_start;
 extern unsigned long seek_start_time;
+extern bool seek_streamed;              // Settling after a Y stream (TRAJ_SETTLE_*), not a Z
 
 // ======================== Helper Functions ========================
 
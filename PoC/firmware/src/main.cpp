@@ -7,6 +7,7 @@
  *   haptics      — Torque computation (4 models)
  *   comms        — Serial commands, position reporting, Commander
  *   button       — Debounced multi-button input
+ *   trajectory   — Host-streamed seek trajectories (Y)
  *
  * Serial Protocol:
  *   PC → STM32: Single-letter commands (H, I, C, O, S, D, etc.)
@@ -22,6 +23,7 @@
 #include "haptics.h"
 #include "comms.h"
 #include "button.h"
+#include "trajectory.h"
 
 // ======================== Hardware Object Definitions ========================
 // These are declared extern in config.h, defined here because they need
@@ -34,7 +36,7 @@ Commander command = Commander(Serial);
 
 // ======================== Setup ========================
 void setup() {
-  Serial.begin(115200);
+  Serial.begin(BAUD_DEFAULT);
   delay(1000);
   SimpleFOCDebug::enable(&Serial);
 
@@ -92,20 +94,35 @@ void loop() {
 
   // Mode dispatch
   if (currentMode == MODE_POSITION) {
+    // Streamed trajectory: move motor.target along the waypoints; once it
+    // finishes, settle at the last one like a Z seek. The shaft arrives
+    // still catching up with the moving target, so the hold is shorter but
+    // must also be slow.
+    if (traj_active && !updateTrajectory()) {
+      seek_settle_start = 0;
+      seek_start_time = millis();
+      seek_streamed = true;
+    }
+
     // SimpleFOC handles position control internally
     motor.move(motor.target);
 
     // Check if we've reached target position
     float pos_error = fabs(motor.shaft_angle - motor.target);
     bool timeout = (millis() - seek_start_time) > SEEK_TIMEOUT_MS;
+    bool settled = pos_error < seek_tolerance_rad
+        && (!seek_streamed || fabs(motor.shaft_velocity) < TRAJ_SETTLE_VELOCITY);
+    unsigned long settle_ms = seek_streamed ? TRAJ_SETTLE_MS : SEEK_SETTLE_MS;
 
-    if (pos_error < seek_tolerance_rad || timeout) {
+    if (traj_active) {
+      // Still streaming: the target is moving, nothing to settle yet
+    } else if (settled || timeout) {
       if (seek_settle_start == 0) {
         seek_settle_start = millis();
         if (timeout) {
           Serial.print(F("Seek timeout, error=")); Serial.println(pos_error * 180.0f / _PI, 1);
         }
-      } else if (millis() - seek_settle_start > SEEK_SETTLE_MS) {
+      } else if (millis() - seek_settle_start > settle_ms) {
         // Settled at target — return to previous mode
         motor.controller = MotionControlType::torque;
         currentMode = previousMode;
@@ -139,4 +156,5 @@ void loop() {
 
   reportPosition();
   command.run();
+  checkBaudProbe();
 }
@@ -0,0 +1,101 @@
+/**
+ * trajectory.cpp — Host-Streamed Seek Trajectories
+ *
+ * Waypoint ring plus a trajectory clock. The segment being followed runs
+ * from the ring's head to the next waypoint; traj_phase_ms is the time
+ * into it. The clock only advances while a next waypoint exists, so an
+ * underrun holds position instead of skipping ahead when data resumes.
+ */
+
+#include "trajectory.h"
+#include "config.h"
+
+// ======================== State ========================
+bool traj_active = false;
+unsigned long traj_underruns = 0;
+
+static float traj_buf[TRAJ_BUFFER_SIZE];
+static unsigned int traj_head = 0;       // Ring index of the segment start
+static unsigned int traj_count = 0;      // Waypoints buffered (head included)
+static float traj_phase_ms = 0.0f;       // Time into the current segment
+static unsigned long traj_last_us = 0;
+static bool traj_ending = false;         // YE received
+static bool traj_starved = false;
+static unsigned long traj_starve_start = 0;
+
+// ======================== Stream Control ========================
+void trajectoryStart() {
+  traj_head = 0;
+  traj_count = 0;
+  traj_phase_ms = 0.0f;
+  traj_last_us = micros();
+  traj_ending = false;
+  traj_starved = false;
+  traj_active = true;
+}
+
+void trajectoryStop() {
+  traj_active = false;
+  traj_count = 0;
+}
+
+bool trajectoryPush(float target_rad) {
+  if (traj_count >= TRAJ_BUFFER_SIZE) {
+    return false;
+  }
+  traj_buf[(traj_head + traj_count) % TRAJ_BUFFER_SIZE] = target_rad;
+  traj_count++;
+  return true;
+}
+
+void trajectoryEnd() {
+  traj_ending = true;
+}
+
+unsigned int trajectoryFree() {
+  return TRAJ_BUFFER_SIZE - traj_count;
+}
+
+// ======================== Interpolation ========================
+bool updateTrajectory() {
+  unsigned long now = micros();
+  float dt_ms = (now - traj_last_us) / 1000.0f;
+  traj_last_us = now;
+
+  if (traj_count == 0) {
+    // Nothing received yet (or stopped): hold the current target
+    return traj_active = !traj_ending;
+  }
+
+  traj_phase_ms += dt_ms;
+  while (traj_phase_ms >= TRAJ_PERIOD_MS && traj_count >= 2) {
+    traj_head = (traj_head + 1) % TRAJ_BUFFER_SIZE;
+    traj_count--;
+    traj_phase_ms -= TRAJ_PERIOD_MS;
+  }
+
+  float from = traj_buf[traj_head];
+  if (traj_count >= 2) {
+    float to = traj_buf[(traj_head + 1) % TRAJ_BUFFER_SIZE];
+    motor.target = from + (to - from) * (traj_phase_ms / TRAJ_PERIOD_MS);
+    traj_starved = false;
+    return true;
+  }
+
+  // One waypoint left: hold it and pause the clock
+  motor.target = from;
+  traj_phase_ms = 0.0f;
+  if (traj_ending) {
+    traj_active = false;
+    return false;
+  }
+  if (!traj_starved) {
+    traj_starved = true;
+    traj_starve_start = millis();
+    traj_underruns++;
+  } else if (millis() - traj_starve_start > TRAJ_STARVE_TIMEOUT_MS) {
+    traj_active = false;  // Host stopped streaming: finish where we are
+    return false;
+  }
+  return true;
+}
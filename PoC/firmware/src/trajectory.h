@@ -0,0 +1,65 @@
+/**
+ * trajectory.h — Host-Streamed Seek Trajectories
+ *
+ * A Z seek jumps motor.target to the destination and lets the angle
+ * loop's velocity clamp do the rest. For long, smooth moves the host
+ * instead streams a planned trajectory as waypoints TRAJ_PERIOD_MS apart
+ * (Y commands); the loop interpolates motor.target between them.
+ *
+ * Waypoints go into a TRAJ_BUFFER_SIZE ring. Each Y is acked with the
+ * free slots left, which the host uses as flow-control credit. If the
+ * ring runs dry the trajectory clock pauses at the last waypoint until
+ * more arrive (or TRAJ_STARVE_TIMEOUT_MS passes). After YE, the stream
+ * finishes at its last waypoint with the usual seek settle and SEEK_DONE.
+ *
+ * Usage (from loop(), in MODE_POSITION):
+ *   if (traj_active && !updateTrajectory()) { ... start the settle ... }
+ */
+
+#ifndef TRAJECTORY_H
+#define TRAJECTORY_H
+
+#include <Arduino.h>
+
+// ======================== State ========================
+extern bool traj_active;              // A stream is driving motor.target
+extern unsigned long traj_underruns;  // Times the ring ran dry mid-stream
+
+// ======================== Functions ========================
+
+/**
+ * Start a new stream: empty the ring and restart the trajectory clock.
+ */
+void trajectoryStart();
+
+/**
+ * Stop streaming (a Z seek or mode change took over). motor.target is
+ * left where it is.
+ */
+void trajectoryStop();
+
+/**
+ * Append one waypoint.
+ * @param target_rad  Angle in radians
+ * @return            false if the ring is full (waypoint dropped)
+ */
+bool trajectoryPush(float target_rad);
+
+/**
+ * Mark the end of the stream: once the ring drains, the stream finishes.
+ */
+void trajectoryEnd();
+
+/**
+ * Free ring slots (the flow-control credit acked to the host).
+ */
+unsigned int trajectoryFree();
+
+/**
+ * Advance the trajectory clock and set motor.target. Call every loop
+ * iteration while traj_active.
+ * @return  false once the stream has finished (traj_active is cleared)
+ */
+bool updateTrajectory();
+
+#endif // TRAJECTORY_H
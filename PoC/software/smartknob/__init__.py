@@ -4,14 +4,37 @@ SmartKnob — Cross-platform serial driver for the SmartKnob haptic controller.
 Provides:
 - SmartKnobDriver: Thread-safe serial communication with the STM32 firmware
 - HapticMode: Enum of available haptic modes
+- ConnectionState: Link states reported by the driver's auto-reconnect
 - print_help(): Quick protocol reference
+- smartknob.server: share one knob with several local apps (``smartknob serve``)
 
 For Windows integrations (volume, brightness, scroll, zoom), see smartknob_windows.
 """
 
 __version__ = "0.0.3"
 
-from smartknob.driver import SmartKnobDriver
-from smartknob.protocol import HapticMode, print_help
+# Imported on first access, so ``import smartknob.cli`` (and any other
+# submodule) doesn't pay for the driver and pyserial up front
+_EXPORTS = {
+    "SmartKnobDriver": "smartknob.driver",
+    "ConnectionState": "smartknob.driver",
+    "HapticMode": "smartknob.protocol",
+    "print_help": "smartknob.protocol",
+}
 
-__all__ = ["SmartKnobDriver", "HapticMode", "print_help"]
+__all__ = ["SmartKnobDriver", "ConnectionState", "HapticMode", "print_help"]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'smartknob' has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
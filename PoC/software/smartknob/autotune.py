@@ -0,0 +1,666 @@
+"""Seek PID autotuning from recorded step responses.
+
+Tuning ``MPP``/``MPI``/``MPD``/``MVL`` by hand means seek, watch, nudge,
+repeat. ``autotune()`` automates it in three stages:
+
+    record      run a series of ``Z`` seeks through ``SmartKnobDriver`` with
+                known gains and keep each position trace (``on_sample``,
+                device timestamps when enabled) from the command to
+                ``A:SEEK_DONE``
+    fit         find the ``RotorParams`` (inertia, viscous drag, dry
+                friction) whose closed-loop simulation reproduces every
+                trace: a coarse batched grid, then Levenberg–Marquardt with
+                the whole Jacobian simulated as one batch
+    tune        search the gains against the fitted rotor (Latin hypercube,
+                then a refined box) for the shortest worst-case settle time
+                with every step's overshoot under a bound
+
+Proposed gains can be applied and checked by recording the same seeks
+again. Everything runs through the serial protocol, so it works the same
+against hardware and against ``SimulatedKnob(rotor=...)`` — ``benchmark()``
+tunes a simulated rotor with known parameters end to end.
+
+Needs numpy (``pip install smartknob[model]``).
+
+Usage:
+    knob.connect("/dev/ttyACM0")
+    result = autotune(knob, overshoot_pct=5.0)
+    print(result.proposal.commands)    # {"MPP": ..., "MPI": ..., ...}
+
+    # or: smartknob autotune --port /dev/ttyACM0 [--apply]
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field, fields, replace
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+import numpy as np
+
+from smartknob.model import (
+    DEFAULT_GAINS,
+    DEFAULT_ROTOR,
+    LOOP_DT_S,
+    SEEK_TOLERANCE_RAD,
+    RotorParams,
+    SeekGains,
+    score,
+    simulate_closed_loop,
+)
+from smartknob.sweep import latin_hypercube, rank
+
+if TYPE_CHECKING:
+    from smartknob.driver import PositionSample, SmartKnobDriver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STEPS_DEG: tuple[float, ...] = (90.0, 0.0, -30.0, 15.0, -60.0, 0.0)
+"""Seek targets recorded in order: large and small steps in both directions."""
+
+DEFAULT_OVERSHOOT_PCT: float = 5.0
+"""Overshoot bound (% of the step) every step must respect."""
+
+DEFAULT_SPACE: dict[str, tuple[float, float]] = {
+    "pos_p": (5.0, 150.0),
+    "pos_i": (0.0, 5.0),
+    "pos_d": (0.0, 1.5),
+    "velocity_limit": (10.0, 80.0),
+}
+"""Gain search ranges (the driver's documented typical ranges)."""
+
+TUNED_COMMANDS: dict[str, str] = {"pos_p": "MPP", "pos_i": "MPI", "pos_d": "MPD", "velocity_limit": "MVL"}
+"""SeekGains field → firmware parameter."""
+
+FIT_FIELDS: tuple[str, ...] = ("inertia", "viscous", "coulomb")
+"""RotorParams fields fitted from the traces; the rest come from the base rotor."""
+
+SETTLE_TOLERANCE_DEG: float = math.degrees(SEEK_TOLERANCE_RAD)
+"""Settling band for predicted and measured settle times: the firmware's
+seek band (~3.4°). Traces end at ``A:SEEK_DONE``, which is only sent after
+the knob has held inside this band, so a narrower band would often never
+be reached within the recording (the firmware changes mode right after)."""
+
+# Coarse grid for the fit's starting point: log10 of each FIT_FIELDS value
+_FIT_GRID = (np.linspace(-6.0, -3.5, 11), np.linspace(-7.0, -3.0, 9), np.linspace(-5.0, -2.5, 6))
+_FIT_BOUNDS = (np.array([-7.0, -9.0, -7.0]) * math.log(10), np.array([-2.0, -2.0, -1.5]) * math.log(10))
+_MAX_BATCH_ROWS = 2048
+
+
+# ======================== Recording ========================
+
+
+@dataclass
+class StepTrace:
+    """
+    One recorded seek.
+
+    Attributes:
+        start_deg: Shaft angle when ``Z`` was sent.
+        target_deg: Seek target.
+        t: Sample times (s after the command was written).
+        angle_deg: Reported angle per sample.
+        gains: Gains in effect during the seek.
+        status: ``SeekResult.status`` ("done", "timeout", ...).
+    """
+
+    start_deg: float
+    target_deg: float
+    t: np.ndarray
+    angle_deg: np.ndarray
+    gains: SeekGains
+    status: str = "done"
+
+
+def apply_gains(driver: SmartKnobDriver, gains: SeekGains) -> None:
+    """Send ``MPP``/``MPI``/``MPD``/``MVL`` for the tuned fields of *gains*."""
+    driver.set_pid_p(float(gains.pos_p))
+    driver.set_pid_i(float(gains.pos_i))
+    driver.set_pid_d(float(gains.pos_d))
+    driver.set_velocity_limit(float(gains.velocity_limit))
+
+
+def record_steps(
+    driver: SmartKnobDriver,
+    steps_deg: Sequence[float] = DEFAULT_STEPS_DEG,
+    gains: Optional[SeekGains] = None,
+    pause_s: float = 0.3,
+    timeout: float = 12.0,
+) -> list[StepTrace]:
+    """
+    Run seeks to each of *steps_deg* in turn and record their traces.
+
+    ``on_sample`` is wrapped (the previous handler still runs) for the
+    duration. Samples use the device timestamp mapped to host time when
+    ``enable_device_timestamps()`` is on, else the arrival time.
+
+    Args:
+        driver: A connected driver.
+        steps_deg: Seek targets, in order.
+        gains: Gains to send first (default: firmware defaults). The fit
+               needs to know them, so they are always set explicitly.
+        pause_s: Rest between seeks so each starts from standstill.
+        timeout: Per-seek wait; the firmware gives up after 10 s.
+
+    Returns:
+        list[StepTrace]: One per target that produced any samples.
+
+    Raises:
+        ConnectionError: The driver is not connected.
+    """
+    if not driver.is_connected:
+        raise ConnectionError("record_steps() needs a connected driver")
+    gains = gains or DEFAULT_GAINS
+    apply_gains(driver, gains)
+
+    lock = threading.Lock()
+    samples: list[tuple[float, float]] = []
+    def on_sample(sample: PositionSample) -> None:
+        ts = sample.device_host_time if sample.device_host_time is not None else sample.host_time
+        with lock:
+            samples.append((ts, sample.angle_deg))
+
+    sub = driver.events.subscribe("sample", on_sample, name="autotune.record_steps")
+    traces = []
+    try:
+        time.sleep(pause_s)
+        for target in steps_deg:
+            start = driver.current_angle
+            with lock:
+                samples.clear()
+            future = driver.seek(target)
+            try:
+                result = future.result(timeout)
+                status, sent_at, done_at = result.status, result.sent_at, result.done_at
+            except Exception:  # Timed out waiting: keep what arrived
+                status, sent_at, done_at = "timeout", None, None
+            with lock:
+                recorded = list(samples)
+            if sent_at is None or not recorded:
+                logger.warning("Seek to %.1f° recorded nothing (%s)", target, status)
+                continue
+            end = done_at if done_at is not None else math.inf
+            kept = [(ts - sent_at, a) for ts, a in recorded if sent_at <= ts <= end]
+            if kept:
+                t, angle = np.array(kept).T
+                traces.append(StepTrace(start, float(target), t, angle, gains, status))
+            time.sleep(pause_s)
+    finally:
+        sub.unsubscribe()
+    return traces
+
+
+def step_metrics(trace: StepTrace, tolerance_deg: float = SETTLE_TOLERANCE_DEG) -> dict[str, float]:
+    """
+    Overshoot and settle time measured from a recorded trace.
+
+    Position reports are sparse (interval and threshold gated), so the
+    settle time is the first sample from which every later one stays in
+    the band.
+
+    Returns:
+        dict: ``overshoot_pct``, ``overshoot_deg``, ``settle_s`` (inf if
+              the last sample is outside the band) and ``final_error_deg``.
+    """
+    err = trace.angle_deg - trace.target_deg
+    step = trace.start_deg - trace.target_deg
+    direction = 1.0 if step >= 0 else -1.0
+    overshoot = max(0.0, float((-err * direction).max()))
+    outside = np.flatnonzero(np.abs(err) > tolerance_deg)
+    if not len(outside):
+        settle = float(trace.t[0])
+    elif outside[-1] == len(err) - 1:
+        settle = math.inf
+    else:
+        settle = float(trace.t[outside[-1] + 1])
+    return {
+        "overshoot_pct": overshoot / abs(step) * 100 if step else 0.0,
+        "overshoot_deg": overshoot,
+        "settle_s": settle,
+        "final_error_deg": float(abs(err[-1])),
+    }
+
+
+def summarize(traces: Sequence[StepTrace]) -> dict[str, float]:
+    """Worst-case overshoot / settle time and mean settle time over *traces*."""
+    rows = [step_metrics(t) for t in traces]
+    if not rows:
+        return {"overshoot_pct": math.nan, "settle_s": math.nan, "mean_settle_s": math.nan}
+    return {
+        "overshoot_pct": max(r["overshoot_pct"] for r in rows),
+        "settle_s": max(r["settle_s"] for r in rows),
+        "mean_settle_s": float(np.mean([r["settle_s"] for r in rows])),
+    }
+
+
+# ======================== Plant Fit ========================
+
+
+@dataclass
+class PlantFit:
+    """
+    Result of ``fit_plant()``.
+
+    Attributes:
+        rotor: Fitted rotor (FIT_FIELDS fitted, the rest from the base).
+        rms_deg: RMS residual over all samples.
+        iterations: Levenberg–Marquardt iterations run.
+        samples: Number of residuals (recorded samples) fitted.
+    """
+
+    rotor: RotorParams
+    rms_deg: float
+    iterations: int
+    samples: int
+
+
+class _TraceSet:
+    """Recorded traces packed for batched simulation: one row per trace."""
+
+    def __init__(self, traces: Sequence[StepTrace], dt: float) -> None:
+        if not traces:
+            raise ValueError("No traces to fit")
+        self.n = len(traces)
+        self.dt = dt
+        self.angle0 = np.radians([t.start_deg for t in traces])
+        self.target = np.radians([t.target_deg for t in traces])
+        self.gains = SeekGains(**{
+            f.name: np.array([float(getattr(t.gains, f.name)) for t in traces]) for f in fields(SeekGains)
+        })
+        self.duration_s = max(float(t.t[-1]) for t in traces) + 2 * dt
+        self.steps = int(round(self.duration_s / dt))
+        self.row = np.concatenate([np.full(len(t.t), i) for i, t in enumerate(traces)])
+        self.index = np.clip(np.round(np.concatenate([t.t for t in traces]) / dt).astype(int) - 1,
+                             0, self.steps - 1)
+        self.measured = np.radians(np.concatenate([t.angle_deg for t in traces]))
+
+    def residuals(self, log_theta: np.ndarray, base: RotorParams) -> np.ndarray:
+        """Simulated minus measured angle (deg), shape ``(candidates, samples)``."""
+        log_theta = np.atleast_2d(log_theta)
+        m = len(log_theta)
+        out = np.empty((m, len(self.measured)))
+        per_call = max(1, _MAX_BATCH_ROWS // self.n)
+        for lo in range(0, m, per_call):
+            chunk = np.exp(log_theta[lo:lo + per_call])
+            k = len(chunk)
+            rotor = replace(base, **{name: np.repeat(chunk[:, j], self.n) for j, name in enumerate(FIT_FIELDS)})
+            gains = SeekGains(**{f.name: np.tile(getattr(self.gains, f.name), k) for f in fields(SeekGains)})
+            trace = simulate_closed_loop("position", np.tile(self.angle0, k), 0.0, rotor=rotor, gains=gains,
+                                         target=np.tile(self.target, k), duration_s=self.duration_s, dt=self.dt)
+            angle = trace.angle.reshape(k, self.n, self.steps)
+            out[lo:lo + k] = angle[:, self.row, self.index] - self.measured
+        return np.degrees(out)
+
+
+def fit_plant(
+    traces: Sequence[StepTrace],
+    base: RotorParams = DEFAULT_ROTOR,
+    max_iterations: int = 30,
+    dt: float = LOOP_DT_S,
+) -> PlantFit:
+    """
+    Least-squares fit of the rotor to recorded seeks.
+
+    Each candidate rotor is scored by simulating every trace's seek (same
+    start, target and gains) and comparing angles at the sample times.
+    A coarse log-spaced grid picks the start; Levenberg–Marquardt in log
+    parameters refines it, with the base point and all forward-difference
+    perturbations simulated as one batch per iteration.
+
+    Args:
+        traces: Output of ``record_steps()``.
+        base: Supplies ``torque_per_volt`` and ``back_emf`` (not separable
+              from the fitted terms with position data alone).
+        max_iterations: Levenberg–Marquardt iteration cap.
+        dt: Simulation step (the firmware loop period).
+
+    Returns:
+        PlantFit: Fitted rotor and residual.
+
+    Raises:
+        ValueError: No traces.
+    """
+    data = _TraceSet(traces, dt)
+    lower, upper = _FIT_BOUNDS
+
+    grid = np.stack(np.meshgrid(*_FIT_GRID, indexing="ij"), axis=-1).reshape(-1, len(FIT_FIELDS)) * math.log(10)
+    costs = (data.residuals(grid, base) ** 2).sum(axis=1)
+    theta = grid[np.nanargmin(costs)]
+    r = data.residuals(theta, base)[0]
+    cost = float(r @ r)
+
+    h = 0.02
+    damping = 1e-2
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        probe = np.vstack([theta, theta + h * np.eye(len(theta))])
+        res = data.residuals(probe, base)
+        r = res[0]
+        jac = ((res[1:] - r) / h).T
+        jtj = jac.T @ jac
+        grad = jac.T @ r
+        improved = False
+        while damping < 1e8:
+            delta = np.linalg.solve(jtj + damping * np.diag(np.diag(jtj) + 1e-12), -grad)
+            trial = np.clip(theta + delta, lower, upper)
+            r_trial = data.residuals(trial, base)[0]
+            cost_trial = float(r_trial @ r_trial)
+            if cost_trial < cost:
+                theta, damping, improved = trial, max(damping / 3.0, 1e-7), True
+                converged = (cost - cost_trial) < 1e-6 * cost or np.abs(delta).max() < 1e-4
+                cost = cost_trial
+                break
+            damping *= 4.0
+        if not improved or converged:
+            break
+
+    rotor = replace(base, **{name: float(np.exp(theta[j])) for j, name in enumerate(FIT_FIELDS)})
+    return PlantFit(rotor, math.sqrt(cost / len(data.measured)), iteration, len(data.measured))
+
+
+# ======================== Gain Search ========================
+
+
+@dataclass
+class GainProposal:
+    """
+    Result of ``tune_gains()``.
+
+    Attributes:
+        gains: Proposed gains (scalars).
+        predicted: Simulated worst-case ``settle_s`` / ``overshoot_pct`` and
+                   ``mean_settle_s`` and ``peak_v`` over the steps.
+        baseline: The same figures for the gains the traces were recorded with.
+        evaluated: Candidate gain sets simulated.
+    """
+
+    gains: SeekGains
+    predicted: dict[str, float]
+    baseline: dict[str, float]
+    evaluated: int
+
+    @property
+    def commands(self) -> dict[str, float]:
+        """Firmware parameter → value, e.g. ``{"MPP": 32.5, ...}``."""
+        return {cmd: round(float(getattr(self.gains, name)), 2) for name, cmd in TUNED_COMMANDS.items()}
+
+
+def evaluate_gains(
+    columns: dict[str, np.ndarray],
+    rotor: RotorParams,
+    steps: Sequence[tuple[float, float]],
+    base: SeekGains = DEFAULT_GAINS,
+    duration_s: float = 1.5,
+    dt: float = LOOP_DT_S,
+) -> dict[str, np.ndarray]:
+    """
+    Simulate every candidate on every ``(start_deg, target_deg)`` step.
+
+    Args:
+        columns: {SeekGains field: values}, all the same length.
+        rotor: Plant to simulate.
+        steps: Step set each candidate must handle.
+        base: Gains for fields not in *columns*.
+
+    Returns:
+        dict: Per candidate: worst ``settle_s`` and ``overshoot_pct``,
+              ``mean_settle_s``, ``peak_v`` and worst ``final_error_deg``.
+    """
+    n = len(next(iter(columns.values())))
+    s = len(steps)
+    start, target = np.radians(np.array(steps, dtype=float)).T
+    out = {k: np.empty(n) for k in ("settle_s", "overshoot_pct", "mean_settle_s", "peak_v", "final_error_deg")}
+    per_call = max(1, _MAX_BATCH_ROWS // s)
+    for lo in range(0, n, per_call):
+        k = min(per_call, n - lo)
+        gains = replace(base, **{name: np.repeat(np.asarray(v, dtype=float)[lo:lo + k], s)
+                                 for name, v in columns.items()})
+        trace = simulate_closed_loop("position", np.tile(start, k), 0.0, rotor=rotor, gains=gains,
+                                     target=np.tile(target, k), duration_s=duration_s, dt=dt)
+        scores = {key: v.reshape(k, s) for key, v in
+                  score(trace, np.tile(target, k), math.radians(SETTLE_TOLERANCE_DEG)).items()}
+        out["settle_s"][lo:lo + k] = scores["settle_s"].max(axis=1)
+        out["overshoot_pct"][lo:lo + k] = scores["overshoot_pct"].max(axis=1)
+        out["mean_settle_s"][lo:lo + k] = scores["settle_s"].mean(axis=1)
+        out["peak_v"][lo:lo + k] = scores["peak_v"].max(axis=1)
+        out["final_error_deg"][lo:lo + k] = scores["final_error_deg"].max(axis=1)
+    return out
+
+
+def tune_gains(
+    rotor: RotorParams,
+    steps: Sequence[tuple[float, float]],
+    overshoot_pct: float = DEFAULT_OVERSHOOT_PCT,
+    baseline: SeekGains = DEFAULT_GAINS,
+    space: Optional[dict[str, tuple[float, float]]] = None,
+    samples: int = 1024,
+    rounds: int = 2,
+    seed: int = 0,
+) -> GainProposal:
+    """
+    Gains minimising the worst-case settle time with every step's
+    overshoot at or under *overshoot_pct*.
+
+    Round one samples *space* by Latin hypercube; each further round
+    samples a box a quarter the size around the best so far.
+
+    Args:
+        rotor: Fitted plant.
+        steps: ``(start_deg, target_deg)`` pairs to tune for.
+        overshoot_pct: Bound on every step's overshoot.
+        baseline: Gains to compare against (and to keep if nothing
+                  better satisfies the bound).
+        space: {SeekGains field: (low, high)} (default ``DEFAULT_SPACE``).
+        samples: Candidates per round.
+        rounds: Search rounds.
+        seed: Sampling seed.
+
+    Returns:
+        GainProposal: Best gains with predicted and baseline figures.
+    """
+    space = dict(space or DEFAULT_SPACE)
+    names = list(space)
+    base_cols = {name: np.array([float(getattr(baseline, name))]) for name in names}
+    base_scores = evaluate_gains(base_cols, rotor, steps, baseline)
+    best_cols, best_scores = base_cols, base_scores
+    feasible = base_scores["overshoot_pct"][0] <= overshoot_pct and np.isfinite(base_scores["settle_s"][0])
+    box = space
+    evaluated = 1
+    for round_ in range(rounds):
+        cols = latin_hypercube(box, samples, seed + round_)
+        scores = evaluate_gains(cols, rotor, steps, baseline)
+        evaluated += samples
+        order = rank(scores, "settle_s", {"overshoot_pct": overshoot_pct})
+        if len(order):
+            i = order[0]
+            if not feasible or scores["settle_s"][i] < best_scores["settle_s"][0]:
+                best_cols = {name: cols[name][i:i + 1] for name in names}
+                best_scores = {k: v[i:i + 1] for k, v in scores.items()}
+                feasible = True
+        if not feasible:
+            continue  # Keep searching the full space
+        box = {}
+        for name in names:
+            low, high = space[name]
+            half = (high - low) / 8.0
+            centre = float(best_cols[name][0])
+            box[name] = (max(low, centre - half), min(high, centre + half))
+
+    if not feasible:
+        logger.warning("No gains keep overshoot under %.1f%%; keeping the baseline", overshoot_pct)
+    gains = replace(baseline, **{name: float(best_cols[name][0]) for name in names})
+    return GainProposal(
+        gains,
+        {k: float(v[0]) for k, v in best_scores.items()},
+        {k: float(v[0]) for k, v in base_scores.items()},
+        evaluated,
+    )
+
+
+# ======================== End to End ========================
+
+
+@dataclass
+class AutotuneResult:
+    """
+    Everything ``autotune()`` did.
+
+    Attributes:
+        traces: Seeks recorded with the starting gains.
+        fit: Plant fit.
+        proposal: Proposed gains.
+        before: Measured ``summarize()`` figures with the starting gains.
+        after: Measured figures after applying the proposal (None unless
+               applied and verified).
+        verify_traces: Seeks recorded with the proposed gains.
+        timings: Seconds spent per stage.
+    """
+
+    traces: list[StepTrace]
+    fit: PlantFit
+    proposal: GainProposal
+    before: dict[str, float]
+    after: Optional[dict[str, float]] = None
+    verify_traces: list[StepTrace] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+def autotune(
+    driver: SmartKnobDriver,
+    steps_deg: Sequence[float] = DEFAULT_STEPS_DEG,
+    gains: Optional[SeekGains] = None,
+    overshoot_pct: float = DEFAULT_OVERSHOOT_PCT,
+    base_rotor: RotorParams = DEFAULT_ROTOR,
+    samples: int = 1024,
+    apply: bool = False,
+    verify: bool = True,
+    seed: int = 0,
+    progress: Optional[Callable[[str], None]] = None,
+) -> AutotuneResult:
+    """
+    Record seeks, fit the rotor, propose gains and optionally apply them.
+
+    Args:
+        driver: A connected driver. Seeks move the knob; keep hands off.
+        steps_deg: Seek targets to record and tune for.
+        gains: Gains to record with (default: firmware defaults).
+        overshoot_pct: Overshoot bound for the proposal.
+        base_rotor: Fixed rotor terms for the fit (see ``fit_plant()``).
+        samples: Gain candidates per search round.
+        apply: Send the proposed gains to the knob. Otherwise the starting
+               gains are left in place.
+        verify: After applying, record the steps again and measure.
+        seed: Search seed.
+        progress: Optional ``(stage)`` callback ("record", "fit", ...).
+
+    Returns:
+        AutotuneResult: Traces, fit, proposal and measurements.
+
+    Raises:
+        RuntimeError: No seek produced a trace.
+    """
+    gains = gains or DEFAULT_GAINS
+    timings = {}
+
+    def stage(name: str) -> float:
+        if progress:
+            progress(name)
+        return time.perf_counter()
+
+    t0 = stage("record")
+    traces = record_steps(driver, steps_deg, gains)
+    if not traces:
+        raise RuntimeError("No seek produced any position samples")
+    timings["record"] = time.perf_counter() - t0
+
+    t0 = stage("fit")
+    fit = fit_plant(traces, base_rotor)
+    timings["fit"] = time.perf_counter() - t0
+    logger.info("Fitted rotor: %s (RMS %.2f°)", fit.rotor, fit.rms_deg)
+
+    t0 = stage("tune")
+    pairs = [(t.start_deg, t.target_deg) for t in traces]
+    proposal = tune_gains(fit.rotor, pairs, overshoot_pct, gains, samples=samples, seed=seed)
+    timings["tune"] = time.perf_counter() - t0
+
+    result = AutotuneResult(traces, fit, proposal, summarize(traces), timings=timings)
+    if apply:
+        if verify:
+            t0 = stage("verify")
+            result.verify_traces = record_steps(driver, steps_deg, proposal.gains)
+            result.after = summarize(result.verify_traces)
+            timings["verify"] = time.perf_counter() - t0
+        else:
+            apply_gains(driver, proposal.gains)
+    else:
+        apply_gains(driver, gains)
+    return result
+
+
+def format_result(result: AutotuneResult) -> str:
+    """Human-readable summary of an ``autotune()`` run."""
+    fit, proposal = result.fit, result.proposal
+    lines = [
+        f"Recorded {len(result.traces)} seeks, {fit.samples} samples",
+        "Fitted rotor: " + ", ".join(f"{name}={getattr(fit.rotor, name):.3g}" for name in FIT_FIELDS)
+        + f"  (RMS {fit.rms_deg:.2f}°, {fit.iterations} iterations)",
+        "Proposed: " + " ".join(f"{cmd}={value:g}" for cmd, value in proposal.commands.items())
+        + f"  ({proposal.evaluated} candidates)",
+        f"  predicted  settle {proposal.baseline['settle_s'] * 1e3:6.0f} → {proposal.predicted['settle_s'] * 1e3:6.0f} ms"
+        f"   overshoot {proposal.baseline['overshoot_pct']:5.1f} → {proposal.predicted['overshoot_pct']:5.1f} %",
+    ]
+    if result.after is not None:
+        before, after = result.before, result.after
+        lines.append(
+            f"  measured   settle {before['settle_s'] * 1e3:6.0f} → {after['settle_s'] * 1e3:6.0f} ms"
+            f"   overshoot {before['overshoot_pct']:5.1f} → {after['overshoot_pct']:5.1f} %"
+        )
+    lines.append("Stages: " + ", ".join(f"{k} {v:.1f} s" for k, v in result.timings.items()))
+    return "\n".join(lines)
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(
+    true_rotor: Optional[RotorParams] = None,
+    overshoot_pct: float = DEFAULT_OVERSHOOT_PCT,
+    samples: int = 512,
+) -> dict:
+    """
+    Autotune a simulated knob whose rotor is known, end to end over a pty.
+
+    Returns:
+        dict: ``truth`` and ``fitted`` rotor terms, ``result`` (the
+              ``AutotuneResult``, applied and verified).
+    """
+    from smartknob.driver import SmartKnobDriver
+    from smartknob.sim import SimulatedKnob
+
+    true_rotor = true_rotor or replace(DEFAULT_ROTOR, inertia=3.2e-5, viscous=2.5e-5, coulomb=4.5e-4)
+    sim = SimulatedKnob(rotor=true_rotor)
+    sim.start()
+    knob = SmartKnobDriver()
+    try:
+        knob.connect(sim.port)
+        result = autotune(knob, overshoot_pct=overshoot_pct, samples=samples, apply=True)
+    finally:
+        knob.disconnect()
+        sim.stop()
+    return {
+        "truth": {name: getattr(true_rotor, name) for name in FIT_FIELDS},
+        "fitted": {name: getattr(result.fit.rotor, name) for name in FIT_FIELDS},
+        "result": result,
+    }
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    print(format_result(r["result"]))
+    for name in FIT_FIELDS:
+        truth, fitted = r["truth"][name], r["fitted"][name]
+        print(f"  {name:<8} true {truth:.3g}  fitted {fitted:.3g}  ({(fitted / truth - 1) * 100:+.1f}%)")
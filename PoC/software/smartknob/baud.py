@@ -0,0 +1,307 @@
+"""Runtime baud-rate negotiation.
+
+The firmware boots at 115200 baud. ``R<baud>`` asks it to switch; it acks
+at the old rate, switches, and reverts on its own unless the host probes
+(bare ``R``) at the new rate within ``BAUD_PROBE_TIMEOUT_S``. That makes a
+failed switch — a cable or USB-UART bridge that cannot keep up — always
+recoverable: whichever side notices first falls back to 115200.
+
+``BaudNegotiator`` drives one negotiation as an explicit state machine:
+
+    IDLE → PROPOSED → SWITCHED → PROBING → VERIFIED
+                  ↘ REFUSED          ↘ REVERTING → REVERTED (try next rate)
+                                                ↘ FAILED   (link is dead)
+
+The remembered rate for the device is tried first, then the remaining
+candidates fastest-first. The rate that verified is stored in
+``BaudMemory`` (a JSON file keyed by USB VID:PID:serial, or the port path
+when the port has no USB identity), so the next session goes straight to
+it; a rate that fails is forgotten.
+
+Usage:
+    rate = knob.negotiate_baud()            # Fastest working rate
+    knob.negotiate_baud(rates=(460800,))    # Only try 460800
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import serial.tools.list_ports
+
+from smartknob.protocol import BAUD_PROBE_TIMEOUT_S, SUPPORTED_BAUD_RATES
+
+if TYPE_CHECKING:
+    from smartknob.driver import SmartKnobDriver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_PATH: str = os.path.join(os.path.expanduser("~"), ".smartknob", "baud.json")
+"""Where negotiated rates are remembered between sessions."""
+
+ACK_TIMEOUT_S: float = 0.3
+"""Wait for ``A:R<baud>`` after proposing a rate."""
+
+PROBE_TIMEOUT_S: float = 0.1
+"""Wait for each ``R<baud>`` probe reply."""
+
+PROBE_ATTEMPTS: int = 3
+"""Probes at the new rate before giving up (all fit inside the firmware timeout)."""
+
+
+class BaudState(str, Enum):
+    """States of a single negotiation."""
+
+    IDLE = "idle"
+    PROPOSED = "proposed"      # R<baud> sent, waiting for the ack
+    SWITCHED = "switched"      # Ack received, host port re-opened at the new rate
+    PROBING = "probing"        # Bare R sent at the new rate
+    VERIFIED = "verified"      # Probe answered — both sides run at the new rate
+    REFUSED = "refused"        # Firmware answered A:R0 (unsupported rate)
+    REVERTING = "reverting"    # Probe failed; host back at the base rate, waiting
+    REVERTED = "reverted"      # Firmware timed out and answers at the base rate again
+    FAILED = "failed"          # No answer at either rate
+
+
+class BaudMemory:
+    """Last verified rate per device, persisted as JSON.
+
+    Args:
+        path: JSON file (created on first write).
+    """
+
+    def __init__(self, path: str = DEFAULT_MEMORY_PATH) -> None:
+        self.path = path
+
+    @staticmethod
+    def device_key(port: str) -> str:
+        """Stable identity for the device behind *port*.
+
+        ``VID:PID:serial`` for USB serial adapters (survives the port being
+        renumbered), otherwise the resolved port path.
+        """
+        device = os.path.realpath(port) if port.startswith("/") else port
+        for info in serial.tools.list_ports.comports():
+            if info.device in (port, device) and info.vid is not None:
+                return f"{info.vid:04X}:{info.pid:04X}:{info.serial_number or ''}"
+        return device
+
+    def _load(self) -> dict[str, int]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, data: dict[str, int]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def get(self, key: str) -> Optional[int]:
+        """Remembered rate for *key*, or None."""
+        rate = self._load().get(key)
+        return rate if isinstance(rate, int) else None
+
+    def set(self, key: str, rate: int) -> None:
+        """Remember *rate* for *key*."""
+        data = self._load()
+        if data.get(key) != rate:
+            data[key] = rate
+            self._save(data)
+
+    def forget(self, key: str) -> None:
+        """Drop the remembered rate for *key*."""
+        data = self._load()
+        if data.pop(key, None) is not None:
+            self._save(data)
+
+
+class BaudNegotiator:
+    """Negotiate the fastest working rate with a connected driver.
+
+    Attributes:
+        state: Current ``BaudState``.
+        transitions: ``(perf_counter, state, rate)`` for every state change.
+    """
+
+    def __init__(self, driver: SmartKnobDriver, memory: Optional[BaudMemory] = None) -> None:
+        """
+        Args:
+            driver: A connected ``SmartKnobDriver``.
+            memory: Rate memory (default: ``BaudMemory()`` in the home directory).
+        """
+        self.driver = driver
+        self.memory = memory if memory is not None else BaudMemory()
+        self.state = BaudState.IDLE
+        self.transitions: list[tuple[float, BaudState, int]] = []
+
+    def _enter(self, state: BaudState, rate: int) -> None:
+        self.state = state
+        self.transitions.append((time.perf_counter(), state, rate))
+        logger.debug("Baud %s: %d", state.value, rate)
+
+    def candidates(self, rates: Optional[Iterable[int]] = None, key: Optional[str] = None) -> list[int]:
+        """Rates to try, in order: the remembered one first, then fastest-first.
+
+        Only rates above the driver's current rate are worth a switch.
+        """
+        base = self.driver.baud_rate
+        pool = sorted({r for r in (rates or SUPPORTED_BAUD_RATES) if r > base}, reverse=True)
+        remembered = self.memory.get(key) if key else None
+        if remembered in pool:
+            pool.remove(remembered)
+            pool.insert(0, remembered)
+        return pool
+
+    def run(self, rates: Optional[Iterable[int]] = None) -> int:
+        """Try each candidate until one verifies.
+
+        Args:
+            rates: Candidate rates (default: ``SUPPORTED_BAUD_RATES``).
+
+        Returns:
+            int: The rate in use afterwards (the base rate if none worked).
+
+        Raises:
+            RuntimeError: If the driver is not connected.
+        """
+        port = self.driver.port
+        if port is None or not self.driver.is_connected:
+            raise RuntimeError("Not connected")
+        key = self.memory.device_key(port)
+        base = self.driver.baud_rate
+
+        if self.driver.probe_baud(PROBE_TIMEOUT_S) != base:
+            # A previous session may have left the firmware at a faster rate
+            remembered = self.memory.get(key)
+            if remembered is not None and remembered != base and self.resume(remembered, base):
+                return remembered
+
+        for rate in self.candidates(rates, key):
+            if self.attempt(rate, base):
+                self.memory.set(key, rate)
+                return rate
+            if self.memory.get(key) == rate:
+                self.memory.forget(key)
+            if self.state == BaudState.FAILED:
+                break
+        return self.driver.baud_rate
+
+    def resume(self, rate: int, base: int) -> bool:
+        """Check whether the firmware already runs at *rate*; stay at *base* if not.
+
+        Returns:
+            bool: True if the firmware answered a probe at *rate*.
+        """
+        self.driver.set_host_baudrate(rate)
+        self._enter(BaudState.PROBING, rate)
+        for _ in range(PROBE_ATTEMPTS):
+            if self.driver.probe_baud(PROBE_TIMEOUT_S) == rate:
+                self._enter(BaudState.VERIFIED, rate)
+                logger.info("Firmware already at %d baud", rate)
+                return True
+        self.driver.set_host_baudrate(base)
+        self._enter(BaudState.IDLE, base)
+        return False
+
+    def attempt(self, rate: int, base: int) -> bool:
+        """Switch from *base* to *rate*; fall back to *base* if it doesn't verify.
+
+        Returns:
+            bool: True if both sides now run at *rate*.
+        """
+        driver = self.driver
+        self._enter(BaudState.PROPOSED, rate)
+        reply = driver.request_baud(rate, ACK_TIMEOUT_S)
+        acked_at = time.perf_counter()
+        if reply == 0:
+            self._enter(BaudState.REFUSED, rate)
+            return False
+
+        if reply == rate:
+            driver.set_host_baudrate(rate)
+            self._enter(BaudState.SWITCHED, rate)
+            self._enter(BaudState.PROBING, rate)
+            for _ in range(PROBE_ATTEMPTS):
+                if driver.probe_baud(PROBE_TIMEOUT_S) == rate:
+                    self._enter(BaudState.VERIFIED, rate)
+                    logger.info("Baud rate %d verified", rate)
+                    return True
+        # else: the ack was lost — the firmware may or may not have switched,
+        # either way it is back at the base rate once its probe timeout passes
+
+        self._enter(BaudState.REVERTING, rate)
+        driver.set_host_baudrate(base)
+        remaining = acked_at + BAUD_PROBE_TIMEOUT_S + 0.05 - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        for _ in range(PROBE_ATTEMPTS):
+            if driver.probe_baud(PROBE_TIMEOUT_S) == base:
+                self._enter(BaudState.REVERTED, rate)
+                logger.warning("Baud rate %d did not verify, back at %d", rate, base)
+                return False
+        self._enter(BaudState.FAILED, rate)
+        logger.error("No answer at %d or %d baud", rate, base)
+        return False
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(max_reliable_baud: int = 460800) -> dict:
+    """Negotiate against a simulated knob whose link tops out at *max_reliable_baud*.
+
+    The first negotiation has to fail at the faster rates and fall back;
+    the second starts from the remembered rate and verifies directly.
+
+    Returns:
+        dict: Chosen rate, time taken and state path for both negotiations.
+    """
+    import tempfile
+
+    from smartknob.driver import SmartKnobDriver
+    from smartknob.sim import SimulatedKnob
+
+    sim = SimulatedKnob()
+    sim.max_reliable_baud = max_reliable_baud
+    sim.start()
+    result: dict = {"max_reliable_baud": max_reliable_baud}
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = BaudMemory(os.path.join(tmp, "baud.json"))
+        try:
+            for run in ("first", "remembered"):
+                knob = SmartKnobDriver()
+                knob.connect(sim.port)
+                negotiator = BaudNegotiator(knob, memory)
+                t0 = time.perf_counter()
+                rate = negotiator.run()
+                elapsed_ms = (time.perf_counter() - t0) * 1e3
+                result[run] = {
+                    "rate": rate,
+                    "device_rate": sim.baud,
+                    "ms": elapsed_ms,
+                    "path": [f"{s.value}@{r}" for _, s, r in negotiator.transitions],
+                }
+                knob.disconnect()  # Puts the firmware back at the boot rate
+        finally:
+            sim.stop()
+    return result
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    print(f"Link reliable up to {r['max_reliable_baud']} baud")
+    for run in ("first", "remembered"):
+        x = r[run]
+        print(f"{run:>10}: {x['rate']} baud (device {x['device_rate']}) in {x['ms']:.0f} ms")
+        print(f"            {' → '.join(x['path'])}")
@@ -0,0 +1,634 @@
+"""SmartKnob command line tool.
+
+Usage:
+    smartknob serve --port COM3 [--listen tcp:127.0.0.1:7777]
+    smartknob serve --bench
+    smartknob serve --port COM3 --metrics-log 10 --metrics-port 9464
+    smartknob --trace knob.trace.json serve --port COM3
+    smartknob --profile profile-out [--profile-mode cprofile] serve --port COM3
+    smartknob loadgen inertia_spin corrupt my-scenarios.json [--json]
+    smartknob loadgen --serve overload
+    smartknob sweep sweeps/seek --scenario seek --range pos_p=5:100 --grid pos_d=0,0.3,0.6 --lhs 2000
+    smartknob sweep sweeps/seek                     (resume, then rank)
+    smartknob autotune --port COM3 [--overshoot 5] [--apply]
+    smartknob autotune --bench
+    smartknob monitor --port COM3 [--timestamps] [--duration 10]
+    smartknob send --port COM3 --preset VOLUME_KNOB Q
+    smartknob record --port COM3 session.csv [--duration 30]
+    smartknob replay session.csv [--speed 2] [--loop]
+    smartknob bench --list
+    smartknob bench detents events stream
+    smartknob bench --sim | --port COM3
+
+Each subcommand imports only what it uses, and ``import smartknob`` is
+lazy, so parsing arguments (``--help``) costs little beyond interpreter
+start-up; the driver and pyserial load only for commands that open a port.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from smartknob.server import DEFAULT_ADDRESS, DEFAULT_QUEUE_FRAMES, PositionServer, benchmark_fanout
+
+    if args.bench:
+        for row in benchmark_fanout():
+            print(
+                f"{row['clients']:3d} clients: p50 {row['p50_us']:7.0f} µs  "
+                f"p99 {row['p99_us']:7.0f} µs  max {row['max_us']:7.0f} µs  "
+                f"dropped {row['dropped']}"
+            )
+        return 0
+
+    if not args.port:
+        print("serve: --port is required (or use --bench)", file=sys.stderr)
+        return 2
+
+    from smartknob.driver import SmartKnobDriver
+
+    knob = SmartKnobDriver()
+    if args.metrics_log or args.metrics_port is not None:
+        knob.enable_metrics(log_interval_s=args.metrics_log, prometheus_port=args.metrics_port)
+    server = PositionServer(knob, args.listen or DEFAULT_ADDRESS, max_queue_frames=args.queue or DEFAULT_QUEUE_FRAMES)
+    server.start()
+    knob.connect(args.port)  # Clients see "connected"/"lost"/"reconnected" states
+    print(f"Serving {args.port} on {server.address} — Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        knob.disable_metrics()
+        knob.disconnect()
+    return 0
+
+
+def _cmd_loadgen(args: argparse.Namespace) -> int:
+    import json
+
+    from smartknob.loadgen import SCENARIOS, format_report, resolve_scenario, run_scenario, serve
+
+    if args.list or not args.scenarios:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:<14} {scenario.get('description', '')}")
+        return 0
+    try:
+        scenarios = [s for name in args.scenarios for s in resolve_scenario(name)]
+    except ValueError as e:
+        print(f"loadgen: {e}", file=sys.stderr)
+        return 2
+
+    if args.serve:
+        serve(scenarios[0], args.link, args.seed)
+        return 0
+    reports = []
+    for scenario in scenarios:
+        report = run_scenario(scenario, seed=args.seed)
+        reports.append(report)
+        if not args.json:
+            print(format_report(report))
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    return 0
+
+
+def _parse_assignments(items: list[str], option: str) -> dict[str, str]:
+    out = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep or not name or not value:
+            raise ValueError(f"{option} expects NAME=VALUE, got {item!r}")
+        out[name] = value
+    return out
+
+
+def _cmd_sweep(args: argparse.Namespace) -> int:
+    from smartknob.sweep import SCENARIOS, Sweep, grid, latin_hypercube, random_samples, rank
+
+    try:
+        space: dict = {n: [float(x) for x in v.split(",")]
+                       for n, v in _parse_assignments(args.grid, "--grid").items()}
+        for name, value in _parse_assignments(args.range, "--range").items():
+            low, _, high = value.partition(":")
+            space[name] = (float(low), float(high))
+        limits = {n: float(v) for n, v in _parse_assignments(args.limit, "--limit").items()}
+        if space:
+            if args.scenario not in SCENARIOS:
+                raise ValueError(f"--scenario must be one of {', '.join(SCENARIOS)}")
+            if args.lhs:
+                samples = latin_hypercube(space, args.lhs, args.seed)
+            elif args.random:
+                samples = random_samples(space, args.random, args.seed)
+            else:
+                samples = grid(space)
+            sweep = Sweep(args.out_dir, args.scenario, samples, args.chunk)
+        else:
+            sweep = Sweep(args.out_dir)
+    except ValueError as e:
+        print(f"sweep: {e}", file=sys.stderr)
+        return 2
+
+    print(f"{sweep.scenario}: {sweep.count} samples in {sweep.chunks} chunks, "
+          f"{sweep.chunks - len(sweep.pending())} already done")
+    t0 = time.perf_counter()
+    results = sweep.run(
+        workers=args.workers,
+        progress=lambda done, total: print(f"\r  {done}/{total} chunks", end="", flush=True),
+    )
+    print(f"\n  {time.perf_counter() - t0:.1f} s")
+    order = rank(results, args.by, limits)
+    params = list(sweep.samples)
+    columns = params + ["settle_s", "overshoot_pct", "oscillations", "peak_v"]
+    print("  ".join(f"{c:>14}" for c in columns))
+    for i in order[:args.top]:
+        print("  ".join(f"{results[c][i]:14.4g}" for c in columns))
+    if not len(order):
+        print("(no sample within the limits)")
+    return 0
+
+
+def _cmd_autotune(args: argparse.Namespace) -> int:
+    from smartknob.autotune import autotune, benchmark, format_result
+
+    if args.bench:
+        r = benchmark(overshoot_pct=args.overshoot, samples=args.samples)
+        print(format_result(r["result"]))
+        for name, truth in r["truth"].items():
+            print(f"  {name:<8} true {truth:.3g}  fitted {r['fitted'][name]:.3g}")
+        return 0
+    if not args.port:
+        print("autotune: --port is required (or use --bench)", file=sys.stderr)
+        return 2
+    try:
+        steps = [float(x) for x in args.steps.split(",")]
+    except ValueError:
+        print(f"autotune: --steps expects comma-separated degrees, got {args.steps!r}", file=sys.stderr)
+        return 2
+
+    from smartknob.driver import SmartKnobDriver
+
+    knob = SmartKnobDriver()
+    knob.connect(args.port)
+    try:
+        if args.timestamps:
+            knob.enable_device_timestamps()
+            time.sleep(0.3)  # Let the first sync burst converge
+        print(f"Autotuning {args.port} — the knob will move, keep hands off")
+        result = autotune(knob, steps, overshoot_pct=args.overshoot, samples=args.samples,
+                          apply=args.apply, seed=args.seed, progress=lambda stage: print(f"  {stage}..."))
+    finally:
+        knob.disconnect()
+    print(format_result(result))
+    if not args.apply:
+        print("Not applied (use --apply)")
+    return 0
+
+
+def _connect(port: str, timestamps: bool = False):
+    """Driver connected to *port* without auto-reconnect (one-shot tools)."""
+    from smartknob.driver import SmartKnobDriver
+
+    knob = SmartKnobDriver(auto_reconnect=False)
+    knob.connect(port)
+    if timestamps:
+        knob.enable_device_timestamps()
+    return knob
+
+
+def _cmd_monitor(args: argparse.Namespace) -> int:
+    knob = _connect(args.port, args.timestamps)
+    count = [0]
+    latencies: list[list[float]] = [[]]
+
+    def on_sample(sample) -> None:
+        count[0] += 1
+        if sample.latency_s is not None:
+            latencies[0].append(sample.latency_s)
+
+    knob.events.subscribe("sample", on_sample, name="monitor")
+    knob.query_position()
+    overwrite = sys.stdout.isatty() and not args.lines
+    start = last = time.perf_counter()
+    last_count = 0
+    try:
+        while args.duration is None or last - start < args.duration:
+            time.sleep(args.interval)
+            now = time.perf_counter()
+            window, latencies[0] = latencies[0], []
+            rate = (count[0] - last_count) / (now - last)
+            last, last_count = now, count[0]
+            line = f"{knob.current_angle:9.2f}°  {rate:6.1f} Hz"
+            if window:
+                window.sort()
+                line += f"  latency p50 {window[len(window) // 2] * 1e3:5.2f} ms  max {window[-1] * 1e3:5.2f} ms"
+            elif args.timestamps:
+                line += "  latency   ---"
+            if knob.detents.index is not None:
+                line += f"  detent {knob.detents.index:4d}"
+            print(f"\r{line}\033[K" if overwrite else line, end="" if overwrite else "\n", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if overwrite:
+            print()
+        knob.disconnect()
+    return 0
+
+
+def _cmd_send(args: argparse.Namespace) -> int:
+    import json
+
+    preset = None
+    if args.preset:
+        from smartknob_windows.mapping import CONFIG_DIR
+
+        path = args.presets or CONFIG_DIR / "presets.json"
+        with open(path, encoding="utf-8") as f:
+            presets = json.load(f).get("presets", {})
+        if args.preset not in presets:
+            print(f"send: no preset {args.preset!r} in {path} ({', '.join(presets)})", file=sys.stderr)
+            return 2
+        from smartknob_windows.config_service import compile_preset
+
+        try:
+            preset = compile_preset(args.preset, presets[args.preset])
+        except ValueError as e:
+            print(f"send: {e}", file=sys.stderr)
+            return 2
+    if preset is None and not args.commands:
+        print("send: give commands and/or --preset", file=sys.stderr)
+        return 2
+
+    knob = _connect(args.port)
+    knob.on_ack = lambda text: print(f"A:{text}")
+    knob.on_raw = print
+    try:
+        if preset is not None:
+            print(f"> {' '.join(preset.commands)}")
+            knob.send_commands(preset.commands, preset.payload)
+        for cmd in args.commands:
+            print(f"> {cmd}")
+            knob.send_raw(cmd)
+        time.sleep(args.wait)  # Replies print as they arrive
+    finally:
+        knob.disconnect()
+    return 0
+
+
+def _cmd_record(args: argparse.Namespace) -> int:
+    import threading
+
+    knob = _connect(args.port, args.timestamps)
+    samples = knob.stream(maxsize=args.buffer)
+    timer = None
+    if args.duration is not None:
+        timer = threading.Timer(args.duration, samples.close)
+        timer.daemon = True
+        timer.start()
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8", newline="")
+    print(f"Recording {args.port} → {args.out} — Ctrl+C to stop", file=sys.stderr)
+    rows = 0
+    t0 = None
+    try:
+        out.write("time_s,angle_deg,latency_ms\n")
+        for s in samples:
+            # Device time once clocks are synced, arrival time before that
+            t = s.device_host_time if s.device_host_time is not None else s.host_time
+            if t0 is None:
+                t0 = t
+            latency = f"{s.latency_s * 1e3:.3f}" if s.latency_s is not None else ""
+            out.write(f"{t - t0:.6f},{s.angle_deg:.2f},{latency}\n")
+            rows += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if timer is not None:
+            timer.cancel()
+        samples.close()
+        knob.disconnect()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{rows} samples recorded, {samples.dropped} dropped", file=sys.stderr)
+    return 0
+
+
+def _cmd_replay(args: argparse.Namespace) -> int:
+    from smartknob.traces import load_trace
+    from smartknob.sim import SimulatedKnob
+
+    try:
+        trace = load_trace(args.session)
+    except (OSError, ValueError) as e:
+        print(f"replay: {e}", file=sys.stderr)
+        return 2
+    if not trace:
+        print(f"replay: {args.session} has no samples", file=sys.stderr)
+        return 2
+    if args.speed <= 0:
+        print("replay: --speed must be > 0", file=sys.stderr)
+        return 2
+
+    sim = SimulatedKnob(args.link)
+    sim.start()
+    t_first = trace[0][0]
+    length = (trace[-1][0] - t_first) / args.speed
+    print(f"Replaying {len(trace)} samples ({length:.1f} s) on {sim.port} — Ctrl+C to stop")
+    print(f"  e.g. smartknob monitor --port {sim.port}")
+    try:
+        while True:
+            start = time.perf_counter()
+            for t, angle in trace:
+                delay = start + (t - t_first) / args.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                sim.turn_to(angle)
+            if not args.loop:
+                time.sleep(0.1)  # Let the last report go out
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+    return 0
+
+
+BENCHMARKS: dict[str, tuple[str, str]] = {
+    "detents": ("smartknob.detents", "DetentTracker.update() on a fast sweep"),
+    "gestures": ("smartknob.gestures", "gesture recognition on synthetic traces"),
+    "events": ("smartknob.events", "event bus publish cost and subscriber lag"),
+    "stream": ("smartknob.stream", "stream() vs on_sample throughput"),
+    "metrics": ("smartknob.metrics", "counter/histogram cost under contention"),
+    "shm": ("smartknob.shm", "shared-memory reader latency"),
+    "profiling": ("smartknob.profiling", "per-line cost of each profiler mode"),
+    "tracing": ("smartknob.tracing", "tracing overhead on a simulated session"),
+    "clock": ("smartknob.clock", "clock sync accuracy against a drifting simulator"),
+    "baud": ("smartknob.baud", "baud negotiation against the simulator"),
+    "reconnect": ("smartknob.sim", "unplug/replug restore time"),
+    "trajectory": ("smartknob.trajectory", "streamed vs single-step seeks on the simulator"),
+    "server": ("smartknob.server", "socket fan-out latency"),
+    "loadgen": ("smartknob.loadgen", "every built-in load scenario (slow)"),
+    "filtering": ("smartknob_windows.filtering", "input filters on synthetic traces"),
+    "mapping": ("smartknob_windows.mapping", "curve table lookups"),
+    "model": ("smartknob.model", "vectorized torque laws (numpy)"),
+    "sweep": ("smartknob.sweep", "parallel sweep scaling (numpy)"),
+    "autotune": ("smartknob.autotune", "autotune a simulated rotor (numpy)"),
+}
+"""``smartknob bench`` name → (module whose ``__main__`` block runs, description)."""
+
+
+def _bench_link(knob, pings: int, seeks: list[float]) -> dict:
+    """Round-trip timings over a connected link: ``T`` pings, then seeks."""
+    rtts = []
+    for _ in range(pings):
+        rtt = knob.sync_clock()
+        if rtt is not None:
+            rtts.append(rtt * 1e3)
+    reports = [0]
+    sub = knob.events.subscribe("position", lambda angle: reports.__setitem__(0, reports[0] + 1),
+                                name="bench.reports")
+    t0 = time.perf_counter()
+    for target in seeks:
+        try:
+            knob.seek(target).result(12.0)
+        except Exception:  # noqa: BLE001 — counted as not done in seek_stats()
+            pass
+    elapsed = time.perf_counter() - t0
+    sub.unsubscribe()
+    rtts.sort()
+    return {
+        "pings": pings,
+        "ping_ms": {
+            "p50": rtts[len(rtts) // 2], "p99": rtts[min(len(rtts) - 1, int(len(rtts) * 0.99))], "max": rtts[-1],
+        } if rtts else None,
+        "ping_timeouts": pings - len(rtts),
+        "seeks": knob.seek_stats(),
+        "report_hz": reports[0] / elapsed if seeks and elapsed > 0 else None,
+    }
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    if args.port or args.sim:
+        try:
+            seeks = [float(x) for x in args.seeks.split(",")] if args.seeks else []
+        except ValueError:
+            print(f"bench: --seeks expects comma-separated degrees, got {args.seeks!r}", file=sys.stderr)
+            return 2
+        sim = None
+        port = args.port
+        if args.sim:
+            from smartknob.sim import SimulatedKnob
+
+            sim = SimulatedKnob()
+            sim.start()
+            port = sim.port
+        knob = _connect(port)
+        try:
+            if seeks and not args.sim:
+                print(f"Benchmarking {port} — the knob will move, keep hands off")
+            r = _bench_link(knob, args.pings, seeks)
+        finally:
+            knob.disconnect()
+            if sim is not None:
+                sim.stop()
+        p = r["ping_ms"]
+        if p is not None:
+            print(f"T ping round trip: p50 {p['p50']:.2f} ms  p99 {p['p99']:.2f} ms  max {p['max']:.2f} ms"
+                  f"  ({r['ping_timeouts']}/{r['pings']} timed out)")
+        else:
+            print(f"T ping round trip: all {r['pings']} timed out")
+        s = r["seeks"]
+        if s["count"]:
+            for key, label in (("ack_ms", "Z → A:Z"), ("total_ms", "Z → SEEK_DONE")):
+                x = s[key]
+                if x["p50"] is not None:
+                    print(f"{label:>17}: p50 {x['p50']:8.2f} ms  p95 {x['p95']:8.2f} ms  max {x['max']:8.2f} ms")
+            print(f"{'reports':>17}: {r['report_hz']:.1f} Hz while seeking ({s['count']} seeks)")
+        return 0
+
+    if args.list or not args.names:
+        for name, (module, description) in BENCHMARKS.items():
+            print(f"{name:<11} {description}")
+        return 0
+    unknown = [n for n in args.names if n not in BENCHMARKS]
+    if unknown:
+        print(f"bench: unknown benchmark {', '.join(unknown)} (see --list)", file=sys.stderr)
+        return 2
+
+    import runpy
+    import warnings
+
+    argv = sys.argv
+    for name in args.names:
+        module = BENCHMARKS[name][0]
+        print(f"== {name} ({module})", flush=True)
+        sys.argv = [module]  # Some benchmarks take trace files as arguments
+        try:
+            with warnings.catch_warnings():
+                # Already imported through the smartknob package; harmless here
+                warnings.filterwarnings("ignore", r".*found in sys\.modules", RuntimeWarning)
+                runpy.run_module(module, run_name="__main__")
+        except ImportError as e:
+            print(f"  skipped: {e}")
+        finally:
+            sys.argv = argv
+    return 0
+
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser (one sub-parser per subcommand).
+
+    Nothing beyond argparse is imported here; each ``_cmd_*`` imports what
+    it needs.
+    """
+    parser = argparse.ArgumentParser(prog="smartknob", description="SmartKnob tools")
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="record a Chrome/Perfetto trace and write it to PATH on exit")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="profile all threads, dumping per-thread stats and summary.txt to DIR")
+    parser.add_argument("--profile-mode", choices=("sample", "cprofile"), default="sample",
+                        help="statistical sampling or deterministic cProfile (default: %(default)s)")
+    parser.add_argument("--profile-interval", type=float, default=30.0, metavar="SECONDS",
+                        help="dump interval (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="share one knob with local apps over a socket")
+    serve.add_argument("--port", help="serial port, e.g. COM3 or /dev/ttyACM0")
+    serve.add_argument("--listen", help="tcp:host:port or unix:/path (default: tcp:127.0.0.1:7777)")
+    serve.add_argument("--queue", type=int, help="per-client queue bound in frames (default: 1024)")
+    serve.add_argument("--bench", action="store_true",
+                       help="run the fan-out latency benchmark instead of serving")
+    serve.add_argument("--metrics-log", type=float, metavar="SECONDS",
+                       help="log a metrics summary line this often")
+    serve.add_argument("--metrics-port", type=int, metavar="PORT",
+                       help="serve Prometheus metrics on 127.0.0.1:PORT/metrics")
+    serve.set_defaults(func=_cmd_serve)
+
+    loadgen = sub.add_parser("loadgen", help="stress the host stack with scripted serial traffic")
+    loadgen.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                         help="built-in scenario name or JSON scenario file")
+    loadgen.add_argument("--list", action="store_true", help="list built-in scenarios")
+    loadgen.add_argument("--json", action="store_true", help="print reports as JSON")
+    loadgen.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    loadgen.add_argument("--serve", action="store_true",
+                         help="loop the first scenario on a pty for the real GUI instead of measuring")
+    loadgen.add_argument("--link", metavar="PATH", help="pty symlink path for --serve")
+    loadgen.set_defaults(func=_cmd_loadgen)
+
+    sweep = sub.add_parser("sweep", help="parallel closed-loop parameter sweep (needs numpy)")
+    sweep.add_argument("out_dir", help="results directory; an existing sweep there is resumed")
+    sweep.add_argument("--scenario", default="seek", help="seek, spring_release, haptic_snap, "
+                       "wall_release or inertia_flick (default: %(default)s)")
+    sweep.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                       help="grid axis, e.g. pos_d=0,0.3,0.6")
+    sweep.add_argument("--range", action="append", default=[], metavar="NAME=LOW:HIGH",
+                       help="sampled range, e.g. pos_p=5:100")
+    sweep.add_argument("--lhs", type=int, metavar="N", help="N Latin-hypercube samples")
+    sweep.add_argument("--random", type=int, metavar="N", help="N uniform random samples")
+    sweep.add_argument("--seed", type=int, default=0)
+    sweep.add_argument("--chunk", type=int, default=256, help="samples per worker task")
+    sweep.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    sweep.add_argument("--by", default="settle_s", help="score to minimise (default: %(default)s)")
+    sweep.add_argument("--limit", action="append", default=[], metavar="NAME=MAX",
+                       help="constraint for ranking, e.g. overshoot_pct=10")
+    sweep.add_argument("--top", type=int, default=10, help="rows to print")
+    sweep.set_defaults(func=_cmd_sweep)
+
+    tune = sub.add_parser("autotune", help="fit the rotor from recorded seeks and propose seek PID gains "
+                          "(needs numpy)")
+    tune.add_argument("--port", help="serial port, e.g. COM3 or /dev/ttyACM0")
+    tune.add_argument("--steps", default="90,0,-30,15,-60,0", metavar="DEG,DEG,...",
+                      help="seek targets to record, in order (default: %(default)s)")
+    tune.add_argument("--overshoot", type=float, default=5.0, metavar="PCT",
+                      help="overshoot bound for every step (default: %(default)s)")
+    tune.add_argument("--samples", type=int, default=1024, help="gain candidates per search round")
+    tune.add_argument("--seed", type=int, default=0)
+    tune.add_argument("--apply", action="store_true", help="send the proposed gains and verify them")
+    tune.add_argument("--timestamps", action="store_true",
+                      help="time samples with device timestamps (TS1) instead of arrival")
+    tune.add_argument("--bench", action="store_true", help="autotune a simulated rotor with known parameters")
+    tune.set_defaults(func=_cmd_autotune)
+
+    monitor = sub.add_parser("monitor", help="live angle, report rate and latency")
+    monitor.add_argument("--port", required=True, help="serial port, e.g. COM3 or /dev/ttyACM0")
+    monitor.add_argument("--timestamps", action="store_true",
+                         help="enable device timestamps (TS1) to show one-way latency")
+    monitor.add_argument("--interval", type=float, default=0.2, metavar="SECONDS",
+                         help="update interval (default: %(default)s)")
+    monitor.add_argument("--duration", type=float, metavar="SECONDS", help="stop after this long")
+    monitor.add_argument("--lines", action="store_true",
+                         help="one line per update instead of rewriting it (default when not a tty)")
+    monitor.set_defaults(func=_cmd_monitor)
+
+    send = sub.add_parser("send", help="send commands and/or a preset, printing the replies")
+    send.add_argument("commands", nargs="*", metavar="COMMAND", help="raw commands, e.g. H S24 Z45 Q")
+    send.add_argument("--port", required=True, help="serial port, e.g. COM3 or /dev/ttyACM0")
+    send.add_argument("--preset", metavar="NAME", help="apply a preset's mode and parameters first")
+    send.add_argument("--presets", metavar="PATH", help="presets.json to read (default: the bundled one)")
+    send.add_argument("--wait", type=float, default=0.3, metavar="SECONDS",
+                      help="how long to print replies (default: %(default)s)")
+    send.set_defaults(func=_cmd_send)
+
+    record = sub.add_parser("record", help="record position samples to CSV (time_s,angle_deg,latency_ms)")
+    record.add_argument("out", help="output CSV path, or - for stdout")
+    record.add_argument("--port", required=True, help="serial port, e.g. COM3 or /dev/ttyACM0")
+    record.add_argument("--duration", type=float, metavar="SECONDS", help="stop after this long")
+    record.add_argument("--timestamps", action="store_true",
+                        help="time samples with device timestamps (TS1) and record latency")
+    record.add_argument("--buffer", type=int, default=65536, metavar="SAMPLES",
+                        help="queue bound between the reader and the writer (default: %(default)s)")
+    record.set_defaults(func=_cmd_record)
+
+    replay = sub.add_parser("replay", help="play a recorded session on a simulated knob (pty)")
+    replay.add_argument("session", help="CSV from smartknob record (or any time_s,angle_deg CSV)")
+    replay.add_argument("--link", metavar="PATH", help="pty symlink path (default: a temp path)")
+    replay.add_argument("--speed", type=float, default=1.0, help="playback speed factor (default: %(default)s)")
+    replay.add_argument("--loop", action="store_true", help="repeat until interrupted")
+    replay.set_defaults(func=_cmd_replay)
+
+    bench = sub.add_parser("bench", help="run built-in benchmarks, or time a port / the simulator")
+    bench.add_argument("names", nargs="*", metavar="NAME", help="benchmarks to run (see --list)")
+    bench.add_argument("--list", action="store_true", help="list built-in benchmarks")
+    target = bench.add_mutually_exclusive_group()
+    target.add_argument("--port", help="time ping and seek round trips on this serial port")
+    target.add_argument("--sim", action="store_true", help="time them on a simulated knob")
+    bench.add_argument("--pings", type=int, default=200, help="T pings (default: %(default)s)")
+    bench.add_argument("--seeks", default="30,-30,0", metavar="DEG,DEG,...",
+                       help="seek targets, empty for none (default: %(default)s)")
+    bench.set_defaults(func=_cmd_bench)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Console script entry point."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(name)s %(levelname)s: %(message)s",
+    )
+    from smartknob import profiling, tracing
+
+    if args.profile:
+        profiling.start(args.profile, args.profile_mode, args.profile_interval)
+    if args.trace:
+        tracing.enable()
+    try:
+        return args.func(args)
+    finally:
+        if args.trace:
+            tracing.export(args.trace)
+            print(f"Trace written to {args.trace}")
+        if args.profile:
+            print(f"Profile written to {profiling.stop()}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
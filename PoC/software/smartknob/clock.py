@@ -0,0 +1,230 @@
+"""Device/host clock synchronization.
+
+The firmware answers a ``T`` ping with ``T<micros>`` and, after ``TS1``,
+stamps every position report as ``P<angle>@<micros>``. ``ClockSync`` turns
+those device timestamps into host ``time.perf_counter()`` time:
+
+- Each ping gives one sample: the device time is assumed to correspond to
+  the midpoint of the host's send/receive times, with an uncertainty of
+  half the round trip.
+- Only the lowest-RTT half of the recent pings is used (queueing delay can
+  only make a ping slower, never faster), and a Theil–Sen fit (median of
+  pairwise slopes) over those gives offset and drift without being pulled
+  around by outliers.
+- Until the pings span ``MIN_DRIFT_SPAN_S`` the drift is assumed to be 0,
+  because a slope fitted over a short span is mostly noise.
+
+With that mapping every timestamped sample yields a one-way latency:
+host arrival time minus the device time mapped into host time. That
+covers UART transfer, USB, OS and the reader thread.
+
+Usage:
+    knob.enable_device_timestamps()
+    knob.on_sample = lambda s: print(s.angle_deg, s.latency_s)
+    knob.clock.drift_ppm
+"""
+
+from __future__ import annotations
+
+import collections
+import statistics
+import time
+from typing import Optional
+
+WRAP_US: int = 1 << 32
+"""``micros()`` is an unsigned 32-bit counter (wraps every ~71.6 min)."""
+
+MIN_DRIFT_SPAN_S: float = 5.0
+"""Minimum device-time span of the fitted pings before drift is estimated."""
+
+
+class ClockSync:
+    """Robust device → host clock mapping from sync pings.
+
+    Attributes:
+        pings: Number of pings received since the last reset.
+    """
+
+    def __init__(self, window: int = 64, keep_fraction: float = 0.5) -> None:
+        """
+        Args:
+            window: Number of recent pings kept.
+            keep_fraction: Fraction of them (lowest RTT) used in the fit.
+        """
+        self.keep_fraction = keep_fraction
+        self._samples: collections.deque[tuple[float, float, float]] = collections.deque(maxlen=window)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all pings (call when the device reboots — micros() restarts)."""
+        self._samples.clear()
+        self._last_raw: Optional[int] = None
+        self._wraps = 0
+        self._x0 = 0.0
+        self._intercept: Optional[float] = None
+        self._slope = 1.0
+        self._min_rtt: Optional[float] = None
+        self.pings = 0
+
+    # ------------------------------------------------------------------ #
+    #  Inputs
+    # ------------------------------------------------------------------ #
+
+    def unwrap(self, device_us: int) -> int:
+        """Extend a raw 32-bit ``micros()`` value to a monotonic count.
+
+        Values must be fed in stream order (pings and position stamps share
+        one unwrapper).
+        """
+        if self._last_raw is not None and device_us < self._last_raw - WRAP_US // 2:
+            self._wraps += 1
+        self._last_raw = device_us
+        return device_us + self._wraps * WRAP_US
+
+    def add_ping(self, host_send: float, host_recv: float, device_us: int) -> None:
+        """Add a ping round trip.
+
+        Args:
+            host_send: ``perf_counter()`` just before ``T`` was written.
+            host_recv: ``perf_counter()`` when ``T<micros>`` arrived.
+            device_us: Unwrapped device time from the reply.
+        """
+        rtt = host_recv - host_send
+        if rtt < 0:
+            return
+        self._samples.append((device_us * 1e-6, (host_send + host_recv) / 2.0, rtt))
+        self.pings += 1
+        self._fit()
+
+    def _fit(self) -> None:
+        samples = sorted(self._samples, key=lambda s: s[2])
+        keep = max(2, int(len(samples) * self.keep_fraction))
+        best = sorted(samples[:keep])
+        self._min_rtt = samples[0][2]
+
+        # Center x to keep float precision over long uptimes:
+        # host = intercept + slope * (device - x0)
+        self._x0 = best[-1][0]
+        xs = [x - self._x0 for x, _, _ in best]
+        ys = [y for _, y, _ in best]
+
+        slope = 1.0
+        if len(best) >= 2 and xs[-1] - xs[0] >= MIN_DRIFT_SPAN_S:
+            slopes = [
+                (ys[j] - ys[i]) / (xs[j] - xs[i])
+                for i in range(len(xs))
+                for j in range(i + 1, len(xs))
+                if xs[j] - xs[i] > 1e-3
+            ]
+            if slopes:
+                slope = statistics.median(slopes)
+        self._slope = slope
+        self._intercept = statistics.median(y - slope * x for x, y in zip(xs, ys))
+
+    # ------------------------------------------------------------------ #
+    #  Outputs
+    # ------------------------------------------------------------------ #
+
+    @property
+    def synced(self) -> bool:
+        """True once at least one ping has been received."""
+        return self._intercept is not None
+
+    @property
+    def drift_ppm(self) -> float:
+        """How fast the device clock runs relative to the host, in ppm (0 until estimated)."""
+        return (1.0 / self._slope - 1.0) * 1e6
+
+    @property
+    def offset_s(self) -> Optional[float]:
+        """host_time − device_time at the newest fitted ping, in seconds."""
+        if self._intercept is None:
+            return None
+        return self._intercept - self._x0
+
+    @property
+    def min_rtt_s(self) -> Optional[float]:
+        """Smallest ping round trip in the window (offset error is at most half of it)."""
+        return self._min_rtt
+
+    def to_host(self, device_us: int) -> Optional[float]:
+        """Map an unwrapped device time to host ``perf_counter()`` time."""
+        if self._intercept is None:
+            return None
+        return self._intercept + self._slope * (device_us * 1e-6 - self._x0)
+
+    def latency(self, device_us: int, host_arrival: float) -> Optional[float]:
+        """One-way device → host latency of a sample, in seconds."""
+        host = self.to_host(device_us)
+        return None if host is None else host_arrival - host
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(duration_s: float = 8.0, drift_ppm: float = 80.0, sync_interval_s: float = 0.2) -> dict:
+    """Recover a known offset and drift from a simulated device.
+
+    The simulator's clock runs *drift_ppm* fast with a large offset while
+    the knob turns continuously; the driver pings every *sync_interval_s*.
+
+    Returns:
+        dict: offset error (µs), estimated vs true drift (ppm), min RTT,
+              and p50/p99 of the measured one-way latency (ms).
+    """
+    import threading
+
+    from smartknob.driver import SmartKnobDriver
+    from smartknob.sim import SimulatedKnob
+
+    sim = SimulatedKnob(report_interval_s=0.005, report_threshold_deg=0.1)
+    sim.clock_drift_ppm = drift_ppm
+    sim.clock_offset_s = 1234.567
+    sim.start()
+    knob = SmartKnobDriver()
+    latencies: list[float] = []
+    knob.on_sample = lambda s: s.latency_s is not None and latencies.append(s.latency_s)
+    knob.connect(sim.port)
+    knob.enable_device_timestamps(sync_interval_s=sync_interval_s)
+
+    stop = threading.Event()
+
+    def turn() -> None:
+        a = 0.0
+        while not stop.wait(0.002):
+            a += 0.5
+            sim.turn_to(a % 360.0)
+
+    turner = threading.Thread(target=turn, daemon=True)
+    turner.start()
+    time.sleep(duration_s)
+    stop.set()
+    turner.join()
+
+    now = time.perf_counter()
+    est_host = knob.clock.to_host(knob.clock.unwrap(sim.device_micros(now)))
+    knob.disconnect()
+    sim.stop()
+
+    lat_ms = sorted(x * 1e3 for x in latencies)
+    n = len(lat_ms)
+    return {
+        "offset_error_us": (est_host - now) * 1e6 if est_host is not None else float("nan"),
+        "drift_true_ppm": drift_ppm,
+        "drift_est_ppm": knob.clock.drift_ppm,
+        "min_rtt_ms": (knob.clock.min_rtt_s or float("nan")) * 1e3,
+        "pings": knob.clock.pings,
+        "samples": n,
+        "latency_p50_ms": lat_ms[n // 2] if n else float("nan"),
+        "latency_p99_ms": lat_ms[min(n - 1, int(n * 0.99))] if n else float("nan"),
+    }
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    print(f"Pings: {r['pings']}, min RTT {r['min_rtt_ms']:.2f} ms")
+    print(f"Offset error: {r['offset_error_us']:.0f} µs")
+    print(f"Drift: estimated {r['drift_est_ppm']:.1f} ppm, true {r['drift_true_ppm']:.1f} ppm")
+    print(f"One-way latency over {r['samples']} samples: "
+          f"p50 {r['latency_p50_ms']:.2f} ms, p99 {r['latency_p99_ms']:.2f} ms")
@@ -0,0 +1,212 @@
+"""Detent index tracking.
+
+The firmware's detents are not reported over serial, only the shaft angle.
+``DetentTracker`` mirrors the detent layout the firmware is using (kept up
+to date by the driver from the ``A:H``/``A:O``/``A:S``/``A:L``/``A:U`` acks)
+and turns position reports into detent steps:
+
+    HAPTIC   detent k at k · 360/count degrees; the index keeps counting
+             across turns (negative below 0°)
+    BOUNDED  count detents from the lower to the upper wall, indices
+             0 … count-1 (clamped at the walls)
+    others   no detents (INERTIA, SPRING): no events
+
+The index only changes once the angle is ``hysteresis`` of a detent pitch
+past the midpoint between two detents, so a knob resting on a boundary
+does not chatter back and forth. Each report costs O(1): the new index is
+rounded straight from the angle, so a fast spin that skips several
+detents between two reports yields one event with ``|delta| > 1`` rather
+than losing clicks.
+
+Usage:
+    knob.on_detent = lambda index, delta: print(index, delta)
+    knob.detents.index
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from smartknob.protocol import HapticMode
+
+DEFAULT_DETENT_COUNT: int = 36
+"""Firmware detent_count at boot."""
+
+DEFAULT_LOWER_DEG: float = -60.0
+"""Firmware bound_min at boot (degrees)."""
+
+DEFAULT_UPPER_DEG: float = 60.0
+"""Firmware bound_max at boot (degrees)."""
+
+DEFAULT_HYSTERESIS: float = 0.15
+"""How far past a detent boundary (fraction of the pitch) the angle must go
+before the index changes."""
+
+_MODES = {mode.value: mode for mode in HapticMode}
+
+
+class DetentTracker:
+    """Current detent index from the firmware's detent layout and position reports.
+
+    Attributes:
+        mode: Haptic mode the layout applies to (firmware boots in HAPTIC).
+        count: Detent count (``S``).
+        lower_deg: Lower wall (``L``), used in BOUNDED mode.
+        upper_deg: Upper wall (``U``), used in BOUNDED mode.
+        hysteresis: Fraction of a pitch past the boundary needed to move on.
+        index: Current detent index, or None before the first report (and
+               in modes without detents).
+    """
+
+    def __init__(self, hysteresis: float = DEFAULT_HYSTERESIS) -> None:
+        """
+        Args:
+            hysteresis: Fraction of a detent pitch, 0 to 0.5.
+
+        Raises:
+            ValueError: *hysteresis* outside [0, 0.5).
+        """
+        if not 0.0 <= hysteresis < 0.5:
+            raise ValueError("hysteresis must be in [0, 0.5)")
+        self.hysteresis = hysteresis
+        self.reset()
+
+    def reset(self) -> None:
+        """Back to the firmware's boot layout (call when the device reboots)."""
+        self.mode = HapticMode.HAPTIC
+        self.count = DEFAULT_DETENT_COUNT
+        self.lower_deg = DEFAULT_LOWER_DEG
+        self.upper_deg = DEFAULT_UPPER_DEG
+        self._layout()
+
+    # ------------------------------------------------------------------ #
+    #  Layout
+    # ------------------------------------------------------------------ #
+
+    def configure(
+        self,
+        mode: Optional[HapticMode] = None,
+        count: Optional[int] = None,
+        lower_deg: Optional[float] = None,
+        upper_deg: Optional[float] = None,
+    ) -> None:
+        """Change any part of the layout. The index is re-anchored on the next
+        report without an event (the detents moved, the knob did not)."""
+        if mode is not None:
+            self.mode = mode
+        if count is not None:
+            self.count = count
+        if lower_deg is not None:
+            self.lower_deg = lower_deg
+        if upper_deg is not None:
+            self.upper_deg = upper_deg
+        self._layout()
+
+    def on_ack(self, ack_text: str) -> bool:
+        """Apply a firmware ack (the text after ``A:``) that changes the layout.
+
+        Returns:
+            bool: True if *ack_text* was a layout ack.
+        """
+        letter, value = ack_text[:1], ack_text[1:]
+        try:
+            if not value and letter in _MODES:
+                self.configure(mode=_MODES[letter])
+            elif letter == "S" and value.isdigit():
+                self.configure(count=int(value))
+            elif letter == "L" and value:
+                self.configure(lower_deg=float(value))
+            elif letter == "U" and value:
+                self.configure(upper_deg=float(value))
+            else:
+                return False
+        except ValueError:
+            return False
+        return True
+
+    @property
+    def pitch_deg(self) -> Optional[float]:
+        """Angle between neighbouring detents, or None without detents."""
+        return self._pitch
+
+    def angle_of(self, index: int) -> Optional[float]:
+        """Center angle of detent *index*, or None without detents."""
+        if self._pitch is None:
+            return None
+        return self._origin + index * self._pitch
+
+    def _layout(self) -> None:
+        # Precompute everything update() needs: origin, pitch and index range
+        self.index: Optional[int] = None
+        self._pitch: Optional[float] = None
+        self._origin = 0.0
+        self._min_index = -math.inf
+        self._max_index = math.inf
+        if self.mode == HapticMode.HAPTIC and self.count > 0:
+            self._pitch = 360.0 / self.count
+        elif self.mode == HapticMode.BOUNDED and self.count >= 2 and self.upper_deg > self.lower_deg:
+            # computeBoundedTorque(): phase = normalized · (count-1) · 2π
+            self._pitch = (self.upper_deg - self.lower_deg) / (self.count - 1)
+            self._origin = self.lower_deg
+            self._min_index, self._max_index = 0, self.count - 1
+
+    # ------------------------------------------------------------------ #
+    #  Position reports
+    # ------------------------------------------------------------------ #
+
+    def update(self, angle_deg: float) -> Optional[tuple[int, int]]:
+        """Feed one position report.
+
+        Returns:
+            tuple[int, int] | None: ``(index, delta)`` when the index changed,
+            else None.
+        """
+        pitch = self._pitch
+        if pitch is None:
+            return None
+        x = (angle_deg - self._origin) / pitch
+        index = self.index
+        if index is None:
+            self.index = int(min(max(round(x), self._min_index), self._max_index))
+            return None
+        if abs(x - index) <= 0.5 + self.hysteresis:
+            return None
+        new = int(min(max(round(x), self._min_index), self._max_index))
+        if new == index:
+            return None  # Past a wall: already at the end detent
+        self.index = new
+        return new, new - index
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(samples: int = 1_000_000) -> dict:
+    """
+    Time ``update()`` on a fast sweep (about 2.5 detents per report).
+
+    Returns:
+        dict: ``ns_per_update``, ``events`` and ``detents`` crossed.
+    """
+    import time
+
+    tracker = DetentTracker()
+    # Triangle sweep 0° → 10 000° → 0° in 25° steps (10° detent pitch)
+    angles = [25.0 * (i % 400 if (i // 400) % 2 == 0 else 400 - i % 400) for i in range(samples)]
+    events = crossed = 0
+    t0 = time.perf_counter()
+    for angle in angles:
+        event = tracker.update(angle)
+        if event is not None:
+            events += 1
+            crossed += abs(event[1])
+    elapsed = time.perf_counter() - t0
+    return {"ns_per_update": elapsed / samples * 1e9, "events": events, "detents": crossed}
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"update(): {result['ns_per_update']:.0f} ns, "
+          f"{result['events']} events for {result['detents']} detents")
@@ -16,16 +16,29 @@ Usage:
 
 from __future__ import annotations
 
+import collections
 import logging
+import os
+import queue
 import threading
 import time
-from typing import Callable, Optional
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, Optional, Sequence
 
 import serial
 import serial.tools.list_ports
 
+from smartknob import tracing
+from smartknob.clock import ClockSync
+from smartknob.detents import DetentTracker
+from smartknob.events import EventBus, Subscription
+from smartknob.gestures import Gesture, GestureRecognizer
 from smartknob.protocol import (
     BAUD_RATE,
+    CMD_BAUD,
     CMD_BOUNDED,
     CMD_COUPLING,
     CMD_DAMPING,
@@ -47,15 +60,36 @@ from smartknob.protocol import (
     CMD_SPRING_CENTER,
     CMD_SPRING_DAMPING,
     CMD_SPRING_STIFFNESS,
+    CMD_TIME,
+    CMD_TIMESTAMPS,
+    CMD_TRAJECTORY,
     CMD_UPPER_BOUND,
     CMD_WALL_STRENGTH,
     RESP_ACK,
+    RESP_BANNER,
+    RESP_BAUD,
     RESP_POSITION,
     RESP_SEEK_DONE,
+    RESP_TIME,
     SERIAL_TIMEOUT,
+    TRAJ_BUFFER_SIZE,
     HapticMode,
+    preset_commands,
     print_help,
 )
+from smartknob.stream import DEFAULT_MAXSIZE, SampleStream
+from smartknob.trajectory import (
+    DEFAULT_LOOKAHEAD_S,
+    DEFAULT_MAX_ACCEL_DPS2,
+    DEFAULT_MAX_JERK_DPS3,
+    DEFAULT_MAX_VELOCITY_DPS,
+    TrajectoryStream,
+    plan,
+)
+
+if TYPE_CHECKING:
+    from smartknob.baud import BaudMemory
+    from smartknob.metrics import MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +106,151 @@ SeekDoneCallback = Callable[[], None]
 RawLineCallback = Callable[[str], None]
 """Called with the full line (str) for any unrecognised serial data."""
 
+DetentCallback = Callable[[int, int], None]
+"""Called with (index, delta) when the knob moves to another detent (see detents.py)."""
+
+GestureCallback = Callable[[Gesture], None]
+"""Called with a Gesture (flick, fling, reversal, hold, idle) while gestures are enabled."""
+
+
+class PositionSample(NamedTuple):
+    """One position report with its timing (see ``on_sample``)."""
+
+    angle_deg: float
+    """Reported angle in degrees."""
+    host_time: float
+    """Host ``time.perf_counter()`` when the line was read from the port."""
+    device_us: Optional[int]
+    """Firmware ``micros()`` stamp (unwrapped), or None without ``TS1``."""
+    device_host_time: Optional[float]
+    """``device_us`` mapped to host time, or None until clocks are synced."""
+    latency_s: Optional[float]
+    """Estimated one-way latency (``host_time - device_host_time``)."""
+
+
+SampleCallback = Callable[[PositionSample], None]
+"""Called with a PositionSample for every position update (after on_position)."""
+
+
+class ConnectionState(str, Enum):
+    """Serial link state reported through ``on_connection_state``."""
+
+    CONNECTED = "connected"
+    """``connect()`` opened the port."""
+    LOST = "lost"
+    """The link dropped (USB unplugged, device reset). Reconnecting if enabled."""
+    RECONNECTED = "reconnected"
+    """The port was re-opened and the last-known mode/parameters re-sent."""
+    CLOSED = "closed"
+    """``disconnect()`` was called."""
+
+
+ConnectionStateCallback = Callable[[ConnectionState], None]
+"""Called with the new ConnectionState whenever the link state changes."""
+
+RECONNECT_INITIAL_S: float = 0.05
+"""First retry delay after a failed re-open; doubles up to RECONNECT_MAX_S."""
+
+RECONNECT_MAX_S: float = 2.0
+"""Upper bound for the reconnect backoff."""
+
+PORT_POLL_S: float = 0.01
+"""How often to check for the device node while it is absent (cheap stat)."""
+
+_STATE_COMMANDS = frozenset("HICOSDBFJKWEGLUA")
+"""Command letters whose effect persists (re-sent after a reconnect)."""
+
+_MODE_COMMANDS = frozenset(mode.value for mode in HapticMode)
+
+SEEK_ACK_TIMEOUT_S: float = 0.5
+"""A seek whose ``A:Z`` ack is this late is assumed lost; the next seek is sent
+immediately instead of being coalesced behind it."""
+
+SEEK_HISTORY: int = 256
+"""Number of completed seeks kept for ``seek_stats()``."""
+
+
+@dataclass
+class SeekResult:
+    """Outcome of one seek request (the value of a ``seek_async()`` future).
+
+    Attributes:
+        target_deg: Requested angle.
+        status: ``"done"`` (settled at target), ``"superseded"`` (a newer
+                seek replaced it), ``"cancelled"`` or ``"disconnected"``.
+        sent_at: ``time.perf_counter()`` when ``Z`` was written, or None if
+                 the request was coalesced away before being sent.
+        acked_at: When ``A:Z`` arrived.
+        done_at: When ``A:SEEK_DONE`` arrived.
+    """
+
+    target_deg: float
+    status: str = "pending"
+    sent_at: Optional[float] = None
+    acked_at: Optional[float] = None
+    done_at: Optional[float] = None
+
+    @property
+    def ack_ms(self) -> Optional[float]:
+        """Command → ``A:Z`` latency in milliseconds."""
+        if self.sent_at is None or self.acked_at is None:
+            return None
+        return (self.acked_at - self.sent_at) * 1e3
+
+    @property
+    def total_ms(self) -> Optional[float]:
+        """Command → ``A:SEEK_DONE`` time in milliseconds."""
+        if self.sent_at is None or self.done_at is None:
+            return None
+        return (self.done_at - self.sent_at) * 1e3
+
+
+class _SeekOp:
+    __slots__ = ("result", "future")
+
+    def __init__(self, angle_deg: float) -> None:
+        self.result = SeekResult(angle_deg)
+        self.future: Future = Future()
+
+
+class _DriverMetrics:
+    """Instruments updated by the driver while metrics are enabled."""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.registry = registry
+        self.rx_bytes = registry.counter("smartknob_rx_bytes_total", "Bytes read from the serial port")
+        self.lines = registry.counter("smartknob_lines_total", "Lines received")
+        self.positions = registry.counter("smartknob_positions_total", "Position reports received")
+        self.acks = registry.counter("smartknob_acks_total", "Acknowledgements received")
+        self.parse_errors = registry.counter("smartknob_parse_errors_total", "Malformed lines (Bad position line)")
+        self.tx_commands = registry.counter("smartknob_tx_commands_total", "Commands written")
+        self.link_lost = registry.counter("smartknob_link_lost_total", "Serial link drops")
+        self.reconnects = registry.counter("smartknob_reconnects_total", "Successful reconnects")
+        self.line_seconds = registry.histogram(
+            "smartknob_line_seconds", "Time to parse and dispatch one line, callbacks included")
+        self.line_queue_seconds = registry.histogram(
+            "smartknob_line_queue_seconds", "Wait between a line's arrival and its dispatch")
+        self.position_callback = registry.histogram(
+            "smartknob_callback_seconds", "User callback duration", callback="position")
+        self.ack_callback = registry.histogram(
+            "smartknob_callback_seconds", "User callback duration", callback="ack")
+        self.write_seconds = registry.histogram(
+            "smartknob_write_seconds", "Serial write duration")
+        self.gauges: list = []
+
+
+def _callback_attribute(topic: str, doc: str) -> property:
+    """``on_<topic>`` attribute backed by one inline ``events`` subscription."""
+    name = f"on_{topic}"
+
+    def get(self: SmartKnobDriver) -> Optional[Callable]:
+        return self.events.get_attribute(topic)
+
+    def set(self: SmartKnobDriver, handler: Optional[Callable]) -> None:
+        self.events.set_attribute(topic, handler, name)
+
+    return property(get, set, doc=doc)
+
 
 class SmartKnobDriver:
     """Thread-safe serial driver for the SmartKnob STM32 firmware.
@@ -82,32 +261,117 @@ class SmartKnobDriver:
     touches GUI widgets, schedule it onto the GUI event loop yourself
     (e.g. ``root.after(0, callback)`` for Tkinter).
 
+    Each ``on_*`` attribute holds one handler; assigning replaces it. For
+    several handlers per event, or delivery off the reader thread, subscribe
+    through ``events`` instead (see ``smartknob.events``).
+
     Attributes:
+        events:       ``EventBus`` publishing every event below by topic
+                      (``"position"``, ``"ack"``, ``"seek_done"``, ...).
         on_position:  Callback fired on every ``P<angle>`` line.
         on_ack:       Callback fired on every ``A:<text>`` line.
         on_seek_done: Callback fired when ``A:SEEK_DONE`` is received.
         on_raw:       Callback fired for lines that don't match P or A:.
+        on_connection_state: Callback fired with a ``ConnectionState`` when
+                      the link connects, drops, is restored or is closed.
+        on_sample:    Callback fired with a ``PositionSample`` (angle plus host
+                      arrival time, device timestamp and one-way latency).
+        on_detent:    Callback fired with ``(index, delta)`` when the knob
+                      settles into another detent; *delta* covers every
+                      detent passed since the last event.
+        detents:      ``DetentTracker`` following the firmware's detent
+                      layout (mode, count, bounds) from its acks.
+        on_gesture:   Callback fired with a ``Gesture`` after
+                      ``enable_gestures()``.
+        gestures:     The ``GestureRecognizer`` in use, or None.
+        clock:        ``ClockSync`` estimating device clock offset and drift.
+        auto_reconnect: Re-open the port after the link drops and restore
+                      the last-known mode and parameters (default True).
     """
 
+    on_position = _callback_attribute("position", "Handler for every ``P<angle>`` line (angle_deg).")
+    on_ack = _callback_attribute("ack", "Handler for every ``A:<text>`` line (text after ``A:``).")
+    on_seek_done = _callback_attribute("seek_done", "Handler for ``A:SEEK_DONE`` (no args).")
+    on_raw = _callback_attribute("raw", "Handler for lines that don't match P or A: (line).")
+    on_connection_state = _callback_attribute("connection_state", "Handler for link state changes (ConnectionState).")
+    on_sample = _callback_attribute("sample", "Handler for every position report (PositionSample).")
+    on_detent = _callback_attribute("detent", "Handler for detent changes (index, delta).")
+    on_gesture = _callback_attribute("gesture", "Handler for recognized gestures (Gesture).")
+
     # ------------------------------------------------------------------ #
     #  Construction
     # ------------------------------------------------------------------ #
 
-    def __init__(self) -> None:
+    def __init__(self, auto_reconnect: bool = True) -> None:
         self._serial: Optional[serial.Serial] = None
         self._lock: threading.Lock = threading.Lock()
         self._running: bool = False
         self._reader_thread: Optional[threading.Thread] = None
 
-        # Public callbacks — assign your handlers before calling connect()
-        self.on_position: Optional[PositionCallback] = None
-        self.on_ack: Optional[AckCallback] = None
-        self.on_seek_done: Optional[SeekDoneCallback] = None
-        self.on_raw: Optional[RawLineCallback] = None
+        # Event subscribers; the on_* attributes are inline subscriptions here.
+        # Subscribe before calling connect() to see the first events
+        self.events = EventBus()
+
+        # Detent layout mirrored from acks; reader thread only (see detents.py)
+        self.detents = DetentTracker()
+
+        # Optional gesture recognizer (see enable_gestures()); reader thread only
+        self.gestures: Optional[GestureRecognizer] = None
+
+        # Open stream() queues (each subscribed to "sample"), closed on
+        # disconnect()
+        self._streams: tuple[SampleStream, ...] = ()
+        self._streams_lock = threading.Lock()
+
+        # Clock sync: device micros() → host perf_counter() (see clock.py)
+        self.clock = ClockSync()
+        self._ping_sent_at: Optional[float] = None
+        self._ping_reply = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_interval_s: Optional[float] = None
+
+        # Reconnect: port to re-open, stop flag for disconnect(), and the
+        # last command sent per persistent setting (replayed on restore)
+        self.auto_reconnect = auto_reconnect
+        self._port: Optional[str] = None
+        self._stop = threading.Event()
+        self._reconnect_thread: Optional[threading.Thread] = None
+        self._shadow: dict[str, str] = {}
+
+        # Seeks: at most one Z awaiting its ack; newer targets wait in
+        # _seek_pending (only the latest is kept) until that ack arrives
+        self._seek_lock = threading.Lock()
+        self._seek_active: Optional[_SeekOp] = None
+        self._seek_unacked = False
+        self._seek_pending: Optional[_SeekOp] = None
+        self._seek_history: collections.deque[SeekResult] = collections.deque(maxlen=SEEK_HISTORY)
+        self._seek_counts = {"superseded": 0, "cancelled": 0, "disconnected": 0}
+
+        # Streamed move (move_to()): replaces the in-flight seek; its thread
+        # sends Y lines as acks free ring space (_stream_wake)
+        self._stream: Optional[TrajectoryStream] = None
+        self._stream_wake = threading.Event()
+
+        # Baud negotiation: host-side rate, the rate to get back to after a
+        # reconnect, and R replies ("ack"/"probe", rate) for the negotiator
+        self._baud = BAUD_RATE
+        self._baud_negotiated: Optional[int] = None
+        self._baud_rates: Optional[tuple[int, ...]] = None
+        self._baud_memory: Optional[BaudMemory] = None
+        self._baud_replies: queue.Queue[tuple[str, int]] = queue.Queue()
+        self._rx_flush = False
 
         # Last known position (thread-safe via _lock)
         self._current_angle: float = 0.0
 
+        # Optional shared-memory publisher (see enable_shared_memory())
+        self._shm_writer = None
+        self._mode: Optional[HapticMode] = None
+
+        # Optional metrics (see enable_metrics()); None = nothing recorded
+        self._metrics: Optional[_DriverMetrics] = None
+        self._metrics_reporters: list = []
+
     # ------------------------------------------------------------------ #
     #  Connection management
     # ------------------------------------------------------------------ #
@@ -133,6 +397,16 @@ class SmartKnobDriver:
         with self._lock:
             return self._current_angle
 
+    @property
+    def port(self) -> Optional[str]:
+        """Port passed to ``connect()`` (kept while reconnecting), or None."""
+        return self._port
+
+    @property
+    def baud_rate(self) -> int:
+        """Host-side baud rate of the link (115 200 until ``negotiate_baud()``)."""
+        return self._baud
+
     def connect(self, port: str) -> None:
         """Open *port* at 115 200 baud and start the reader thread.
 
@@ -143,28 +417,37 @@ class SmartKnobDriver:
             serial.SerialException: If the port cannot be opened.
             RuntimeError: If already connected.
         """
-        if self.is_connected:
+        if self.is_connected or self.is_reconnecting:
             raise RuntimeError(f"Already connected — disconnect first")
 
-        ser = serial.Serial(port, BAUD_RATE, timeout=SERIAL_TIMEOUT)
-
-        with self._lock:
-            self._serial = ser
-            self._running = True
-
-        self._reader_thread = threading.Thread(
-            target=self._reader_loop, daemon=True, name="smartknob-reader"
-        )
-        self._reader_thread.start()
+        self._stop.clear()
+        self._open(port)
+        self._port = port
+        self.clock.reset()
+        self._start_sync_thread()  # Timestamps were enabled before a disconnect()
         logger.info("Connected to %s", port)
+        self._set_state(ConnectionState.CONNECTED)
 
     def disconnect(self) -> None:
-        """Stop the reader thread and close the serial port."""
+        """Stop reconnecting, stop the reader thread and close the serial port."""
+        if self._baud != BAUD_RATE and self.is_connected:
+            # Leave the firmware at its boot rate for the next session
+            self._send(f"{CMD_BAUD}{BAUD_RATE}")
+            with self._lock:
+                if self._serial is not None:
+                    self._serial.flush()
+        self._stop.set()
+        was_active = self._port is not None
+        if self._reconnect_thread and self._reconnect_thread is not threading.current_thread():
+            self._reconnect_thread.join(timeout=1.0)
+        self._reconnect_thread = None
+
         with self._lock:
             self._running = False
 
         # Wait for reader to finish (short timeout to avoid deadlock)
-        if self._reader_thread and self._reader_thread.is_alive():
+        if (self._reader_thread and self._reader_thread.is_alive()
+                and self._reader_thread is not threading.current_thread()):
             self._reader_thread.join(timeout=1.0)
 
         with self._lock:
@@ -173,7 +456,166 @@ class SmartKnobDriver:
             self._serial = None
             self._reader_thread = None
 
+        self._port = None
+        self._baud = BAUD_RATE
+        self._baud_negotiated = None
+        self._abort_seeks("disconnected")
+        for stream in self._streams:
+            stream.close()
         logger.info("Disconnected")
+        if was_active:
+            self._set_state(ConnectionState.CLOSED)
+
+    # ------------------------------------------------------------------ #
+    #  Reconnect and state restore
+    # ------------------------------------------------------------------ #
+
+    @property
+    def is_reconnecting(self) -> bool:
+        """True while the link is down and the driver is trying to re-open it."""
+        return self._reconnect_thread is not None and self._reconnect_thread.is_alive()
+
+    def restore_commands(self) -> list[str]:
+        """Commands that recreate the last-known device state.
+
+        One command per persistent setting (the most recent value sent),
+        parameters first and the mode last.
+        """
+        with self._lock:
+            commands = [c for k, c in self._shadow.items() if k != "mode"]
+            if "mode" in self._shadow:
+                commands.append(self._shadow["mode"])
+        return commands
+
+    def _remember(self, cmd: str) -> None:
+        """Record *cmd* in the shadow state if it changes a persistent setting.
+
+        Caller holds ``self._lock``.
+        """
+        letter = cmd[0]
+        if letter in _MODE_COMMANDS and len(cmd) == 1:
+            self._shadow["mode"] = cmd
+            # Every mode change (set_mode, send_raw, batches) passes here
+            self._mode = HapticMode(cmd)
+            if self._shm_writer is not None:
+                self._shm_writer.set_mode(self._mode)
+        elif cmd.startswith(CMD_TIMESTAMPS):
+            self._shadow[CMD_TIMESTAMPS] = cmd
+        elif letter == "M" and cmd[1:3] in ("PP", "PI", "PD", "VL"):
+            self._shadow[cmd[:3]] = cmd
+        elif letter in _STATE_COMMANDS and len(cmd) > 1:
+            # Bare "E" (center = current angle) is recorded from its ack
+            self._shadow[letter] = cmd
+
+    def _open(self, port: str) -> None:
+        """Open *port* at the boot rate and start a reader thread for it."""
+        ser = serial.Serial(port, BAUD_RATE, timeout=SERIAL_TIMEOUT)
+
+        with self._lock:
+            self._serial = ser
+            self._baud = BAUD_RATE
+            self._running = True
+
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop, daemon=True, name="smartknob-reader"
+        )
+        self._reader_thread.start()
+
+    def _restore(self) -> None:
+        """Re-send the shadow state as a single serial write."""
+        commands = self.restore_commands()
+        if not commands:
+            return
+        burst = "".join(f"{cmd}\n" for cmd in commands).encode()
+        with self._lock:
+            if self._serial and self._serial.is_open:
+                self._serial.write(burst)
+        logger.info("Restored %d settings", len(commands))
+
+    def _set_state(self, state: ConnectionState) -> None:
+        if self.events.handlers["connection_state"]:
+            self.events.publish("connection_state", state)
+
+    def _handle_link_lost(self) -> None:
+        """Reader thread: close the dead port and start reconnecting."""
+        with self._lock:
+            ser, self._serial = self._serial, None
+            self._running = False
+        if ser is not None:
+            try:
+                ser.close()
+            except (serial.SerialException, OSError):
+                pass
+
+        self._abort_seeks("disconnected")  # The device may reboot mid-seek
+        self.clock.reset()
+        if self._metrics is not None:
+            self._metrics.link_lost.inc()
+        if self._stop.is_set():
+            return
+        self._set_state(ConnectionState.LOST)
+        if self.auto_reconnect and self._port is not None:
+            self._reconnect_thread = threading.Thread(
+                target=self._reconnect_loop, args=(self._port,),
+                daemon=True, name="smartknob-reconnect",
+            )
+            self._reconnect_thread.start()
+
+    @staticmethod
+    def _port_present(port: str) -> bool:
+        """False while a device node path (Linux/macOS) does not exist.
+
+        COM ports have no node to stat; opening them fails fast instead.
+        """
+        return not port.startswith("/") or os.path.exists(port)
+
+    def _reconnect_loop(self, port: str) -> None:
+        """Re-open *port* with exponential backoff, then restore state."""
+        delay = RECONNECT_INITIAL_S
+        attempts = 0
+        while not self._stop.is_set():
+            if not self._port_present(port):
+                self._stop.wait(PORT_POLL_S)
+                continue
+            attempts += 1
+            try:
+                self._open(port)
+            except (serial.SerialException, OSError) as exc:
+                logger.debug("Reconnect attempt %d failed: %s", attempts, exc)
+                self._stop.wait(delay)
+                delay = min(delay * 2, RECONNECT_MAX_S)
+                continue
+
+            if self._stop.is_set():
+                break  # disconnect() raced with the open; it closes the port
+            self._recover_baud()
+            self._restore()
+            if self._metrics is not None:
+                self._metrics.reconnects.inc()
+            logger.info("Reconnected to %s after %d attempt(s)", port, attempts)
+            self._set_state(ConnectionState.RECONNECTED)
+            if self._baud_negotiated is not None and self._baud == BAUD_RATE:
+                self._renegotiate_baud()
+            return
+
+    def _recover_baud(self) -> None:
+        """After a re-open at the boot rate, find the rate the firmware is at.
+
+        A rebooted firmware answers at 115 200; one that only lost its USB
+        link is still at the negotiated rate.
+        """
+        rate = self._baud_negotiated
+        if rate is None or self.probe_baud(0.1) == BAUD_RATE:
+            return
+        self.set_host_baudrate(rate)
+        if self.probe_baud(0.1) != rate:
+            self.set_host_baudrate(BAUD_RATE)
+
+    def _renegotiate_baud(self) -> None:
+        try:
+            self.negotiate_baud(self._baud_rates, self._baud_memory)
+        except (RuntimeError, serial.SerialException, OSError) as exc:
+            logger.warning("Baud renegotiation failed: %s", exc)
 
     # ------------------------------------------------------------------ #
     #  Mode switching
@@ -182,10 +624,15 @@ class SmartKnobDriver:
     def set_mode(self, mode: HapticMode) -> None:
         """Switch the firmware to *mode*.
 
+        The firmware abandons any seek or streamed move on a mode change, so
+        their futures resolve as ``"cancelled"`` and the stream thread stops
+        (its next ``Y`` would re-enter position mode).
+
         Args:
             mode: One of ``HapticMode.HAPTIC``, ``.INERTIA``,
                   ``.SPRING``, or ``.BOUNDED``.
         """
+        self._abort_seeks("cancelled")
         self._send(mode.value)
 
     # ------------------------------------------------------------------ #
@@ -316,20 +763,268 @@ class SmartKnobDriver:
         """Request a full state dump (response arrives via ``on_raw``)."""
         self._send(CMD_QUERY_STATE)
 
-    def seek(self, angle_deg: float) -> None:
+    def seek(self, angle_deg: float) -> Future:
         """Command the motor to seek to *angle_deg* degrees.
 
         The firmware will acknowledge with ``A:Z<angle>`` immediately,
         then fire ``A:SEEK_DONE`` (and ``on_seek_done``) when settled.
+        Back-to-back seeks are coalesced: while a ``Z`` command is waiting
+        for its ack, newer targets replace each other and only the latest
+        is sent once the ack arrives (the firmware retargets in place).
 
         Args:
             angle_deg: Target position in degrees.
+
+        Returns:
+            Future: Resolves to a ``SeekResult``. Ignore it for
+                    fire-and-forget use.
         """
-        self._send(f"{CMD_SEEK}{angle_deg:.1f}")
+        op = _SeekOp(angle_deg)
+        if not self.is_connected:
+            self._finish_seeks([op], "disconnected")
+            return op.future
+
+        superseded = []
+        with self._seek_lock:
+            active = self._seek_active
+            now = time.perf_counter()
+            if (self._seek_unacked and active is not None
+                    and now - active.result.sent_at < SEEK_ACK_TIMEOUT_S):
+                if self._seek_pending is not None:
+                    superseded.append(self._seek_pending)
+                self._seek_pending = op
+                send = False
+            else:
+                if active is not None:
+                    superseded.append(active)
+                self._stream = None  # The firmware drops the stream on Z
+                self._start_seek(op, now)
+                send = True
+        self._finish_seeks(superseded, "superseded")
+        if send:
+            self._send(f"{CMD_SEEK}{angle_deg:.1f}")
+        return op.future
+
+    seek_async = seek
+    """Alias of ``seek()`` for code that wants to make the Future explicit.
+
+    With asyncio: ``result = await asyncio.wrap_future(knob.seek_async(30))``.
+    """
 
-    def seek_zero(self) -> None:
-        """Shortcut: seek to 0° (sends ``Z0``)."""
-        self._send(f"{CMD_SEEK}0")
+    def seek_and_wait(self, angle_deg: float, timeout: Optional[float] = 10.0) -> bool:
+        """Seek and block until the knob has settled at *angle_deg*.
+
+        Args:
+            angle_deg: Target position in degrees.
+            timeout: Seconds to wait (None = forever). The firmware gives
+                     up after 10 s on its own.
+
+        Returns:
+            bool: True if the seek completed; False on timeout, or if it was
+                  superseded, cancelled or the link dropped.
+        """
+        try:
+            return self.seek(angle_deg).result(timeout).status == "done"
+        except FutureTimeoutError:
+            return False
+
+    def cancel_seek(self) -> bool:
+        """Cancel the in-flight and pending seek.
+
+        The firmware has no stop command, so the motor is retargeted to its
+        current angle: it settles in place and returns to the previous mode.
+
+        Returns:
+            bool: True if a seek was cancelled.
+        """
+        with self._seek_lock:
+            ops = [op for op in (self._seek_active, self._seek_pending) if op is not None]
+            in_flight = self._seek_active is not None
+            self._seek_pending = None
+            self._stream = None
+            if in_flight:
+                # Internal hold-in-place seek; nobody waits on its future
+                self._start_seek(_SeekOp(self.current_angle), time.perf_counter())
+        self._finish_seeks(ops, "cancelled")
+        if in_flight:
+            self._send(f"{CMD_SEEK}{self.current_angle:.1f}")
+        return bool(ops)
+
+    def move_to(
+        self,
+        angle_deg: float,
+        profile: str = "scurve",
+        max_velocity: float = DEFAULT_MAX_VELOCITY_DPS,
+        max_accel: float = DEFAULT_MAX_ACCEL_DPS2,
+        max_jerk: float = DEFAULT_MAX_JERK_DPS3,
+        lookahead_s: float = DEFAULT_LOOKAHEAD_S,
+    ) -> Future:
+        """Seek along a planned trajectory instead of a single ``Z`` step.
+
+        The move from the current angle is planned with
+        ``smartknob.trajectory.plan()`` and streamed as ``Y`` waypoints by a
+        background thread. It keeps about *lookahead_s* of motion queued in
+        the firmware and never sends more than the ring's free slots reported
+        by the acks. ``YE`` closes the stream; ``A:SEEK_DONE`` follows once the
+        knob has settled at the last waypoint. Like ``seek()``, a newer seek,
+        ``move_to()`` or ``cancel_seek()`` supersedes it.
+
+        Args:
+            angle_deg: Target position in degrees.
+            profile: ``"scurve"`` (jerk-limited) or ``"trapezoid"``.
+            max_velocity: Cruise velocity limit in °/s.
+            max_accel: Acceleration limit in °/s².
+            max_jerk: Jerk limit in °/s³ (S-curve only).
+            lookahead_s: Motion to keep buffered ahead of the firmware.
+
+        Returns:
+            Future: Resolves to a ``SeekResult`` (``acked_at`` is the first
+                    ``A:Y``).
+
+        Raises:
+            ValueError: Unknown profile or non-positive limits.
+        """
+        waypoints = plan(self.current_angle, angle_deg, profile, max_velocity, max_accel, max_jerk)
+        stream = TrajectoryStream(waypoints, TRAJ_BUFFER_SIZE, lookahead_s)
+        op = _SeekOp(angle_deg)
+        if not self.is_connected:
+            self._finish_seeks([op], "disconnected")
+            return op.future
+
+        with self._seek_lock:
+            superseded = [o for o in (self._seek_active, self._seek_pending) if o is not None]
+            self._seek_pending = None
+            self._start_seek(op, time.perf_counter())
+            self._seek_unacked = False  # Y lines are acked through the stream
+            self._stream = stream
+        self._finish_seeks(superseded, "superseded")
+        threading.Thread(target=self._stream_loop, args=(stream,), daemon=True,
+                         name="smartknob-stream").start()
+        return op.future
+
+    def _stream_loop(self, stream: TrajectoryStream) -> None:
+        """Stream thread: send what flow control allows, then wait for an ack."""
+        while True:
+            self._stream_wake.clear()
+            with self._seek_lock:
+                if self._stream is not stream:
+                    return  # Superseded, cancelled or disconnected
+                batch = stream.next_batch(time.perf_counter())
+                if batch:
+                    # Under _seek_lock so a superseding seek can't interleave
+                    self._send("\n".join(batch))
+            if stream.finished_sending:
+                return
+            self._stream_wake.wait(stream.period_s)
+
+    def _on_stream_ack(self, text: str, now: float) -> None:
+        """``A:Y<free>`` / ``A:YE`` received: update flow control and wake the stream."""
+        with self._seek_lock:
+            stream = self._stream
+            if stream is None:
+                return
+            if text == "E":
+                stream.end_acked = True
+                return
+            try:
+                free = int(text)
+            except ValueError:
+                return
+            stream.on_ack(free, now)
+            if self._seek_active is not None and self._seek_active.result.acked_at is None:
+                self._seek_active.result.acked_at = now
+        self._stream_wake.set()
+
+    def seek_stats(self) -> dict:
+        """Timing of recent completed seeks.
+
+        Returns:
+            dict: ``count`` of completed seeks in the history window,
+                  ``ack_ms`` / ``total_ms`` dicts with p50/p95/max (command
+                  → ``A:Z`` and command → ``A:SEEK_DONE``), and lifetime
+                  ``superseded`` / ``cancelled`` / ``disconnected`` counts.
+        """
+        with self._seek_lock:
+            history = list(self._seek_history)
+            counts = dict(self._seek_counts)
+
+        def summary(values: list[float]) -> dict:
+            if not values:
+                return {"p50": None, "p95": None, "max": None}
+            values.sort()
+            n = len(values)
+            return {"p50": values[n // 2], "p95": values[min(n - 1, int(n * 0.95))], "max": values[-1]}
+
+        return {
+            "count": len(history),
+            "ack_ms": summary([r.ack_ms for r in history if r.ack_ms is not None]),
+            "total_ms": summary([r.total_ms for r in history if r.total_ms is not None]),
+            **counts,
+        }
+
+    def seek_zero(self) -> Future:
+        """Shortcut: seek to 0° (sends ``Z0.0``)."""
+        return self.seek(0.0)
+
+    def _start_seek(self, op: _SeekOp, now: float) -> None:
+        """Make *op* the in-flight seek. Caller holds ``_seek_lock`` and sends Z."""
+        op.result.sent_at = now
+        self._seek_active = op
+        self._seek_unacked = True
+
+    def _finish_seeks(self, ops: list[_SeekOp], status: str) -> None:
+        """Resolve futures (outside ``_seek_lock`` — callbacks may seek again)."""
+        for op in ops:
+            op.result.status = status
+            if status in self._seek_counts:
+                self._seek_counts[status] += 1
+            if not op.future.done():
+                op.future.set_result(op.result)
+
+    def _abort_seeks(self, status: str) -> None:
+        with self._seek_lock:
+            ops = [op for op in (self._seek_active, self._seek_pending) if op is not None]
+            self._seek_active = self._seek_pending = None
+            self._seek_unacked = False
+            self._stream = None
+        self._finish_seeks(ops, status)
+
+    def _on_seek_ack(self) -> None:
+        """``A:Z`` received: send the newest coalesced target, if any."""
+        now = time.perf_counter()
+        superseded = []
+        with self._seek_lock:
+            if self._stream is not None:
+                return  # Late ack of a Z the stream replaced
+            if self._seek_active is not None and self._seek_active.result.acked_at is None:
+                self._seek_active.result.acked_at = now
+            self._seek_unacked = False
+            pending, self._seek_pending = self._seek_pending, None
+            if pending is not None:
+                if self._seek_active is not None:
+                    superseded.append(self._seek_active)
+                self._start_seek(pending, now)
+        self._finish_seeks(superseded, "superseded")
+        if pending is not None:
+            self._send(f"{CMD_SEEK}{pending.result.target_deg:.1f}")
+
+    def _on_seek_complete(self) -> None:
+        """``A:SEEK_DONE`` received: resolve the in-flight seek."""
+        with self._seek_lock:
+            if self._seek_unacked:
+                # Done for the previous target; the firmware is about to
+                # start the retarget we just sent
+                return
+            if self._stream is not None:
+                if not self._stream.end_acked:
+                    return  # From the seek the stream replaced
+                self._stream = None
+            op, self._seek_active = self._seek_active, None
+            if op is None:
+                return
+            op.result.done_at = time.perf_counter()
+            self._seek_history.append(op.result)
+        self._finish_seeks([op], "done")
 
     # ------------------------------------------------------------------ #
     #  Motor PID configuration
@@ -388,19 +1083,428 @@ class SmartKnobDriver:
         """
         self._send(command)
 
+    def send_commands(self, commands: Sequence[str], payload: Optional[bytes] = None) -> None:
+        """Send several commands in a single serial write.
+
+        The firmware applies them in order; persistent settings are
+        remembered for restore as with the individual setters.
+
+        Args:
+            commands: Command lines without newlines.
+            payload: The same commands already encoded as newline-terminated
+                     bytes (e.g. a compiled preset's), to skip building it.
+        """
+        if payload is None:
+            payload = "".join(f"{cmd}\n" for cmd in commands).encode()
+        m = self._metrics
+        tr = tracing.TRACER
+        with self._lock:
+            for cmd in commands:
+                if cmd:
+                    self._remember(cmd)
+            if self._serial and self._serial.is_open:
+                if m is None and tr is None:
+                    self._serial.write(payload)
+                else:
+                    t0 = time.perf_counter()
+                    self._serial.write(payload)
+                    t1 = time.perf_counter()
+                    if m is not None:
+                        m.write_seconds.record(t1 - t0)
+                        m.tx_commands.inc(len(commands))
+                    if tr is not None:
+                        tr.complete("serial.write", t0, t1, "serial", {"cmd": " ".join(commands)})
+                logger.debug("TX: %s", " ".join(commands))
+
+    def apply_preset(self, preset: dict) -> list[str]:
+        """Send the mode and haptic parameters of a presets.json entry in one write.
+
+        Args:
+            preset: One entry of presets.json ``"presets"`` (keys the
+                    firmware doesn't take, like ``curve``, are ignored).
+
+        Returns:
+            list[str]: The commands sent (see ``protocol.preset_commands()``).
+
+        Raises:
+            ValueError: Unknown mode or a non-numeric parameter.
+        """
+        commands = preset_commands(preset)
+        self.send_commands(commands)
+        return commands
+
+    # ------------------------------------------------------------------ #
+    #  Gestures
+    # ------------------------------------------------------------------ #
+
+    def enable_gestures(self, config: Optional[dict] = None) -> GestureRecognizer:
+        """Recognize flicks, flings, reversals, holds and idle on the reader thread.
+
+        Each report costs one O(1) ``GestureRecognizer.update()``; hold and
+        idle timing advance on read timeouts while the knob is silent.
+        Motion during a seek or streamed move is not the user's and is
+        skipped. Holds are measured from the last acked spring center.
+
+        Args:
+            config: Gesture thresholds, e.g. a preset's "gestures" entry
+                    (see ``smartknob.gestures``); None = defaults.
+
+        Returns:
+            GestureRecognizer: The new recognizer (also ``self.gestures``).
+
+        Raises:
+            ValueError: Invalid config.
+        """
+        center = self._shadow.get(CMD_SPRING_CENTER, "")[1:]
+        rec = GestureRecognizer(config, float(center) if center else 0.0)
+        self.gestures = rec
+        return rec
+
+    def disable_gestures(self) -> None:
+        """Stop recognizing gestures."""
+        self.gestures = None
+
+    def _feed_gestures(self, rec: GestureRecognizer, angle: Optional[float], t: float) -> None:
+        """Run *rec* on one report (or a read timeout when *angle* is None)."""
+        if self._seek_active is not None or self._stream is not None:
+            rec.reset()
+            return
+        gestures = rec.poll(t) if angle is None else rec.update(angle, t)
+        if gestures and self.events.handlers["gesture"]:
+            for gesture in gestures:
+                self.events.publish("gesture", gesture)
+
+    # ------------------------------------------------------------------ #
+    #  Sample streams
+    # ------------------------------------------------------------------ #
+
+    def stream(self, maxsize: int = DEFAULT_MAXSIZE, overflow: str = "drop_oldest") -> SampleStream:
+        """Iterate position samples instead of assigning ``on_sample``.
+
+        The reader thread queues every ``PositionSample``; iterating blocks
+        until the next one arrives and ends after ``close()`` (or
+        ``disconnect()``) once the queue is drained. Chain ``map``,
+        ``filter``, ``throttle``, ``window`` and ``dedupe`` onto it (see
+        ``smartknob.stream``). Any number of streams can be open at once.
+
+        Args:
+            maxsize: Queue bound.
+            overflow: ``"drop_oldest"``, ``"drop_newest"`` or ``"block"``
+                      (the reader waits for the consumer).
+
+        Returns:
+            SampleStream: Iterable, also a context manager that closes it.
+
+        Raises:
+            ValueError: Bad *maxsize* or *overflow*.
+        """
+        stream = SampleStream(maxsize, overflow, lambda s: self._close_stream(s, sub))
+        sub = self.events.subscribe("sample", stream.put, name=f"stream-{id(stream):x}")
+        with self._streams_lock:
+            self._streams = self._streams + (stream,)
+        return stream
+
+    def _close_stream(self, stream: SampleStream, sub: Subscription) -> None:
+        sub.unsubscribe()
+        with self._streams_lock:
+            self._streams = tuple(s for s in self._streams if s is not stream)
+
+    # ------------------------------------------------------------------ #
+    #  Shared memory
+    # ------------------------------------------------------------------ #
+
+    def enable_shared_memory(self, name: Optional[str] = None, capacity: Optional[int] = None) -> str:
+        """Publish every position sample into a shared-memory segment.
+
+        Other local processes read it with ``smartknob.shm.SharedStateReader``
+        without any socket or syscall per sample.
+
+        Args:
+            name: Segment name (default ``smartknob.shm.DEFAULT_NAME``).
+            capacity: Sample ring size (default ``smartknob.shm.DEFAULT_CAPACITY``).
+
+        Returns:
+            str: The segment name.
+        """
+        from smartknob import shm
+
+        self.disable_shared_memory()
+        writer = shm.SharedStateWriter(
+            name or shm.DEFAULT_NAME, capacity or shm.DEFAULT_CAPACITY
+        )
+        with self._lock:
+            writer.set_mode(self._mode)
+            self._shm_writer = writer
+        logger.info("Publishing state to shared memory %r", writer.name)
+        return writer.name
+
+    def disable_shared_memory(self) -> None:
+        """Stop publishing and remove the shared-memory segment."""
+        # Under _lock: the reader writes samples while holding it
+        with self._lock:
+            writer, self._shm_writer = self._shm_writer, None
+            if writer is not None:
+                writer.close()
+
+    # ------------------------------------------------------------------ #
+    #  Device timestamps / clock sync
+    # ------------------------------------------------------------------ #
+
+    def enable_device_timestamps(self, sync_interval_s: float = 1.0) -> None:
+        """Stamp position reports with device time and keep clocks in sync.
+
+        Sends ``TS1`` and starts a background thread that pings ``T`` every
+        *sync_interval_s* (a quick burst first, so ``on_sample`` latencies
+        are available within ~0.2 s). ``TS1`` is part of the restored state
+        after a reconnect.
+
+        Args:
+            sync_interval_s: Seconds between sync pings once converged.
+        """
+        self._send(f"{CMD_TIMESTAMPS}1")
+        self._sync_interval_s = sync_interval_s
+        self._start_sync_thread()
+
+    def disable_device_timestamps(self) -> None:
+        """Send ``TS0`` and stop sync pings."""
+        self._sync_interval_s = None
+        self._send(f"{CMD_TIMESTAMPS}0")
+
+    def sync_clock(self, timeout: float = 0.5) -> Optional[float]:
+        """Send one ``T`` ping and wait for the reply.
+
+        Returns:
+            Optional[float]: Round-trip time in seconds, or None on timeout.
+        """
+        self._ping_reply.clear()
+        sent_at = time.perf_counter()
+        self._ping_sent_at = sent_at
+        self._send(CMD_TIME)
+        if not self._ping_reply.wait(timeout):
+            self._ping_sent_at = None
+            return None
+        return time.perf_counter() - sent_at
+
+    def _start_sync_thread(self) -> None:
+        if self._sync_interval_s is None:
+            return
+        if self._sync_thread is None or not self._sync_thread.is_alive():
+            self._sync_thread = threading.Thread(
+                target=self._sync_loop, daemon=True, name="smartknob-clock"
+            )
+            self._sync_thread.start()
+
+    def _sync_loop(self) -> None:
+        """Background thread: periodic sync pings while timestamps are enabled."""
+        burst = 8
+        while self._sync_interval_s is not None and not self._stop.is_set():
+            if self.is_connected:
+                self.sync_clock()
+                if self.clock.pings == 0:
+                    burst = 8  # Fresh (or rebooted) device: converge quickly
+            interval = 0.02 if burst > 0 else self._sync_interval_s
+            burst -= 1
+            if interval is None or self._stop.wait(interval):
+                break
+        logger.debug("Clock sync loop exited")
+
+    # ------------------------------------------------------------------ #
+    #  Metrics
+    # ------------------------------------------------------------------ #
+
+    def enable_metrics(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        log_interval_s: Optional[float] = None,
+        prometheus_port: Optional[int] = None,
+    ) -> MetricsRegistry:
+        """Start counting lines, errors, callback and write latencies.
+
+        Args:
+            registry: Where to register instruments (default ``metrics.REGISTRY``).
+            log_interval_s: Log a summary line this often (None = don't).
+            prometheus_port: Serve ``/metrics`` on 127.0.0.1 at this port
+                             (None = don't, 0 = any free port).
+
+        Returns:
+            MetricsRegistry: The registry in use.
+        """
+        from smartknob import metrics
+
+        self.disable_metrics()
+        registry = registry if registry is not None else metrics.REGISTRY
+        m = _DriverMetrics(registry)
+        m.gauges = [
+            registry.gauge("smartknob_rx_buffered_bytes", self._rx_buffered,
+                           "Bytes waiting in the OS serial buffer"),
+            registry.gauge("smartknob_seeks_pending", lambda: int(self._seek_active is not None)
+                           + int(self._seek_pending is not None), "Seeks in flight or queued"),
+            registry.gauge("smartknob_baud_rate", lambda: self._baud, "Host-side baud rate"),
+        ]
+        if log_interval_s:
+            reporter = metrics.MetricsLogger(registry, log_interval_s)
+            reporter.start()
+            self._metrics_reporters.append(reporter)
+        if prometheus_port is not None:
+            server = metrics.PrometheusServer(registry, prometheus_port)
+            server.start()
+            self._metrics_reporters.append(server)
+        self._metrics = m
+        return registry
+
+    def disable_metrics(self) -> None:
+        """Stop recording and stop the log line / Prometheus endpoint."""
+        m, self._metrics = self._metrics, None
+        for reporter in self._metrics_reporters:
+            reporter.stop()
+        self._metrics_reporters = []
+        if m is not None:
+            for gauge in m.gauges:
+                m.registry.remove(gauge)
+
+    def stats(self) -> dict:
+        """Snapshot of the driver's state and metrics.
+
+        Returns:
+            dict: ``connected``, ``baud_rate``, ``seeks`` (``seek_stats()``),
+                  ``subscribers`` (``events.stats()``) and ``metrics`` (registry snapshot, or None if disabled).
+        """
+        m = self._metrics
+        return {
+            "connected": self.is_connected,
+            "baud_rate": self._baud,
+            "seeks": self.seek_stats(),
+            "subscribers": self.events.stats(),
+            "metrics": m.registry.snapshot() if m is not None else None,
+        }
+
+    def _rx_buffered(self) -> int:
+        ser = self._serial
+        return ser.in_waiting if ser is not None and ser.is_open else 0
+
+    # ------------------------------------------------------------------ #
+    #  Baud rate
+    # ------------------------------------------------------------------ #
+
+    def negotiate_baud(
+        self,
+        rates: Optional[Iterable[int]] = None,
+        memory: Optional[BaudMemory] = None,
+    ) -> int:
+        """Switch the link to the fastest rate both sides can sustain.
+
+        Runs ``smartknob.baud.BaudNegotiator``: the remembered rate for this
+        device first, then faster rates first, verifying each with a probe
+        and falling back to 115 200 if it doesn't answer. After a reconnect
+        the driver re-negotiates automatically.
+
+        Args:
+            rates: Candidate rates (default ``SUPPORTED_BAUD_RATES``).
+            memory: ``smartknob.baud.BaudMemory`` (default: ``~/.smartknob/baud.json``).
+
+        Returns:
+            int: The rate in use afterwards.
+
+        Raises:
+            RuntimeError: If not connected.
+        """
+        from smartknob.baud import BaudMemory, BaudNegotiator
+
+        if memory is None:
+            memory = BaudMemory()
+        rate = BaudNegotiator(self, memory).run(rates)
+        self._baud_rates = tuple(rates) if rates is not None else None
+        self._baud_memory = memory
+        self._baud_negotiated = rate if rate != BAUD_RATE else None
+        return rate
+
+    def request_baud(self, rate: int, timeout: float = 0.3) -> Optional[int]:
+        """Send ``R<rate>`` and wait for the ack (the host rate is unchanged).
+
+        Returns:
+            Optional[int]: The acked rate, 0 if refused, None on timeout.
+        """
+        return self._baud_request(f"{CMD_BAUD}{rate}", "ack", timeout)
+
+    def probe_baud(self, timeout: float = 0.1) -> Optional[int]:
+        """Send a bare ``R`` and wait for ``R<baud>``.
+
+        Returns:
+            Optional[int]: The firmware's rate, or None if nothing intelligible came back.
+        """
+        return self._baud_request(CMD_BAUD, "probe", timeout)
+
+    def _baud_request(self, cmd: str, kind: str, timeout: float) -> Optional[int]:
+        while True:  # Drop stale replies from an earlier request
+            try:
+                self._baud_replies.get_nowait()
+            except queue.Empty:
+                break
+        self._send(cmd)
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            try:
+                reply_kind, rate = self._baud_replies.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if reply_kind == kind:
+                return rate
+
+    def set_host_baudrate(self, rate: int) -> None:
+        """Re-configure the host side of the link to *rate*.
+
+        Only the host changes; the firmware must already be switching (see
+        ``request_baud()``) or ``negotiate_baud()`` should be used instead.
+        Bytes already received at the old rate are discarded, including a
+        partial line held by the reader.
+        """
+        with self._lock:
+            if self._serial is not None and self._serial.is_open:
+                self._serial.baudrate = rate
+                self._serial.reset_input_buffer()
+            self._baud = rate
+            self._rx_flush = True
+
     # ------------------------------------------------------------------ #
     #  Internal: send / receive
     # ------------------------------------------------------------------ #
 
     def _send(self, cmd: str) -> None:
-        """Write *cmd* + newline to the serial port (thread-safe)."""
+        """Write *cmd* + newline to the serial port (thread-safe).
+
+        Persistent settings are remembered even while disconnected, so they
+        are applied by the next restore.
+        """
+        m = self._metrics
+        tr = tracing.TRACER
         with self._lock:
+            if cmd:
+                self._remember(cmd)
             if self._serial and self._serial.is_open:
-                self._serial.write(f"{cmd}\n".encode())
+                if m is None and tr is None:
+                    self._serial.write(f"{cmd}\n".encode())
+                else:
+                    t0 = time.perf_counter()
+                    self._serial.write(f"{cmd}\n".encode())
+                    t1 = time.perf_counter()
+                    if m is not None:
+                        m.write_seconds.record(t1 - t0)
+                        m.tx_commands.inc()
+                    if tr is not None:
+                        tr.complete("serial.write", t0, t1, "serial", {"cmd": cmd})
                 logger.debug("TX: %s", cmd)
 
     def _reader_loop(self) -> None:
-        """Background thread: continuously read lines and dispatch callbacks."""
+        """Background thread: continuously read lines and dispatch callbacks.
+
+        Blocks in ``read()`` (up to SERIAL_TIMEOUT) instead of polling, so a
+        line is handled as soon as its bytes arrive; the arrival time is
+        taken right after the read returns.
+        """
+        buf = bytearray()
         while True:
             with self._lock:
                 if not self._running:
@@ -411,49 +1515,179 @@ class SmartKnobDriver:
                 break
 
             try:
-                if ser.in_waiting:
-                    raw = ser.readline()
-                    if raw:
-                        line = raw.decode(errors="replace").strip()
-                        if line:
-                            self._process_line(line)
-            except serial.SerialException as exc:
-                logger.error("Serial read error: %s", exc)
+                tr = tracing.TRACER
+                if tr is not None:
+                    read_start = time.perf_counter()
+                data = ser.read(ser.in_waiting or 1)
+                if self._rx_flush:
+                    self._rx_flush = False
+                    buf.clear()  # Partial line from before a rate change
+                if not data:
+                    rec = self.gestures
+                    if rec is not None:
+                        self._feed_gestures(rec, None, time.perf_counter())
+                    continue
+                arrival = time.perf_counter()
+                m = self._metrics
+                if m is not None:
+                    m.rx_bytes.inc(len(data))
+                if tr is not None:
+                    tr.complete("serial.read", read_start, arrival, "serial", {"bytes": len(data)})
+                buf += data
+                while True:
+                    end = buf.find(b"\n")
+                    if end < 0:
+                        break
+                    line = buf[:end].decode(errors="replace")
+                    del buf[:end + 1]
+                    # Keep what follows bytes garbled by a rate mismatch
+                    line = line.rpartition("\ufffd")[2].strip()
+                    if not line:
+                        continue
+                    try:
+                        if m is None and tr is None:
+                            self._process_line(line, arrival)
+                            continue
+                        t0 = time.perf_counter()
+                        self._process_line(line, arrival)
+                        t1 = time.perf_counter()
+                        if m is not None:
+                            m.line_seconds.record(t1 - t0)
+                            m.line_queue_seconds.record(t0 - arrival)
+                            m.lines.inc()
+                        if tr is not None:
+                            tr.complete("serial.line", t0, t1, "serial", {"line": line[:24]})
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning("Reader exception: %s", exc)
+            except (serial.SerialException, OSError) as exc:
+                with self._lock:
+                    lost = self._running and self._serial is ser
+                if lost:
+                    logger.error("Serial read error: %s", exc)
+                    self._handle_link_lost()
                 break
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Reader exception: %s", exc)
 
-            time.sleep(0.01)
-
         logger.debug("Reader loop exited")
 
-    def _process_line(self, line: str) -> None:
-        """Parse a single firmware response line and fire the matching callback."""
+    def _process_line(self, line: str, arrival: Optional[float] = None) -> None:
+        """Parse a single firmware response line and fire the matching callback.
+
+        Args:
+            line: Stripped line text.
+            arrival: ``perf_counter()`` when the line was read (default: now).
+        """
+        if arrival is None:
+            arrival = time.perf_counter()
+        m = self._metrics
+        tr = tracing.TRACER
+        events = self.events
+        handlers = events.handlers
         if line.startswith(RESP_POSITION) and len(line) > 1 and (line[1].isdigit() or line[1] == '-'):
-            # Position update: P<angle_deg> (e.g., P60.12, P-30.5)
+            # Position update: P<angle_deg>[@<micros>] (e.g., P60.12, P-30.5@81234567)
             try:
-                angle = float(line[len(RESP_POSITION):])
-                with self._lock:
-                    self._current_angle = angle
-                if self.on_position:
-                    self.on_position(angle)
+                angle_text, _, stamp = line[len(RESP_POSITION):].partition("@")
+                angle = float(angle_text)
+                device_us = self.clock.unwrap(int(stamp)) if stamp else None
             except ValueError:
                 logger.warning("Bad position line: %s", line)
+                if m is not None:
+                    m.parse_errors.inc()
+                return
+            # Device time (when stamped) separates lines that arrived in one read
+            device_host = self.clock.to_host(device_us) if device_us is not None else None
+            with self._lock:
+                self._current_angle = angle
+                shm_writer = self._shm_writer
+                if shm_writer is not None:
+                    shm_writer.write(angle, arrival if device_host is None else device_host)
+            if m is not None:
+                m.positions.inc()
+            if handlers["position"]:
+                if m is None and tr is None:
+                    events.publish("position", angle)
+                else:
+                    t0 = time.perf_counter()
+                    events.publish("position", angle)
+                    t1 = time.perf_counter()
+                    if m is not None:
+                        m.position_callback.record(t1 - t0)
+                    if tr is not None:
+                        tr.complete("callback.position", t0, t1, "callback")
+            if handlers["sample"]:
+                events.publish("sample", PositionSample(
+                    angle, arrival, device_us, device_host,
+                    arrival - device_host if device_host is not None else None,
+                ))
+            rec = self.gestures
+            if rec is not None:
+                self._feed_gestures(rec, angle, arrival if device_host is None else device_host)
+            detent = self.detents.update(angle)
+            if detent is not None and handlers["detent"]:
+                events.publish("detent", *detent)
+
+        elif line.startswith(RESP_TIME) and line[len(RESP_TIME):].isdigit():
+            # Sync ping reply: T<micros>
+            device_us = self.clock.unwrap(int(line[len(RESP_TIME):]))
+            sent_at, self._ping_sent_at = self._ping_sent_at, None
+            if sent_at is not None:
+                self.clock.add_ping(sent_at, arrival, device_us)
+            self._ping_reply.set()
+
+        elif line.startswith(RESP_BAUD) and line[len(RESP_BAUD):].isdigit():
+            # Baud probe reply: R<baud>
+            self._baud_replies.put(("probe", int(line[len(RESP_BAUD):])))
 
         elif line == RESP_SEEK_DONE:
-            # Seek completed — fire specific callback
-            if self.on_seek_done:
-                self.on_seek_done()
-            if self.on_ack:
-                self.on_ack("SEEK_DONE")
+            # Seek completed — resolve futures, then fire specific callback
+            self._on_seek_complete()
+            if handlers["seek_done"]:
+                events.publish("seek_done")
+            if handlers["ack"]:
+                events.publish("ack", "SEEK_DONE")
 
         elif line.startswith(RESP_ACK):
             # General acknowledgment: A:<text>
             ack_text = line[len(RESP_ACK):]
-            if self.on_ack:
-                self.on_ack(ack_text)
+            if ack_text.startswith(CMD_SEEK):
+                self._on_seek_ack()
+            elif ack_text.startswith(CMD_TRAJECTORY):
+                self._on_stream_ack(ack_text[len(CMD_TRAJECTORY):], arrival)
+            elif ack_text.startswith(CMD_BAUD) and ack_text[len(CMD_BAUD):].isdigit():
+                self._baud_replies.put(("ack", int(ack_text[len(CMD_BAUD):])))
+            else:
+                self.detents.on_ack(ack_text)
+            if ack_text.startswith(CMD_SPRING_CENTER) and len(ack_text) > 1:
+                # Resolved spring center (also covers bare "E" = current angle)
+                with self._lock:
+                    self._shadow[CMD_SPRING_CENTER] = ack_text
+                rec = self.gestures
+                if rec is not None:
+                    try:
+                        rec.center_deg = float(ack_text[len(CMD_SPRING_CENTER):])
+                    except ValueError:
+                        pass
+            if m is not None:
+                m.acks.inc()
+            if handlers["ack"]:
+                if m is None and tr is None:
+                    events.publish("ack", ack_text)
+                else:
+                    t0 = time.perf_counter()
+                    events.publish("ack", ack_text)
+                    t1 = time.perf_counter()
+                    if m is not None:
+                        m.ack_callback.record(t1 - t0)
+                    if tr is not None:
+                        tr.complete("callback.ack", t0, t1, "callback")
 
         else:
+            if line == RESP_BANNER and self._port is not None:
+                # Firmware rebooted with default parameters; micros() restarted
+                self.clock.reset()
+                self.detents.reset()
+                self._restore()
             # Unrecognised — forward to raw callback
-            if self.on_raw:
-                self.on_raw(line)
+            if handlers["raw"]:
+                events.publish("raw", line)
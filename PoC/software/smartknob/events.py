@@ -0,0 +1,385 @@
+"""Multi-subscriber event bus for driver events.
+
+``SmartKnobDriver.events`` publishes every driver event on a topic, and any
+number of subscribers can listen to each one. Every subscriber picks how it
+is called:
+
+    "inline"  on the reader thread, in subscription order (cheapest; a slow
+              handler delays every later line)
+    "thread"  on the subscriber's own thread, through a bounded queue
+    "pool"    on a worker of the bus's shared thread pool, through a bounded
+              queue (calls for one subscriber never overlap and keep order)
+
+Queued subscribers use ``smartknob.stream.SampleStream`` as their queue, so
+they get the same overflow policies ("drop_oldest", "drop_newest",
+"block"). Each one records its own lag (publish → handler start) in a
+``metrics.Histogram`` plus delivered/dropped counts; see ``stats()``. A
+handler that raises is logged and does not affect other subscribers.
+
+Topics and handler arguments:
+
+    position          (angle_deg)
+    sample            (PositionSample)
+    ack               (ack_text)         also "SEEK_DONE" after seek_done
+    seek_done         ()
+    raw               (line)
+    connection_state  (ConnectionState)
+    detent            (index, delta)
+    gesture           (Gesture)
+
+The driver's ``on_position``/``on_ack``/... attributes still work: each is
+one inline subscription that assignment replaces (``None`` removes it).
+
+Usage:
+    sub = knob.events.subscribe("position", recorder.write, delivery="thread", maxsize=4096)
+    knob.events.subscribe("ack", print, delivery="pool")
+    sub.stats()["lag"]["p99"]
+    sub.unsubscribe()
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from smartknob.metrics import Histogram
+from smartknob.stream import DEFAULT_MAXSIZE, SampleStream
+
+logger = logging.getLogger(__name__)
+
+TOPICS: tuple[str, ...] = (
+    "position", "sample", "ack", "seek_done", "raw", "connection_state", "detent", "gesture",
+)
+"""Topics published by ``SmartKnobDriver``."""
+
+DELIVERIES: tuple[str, ...] = ("inline", "thread", "pool")
+"""Accepted values for ``delivery``."""
+
+DEFAULT_POOL_WORKERS: int = 4
+"""Threads in the shared pool used by ``delivery="pool"`` subscribers."""
+
+
+class Subscription:
+    """One handler on one topic (returned by ``EventBus.subscribe()``).
+
+    Attributes:
+        topic: Topic name.
+        name: Label used in stats and thread names.
+        handler: The subscriber's callable.
+        delivery: "inline", "thread" or "pool".
+        queue: The bounded queue (None for inline).
+        lag: Publish → handler start latency (None for inline: always 0).
+        delivered: Handler calls made (queued deliveries only).
+    """
+
+    __slots__ = ("topic", "name", "handler", "delivery", "queue", "lag", "delivered",
+                 "_bus", "_deliver", "_thread", "_scheduled", "_schedule_lock")
+
+    def __init__(self, bus: EventBus, topic: str, handler: Callable, delivery: str, name: str,
+                 maxsize: int, overflow: str) -> None:
+        self._bus = bus
+        self.topic = topic
+        self.name = name
+        self.handler = handler
+        self.delivery = delivery
+        self.delivered = 0
+        self.queue: Optional[SampleStream] = None
+        self.lag: Optional[Histogram] = None
+        self._thread: Optional[threading.Thread] = None
+        self._scheduled = False
+        self._schedule_lock = threading.Lock()
+        if delivery == "inline":
+            self._deliver = handler
+            return
+        self.queue = SampleStream(maxsize, overflow)
+        self.lag = Histogram("smartknob_subscriber_lag_seconds", "Publish to handler start",
+                             {"topic": topic, "subscriber": name})
+        if delivery == "thread":
+            self._deliver = self._enqueue
+            self._thread = threading.Thread(target=self._run_thread, daemon=True,
+                                            name=f"smartknob-sub-{name}")
+            self._thread.start()
+        else:
+            self._deliver = self._enqueue_pool
+
+    def unsubscribe(self) -> None:
+        """Stop receiving events. Queued events are still delivered."""
+        self._bus.unsubscribe(self)
+
+    def stats(self) -> dict:
+        """Delivery mode, counts and lag summary (seconds, see ``Histogram.summary()``)."""
+        q = self.queue
+        return {
+            "topic": self.topic,
+            "delivery": self.delivery,
+            "delivered": self.delivered,
+            "received": q.received if q is not None else None,
+            "dropped": q.dropped if q is not None else 0,
+            "queued": len(q) if q is not None else 0,
+            "lag": self.lag.summary() if self.lag is not None else None,
+        }
+
+    # ------------------------------------------------------------------ #
+    #  Queued delivery
+    # ------------------------------------------------------------------ #
+
+    def _enqueue(self, *args) -> None:
+        self.queue.put((time.perf_counter(), args))
+
+    def _enqueue_pool(self, *args) -> None:
+        self.queue.put((time.perf_counter(), args))
+        if not self._scheduled:
+            with self._schedule_lock:
+                if self._scheduled:
+                    return
+                self._scheduled = True
+            self._bus._submit(self._run_pool)
+
+    def _call(self, item) -> None:
+        published, args = item
+        self.lag.record(time.perf_counter() - published)
+        try:
+            self.handler(*args)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Subscriber %s (%s) raised: %s", self.name, self.topic, exc)
+        self.delivered += 1
+
+    def _run_thread(self) -> None:
+        for item in self.queue:
+            self._call(item)
+
+    def _run_pool(self) -> None:
+        # One drain per subscriber at a time. The flag is cleared before the
+        # final emptiness check, so a put() either sees it cleared (and
+        # schedules a new drain) or lands before the check (and is drained here)
+        queue = self.queue
+        while True:
+            item = queue.get(0)
+            if item is not None:
+                self._call(item)
+                continue
+            with self._schedule_lock:
+                self._scheduled = False
+            if not len(queue):
+                return
+            with self._schedule_lock:
+                if self._scheduled:
+                    return  # A new drain was scheduled meanwhile
+                self._scheduled = True
+
+
+class EventBus:
+    """Topic → subscribers registry with per-subscriber delivery.
+
+    ``publish()`` runs on the publisher's thread (the driver's reader). The
+    subscriber lists are immutable tuples replaced on (un)subscribe, so
+    publishing takes no lock.
+
+    Attributes:
+        handlers: Per topic, the callables ``publish()`` invokes (inline
+                  handlers themselves, or queue puts). Read-only; check it
+                  to skip building an event nobody listens to.
+    """
+
+    def __init__(self, topics: tuple[str, ...] = TOPICS, pool_workers: int = DEFAULT_POOL_WORKERS) -> None:
+        """
+        Args:
+            topics: Topic names accepted by ``subscribe()``.
+            pool_workers: Size of the shared pool (created on first use).
+        """
+        self.handlers: dict[str, tuple[Callable, ...]] = {t: () for t in topics}
+        self._subs: dict[str, tuple[Subscription, ...]] = {t: () for t in topics}
+        self._attributes: dict[str, Subscription] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_workers = pool_workers
+
+    # ------------------------------------------------------------------ #
+    #  Subscribing
+    # ------------------------------------------------------------------ #
+
+    def subscribe(
+        self,
+        topic: str,
+        handler: Callable,
+        delivery: str = "inline",
+        maxsize: int = DEFAULT_MAXSIZE,
+        overflow: str = "drop_oldest",
+        name: Optional[str] = None,
+    ) -> Subscription:
+        """Call *handler* for every event on *topic*.
+
+        Args:
+            topic: One of the bus's topics (see module docstring).
+            handler: Called with the topic's arguments.
+            delivery: "inline", "thread" or "pool".
+            maxsize: Queue bound for "thread"/"pool".
+            overflow: "drop_oldest", "drop_newest" or "block" (the
+                      publisher waits) for "thread"/"pool".
+            name: Label for stats (default: the handler's name).
+
+        Returns:
+            Subscription: Handle for ``unsubscribe()`` and ``stats()``.
+
+        Raises:
+            ValueError: Unknown topic, delivery or overflow policy.
+        """
+        if topic not in self._subs:
+            raise ValueError(f"Unknown topic {topic!r} (expected one of {', '.join(self._subs)})")
+        if delivery not in DELIVERIES:
+            raise ValueError(f"Unknown delivery {delivery!r} (expected one of {', '.join(DELIVERIES)})")
+        name = name or getattr(handler, "__qualname__", None) or repr(handler)
+        sub = Subscription(self, topic, handler, delivery, name, maxsize, overflow)
+        with self._lock:
+            self._subs[topic] = self._subs[topic] + (sub,)
+            self.handlers[topic] = tuple(s._deliver for s in self._subs[topic])
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Remove *sub* (no-op if already removed); its queue drains, then its thread exits."""
+        with self._lock:
+            subs = self._subs[sub.topic]
+            if sub not in subs:
+                return
+            self._subs[sub.topic] = tuple(s for s in subs if s is not sub)
+            self.handlers[sub.topic] = tuple(s._deliver for s in self._subs[sub.topic])
+        if sub.queue is not None:
+            sub.queue.close()
+
+    def subscriptions(self, topic: Optional[str] = None) -> list[Subscription]:
+        """Current subscriptions, for one topic or all."""
+        topics = [topic] if topic is not None else list(self._subs)
+        return [s for t in topics for s in self._subs[t]]
+
+    # ------------------------------------------------------------------ #
+    #  Attribute adapter (on_position = handler)
+    # ------------------------------------------------------------------ #
+
+    def get_attribute(self, topic: str) -> Optional[Callable]:
+        """Handler of the attribute-style subscription on *topic*, or None."""
+        sub = self._attributes.get(topic)
+        return sub.handler if sub is not None else None
+
+    def set_attribute(self, topic: str, handler: Optional[Callable], name: str) -> None:
+        """Replace the attribute-style inline subscription on *topic* (None removes it)."""
+        old = self._attributes.pop(topic, None)
+        if old is not None:
+            self.unsubscribe(old)
+        if handler is not None:
+            self._attributes[topic] = self.subscribe(topic, handler, name=name)
+
+    # ------------------------------------------------------------------ #
+    #  Publishing
+    # ------------------------------------------------------------------ #
+
+    def publish(self, topic: str, *args) -> None:
+        """Deliver one event to every subscriber of *topic*."""
+        for deliver in self.handlers[topic]:
+            try:
+                deliver(*args)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Subscriber on %s raised: %s", topic, exc)
+
+    def _submit(self, fn: Callable[[], None]) -> None:
+        pool = self._pool
+        if pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self._pool_workers, thread_name_prefix="smartknob-pool")
+                pool = self._pool
+        pool.submit(fn)
+
+    # ------------------------------------------------------------------ #
+    #  Stats / shutdown
+    # ------------------------------------------------------------------ #
+
+    def stats(self) -> dict:
+        """``Subscription.stats()`` keyed by subscriber name."""
+        return {s.name: s.stats() for s in self.subscriptions()}
+
+    def close(self) -> None:
+        """Remove every subscription and stop the shared pool."""
+        for sub in self.subscriptions():
+            self.unsubscribe(sub)
+        self._attributes.clear()
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(events: int = 200_000) -> dict:
+    """
+    Publish cost per event on the reader thread, by subscriber setup, and
+    the lag a deliberately slow subscriber builds up without delaying an
+    inline one.
+
+    Returns:
+        dict: ``ns_per_publish`` per setup, plus ``slow`` (stats of a
+              thread subscriber sleeping 1 ms per event at 2 kHz) and
+              ``inline_max_us`` (worst inline handler gap meanwhile).
+    """
+    def noop(*args) -> None:
+        pass
+
+    setups = {
+        "direct call": None,
+        "1 inline": [("inline", 1)],
+        "4 inline": [("inline", 4)],
+        "1 thread": [("thread", 1)],
+        "1 pool": [("pool", 1)],
+        "inline + thread + pool": [("inline", 1), ("thread", 1), ("pool", 1)],
+    }
+    results: dict = {"ns_per_publish": {}}
+    for label, setup in setups.items():
+        bus = EventBus()
+        if setup is None:
+            t0 = time.perf_counter()
+            for i in range(events):
+                noop(i)
+        else:
+            for delivery, count in setup:
+                for _ in range(count):
+                    bus.subscribe("position", noop, delivery, maxsize=events)
+            publish = bus.publish
+            t0 = time.perf_counter()
+            for i in range(events):
+                publish("position", i)
+        results["ns_per_publish"][label] = (time.perf_counter() - t0) / events * 1e9
+        bus.close()
+
+    # A slow subscriber must not hold up the reader or the inline subscriber
+    bus = EventBus()
+    last = [time.perf_counter()]
+    gaps = []
+
+    def inline(i) -> None:
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+
+    bus.subscribe("position", inline)
+    slow = bus.subscribe("position", lambda i: time.sleep(0.001), "thread", maxsize=256, name="slow")
+    for i in range(1000):
+        bus.publish("position", i)
+        time.sleep(0.0005)
+    results["slow"] = slow.stats()
+    results["inline_max_us"] = max(gaps[1:]) * 1e6
+    bus.close()
+    return results
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    for label, ns in r["ns_per_publish"].items():
+        print(f"{label:>24}: {ns:6.0f} ns/publish")
+    s = r["slow"]
+    print(f"slow thread subscriber: {s['delivered']} delivered, {s['dropped']} dropped, "
+          f"lag p50 {s['lag']['p50'] * 1e3:.1f} ms / max {s['lag']['max'] * 1e3:.1f} ms; "
+          f"inline gap max {r['inline_max_us']:.0f} µs")
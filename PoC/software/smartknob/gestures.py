@@ -0,0 +1,418 @@
+"""Streaming gesture recognition over the position feed.
+
+``GestureRecognizer`` turns timestamped angles into discrete gestures so
+integrations don't each need their own ad-hoc motion code:
+
+    flick     a short, quick turn that stops (e.g. jump a page); reported
+              when the knob comes to rest
+    fling     a fast spin; reported as the speed starts to drop from its
+              peak, with that peak as the release velocity
+    reversal  the knob starts turning back the other way right after a
+              real move (at least reversal_deg)
+    hold      the knob rests at least hold_offset_deg away from center_deg
+              (e.g. held at a spring's limit) for hold_s, then every
+              hold_repeat_s while it stays there (fast-forward)
+    idle      no motion for idle_s (once per rest)
+
+Speed is a time-constant EMA of the report-to-report velocity, and all
+decisions use a handful of floats: every ``update()`` is O(1). The
+firmware only reports changes, so a knob that stops goes silent; the
+driver calls ``poll()`` whenever a read times out, which ends the motion
+and drives hold/idle timing.
+
+Thresholds come from the "gestures" entry of a preset in presets.json:
+
+    "ZOOM_DIAL": { ..., "gestures": {"hold_offset_deg": 25.0, "hold_s": 0.4} }
+
+Keys (all optional, see GESTURE_KEYS for defaults):
+    velocity_tau_s    Time constant of the speed estimate
+    move_dps          Speed above which the knob counts as moving
+    flick_dps         Peak speed of a flick
+    flick_max_s       Longest motion that still counts as a flick
+    fling_dps         Peak speed of a fling
+    reversal_deg      Travel needed before turning back counts as a reversal
+    reversal_gap_s    Longest pause between the two directions
+    hold_offset_deg   Distance from center_deg for holds (0 = off)
+    hold_s            Rest time before the first hold event
+    hold_repeat_s     Interval of repeated hold events (0 = fire once)
+    idle_s            Rest time before an idle event (0 = off)
+
+Usage:
+    knob.enable_gestures({"flick_dps": 240.0})
+    knob.on_gesture = lambda g: print(g.kind, g.velocity_dps)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from smartknob.traces import load_traces, ramp, smooth, synthesize, timed
+
+GESTURE_KEYS: dict[str, float] = {
+    "velocity_tau_s": 0.03,
+    "move_dps": 30.0,
+    "flick_dps": 200.0,
+    "flick_max_s": 0.4,
+    "fling_dps": 720.0,
+    "reversal_deg": 5.0,
+    "reversal_gap_s": 0.3,
+    "hold_offset_deg": 0.0,
+    "hold_s": 0.5,
+    "hold_repeat_s": 0.25,
+    "idle_s": 2.0,
+}
+"""Known gesture config keys and their defaults."""
+
+STILL_AFTER_S: float = 0.08
+"""Silence after which ``poll()`` takes the knob as stopped (the firmware
+reports a moving knob at least every 20 ms)."""
+
+RELEASE_RATIO: float = 0.8
+"""A fling is reported once the speed falls below this fraction of its peak."""
+
+MIN_DT_S: float = 1e-4
+"""Reports closer together than this (one serial read) are combined."""
+
+
+class Gesture(NamedTuple):
+    """One recognized gesture (see ``on_gesture``)."""
+
+    kind: str
+    """"flick", "fling", "reversal", "hold" or "idle"."""
+    time: float
+    """Sample time the gesture was recognized at (host ``perf_counter()``)."""
+    angle_deg: float
+    """Angle at that time."""
+    velocity_dps: float
+    """Signed velocity: the peak for flicks and flings, the new direction's
+    speed for reversals, 0 for holds and idle."""
+    distance_deg: float
+    """Signed travel of the motion (reversals: of the move before turning
+    back; holds: offset from center_deg)."""
+    duration_s: float
+    """Length of the motion, hold or rest so far."""
+
+
+_NO_GESTURES: tuple[Gesture, ...] = ()
+
+
+class GestureRecognizer:
+    """
+    Constant-time gesture state machine over ``(angle, time)`` samples.
+
+    Attributes:
+        params: Validated config (all GESTURE_KEYS).
+        center_deg: Reference angle for holds (the spring center).
+        speed_dps: Current smoothed speed estimate (signed).
+    """
+
+    __slots__ = (
+        "params", "center_deg", "speed_dps", "_tau", "_move", "_t", "_angle",
+        "_seg_dir", "_seg_t", "_seg_angle", "_seg_peak", "_seg_flung",
+        "_prev_dir", "_prev_travel", "_prev_end",
+        "_rest_since", "_idle_sent", "_hold_since", "_hold_next",
+    )
+
+    def __init__(self, config: dict | None = None, center_deg: float = 0.0) -> None:
+        """
+        Args:
+            config: Gesture config (see module docstring); None = defaults.
+            center_deg: Reference angle for holds.
+
+        Raises:
+            ValueError: Unknown key or negative / non-numeric value
+        """
+        self.params = validate_gestures(config or {})
+        self._tau = self.params["velocity_tau_s"]
+        self._move = self.params["move_dps"]
+        self.center_deg = center_deg
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the motion state (call after a seek or a link change)."""
+        self.speed_dps = 0.0
+        self._t: Optional[float] = None
+        self._angle = 0.0
+        self._seg_dir = 0
+        self._seg_t = self._seg_angle = self._seg_peak = 0.0
+        self._seg_flung = False
+        self._prev_dir = 0
+        self._prev_travel = 0.0
+        self._prev_end = -math.inf
+        self._rest_since: Optional[float] = None
+        self._idle_sent = False
+        self._hold_since: Optional[float] = None
+        self._hold_next = 0.0
+
+    # ------------------------------------------------------------------ #
+    #  Inputs
+    # ------------------------------------------------------------------ #
+
+    def update(self, angle_deg: float, t: float) -> tuple[Gesture, ...]:
+        """Feed one position report taken at *t* (seconds).
+
+        Returns:
+            tuple[Gesture, ...]: Gestures recognized by this sample (usually none).
+        """
+        last_t = self._t
+        if last_t is None:
+            self._t, self._angle, self._rest_since = t, angle_deg, t
+            return _NO_GESTURES
+        dt = t - last_t
+        if dt < MIN_DT_S:
+            return _NO_GESTURES  # Same read: the next report spans both
+        velocity = (angle_deg - self._angle) / dt
+        self.speed_dps += dt / (self._tau + dt) * (velocity - self.speed_dps)
+        prev_angle = self._angle
+        self._t, self._angle = t, angle_deg
+        return self._advance(t, last_t, prev_angle)
+
+    def poll(self, now: float) -> tuple[Gesture, ...]:
+        """Advance time without a report (the firmware is silent while still).
+
+        Returns:
+            tuple[Gesture, ...]: Gestures that became due (motion end, hold, idle).
+        """
+        if self._t is None:
+            return _NO_GESTURES
+        if self.speed_dps and now - self._t > STILL_AFTER_S:
+            self.speed_dps = 0.0
+        return self._advance(now, self._t, self._angle)
+
+    # ------------------------------------------------------------------ #
+    #  State machine
+    # ------------------------------------------------------------------ #
+
+    def _advance(self, t: float, from_t: float, from_angle: float) -> tuple[Gesture, ...]:
+        v = self.speed_dps
+        speed = abs(v)
+        events = _NO_GESTURES
+        if speed >= self._move:
+            direction = 1 if v > 0 else -1
+            if direction != self._seg_dir:
+                if self._seg_dir:
+                    events = self._end_motion()
+                events += self._start_motion(direction, from_t, from_angle)
+            self._rest_since = self._hold_since = None
+            if speed > self._seg_peak:
+                self._seg_peak = speed
+            elif (not self._seg_flung and self._seg_peak >= self.params["fling_dps"]
+                    and speed < RELEASE_RATIO * self._seg_peak):
+                self._seg_flung = True
+                events += (Gesture("fling", t, self._angle, direction * self._seg_peak,
+                                   self._angle - self._seg_angle, t - self._seg_t),)
+            return events
+
+        # Resting (or creeping below move_dps)
+        if self._seg_dir:
+            events = self._end_motion()
+        if self._rest_since is None:
+            self._rest_since, self._idle_sent = t, False
+        p = self.params
+        if p["idle_s"] and not self._idle_sent and t - self._rest_since >= p["idle_s"]:
+            self._idle_sent = True
+            events += (Gesture("idle", t, self._angle, 0.0, 0.0, t - self._rest_since),)
+        if p["hold_offset_deg"]:
+            offset = self._angle - self.center_deg
+            if abs(offset) < p["hold_offset_deg"]:
+                self._hold_since = None
+            elif self._hold_since is None:
+                self._hold_since, self._hold_next = t, t + p["hold_s"]
+            elif t >= self._hold_next:
+                self._hold_next = t + p["hold_repeat_s"] if p["hold_repeat_s"] else math.inf
+                events += (Gesture("hold", t, self._angle, 0.0, offset, t - self._hold_since),)
+        return events
+
+    def _start_motion(self, direction: int, t: float, angle: float) -> tuple[Gesture, ...]:
+        p = self.params
+        reversal = (self._prev_dir == -direction and self._prev_travel >= p["reversal_deg"]
+                    and t - self._prev_end <= p["reversal_gap_s"])
+        self._seg_dir, self._seg_t, self._seg_angle = direction, t, angle
+        self._seg_peak, self._seg_flung = 0.0, False
+        if not reversal:
+            return _NO_GESTURES
+        return (Gesture("reversal", self._t, self._angle, self.speed_dps,
+                        -direction * self._prev_travel, self._t - self._prev_end),)
+
+    def _end_motion(self) -> tuple[Gesture, ...]:
+        # The motion ended at the last report (poll() may run well after it)
+        end = self._t
+        travel = self._angle - self._seg_angle
+        duration = end - self._seg_t
+        direction = self._seg_dir
+        self._prev_dir, self._prev_travel, self._prev_end = direction, abs(travel), end
+        self._seg_dir = 0
+        p = self.params
+        if self._seg_flung or self._seg_peak < p["flick_dps"] or duration > p["flick_max_s"]:
+            return _NO_GESTURES
+        return (Gesture("flick", end, self._angle, direction * self._seg_peak, travel, duration),)
+
+
+def validate_gestures(config: dict) -> dict:
+    """
+    Check a gesture config and fill in defaults.
+
+    Returns:
+        dict: All GESTURE_KEYS with numeric values.
+
+    Raises:
+        ValueError: Unknown key, non-numeric or out-of-range value
+    """
+    if not isinstance(config, dict):
+        raise ValueError(f"Gesture config must be an object, got {config!r}")
+    unknown = set(config) - set(GESTURE_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown gesture keys: {', '.join(sorted(unknown))}")
+    params = dict(GESTURE_KEYS)
+    for key, value in config.items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"Gesture {key} must be a non-negative number, got {value!r}")
+        params[key] = float(value)
+    if params["velocity_tau_s"] <= 0.0 or params["move_dps"] <= 0.0:
+        raise ValueError("Gesture velocity_tau_s and move_dps must be > 0")
+    return params
+
+
+def load_preset_gestures(path: Path | str) -> dict[str, dict]:
+    """
+    Read gesture configs from a presets.json file.
+
+    Returns:
+        dict: {preset_name: gesture_config} for presets with a "gestures"
+              entry. Invalid configs are reported as ValueError.
+    """
+    with open(path, encoding="utf-8") as f:
+        presets = json.load(f).get("presets", {})
+
+    gestures = {}
+    for name, preset in presets.items():
+        config = preset.get("gestures")
+        if config is None:
+            continue
+        validate_gestures(config)
+        gestures[name] = config
+    return gestures
+
+
+# ======================== Traces & Benchmark ========================
+
+
+def replay(
+    trace: list[tuple[float, float]],
+    config: dict | None = None,
+    report_threshold_deg: float = 0.5,
+    poll_s: float = 0.1,
+    center_deg: float = 0.0,
+) -> list[Gesture]:
+    """
+    Run a recognizer over a ``(time_s, angle_deg)`` trace the way the driver
+    does: only reports that moved *report_threshold_deg* reach ``update()``
+    (the firmware's change filter), and ``poll()`` runs after every
+    *poll_s* of silence (the reader's read timeout).
+
+    Returns:
+        list[Gesture]: Everything recognized, in order.
+    """
+    rec = GestureRecognizer(config, center_deg)
+    out: list[Gesture] = []
+    last_angle: Optional[float] = None
+    last_t = None
+    for t, angle in trace:
+        if last_t is not None:
+            quiet = last_t + poll_s
+            while quiet < t:
+                out += rec.poll(quiet)
+                quiet += poll_s
+        if last_angle is not None and abs(angle - last_angle) < report_threshold_deg:
+            continue
+        out += rec.update(angle, t)
+        last_angle, last_t = angle, t
+    if trace:
+        end = trace[-1][0]
+        quiet = last_t + poll_s
+        while quiet <= end + poll_s:
+            out += rec.poll(quiet)
+            quiet += poll_s
+    return out
+
+
+def synthetic_traces(rate_hz: float = 500.0, seed: int = 1) -> dict[str, tuple[list, dict, set[str]]]:
+    """
+    Noisy traces with the config to run them with and the gestures each
+    should produce.
+
+    - rest: resting on a detent with sensor noise (idle only)
+    - slow_turn: 40° over 4 s (too slow for anything but idle)
+    - flick: 20° in 0.12 s, then rest
+    - fling: 720° spin, coasting to a stop
+    - reversal: 40° out and straight back
+    - hold: pushed to 35° on a spring (holds on at 25°), held for 1.5 s
+
+    Returns:
+        dict: {name: (trace, config, expected gesture kinds)}
+    """
+    import random
+
+    rng = random.Random(seed)
+
+    def trace(duration_s, shape, noise_deg=0.1):
+        return synthesize(duration_s, shape, rate_hz, noise_deg, rng)
+
+    spring = {"hold_offset_deg": 25.0}
+    return {
+        "rest": (trace(4.0, lambda t: 12.0), {}, {"idle"}),
+        "slow_turn": (trace(8.0, lambda t: 40.0 * ramp(t, 1.0, 5.0) - 20.0), {}, {"idle"}),
+        "flick": (trace(4.0, lambda t: 20.0 * smooth(t, 0.5, 0.62)), {}, {"flick", "idle"}),
+        "fling": (trace(4.0, lambda t: 720.0 * (1 - (1 - ramp(t, 0.5, 1.3)) ** 3)), {}, {"fling", "idle"}),
+        "reversal": (trace(4.0, lambda t: 40.0 * (smooth(t, 0.5, 0.8) - smooth(t, 0.85, 1.15))), {},
+                     {"reversal", "idle"}),
+        "hold": (trace(5.0, lambda t: 35.0 * smooth(t, 0.3, 0.9) * (t < 2.4)), spring, {"hold", "idle"}),
+    }
+
+
+def benchmark(traces: dict | None = None) -> dict:
+    """
+    Recognize the synthetic (or recorded) traces and time ``update()``.
+
+    Args:
+        traces: {name: (trace, config, expected kinds or None)} (default:
+                synthetic_traces(); recorded traces via smartknob.traces.load_trace()).
+
+    Returns:
+        dict: {trace: {"gestures": {kind: count}, "expected": set | None,
+              "ok": bool | None}} plus "ns_per_update".
+    """
+    traces = traces or synthetic_traces()
+    results = {}
+    for name, (trace, config, expected) in traces.items():
+        counts: dict[str, int] = {}
+        for g in replay(trace, config):
+            counts[g.kind] = counts.get(g.kind, 0) + 1
+        results[name] = {
+            "gestures": counts,
+            "expected": expected,
+            "ok": None if expected is None else set(counts) == expected,
+        }
+
+    # Raw per-report cost: a fast sine sweep, every sample reported
+    rec = GestureRecognizer({"hold_offset_deg": 25.0})
+    samples = [(i * 0.002, 90.0 * math.sin(i * 0.01)) for i in range(200_000)]
+    _, elapsed = timed(rec.update, samples)
+    results["ns_per_update"] = elapsed / len(samples) * 1e9
+    return results
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    import sys
+
+    recorded = {name: (trace, {}, None) for name, trace in load_traces(sys.argv[1:]).items()} or None
+    r = benchmark(recorded)
+    print(f"update(): {r.pop('ns_per_update'):.0f} ns/report")
+    for name, x in r.items():
+        found = ", ".join(f"{k} ×{n}" for k, n in sorted(x["gestures"].items())) or "none"
+        check = "" if x["ok"] is None else ("  ok" if x["ok"] else f"  MISMATCH (expected {sorted(x['expected'])})")
+        print(f"{name:>10}: {found}{check}")
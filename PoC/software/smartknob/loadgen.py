@@ -0,0 +1,688 @@
+"""Synthetic serial load for stress-testing the host stack (Linux/macOS).
+
+``LoadGenerator`` writes scripted firmware traffic into a pty — position
+reports, acks, info text and state dumps — at configurable rates and
+burst sizes, with optional corruption, and answers host commands (``Q``
+with a state dump, everything else with ``A:<cmd>``). ``run_scenario()``
+connects a ``SmartKnobDriver`` to it, hands positions to a stand-in Tk
+loop the way the GUI does (``root.after``), and reports:
+
+    sent      lines by kind, corrupted lines, achieved vs target rate
+    driver    lines / positions / acks / parse errors seen, positions lost,
+              serial input backlog and line queueing delay
+    gui       hand-off queue depth, heartbeat latency (a ``root.after(0)``
+              tick posted every 50 ms) and how long the backlog took to
+              drain after the load stopped
+    memory    process RSS at start, peak and end
+
+Scenarios are plain dicts (or a JSON file of them)::
+
+    {
+      "name": "inertia_spin",
+      "consumer_cost_ms": 1.0,            # Tk-side work per position
+      "phases": [
+        {
+          "duration_s": 3.0,
+          "rate_hz": 1000,                # Lines per second
+          "burst": 8,                     # Lines per write (USB packets)
+          "mix": {"position": 1.0},       # position / ack / info / state weights
+          "motion": {"type": "spin", "velocity_dps": 2000, "decay_s": 1.5},
+          "corrupt": {"partial": 0.01, "bad_float": 0.01, "garbage": 0.001},
+          "host": {"command": "Q", "rate_hz": 100}
+        }
+      ]
+    }
+
+Motions: ``spin`` (velocity_dps, optional decay_s — an inertia fling),
+``sine`` (amplitude_deg, freq_hz), ``still`` (angle_deg, noise_deg).
+Corruption: ``partial`` drops the end of a line and its newline (the next
+line is lost with it), ``bad_float`` sends unparsable numbers such as
+``P12.3.4``, ``garbage`` sends a line of UART noise.
+
+Usage:
+    from smartknob.loadgen import SCENARIOS, run_scenario
+
+    report = run_scenario(SCENARIOS["inertia_spin"])
+
+    # or: smartknob loadgen inertia_spin corrupt
+    #     smartknob loadgen --serve ack_storm   (point the real GUI at the port)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import queue
+import random
+import select
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LINE_KINDS: tuple[str, ...] = ("position", "ack", "info", "state")
+
+MOTIONS: dict[str, dict[str, float]] = {
+    "spin": {"velocity_dps": 720.0, "decay_s": 0.0},
+    "sine": {"amplitude_deg": 60.0, "freq_hz": 0.5},
+    "still": {"angle_deg": 0.0, "noise_deg": 0.05},
+}
+"""Motion types with their parameter defaults."""
+
+CORRUPTIONS: tuple[str, ...] = ("partial", "bad_float", "garbage")
+
+PHASE_DEFAULTS: dict = {
+    "duration_s": 2.0,
+    "rate_hz": 50.0,
+    "burst": 1,
+    "mix": {"position": 1.0},
+    "motion": {"type": "sine"},
+    "corrupt": {},
+    "host": None,
+}
+
+HEARTBEAT_S: float = 0.05
+"""Interval of the simulated GUI heartbeat."""
+
+DRAIN_TIMEOUT_S: float = 10.0
+"""Longest wait for the host to catch up after the load stops."""
+
+# Replies the firmware sends (comms.cpp), used for the "ack" and "info" kinds
+_ACK_SAMPLES = ("A:S36", "A:D1.50", "A:B1.00", "A:F0.20", "A:H", "A:I", "A:E12.5", "A:MVL40.0")
+_INFO_SAMPLES = ("Mode: HAPTIC", "Detent count: 36", "Motor enabled", "Unknown command", "PID tuned")
+_BAD_FLOATS = ("P12.3.4", "P1-2", "P9e", "P0..5", "P-1e+")
+
+SCENARIOS: dict[str, dict] = {
+    "steady": {
+        "description": "Firmware default reporting (50 Hz) while the knob is swept by hand",
+        "phases": [{"duration_s": 3.0, "rate_hz": 50, "motion": {"type": "sine", "amplitude_deg": 90}}],
+    },
+    "inertia_spin": {
+        "description": "Fling in inertia mode: 1 kHz reports in 8-line USB packets, decaying spin",
+        "consumer_cost_ms": 1.0,
+        "phases": [
+            {"duration_s": 3.0, "rate_hz": 1000, "burst": 8,
+             "motion": {"type": "spin", "velocity_dps": 2000, "decay_s": 1.5}},
+        ],
+    },
+    "q_flood": {
+        "description": "Host polls the state (Q) at 200 Hz while positions stream at 50 Hz",
+        "phases": [
+            {"duration_s": 3.0, "rate_hz": 50, "motion": {"type": "sine"},
+             "host": {"command": "Q", "rate_hz": 200}},
+        ],
+    },
+    "ack_storm": {
+        "description": "Slider drag: parameter commands at 500 Hz, each acked, plus unsolicited acks",
+        "phases": [
+            {"duration_s": 3.0, "rate_hz": 1000, "burst": 4,
+             "mix": {"position": 0.3, "ack": 0.7}, "motion": {"type": "sine"},
+             "host": {"command": "D1.50", "rate_hz": 500}},
+        ],
+    },
+    "corrupt": {
+        "description": "Noisy cable: partial lines, invalid floats, UART garbage and info text",
+        "phases": [
+            {"duration_s": 3.0, "rate_hz": 500, "burst": 2,
+             "mix": {"position": 0.9, "info": 0.05, "ack": 0.05},
+             "motion": {"type": "spin", "velocity_dps": 360},
+             "corrupt": {"partial": 0.02, "bad_float": 0.02, "garbage": 0.005}},
+        ],
+    },
+    "overload": {
+        "description": "Positions faster than the Tk side can process them (3 ms per update)",
+        "consumer_cost_ms": 3.0,
+        "phases": [
+            {"duration_s": 2.0, "rate_hz": 50},
+            {"duration_s": 2.0, "rate_hz": 1000, "burst": 8,
+             "motion": {"type": "spin", "velocity_dps": 1000}},
+            {"duration_s": 1.0, "rate_hz": 50, "motion": {"type": "still"}},
+        ],
+    },
+}
+"""Built-in scenarios."""
+
+
+# ======================== Scenarios ========================
+
+
+def _check_number(where: str, key: str, value, minimum: float = 0.0) -> float:
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value < minimum:
+        raise ValueError(f"{where}: {key} must be a number >= {minimum}, got {value!r}")
+    return float(value)
+
+
+def validate_scenario(scenario: dict, name: str = "scenario") -> dict:
+    """
+    Check a scenario and fill in phase defaults.
+
+    Returns:
+        dict: ``name``, ``description``, ``consumer_cost_ms`` and fully
+              populated ``phases``.
+
+    Raises:
+        ValueError: Unknown key, kind, motion or corruption, or a bad value
+    """
+    if not isinstance(scenario, dict):
+        raise ValueError(f"{name}: scenario must be an object, got {scenario!r}")
+    unknown = set(scenario) - {"name", "description", "consumer_cost_ms", "phases"}
+    if unknown:
+        raise ValueError(f"{name}: unknown keys: {', '.join(sorted(unknown))}")
+    name = scenario.get("name", name)
+    phases = scenario.get("phases")
+    if not isinstance(phases, list) or not phases:
+        raise ValueError(f"{name}: phases must be a non-empty list")
+
+    result = {
+        "name": name,
+        "description": scenario.get("description", ""),
+        "consumer_cost_ms": _check_number(name, "consumer_cost_ms", scenario.get("consumer_cost_ms", 0.0)),
+        "phases": [],
+    }
+    for i, raw in enumerate(phases):
+        where = f"{name} phase {i}"
+        if not isinstance(raw, dict):
+            raise ValueError(f"{where}: must be an object")
+        unknown = set(raw) - set(PHASE_DEFAULTS)
+        if unknown:
+            raise ValueError(f"{where}: unknown keys: {', '.join(sorted(unknown))}")
+        phase = {**PHASE_DEFAULTS, **raw}
+        phase["duration_s"] = _check_number(where, "duration_s", phase["duration_s"])
+        phase["rate_hz"] = _check_number(where, "rate_hz", phase["rate_hz"], 0.1)
+        phase["burst"] = int(_check_number(where, "burst", phase["burst"], 1))
+
+        mix = phase["mix"]
+        if not isinstance(mix, dict) or set(mix) - set(LINE_KINDS):
+            raise ValueError(f"{where}: mix keys must be among {', '.join(LINE_KINDS)}")
+        phase["mix"] = {k: _check_number(where, f"mix.{k}", v) for k, v in mix.items()}
+        if sum(phase["mix"].values()) <= 0:
+            raise ValueError(f"{where}: mix weights must not all be zero")
+
+        motion = dict(phase["motion"])
+        kind = motion.pop("type", "sine")
+        if kind not in MOTIONS:
+            raise ValueError(f"{where}: unknown motion {kind!r} (expected one of {', '.join(MOTIONS)})")
+        if set(motion) - set(MOTIONS[kind]):
+            raise ValueError(f"{where}: {kind} motion takes {', '.join(MOTIONS[kind])}")
+        phase["motion"] = {"type": kind, **MOTIONS[kind],
+                           **{k: _check_number(where, k, v, -math.inf) for k, v in motion.items()}}
+
+        corrupt = phase["corrupt"]
+        if not isinstance(corrupt, dict) or set(corrupt) - set(CORRUPTIONS):
+            raise ValueError(f"{where}: corrupt keys must be among {', '.join(CORRUPTIONS)}")
+        phase["corrupt"] = {k: _check_number(where, f"corrupt.{k}", v) for k, v in corrupt.items()}
+
+        host = phase["host"]
+        if host is not None:
+            if not isinstance(host, dict) or not isinstance(host.get("command"), str) or not host["command"]:
+                raise ValueError(f"{where}: host needs a command string")
+            host = {"command": host["command"],
+                    "rate_hz": _check_number(where, "host.rate_hz", host.get("rate_hz", 10.0), 0.1)}
+        phase["host"] = host
+        result["phases"].append(phase)
+    return result
+
+
+def load_scenarios(path: Path | str) -> dict[str, dict]:
+    """
+    Read scenarios from a JSON file: one scenario object, a list of them,
+    or ``{"scenarios": {name: scenario}}``.
+
+    Returns:
+        dict: {name: validated scenario}
+
+    Raises:
+        ValueError: If any scenario is invalid
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict) and "scenarios" in data:
+        items = list(data["scenarios"].items())
+    elif isinstance(data, list):
+        items = [(s.get("name", f"{Path(path).stem}[{i}]"), s) for i, s in enumerate(data)]
+    else:
+        items = [(data.get("name", Path(path).stem), data)]
+    return {name: validate_scenario(s, name) for name, s in items}
+
+
+def resolve_scenario(name_or_path: str) -> list[dict]:
+    """Built-in scenario by name, or every scenario in a JSON file."""
+    if name_or_path in SCENARIOS:
+        return [validate_scenario(SCENARIOS[name_or_path], name_or_path)]
+    if os.path.exists(name_or_path):
+        return list(load_scenarios(name_or_path).values())
+    raise ValueError(f"No scenario or file {name_or_path!r} (built-in: {', '.join(SCENARIOS)})")
+
+
+# ======================== Generator ========================
+
+
+class LoadGenerator:
+    """Writes scenario traffic into a pty exposed under ``port``.
+
+    Attributes:
+        sent: Lines written by kind, plus ``corrupted``, ``lost`` (valid
+              lines swallowed by a preceding partial line), ``replies``
+              and ``bytes``.
+        valid_positions: Position lines the driver should be able to parse.
+    """
+
+    def __init__(self, link_path: Optional[str] = None, seed: int = 0) -> None:
+        """
+        Args:
+            link_path: Symlink to expose the pty under (default: a temp path).
+            seed: Random seed, for reproducible corruption and mixes.
+
+        Raises:
+            RuntimeError: Platform has no pseudo-terminals (Windows).
+        """
+        if not hasattr(os, "openpty"):
+            raise RuntimeError("LoadGenerator needs pseudo-terminals (Linux/macOS)")
+        self.port = link_path or os.path.join(
+            tempfile.gettempdir(), f"smartknob-load-{os.getpid()}-{id(self):x}"
+        )
+        self._rng = random.Random(seed)
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._rx = bytearray()
+        self._replies: list[bytes] = []
+        self._swallow_next = False
+        self.sent: dict[str, int] = {}
+        self.valid_positions = 0
+        self.elapsed_s = 0.0
+        self._reset_counts()
+
+    def _reset_counts(self) -> None:
+        self.sent = {kind: 0 for kind in LINE_KINDS}
+        self.sent.update(corrupted=0, lost=0, replies=0, bytes=0)
+        self.valid_positions = 0
+
+    def open(self) -> None:
+        """Create the pty and the port symlink."""
+        import termios
+        import tty
+
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        tty.setraw(master)
+        attrs = termios.tcgetattr(slave)
+        attrs[4] = attrs[5] = termios.B115200
+        termios.tcsetattr(slave, termios.TCSANOW, attrs)
+        self._master, self._slave = master, slave
+        if os.path.lexists(self.port):
+            os.unlink(self.port)
+        os.symlink(os.ttyname(slave), self.port)
+
+    def close(self) -> None:
+        """Stop generating and remove the pty."""
+        self.stop()
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+        if os.path.lexists(self.port):
+            os.unlink(self.port)
+
+    def start(self, scenario: dict) -> None:
+        """Play *scenario* (validated or raw) on a background thread."""
+        if self._master is None:
+            self.open()
+        scenario = validate_scenario(scenario)
+        self._reset_counts()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._play, args=(scenario,), daemon=True, name="smartknob-loadgen"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop playing (the pty stays open)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the scenario to finish. Returns False on timeout."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    # ------------------------------------------------------------------ #
+    #  Traffic
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def angle_at(motion: dict, t: float, rng: random.Random) -> float:
+        """Knob angle (deg) *t* seconds into a phase."""
+        kind = motion["type"]
+        if kind == "spin":
+            v, tau = motion["velocity_dps"], motion["decay_s"]
+            return v * tau * (1.0 - math.exp(-t / tau)) if tau > 0 else v * t
+        if kind == "sine":
+            return motion["amplitude_deg"] * math.sin(2 * math.pi * motion["freq_hz"] * t)
+        return motion["angle_deg"] + rng.gauss(0.0, motion["noise_deg"])
+
+    def _line(self, phase: dict, kinds: list[str], weights: list[float], t: float, offset: float) -> str:
+        rng = self._rng
+        kind = rng.choices(kinds, weights)[0] if len(kinds) > 1 else kinds[0]
+        self.sent[kind] += 1
+        if kind == "position":
+            text = f"P{offset + self.angle_at(phase['motion'], t, rng):.2f}\n"
+        elif kind == "ack":
+            text = rng.choice(_ACK_SAMPLES) + "\n"
+        elif kind == "info":
+            text = rng.choice(_INFO_SAMPLES) + "\n"
+        else:
+            text = self._state_dump(offset + self.angle_at(phase["motion"], t, rng))
+
+        corrupt = phase["corrupt"]
+        r = rng.random()
+        swallowed, self._swallow_next = self._swallow_next, False
+        if r < corrupt.get("partial", 0.0):
+            self.sent["corrupted"] += 1
+            self._swallow_next = True  # Glued onto the next line, which is lost too
+            return text[:rng.randint(1, max(1, len(text) - 2))]
+        r -= corrupt.get("partial", 0.0)
+        if kind == "position" and r < corrupt.get("bad_float", 0.0):
+            self.sent["corrupted"] += 1
+            return rng.choice(_BAD_FLOATS) + "\n"
+        r -= corrupt.get("bad_float", 0.0)
+        if r < corrupt.get("garbage", 0.0):
+            self.sent["corrupted"] += 1
+            return bytes(rng.randint(0x80, 0xFF) for _ in range(rng.randint(4, 24))).decode("latin-1") + "\n"
+        if swallowed:
+            self.sent["lost"] += 1
+        elif kind == "position":
+            self.valid_positions += 1
+        return text
+
+    @staticmethod
+    def _state_dump(angle: float) -> str:
+        return (
+            "=== State ===\n"
+            "Mode: HAPTIC\n"
+            f"Position: {angle:.2f} deg\n"
+            "Detent count: 36\n"
+            "Detent strength: 1.50\n"
+        )
+
+    def _handle_input(self) -> None:
+        """Answer host commands: Q → state dump, anything else → A:<cmd>."""
+        try:
+            self._rx += os.read(self._master, 4096)
+        except OSError:
+            return
+        while b"\n" in self._rx:
+            raw, _, rest = self._rx.partition(b"\n")
+            self._rx = bytearray(rest)
+            cmd = raw.decode(errors="replace").strip()
+            if not cmd:
+                continue
+            reply = self._state_dump(0.0) if cmd == "Q" else f"A:{cmd}\n"
+            self._replies.append(reply.encode("latin-1"))
+            self.sent["replies"] += 1
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            try:
+                n = os.write(self._master, view)  # Blocks when the host stops reading
+            except BlockingIOError:
+                select.select([], [self._master], [], 0.01)
+                continue
+            view = view[n:]
+        self.sent["bytes"] += len(data)
+
+    def _play(self, scenario: dict) -> None:
+        start = time.perf_counter()
+        offset = 0.0
+        for phase in scenario["phases"]:
+            kinds = [k for k, w in phase["mix"].items() if w > 0]
+            weights = [phase["mix"][k] for k in kinds]
+            burst = phase["burst"]
+            period = burst / phase["rate_hz"]
+            phase_start = time.perf_counter()
+            phase_end = phase_start + phase["duration_s"]
+            next_write = phase_start
+            t = 0.0
+            while not self._stop.is_set():
+                now = time.perf_counter()
+                if now >= phase_end:
+                    break
+                timeout = max(0.0, next_write - now)
+                ready, _, _ = select.select([self._master], [], [], timeout)
+                if ready:
+                    self._handle_input()
+                if self._replies:
+                    replies, self._replies = self._replies, []
+                    self._write(b"".join(replies))
+                if time.perf_counter() < next_write:
+                    continue
+                t = time.perf_counter() - phase_start
+                chunk = "".join(self._line(phase, kinds, weights, t, offset) for _ in range(burst))
+                self._write(chunk.encode("latin-1"))
+                next_write += period
+            if phase["motion"]["type"] == "spin":
+                offset += self.angle_at(phase["motion"], phase["duration_s"], self._rng)
+            if self._stop.is_set():
+                break
+        self.elapsed_s = time.perf_counter() - start
+
+
+# ======================== Runner ========================
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process (None where unavailable)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Peak, KiB on Linux
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run_scenario(scenario: dict, seed: int = 0) -> dict:
+    """Play *scenario* against a ``SmartKnobDriver`` and a stand-in Tk loop.
+
+    Args:
+        scenario: Scenario dict (validated or raw).
+        seed: Random seed for the generator.
+
+    Returns:
+        dict: ``sent``, ``driver``, ``gui`` and ``memory`` sections (see
+              the module docstring).
+    """
+    from smartknob.driver import SmartKnobDriver
+    from smartknob.metrics import MetricsRegistry
+
+    scenario = validate_scenario(scenario)
+    cost_s = scenario["consumer_cost_ms"] / 1e3
+    target_lines = sum(p["rate_hz"] * p["duration_s"] for p in scenario["phases"])
+
+    gen = LoadGenerator(seed=seed)
+    gen.open()
+    registry = MetricsRegistry()
+    knob = SmartKnobDriver()
+    knob.enable_metrics(registry)
+    handoff: queue.Queue = queue.Queue()  # root.after() stand-in
+    counts = {"raw": 0, "processed": 0}
+    ticks: list[float] = []
+
+    knob.on_position = lambda angle: handoff.put(("position", angle))
+    knob.on_raw = lambda line: counts.__setitem__("raw", counts["raw"] + 1)
+
+    def main_loop() -> None:
+        while True:
+            kind, value = handoff.get()
+            if kind == "stop":
+                return
+            if kind == "tick":
+                ticks.append(time.perf_counter() - value)
+                continue
+            counts["processed"] += 1
+            end = time.perf_counter() + cost_s
+            while time.perf_counter() < end:
+                pass
+
+    samples: dict[str, list] = {"queue": [], "rx": [], "rss": []}
+    sampling = threading.Event()
+
+    def sampler() -> None:
+        next_tick = time.perf_counter()
+        while not sampling.wait(0.01):
+            samples["queue"].append(handoff.qsize())
+            samples["rx"].append(knob._rx_buffered())
+            rss = _rss_bytes()
+            if rss is not None:
+                samples["rss"].append(rss)
+            now = time.perf_counter()
+            if now >= next_tick:
+                handoff.put(("tick", now))
+                next_tick = now + HEARTBEAT_S
+
+    def host_commands() -> None:
+        for phase in scenario["phases"]:
+            host = phase["host"]
+            end = time.perf_counter() + phase["duration_s"]
+            if host is None:
+                sampling.wait(max(0.0, end - time.perf_counter()))
+                continue
+            period = 1.0 / host["rate_hz"]
+            next_send = time.perf_counter()
+            while not sampling.is_set() and time.perf_counter() < end:
+                knob.send_raw(host["command"])
+                next_send += period
+                sampling.wait(max(0.0, next_send - time.perf_counter()))
+
+    rss_start = _rss_bytes()
+    consumer = threading.Thread(target=main_loop, name="tk-mainloop (simulated)")
+    consumer.start()
+    knob.connect(gen.port)
+    watcher = threading.Thread(target=sampler, daemon=True, name="smartknob-loadgen-sampler")
+    watcher.start()
+    gen.start(scenario)
+    commander = threading.Thread(target=host_commands, daemon=True, name="smartknob-loadgen-host")
+    commander.start()
+    try:
+        gen.wait()
+        load_end = time.perf_counter()
+        # Drain: until the driver stops seeing lines and the Tk queue is empty
+        lines = None
+        deadline = load_end + DRAIN_TIMEOUT_S
+        while time.perf_counter() < deadline:
+            time.sleep(0.05)
+            now_lines = registry.snapshot().get("smartknob_lines_total", 0)
+            if now_lines == lines and handoff.qsize() == 0 and knob._rx_buffered() == 0:
+                break
+            lines = now_lines
+        drain_s = time.perf_counter() - load_end
+    finally:
+        sampling.set()
+        commander.join(timeout=1.0)
+        watcher.join(timeout=1.0)
+        knob.disconnect()
+        handoff.put(("stop", None))
+        consumer.join()
+        gen.close()
+
+    snap = registry.snapshot()
+    queue_wait = snap.get("smartknob_line_queue_seconds", {})
+    positions = snap.get("smartknob_positions_total", 0)
+    sent_lines = sum(gen.sent[k] for k in LINE_KINDS)
+    return {
+        "scenario": scenario["name"],
+        "sent": {
+            **gen.sent,
+            "lines": sent_lines,
+            "valid_positions": gen.valid_positions,
+            "target_rate_hz": target_lines / max(1e-9, sum(p["duration_s"] for p in scenario["phases"])),
+            "achieved_rate_hz": sent_lines / max(1e-9, gen.elapsed_s),
+        },
+        "driver": {
+            "lines": snap.get("smartknob_lines_total", 0),
+            "positions": positions,
+            "acks": snap.get("smartknob_acks_total", 0),
+            "raw": counts["raw"],
+            "parse_errors": snap.get("smartknob_parse_errors_total", 0),
+            "lost_positions": max(0, gen.valid_positions - positions),
+            "rx_backlog_max_bytes": max(samples["rx"], default=0),
+            "line_queue_p99_ms": queue_wait.get("p99", 0.0) * 1e3 if isinstance(queue_wait, dict) else 0.0,
+        },
+        "gui": {
+            "processed": counts["processed"],
+            "queue_max": max(samples["queue"], default=0),
+            "heartbeat_p50_ms": _percentile(ticks, 0.5) * 1e3,
+            "heartbeat_p99_ms": _percentile(ticks, 0.99) * 1e3,
+            "heartbeat_max_ms": max(ticks, default=0.0) * 1e3,
+            "drain_s": drain_s,
+        },
+        "memory": {
+            "rss_start_mb": (rss_start or 0) / 2**20,
+            "rss_peak_mb": max(samples["rss"], default=0) / 2**20,
+            "rss_end_mb": (_rss_bytes() or 0) / 2**20,
+        },
+    }
+
+
+def format_report(report: dict) -> str:
+    """Human-readable multi-line summary of a ``run_scenario()`` report."""
+    s, d, g, m = report["sent"], report["driver"], report["gui"], report["memory"]
+    return "\n".join([
+        f"== {report['scenario']} ==",
+        f"  sent    {s['lines']} lines ({s['position']} pos, {s['ack']} ack, {s['info']} info, "
+        f"{s['state']} state, {s['replies']} replies), {s['corrupted']} corrupted, {s['lost']} lost to partials; "
+        f"{s['achieved_rate_hz']:.0f}/{s['target_rate_hz']:.0f} lines/s",
+        f"  driver  {d['lines']} lines, {d['positions']} positions, {d['acks']} acks, {d['raw']} raw, "
+        f"{d['parse_errors']} parse errors, {d['lost_positions']} positions lost; "
+        f"backlog max {d['rx_backlog_max_bytes']} B, line queue p99 {d['line_queue_p99_ms']:.2f} ms",
+        f"  gui     {g['processed']} processed, queue max {g['queue_max']}; heartbeat p50 "
+        f"{g['heartbeat_p50_ms']:.1f} ms, p99 {g['heartbeat_p99_ms']:.1f} ms, max {g['heartbeat_max_ms']:.1f} ms; "
+        f"drained in {g['drain_s']:.2f} s",
+        f"  memory  RSS {m['rss_start_mb']:.1f} → peak {m['rss_peak_mb']:.1f} → {m['rss_end_mb']:.1f} MiB",
+    ])
+
+
+def serve(scenario: dict, link_path: Optional[str] = None, seed: int = 0) -> None:
+    """Play *scenario* in a loop on a pty for an external client (e.g. the GUI).
+
+    Runs until interrupted.
+    """
+    gen = LoadGenerator(link_path, seed)
+    gen.open()
+    print(f"Load on {gen.port} — connect the GUI to it; Ctrl+C to stop")
+    try:
+        while True:
+            gen.start(scenario)
+            gen.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gen.close()
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    for name in SCENARIOS:
+        print(format_report(run_scenario(resolve_scenario(name)[0])))
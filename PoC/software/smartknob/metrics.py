@@ -0,0 +1,453 @@
+"""Lightweight hot-path metrics: counters, gauges and latency histograms.
+
+Instruments are created once from a ``MetricsRegistry`` and then updated
+from any thread without locks: each thread writes to its own shard
+(``threading.local``), and ``snapshot()`` merges the shards when someone
+asks. Histograms use HDR-style log-linear buckets over whole microseconds
+— exact below 32 µs, then 16 buckets per power of two (≤ 6.25 % error) up
+to ~134 s — so recording is an ``int()``, a ``bit_length()`` and two
+list increments, with fixed memory per thread.
+
+Nothing is recorded unless metrics are enabled: instrumented code keeps a
+``None`` reference and tests it once per call.
+
+Exposed as:
+- ``MetricsRegistry.snapshot()`` (``SmartKnobDriver.stats()``)
+- ``MetricsLogger`` — one summary log line every N seconds
+- ``PrometheusServer`` — text exposition format on a local HTTP port
+
+Usage:
+    registry = knob.enable_metrics(log_interval_s=10, prometheus_port=9464)
+    knob.stats()["metrics"]["smartknob_lines_total"]
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+SUB_BITS: int = 5
+"""Buckets are exact below 2**SUB_BITS µs, then 2**(SUB_BITS-1) per octave."""
+
+NUM_BUCKETS: int = 384
+"""Covers up to 2**27 µs (~134 s); larger values land in the last bucket."""
+
+_SUM = NUM_BUCKETS       # Shard slot holding the sum of recorded seconds
+_MAX = NUM_BUCKETS + 1   # Shard slot holding the largest recorded value
+
+QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99, 0.999)
+"""Quantiles reported for every histogram."""
+
+DEFAULT_PROMETHEUS_PORT: int = 9464
+
+
+def _key(name: str, labels: dict[str, str]) -> str:
+    if not labels:
+        return name
+    inner = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+    return f"{name}{{{inner}}}"
+
+
+def bucket_index(us: int) -> int:
+    """Histogram bucket for a value in whole microseconds."""
+    if us < 32:
+        return us if us > 0 else 0
+    shift = us.bit_length() - SUB_BITS
+    i = (shift << 4) + (us >> shift)
+    return i if i < NUM_BUCKETS else NUM_BUCKETS - 1
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """``[low, high)`` microseconds covered by bucket *index*."""
+    if index < 32:
+        return index, index + 1
+    shift = (index >> 4) - 1
+    m = index - (shift << 4)
+    return m << shift, (m + 1) << shift
+
+
+# ======================== Instruments ========================
+
+
+class _Sharded:
+    """Per-thread shards registered in a list for merging."""
+
+    __slots__ = ("name", "help", "labels", "_local", "_shards", "_lock")
+
+    def __init__(self, name: str, help: str, labels: dict[str, str]) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._local = threading.local()
+        self._shards: list[list] = []
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> list:
+        shard = self._empty()
+        self._local.shard = shard
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+
+    def _empty(self) -> list:
+        raise NotImplementedError
+
+
+class Counter(_Sharded):
+    """Monotonic count (lines read, parse failures, ...)."""
+
+    __slots__ = ()
+
+    def _empty(self) -> list:
+        return [0]
+
+    def inc(self, n: int = 1) -> None:
+        """Add *n* (thread-safe, lock-free)."""
+        try:
+            self._local.shard[0] += n
+        except AttributeError:
+            self._new_shard()[0] += n
+
+    @property
+    def value(self) -> int:
+        """Total over all threads."""
+        return sum(s[0] for s in list(self._shards))
+
+
+class Histogram(_Sharded):
+    """Latency distribution in seconds with HDR-style buckets."""
+
+    __slots__ = ()
+
+    def _empty(self) -> list:
+        shard: list = [0] * (NUM_BUCKETS + 2)
+        shard[_SUM] = 0.0
+        shard[_MAX] = 0.0
+        return shard
+
+    def record(self, seconds: float) -> None:
+        """Add one observation (thread-safe, lock-free)."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[bucket_index(int(seconds * 1e6))] += 1
+        shard[_SUM] += seconds
+        if seconds > shard[_MAX]:
+            shard[_MAX] = seconds
+
+    def merged(self) -> list:
+        """Bucket counts plus sum and max, merged over all threads."""
+        total = self._empty()
+        for shard in list(self._shards):
+            for i in range(NUM_BUCKETS):
+                total[i] += shard[i]
+            total[_SUM] += shard[_SUM]
+            total[_MAX] = max(total[_MAX], shard[_MAX])
+        return total
+
+    def summary(self) -> dict:
+        """count, sum, mean, max and QUANTILES (all in seconds)."""
+        merged = self.merged()
+        count = sum(merged[:NUM_BUCKETS])
+        result = {
+            "count": count,
+            "sum": merged[_SUM],
+            "mean": merged[_SUM] / count if count else 0.0,
+            "max": merged[_MAX],
+        }
+        targets = [(q, q * count) for q in QUANTILES]
+        seen = 0
+        t = 0
+        for i in range(NUM_BUCKETS):
+            seen += merged[i]
+            while t < len(targets) and seen >= targets[t][1] and seen > 0:
+                low, high = bucket_bounds(i)
+                result[f"p{targets[t][0] * 100:g}"] = min((low + high) / 2e6, merged[_MAX])
+                t += 1
+        for q, _ in targets[t:]:
+            result[f"p{q * 100:g}"] = 0.0
+        return result
+
+
+class Gauge:
+    """Current value computed on demand (queue depths, buffered bytes, ...)."""
+
+    __slots__ = ("name", "help", "labels", "fn")
+
+    def __init__(self, name: str, help: str, labels: dict[str, str], fn: Callable[[], float]) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.fn = fn
+
+    @property
+    def value(self) -> float:
+        try:
+            return float(self.fn())
+        except Exception:  # noqa: BLE001 — a gauge must never break a scrape
+            return float("nan")
+
+
+# ======================== Registry ========================
+
+
+class MetricsRegistry:
+    """Named instruments, get-or-create by name and labels."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, object] = {}
+
+    def _get(self, cls, name: str, help: str, labels: dict[str, str], *args):
+        key = _key(name, labels)
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = cls(name, help, labels, *args)
+                self._metrics[key] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {key} already registered as {type(metric).__name__}")
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels: str) -> Counter:
+        """Get or create a counter (Prometheus names end in ``_total``)."""
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", **labels: str) -> Histogram:
+        """Get or create a latency histogram (values in seconds)."""
+        return self._get(Histogram, name, help, labels)
+
+    def gauge(self, name: str, fn: Callable[[], float], help: str = "", **labels: str) -> Gauge:
+        """Register (or replace) a gauge computed by *fn* at snapshot time."""
+        key = _key(name, labels)
+        gauge = Gauge(name, help, labels, fn)
+        with self._lock:
+            self._metrics[key] = gauge
+        return gauge
+
+    def remove(self, metric) -> None:
+        """Unregister *metric* (e.g. a gauge whose source went away)."""
+        with self._lock:
+            self._metrics.pop(_key(metric.name, metric.labels), None)
+
+    def snapshot(self) -> dict:
+        """``{key: value}`` for counters/gauges and ``{key: summary}`` for histograms."""
+        with self._lock:
+            items = list(self._metrics.items())
+        result = {}
+        for key, metric in sorted(items):
+            if isinstance(metric, Histogram):
+                result[key] = metric.summary()
+            else:
+                result[key] = metric.value
+        return result
+
+    def prometheus_text(self) -> str:
+        """Text exposition format (histograms as summaries with quantiles)."""
+        with self._lock:
+            items = sorted(self._metrics.items())
+        lines: list[str] = []
+        described: set[str] = set()
+        for _, metric in items:
+            name = metric.name
+            if name not in described:
+                described.add(name)
+                kind = {Counter: "counter", Histogram: "summary", Gauge: "gauge"}[type(metric)]
+                if metric.help:
+                    lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {kind}")
+            if isinstance(metric, Histogram):
+                s = metric.summary()
+                for q in QUANTILES:
+                    labels = dict(metric.labels, quantile=f"{q:g}")
+                    lines.append(f"{_key(name, labels)} {s[f'p{q * 100:g}']:.9g}")
+                lines.append(f"{_key(name + '_sum', metric.labels)} {s['sum']:.9g}")
+                lines.append(f"{_key(name + '_count', metric.labels)} {s['count']}")
+            else:
+                lines.append(f"{_key(name, metric.labels)} {metric.value:.9g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+"""Default process-wide registry."""
+
+
+# ======================== Reporters ========================
+
+
+class MetricsLogger:
+    """Background thread logging one summary line every *interval_s*.
+
+    Counters are shown as per-second rates over the interval, gauges as
+    values, histograms as p50/p99 in milliseconds (only if they have data).
+    """
+
+    def __init__(self, registry: MetricsRegistry, interval_s: float = 10.0,
+                 log: Optional[logging.Logger] = None) -> None:
+        self.registry = registry
+        self.interval_s = interval_s
+        self.log = log or logger
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last: dict[str, float] = {}
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="smartknob-metrics-log")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def line(self) -> str:
+        """Format the summary line (also advances the rate baseline)."""
+        with self.registry._lock:
+            items = sorted(self.registry._metrics.items())
+        parts = []
+        for key, metric in items:
+            if isinstance(metric, Counter):
+                value = metric.value
+                rate = (value - self._last.get(key, 0)) / self.interval_s
+                self._last[key] = value
+                parts.append(f"{key}={value} ({rate:.1f}/s)")
+            elif isinstance(metric, Histogram):
+                s = metric.summary()
+                if s["count"]:
+                    parts.append(f"{key} p50={s['p50'] * 1e3:.3f}ms p99={s['p99'] * 1e3:.3f}ms")
+            else:
+                parts.append(f"{key}={metric.value:g}")
+        return "metrics: " + ", ".join(parts)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.log.info(self.line())
+
+
+class PrometheusServer:
+    """Serve ``registry.prometheus_text()`` at ``http://host:port/metrics``.
+
+    Binds to localhost by default; the endpoint is meant for a local
+    scraper, not the network.
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int = DEFAULT_PROMETHEUS_PORT,
+                 host: str = "127.0.0.1") -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Bind and serve on a daemon thread (port 0 picks a free port)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 — http.server API
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug("prometheus: " + format, *args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True, name="smartknob-metrics-http"
+        )
+        self._thread.start()
+        logger.info("Prometheus metrics on http://%s:%d/metrics", self.host, self.port)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(n: int = 200_000, threads: int = 4) -> dict:
+    """Per-call cost of the instruments and a multi-thread consistency check.
+
+    Returns:
+        dict: ns per disabled check / counter inc / histogram record, and
+              whether counts from *threads* concurrent writers add up.
+    """
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total")
+    hist = registry.histogram("bench_seconds")
+    values = [(i % 5000) * 1e-6 for i in range(n)]
+
+    disabled = None
+    t0 = time.perf_counter()
+    for v in values:
+        if disabled is not None:
+            disabled.record(v)
+    base = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for v in values:
+        counter.inc()
+    inc_ns = (time.perf_counter() - t0 - base) / n * 1e9
+
+    t0 = time.perf_counter()
+    for v in values:
+        hist.record(v)
+    record_ns = (time.perf_counter() - t0 - base) / n * 1e9
+
+    def work() -> None:
+        for v in values:
+            counter.inc()
+            hist.record(v)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    summary = hist.summary()
+    return {
+        "disabled_ns": base / n * 1e9,
+        "counter_inc_ns": inc_ns,
+        "histogram_record_ns": record_ns,
+        "consistent": counter.value == n * (threads + 1) and summary["count"] == n * (threads + 1),
+        "p50_us": summary["p50"] * 1e6,
+        "p99_us": summary["p99"] * 1e6,
+        "true_p50_us": sorted(values)[n // 2] * 1e6,
+        "true_p99_us": sorted(values)[int(n * 0.99)] * 1e6,
+    }
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    print(f"Disabled check:   {r['disabled_ns']:.0f} ns")
+    print(f"Counter.inc:      {r['counter_inc_ns']:.0f} ns")
+    print(f"Histogram.record: {r['histogram_record_ns']:.0f} ns")
+    print(f"Concurrent writers consistent: {r['consistent']}")
+    print(f"p50 {r['p50_us']:.0f} µs (true {r['true_p50_us']:.0f}), "
+          f"p99 {r['p99_us']:.0f} µs (true {r['true_p99_us']:.0f})")
@@ -0,0 +1,777 @@
+"""Vectorized model of the firmware haptic torque laws (NumPy).
+
+Mirrors ``PoC/firmware/src/haptics.cpp`` so a ``presets.json`` entry can be
+judged without flashing the board:
+
+    haptic   τ = -detent_strength · sin(detent_count · θ)
+    spring   τ = -spring_stiffness · (θ - spring_center) - spring_damping · ω
+    bounded  detents spread across [bound_min, bound_max]; outside a 2°
+             buffer a wall spring (wall_strength, wall_damping) pushes back
+    inertia  τ = -coupling_K · (θ - virt_pos), with the virtual flywheel
+             integrated every loop (semi-implicit Euler, 1 ms fallback dt)
+
+All torques are motor voltages, which main.cpp clips to ``VOLTAGE_LIMIT``
+before ``motor.move()``. The stateless laws take angle/velocity arrays of
+any (broadcastable) shape; ``simulate_inertia()`` steps the flywheel for a
+whole batch of shaft trajectories at once. Parameters may be scalars or
+arrays broadcasting against the batch, which is how a parameter sweep runs
+many configurations in one call.
+
+``preset_report()`` evaluates every preset on an angle grid (plus a
+velocity grid for the damped laws and a flick for inertia) and flags
+presets whose torque the firmware would clip.
+
+Usage:
+    from smartknob import model
+
+    params = model.HapticParams.from_preset(presets["ZOOM_DIAL"])
+    tau = model.torque("spring", np.radians(angles_deg), 0.0, params)
+    for row in model.preset_report(presets): print(row["flags"])
+
+Requires numpy (``pip install smartknob[model]``); ``plot_presets()``
+also needs matplotlib.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    HAS_MATPLOTLIB = True
+except ImportError:
+    HAS_MATPLOTLIB = False
+
+ArrayLike = Union[float, np.ndarray]
+
+# Firmware constants (PoC/firmware/src/config.h, haptics.cpp)
+VOLTAGE_LIMIT: float = 8.0
+"""Max motor voltage; main.cpp constrains every torque to ±VOLTAGE_LIMIT."""
+
+WALL_BUFFER_RAD: float = math.radians(2.0)
+"""Bounded mode: distance past a bound before the wall engages."""
+
+LOOP_DT_S: float = 0.001
+"""Inertia integrator step (the firmware's fallback dt; its loop runs ~1 kHz)."""
+
+MODES: tuple[str, ...] = ("haptic", "inertia", "spring", "bounded")
+
+DEFAULT_PRESETS_PATH = Path(__file__).resolve().parent.parent / "smartknob_windows" / "config" / "presets.json"
+"""presets.json shipped with smartknob_windows."""
+
+# Evaluation grids for preset_report()
+ANGLE_POINTS: int = 10_000
+HAND_VELOCITY_RAD_S: float = 10.0
+"""Fastest deliberate hand turn considered for damped laws (~570°/s)."""
+
+WALL_PROBE_DEG: float = 10.0
+"""How far past a bound the user is assumed to push into a wall."""
+
+
+@dataclass
+class HapticParams:
+    """
+    Firmware runtime parameters (config.cpp defaults, radians).
+
+    Any field may be a NumPy array to evaluate several configurations in
+    one call; it must broadcast against the angle/batch shape.
+    """
+
+    detent_count: ArrayLike = 36
+    detent_strength: ArrayLike = 1.5
+    virtual_inertia: ArrayLike = 5.0
+    inertia_damping: ArrayLike = 1.0
+    inertia_friction: ArrayLike = 0.2
+    coupling_K: ArrayLike = 40.0
+    spring_center: ArrayLike = 0.0
+    spring_stiffness: ArrayLike = 10.0
+    spring_damping: ArrayLike = 0.1
+    bound_min: ArrayLike = math.radians(-60.0)
+    bound_max: ArrayLike = math.radians(60.0)
+    wall_strength: ArrayLike = 20.0
+    wall_damping: ArrayLike = 2.0
+
+    # preset key → (field, scale); presets give angles in degrees
+    PRESET_KEYS = {
+        "detent_count": ("detent_count", 1.0),
+        "detent_strength": ("detent_strength", 1.0),
+        "inertia": ("virtual_inertia", 1.0),
+        "damping": ("inertia_damping", 1.0),
+        "friction": ("inertia_friction", 1.0),
+        "coupling": ("coupling_K", 1.0),
+        "spring_center": ("spring_center", math.pi / 180.0),
+        "spring_stiffness": ("spring_stiffness", 1.0),
+        "spring_damping": ("spring_damping", 1.0),
+        "bound_min": ("bound_min", math.pi / 180.0),
+        "bound_max": ("bound_max", math.pi / 180.0),
+        "wall_strength": ("wall_strength", 1.0),
+    }
+
+    @classmethod
+    def from_preset(cls, preset: dict) -> HapticParams:
+        """Firmware defaults overridden by the haptic keys of a presets.json entry."""
+        values = {}
+        for key, (field_name, scale) in cls.PRESET_KEYS.items():
+            if key in preset:
+                values[field_name] = float(preset[key]) * scale
+        return cls(**values)
+
+    @classmethod
+    def stack(cls, params: list[HapticParams]) -> HapticParams:
+        """One instance whose fields are ``(len(params), 1)`` columns, for batch evaluation."""
+        return cls(**{f.name: np.array([getattr(p, f.name) for p in params], dtype=float)[:, None]
+                      for f in fields(cls)})
+
+
+DEFAULT_PARAMS = HapticParams()
+
+
+# ======================== Torque Laws ========================
+
+
+def haptic_torque(angle: ArrayLike, params: HapticParams = DEFAULT_PARAMS) -> np.ndarray:
+    """``computeHapticTorque()``: sine detents over the full turn."""
+    return params.detent_strength * -np.sin(params.detent_count * np.asarray(angle, dtype=float))
+
+
+def spring_torque(angle: ArrayLike, velocity: ArrayLike = 0.0,
+                  params: HapticParams = DEFAULT_PARAMS) -> np.ndarray:
+    """``computeSpringTorque()``: Hooke's law plus velocity damping."""
+    displacement = np.asarray(angle, dtype=float) - params.spring_center
+    return -params.spring_stiffness * displacement - params.spring_damping * np.asarray(velocity, dtype=float)
+
+
+def bounded_torque(angle: ArrayLike, velocity: ArrayLike = 0.0,
+                   params: HapticParams = DEFAULT_PARAMS) -> np.ndarray:
+    """``computeBoundedTorque()``: detents inside the bounds, damped walls outside."""
+    pos = np.asarray(angle, dtype=float)
+    vel = np.asarray(velocity, dtype=float)
+    lo, hi = params.bound_min, params.bound_max
+    normalized = (pos - lo) / (hi - lo)
+    detents = params.detent_strength * -np.sin(normalized * (np.asarray(params.detent_count) - 1) * 2.0 * np.pi)
+    lower = params.wall_strength * ((lo + WALL_BUFFER_RAD * 5) - pos) - params.wall_damping * vel
+    upper = -params.wall_strength * (pos - (hi - WALL_BUFFER_RAD * 5)) - params.wall_damping * vel
+    return np.where(pos < lo - WALL_BUFFER_RAD, lower,
+                    np.where(pos > hi + WALL_BUFFER_RAD, upper, detents))
+
+
+def inertia_torque(angle: ArrayLike, virt_pos: ArrayLike,
+                   params: HapticParams = DEFAULT_PARAMS) -> np.ndarray:
+    """``computeInertiaTorque()`` output for a given flywheel position."""
+    return -params.coupling_K * (np.asarray(angle, dtype=float) - virt_pos)
+
+
+def torque(mode: str, angle: ArrayLike, velocity: ArrayLike = 0.0,
+           params: HapticParams = DEFAULT_PARAMS, clip: bool = True) -> np.ndarray:
+    """
+    Motor voltage for a stateless mode, as ``motor.move()`` receives it.
+
+    Args:
+        mode: "haptic", "spring" or "bounded".
+        angle: Shaft angle(s) in radians.
+        velocity: Shaft velocity (rad/s), broadcast against *angle*.
+        params: Firmware parameters.
+        clip: Constrain to ±VOLTAGE_LIMIT like main.cpp.
+
+    Raises:
+        ValueError: Unknown mode, or "inertia" (stateful — use simulate_inertia())
+    """
+    if mode == "haptic":
+        tau = haptic_torque(angle, params)
+    elif mode == "spring":
+        tau = spring_torque(angle, velocity, params)
+    elif mode == "bounded":
+        tau = bounded_torque(angle, velocity, params)
+    elif mode == "inertia":
+        raise ValueError("Inertia torque depends on the flywheel state; use simulate_inertia()")
+    else:
+        raise ValueError(f"Unknown mode {mode!r} (expected one of {', '.join(MODES)})")
+    return np.clip(tau, -VOLTAGE_LIMIT, VOLTAGE_LIMIT) if clip else tau
+
+
+# ======================== Inertia Simulation ========================
+
+
+@dataclass
+class InertiaTrace:
+    """
+    Result of ``simulate_inertia()``; arrays are shaped ``(batch, steps)``.
+
+    Attributes:
+        t: Time of each step (s).
+        virt_pos: Flywheel position (rad).
+        virt_vel: Flywheel velocity (rad/s).
+        torque: Unclipped coupling torque (V).
+    """
+
+    t: np.ndarray
+    virt_pos: np.ndarray
+    virt_vel: np.ndarray
+    torque: np.ndarray
+
+    @property
+    def clipped(self) -> np.ndarray:
+        """Torque as the motor receives it (±VOLTAGE_LIMIT)."""
+        return np.clip(self.torque, -VOLTAGE_LIMIT, VOLTAGE_LIMIT)
+
+    @property
+    def peak(self) -> np.ndarray:
+        """Peak |torque| per batch row."""
+        return np.abs(self.torque).max(axis=-1)
+
+
+def simulate_inertia(shaft: np.ndarray, params: HapticParams = DEFAULT_PARAMS,
+                     dt: float = LOOP_DT_S, virt_pos0: Optional[ArrayLike] = None) -> InertiaTrace:
+    """
+    Run the firmware flywheel integrator against prescribed shaft motion.
+
+    The loop is sequential in time and vectorized across the batch, so a
+    thousand trajectories (or parameter sets) cost about as much as one.
+
+    Args:
+        shaft: Shaft angle per step, shape ``(steps,)`` or ``(batch, steps)``.
+        params: Parameters; array fields broadcast as ``(batch, 1)``.
+        dt: Loop period in seconds.
+        virt_pos0: Initial flywheel position (default: the first shaft
+                   angle, as ``resetInertiaState()`` does).
+
+    Returns:
+        InertiaTrace: Flywheel state and coupling torque per step.
+    """
+    shaft = np.atleast_2d(np.asarray(shaft, dtype=float))
+    batch, steps = shaft.shape
+    k = np.broadcast_to(np.asarray(params.coupling_K, dtype=float).reshape(-1), (batch,))
+    inertia = np.broadcast_to(np.asarray(params.virtual_inertia, dtype=float).reshape(-1), (batch,))
+    damping = np.broadcast_to(np.asarray(params.inertia_damping, dtype=float).reshape(-1), (batch,))
+    friction = np.broadcast_to(np.asarray(params.inertia_friction, dtype=float).reshape(-1), (batch,))
+
+    pos = shaft[:, 0].copy() if virt_pos0 is None else np.broadcast_to(
+        np.asarray(virt_pos0, dtype=float), (batch,)).copy()
+    vel = np.zeros(batch)
+    out_pos = np.empty((batch, steps))
+    out_vel = np.empty((batch, steps))
+    out_tau = np.empty((batch, steps))
+    for i in range(steps):
+        error = shaft[:, i] - pos
+        accel = (k * error - damping * vel) / inertia - friction * np.sign(vel)
+        vel = vel + accel * dt
+        pos = pos + vel * dt
+        out_pos[:, i] = pos
+        out_vel[:, i] = vel
+        out_tau[:, i] = -k * error
+    return InertiaTrace(np.arange(steps) * dt, out_pos, out_vel, out_tau)
+
+
+def flick(peak_velocity: float = HAND_VELOCITY_RAD_S, duration_s: float = 1.0,
+          dt: float = LOOP_DT_S) -> np.ndarray:
+    """
+    Hand trajectory for inertia checks: accelerate to *peak_velocity* over
+    0.1 s, hold for 0.2 s, then stop the shaft dead and hold it.
+
+    Returns:
+        np.ndarray: Shaft angle (rad) per step.
+    """
+    t = np.arange(int(duration_s / dt)) * dt
+    velocity = np.interp(t, [0.0, 0.1, 0.3, 0.3 + dt], [0.0, peak_velocity, peak_velocity, 0.0])
+    return np.cumsum(velocity) * dt
+
+
+# ======================== Closed Loop ========================
+
+
+VELOCITY_LPF_TF_S: float = 0.03
+"""VELOCITY_LPF_TF: SimpleFOC low-pass on shaft_velocity, used by damping and seeks."""
+
+SEEK_TOLERANCE_RAD: float = 0.06
+"""seek_tolerance_rad: the firmware's "arrived" band for Z seeks (~3.4°)."""
+
+
+@dataclass
+class RotorParams:
+    """
+    The physical knob the motor drives: rotor plus knob cap.
+
+    Defaults are rough values for a gimbal BLDC with a ~40 mm aluminium
+    knob; fit real ones from recorded seeks.
+
+    Attributes:
+        inertia: Moment of inertia (kg·m²).
+        viscous: Bearing drag (N·m·s/rad).
+        coulomb: Dry friction plus averaged cogging (N·m).
+        torque_per_volt: Stall torque per volt of q-axis voltage (N·m/V,
+                         Kt / phase resistance).
+        back_emf: Back-EMF constant (V·s/rad); in voltage mode it acts as
+                  electrical damping of torque_per_volt · back_emf.
+    """
+
+    inertia: ArrayLike = 2e-5
+    viscous: ArrayLike = 1e-5
+    coulomb: ArrayLike = 3e-4
+    torque_per_volt: ArrayLike = 0.003
+    back_emf: ArrayLike = 0.03
+
+
+@dataclass
+class SeekGains:
+    """
+    SimpleFOC angle-mode cascade used by ``Z`` seeks:
+    ``P_angle`` (angle error → velocity set-point, limited to
+    ``velocity_limit``) feeding ``PID_velocity`` (→ voltage).
+
+    The first four are runtime-adjustable (``MPP``/``MPI``/``MPD``/``MVL``);
+    the velocity loop keeps SimpleFOC's defaults.
+    """
+
+    pos_p: ArrayLike = 50.0
+    pos_i: ArrayLike = 0.0
+    pos_d: ArrayLike = 0.3
+    velocity_limit: ArrayLike = 40.0
+    vel_p: ArrayLike = 0.5
+    vel_i: ArrayLike = 10.0
+    vel_ramp: ArrayLike = 1000.0
+
+
+DEFAULT_ROTOR = RotorParams()
+DEFAULT_GAINS = SeekGains()
+
+
+@dataclass
+class LoopTrace:
+    """
+    Result of ``simulate_closed_loop()``; arrays are shaped ``(batch, steps)``.
+
+    Attributes:
+        t: Time of each step (s).
+        angle: Shaft angle (rad).
+        velocity: True shaft velocity (rad/s).
+        voltage: Commanded voltage before the ±VOLTAGE_LIMIT clip.
+        virt_pos: Flywheel position in inertia mode, else None.
+        angle0: Starting angle per batch row.
+    """
+
+    t: np.ndarray
+    angle: np.ndarray
+    velocity: np.ndarray
+    voltage: np.ndarray
+    virt_pos: Optional[np.ndarray]
+    angle0: np.ndarray
+
+
+def _column(value: ArrayLike, batch: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(value, dtype=float).reshape(-1), (batch,))
+
+
+def _batched(obj, batch: int):
+    return type(obj)(**{f.name: _column(getattr(obj, f.name), batch) for f in fields(obj)})
+
+
+class ClosedLoop:
+    """
+    The firmware control law plus rotor, advanced one loop period at a time.
+
+    ``simulate_closed_loop()`` runs this for a fixed duration; the
+    simulator steps it in real time while a seek is in progress. Inputs
+    may be arrays (one row per batch entry) like ``simulate_closed_loop()``.
+
+    Attributes:
+        angle: Shaft angle per row (rad).
+        velocity: True shaft velocity per row (rad/s).
+        virt_pos: Flywheel position per row (inertia mode).
+        target: Seek target per row (position mode, rad).
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        angle0: ArrayLike,
+        velocity0: ArrayLike = 0.0,
+        params: HapticParams = DEFAULT_PARAMS,
+        rotor: RotorParams = DEFAULT_ROTOR,
+        gains: SeekGains = DEFAULT_GAINS,
+        target: ArrayLike = 0.0,
+        dt: float = LOOP_DT_S,
+    ) -> None:
+        """
+        Raises:
+            ValueError: Unknown mode, or inputs that don't broadcast.
+        """
+        if mode not in MODES + ("position",):
+            raise ValueError(f"Unknown mode {mode!r} (expected one of {', '.join(MODES + ('position',))})")
+        sizes = [np.size(v) for v in (angle0, velocity0, target)]
+        for obj in (params, rotor, gains):
+            sizes += [np.size(getattr(obj, f.name)) for f in fields(obj)]
+        batch = max(sizes)
+        self.mode = mode
+        self.dt = dt
+        self.batch = batch
+        self._p, self._r, self._g = _batched(params, batch), _batched(rotor, batch), _batched(gains, batch)
+
+        self.angle = _column(angle0, batch).copy()
+        self.velocity = _column(velocity0, batch).copy()
+        self.target = _column(target, batch)
+        self._vel_f = self.velocity.copy()
+        self._alpha = VELOCITY_LPF_TF_S / (VELOCITY_LPF_TF_S + dt)
+        self.virt_pos, self._virt_vel = self.angle.copy(), self.velocity.copy()
+        self._err_prev = self.target - self.angle
+        self._int_a = np.zeros(batch)
+        self._verr_prev = np.zeros(batch)
+        self._int_v = np.zeros(batch)
+        self._out_prev = np.zeros(batch)
+
+    def retarget(self, target: ArrayLike) -> None:
+        """Move the seek target without resetting the controller (streamed trajectories)."""
+        self.target = _column(target, self.batch)
+
+    def step(self) -> np.ndarray:
+        """
+        Advance one loop period.
+
+        Returns:
+            np.ndarray: Commanded voltage per row, before the ±VOLTAGE_LIMIT clip.
+        """
+        p, r, g, dt = self._p, self._r, self._g, self.dt
+        angle, vel = self.angle, self.velocity
+        self._vel_f = self._alpha * self._vel_f + (1.0 - self._alpha) * vel
+        if self.mode == "position":
+            err = self.target - angle
+            self._int_a = np.clip(self._int_a + g.pos_i * dt * 0.5 * (err + self._err_prev),
+                                  -g.velocity_limit, g.velocity_limit)
+            vel_sp = np.clip(g.pos_p * err + self._int_a + g.pos_d * (err - self._err_prev) / dt,
+                             -g.velocity_limit, g.velocity_limit)
+            self._err_prev = err
+            verr = vel_sp - self._vel_f
+            self._int_v = np.clip(self._int_v + g.vel_i * dt * 0.5 * (verr + self._verr_prev),
+                                  -VOLTAGE_LIMIT, VOLTAGE_LIMIT)
+            self._verr_prev = verr
+            u = np.clip(g.vel_p * verr + self._int_v, -VOLTAGE_LIMIT, VOLTAGE_LIMIT)
+            u = np.clip(u, self._out_prev - g.vel_ramp * dt, self._out_prev + g.vel_ramp * dt)
+            self._out_prev = u
+        elif self.mode == "inertia":
+            error = angle - self.virt_pos
+            accel = (p.coupling_K * error - p.inertia_damping * self._virt_vel) / p.virtual_inertia \
+                - p.inertia_friction * np.sign(self._virt_vel)
+            self._virt_vel = self._virt_vel + accel * dt
+            self.virt_pos = self.virt_pos + self._virt_vel * dt
+            u = -p.coupling_K * error
+        else:
+            u = torque(self.mode, angle, self._vel_f, p, clip=False)
+
+        # Rotor: motor torque, viscous drag, and dry friction that can stop
+        # the shaft but never reverse it
+        drive = r.torque_per_volt * (np.clip(u, -VOLTAGE_LIMIT, VOLTAGE_LIMIT) - r.back_emf * vel) \
+            - r.viscous * vel
+        moving = vel != 0.0
+        friction = np.where(moving, np.sign(vel), np.sign(drive)) * r.coulomb
+        new_vel = vel + (drive - friction) / r.inertia * dt
+        stopped = np.where(moving, np.sign(new_vel) != np.sign(vel), True) & (np.abs(drive) <= r.coulomb)
+        self.velocity = np.where(stopped, 0.0, new_vel)
+        self.angle = angle + self.velocity * dt
+        return u
+
+
+def simulate_closed_loop(
+    mode: str,
+    angle0: ArrayLike,
+    velocity0: ArrayLike = 0.0,
+    params: HapticParams = DEFAULT_PARAMS,
+    rotor: RotorParams = DEFAULT_ROTOR,
+    gains: SeekGains = DEFAULT_GAINS,
+    target: ArrayLike = 0.0,
+    duration_s: float = 1.0,
+    dt: float = LOOP_DT_S,
+) -> LoopTrace:
+    """
+    Simulate the knob after the user lets go, or a seek, under the
+    firmware control law.
+
+    The rotor starts at *angle0* / *velocity0* with no hand on it. The
+    haptic modes drive it with their torque law (fed the low-pass filtered
+    velocity, like SimpleFOC's ``shaft_velocity``); ``"inertia"`` runs the
+    flywheel alongside, starting at the same velocity; ``"position"`` runs
+    the angle cascade to *target*. Every input may be an array: the batch
+    is their common length, so one call simulates a whole parameter set.
+
+    Returns:
+        LoopTrace: Shaft state and commanded voltage per step.
+
+    Raises:
+        ValueError: Unknown mode, or inputs that don't broadcast.
+    """
+    loop = ClosedLoop(mode, angle0, velocity0, params, rotor, gains, target, dt)
+    batch = loop.batch
+    steps = int(round(duration_s / dt))
+
+    out_angle = np.empty((batch, steps))
+    out_vel = np.empty((batch, steps))
+    out_u = np.empty((batch, steps))
+    out_virt = np.empty((batch, steps)) if mode == "inertia" else None
+    for i in range(steps):
+        out_u[:, i] = loop.step()
+        out_angle[:, i] = loop.angle
+        out_vel[:, i] = loop.velocity
+        if out_virt is not None:
+            out_virt[:, i] = loop.virt_pos
+    return LoopTrace(np.arange(1, steps + 1) * dt, out_angle, out_vel, out_u, out_virt,
+                     _column(angle0, batch).copy())
+
+
+def score(trace: LoopTrace, target: Optional[ArrayLike] = None,
+          tolerance: float = math.radians(0.5)) -> dict[str, np.ndarray]:
+    """
+    Step-response figures per batch row.
+
+    Args:
+        trace: Output of ``simulate_closed_loop()``.
+        target: Where the shaft should end (default: wherever it came to
+                rest, which suits coasting).
+        tolerance: Settling band (rad).
+
+    Returns:
+        dict: ``overshoot_deg`` / ``overshoot_pct`` (travel past the target,
+              relative to the initial offset), ``settle_s`` (time after
+              which the shaft stays inside the band; inf if it never does),
+              ``oscillations`` (band-to-band crossings of the target),
+              ``peak_v`` (largest commanded |voltage|), ``saturated_pct``
+              (steps clipped at VOLTAGE_LIMIT) and ``final_error_deg``.
+    """
+    angle = trace.angle
+    batch, steps = angle.shape
+    target = angle[:, -1] if target is None else _column(target, batch)
+    err = angle - target[:, None]
+    step0 = trace.angle0 - target
+    direction = np.where(step0 >= 0, 1.0, -1.0)[:, None]
+    overshoot = np.maximum(0.0, (-err * direction).max(axis=1))
+
+    outside = np.abs(err) > tolerance
+    last_out = np.where(outside.any(axis=1), steps - 1 - np.argmax(outside[:, ::-1], axis=1), -1)
+    dt = trace.t[0]
+    settle = np.where(last_out == steps - 1, np.inf, (last_out + 1) * dt)
+
+    side = np.where(err > tolerance, 1, np.where(err < -tolerance, -1, 0))
+    idx = np.maximum.accumulate(np.where(side != 0, np.arange(steps), 0), axis=1)
+    held = np.take_along_axis(side, idx, axis=1)
+    oscillations = (held[:, 1:] * held[:, :-1] < 0).sum(axis=1)
+
+    volts = np.abs(trace.voltage)
+    return {
+        "overshoot_deg": np.degrees(overshoot),
+        "overshoot_pct": np.where(np.abs(step0) > 0, overshoot / np.maximum(np.abs(step0), 1e-12) * 100, 0.0),
+        "settle_s": settle,
+        "oscillations": oscillations.astype(float),
+        "peak_v": volts.max(axis=1),
+        "saturated_pct": (volts > VOLTAGE_LIMIT).mean(axis=1) * 100,
+        "final_error_deg": np.degrees(np.abs(err[:, -1])),
+    }
+
+
+# ======================== Preset Checks ========================
+
+
+def load_presets(path: Path | str | None = None) -> dict[str, dict]:
+    """Read the ``presets`` object of presets.json (default: the shipped file)."""
+    with open(path or DEFAULT_PRESETS_PATH, encoding="utf-8") as f:
+        return json.load(f).get("presets", {})
+
+
+def angle_grid(mode: str, params: HapticParams, points: int = ANGLE_POINTS) -> np.ndarray:
+    """Angles (rad) a user can reach in *mode*: one turn, or the bounds plus a wall probe."""
+    if mode == "bounded":
+        probe = math.radians(WALL_PROBE_DEG)
+        return np.linspace(params.bound_min - probe, params.bound_max + probe, points)
+    center = params.spring_center if mode == "spring" else 0.0
+    return np.linspace(center - np.pi, center + np.pi, points)
+
+
+def preset_report(presets: dict[str, dict], points: int = ANGLE_POINTS,
+                  velocities: int = 9) -> list[dict]:
+    """
+    Evaluate every preset and flag torque the firmware would clip.
+
+    Stateless modes are checked at rest over ``angle_grid()`` and across
+    ±HAND_VELOCITY_RAD_S; inertia presets run a ``flick()``.
+
+    Returns:
+        list[dict]: Per preset: ``name``, ``mode``, ``peak_v`` (at rest, or
+                    during the flick), ``dynamic_peak_v``, ``clip_from_deg``
+                    (smallest |angle| from center where the rest torque
+                    clips, or None), ``clipped_pct`` and ``flags``.
+    """
+    rows = []
+    for name, preset in presets.items():
+        mode = preset.get("mode", "haptic")
+        params = HapticParams.from_preset(preset)
+        row = {"name": name, "mode": mode, "clip_from_deg": None, "clipped_pct": 0.0, "flags": []}
+        if mode == "inertia":
+            trace = simulate_inertia(flick(), params)
+            row["peak_v"] = row["dynamic_peak_v"] = float(trace.peak[0])
+            row["clipped_pct"] = float((np.abs(trace.torque) > VOLTAGE_LIMIT).mean() * 100)
+            if row["peak_v"] > VOLTAGE_LIMIT:
+                row["flags"].append(
+                    f"coupling torque reaches {row['peak_v']:.1f} V when a "
+                    f"{math.degrees(HAND_VELOCITY_RAD_S):.0f}°/s flick stops (clipped)")
+        else:
+            angles = angle_grid(mode, params, points)
+            rest = torque(mode, angles, 0.0, params, clip=False)
+            v = np.linspace(-HAND_VELOCITY_RAD_S, HAND_VELOCITY_RAD_S, velocities)[:, None]
+            moving = torque(mode, angles[None, :], v, params, clip=False)
+            clipped = np.abs(rest) > VOLTAGE_LIMIT
+            row["peak_v"] = float(np.abs(rest).max())
+            row["dynamic_peak_v"] = float(np.abs(moving).max())
+            row["clipped_pct"] = float(clipped.mean() * 100)
+            if clipped.any():
+                center = params.spring_center if mode == "spring" else 0.0
+                row["clip_from_deg"] = float(np.degrees(np.abs(angles[clipped] - center).min()))
+                row["flags"].append(
+                    f"rest torque peaks at {row['peak_v']:.1f} V > {VOLTAGE_LIMIT:.0f} V "
+                    f"(clipped beyond {row['clip_from_deg']:.0f}° from center)")
+            if row["dynamic_peak_v"] > VOLTAGE_LIMIT and not clipped.any():
+                row["flags"].append(
+                    f"damping adds up to {row['dynamic_peak_v']:.1f} V at "
+                    f"{math.degrees(HAND_VELOCITY_RAD_S):.0f}°/s (clipped while turning fast)")
+        rows.append(row)
+    return rows
+
+
+# ======================== Rendering ========================
+
+
+def ascii_curve(angles: np.ndarray, tau: np.ndarray, width: int = 72, height: int = 13,
+                limit: float = VOLTAGE_LIMIT) -> str:
+    """
+    Torque-vs-angle curve as text, with the ±limit lines marked.
+
+    Returns:
+        str: *height* rows of *width* characters plus an axis line.
+    """
+    columns = np.array_split(np.arange(len(angles)), width)
+    span = max(limit, float(np.abs(tau).max())) * 1.05
+    rows = [[" "] * width for _ in range(height)]
+
+    def row_of(value: float) -> int:
+        return int(round((span - value) / (2 * span) * (height - 1)))
+
+    for r in {row_of(limit), row_of(-limit)}:
+        rows[r] = list("·" * width)
+    rows[row_of(0.0)] = list("─" * width)
+    for c, idx in enumerate(columns):
+        if len(idx):
+            lo, hi = row_of(float(tau[idx].max())), row_of(float(tau[idx].min()))
+            for r in range(lo, hi + 1):
+                rows[r][c] = "#" if abs(tau[idx]).max() > limit else "*"
+    lines = ["".join(r) for r in rows]
+    lines[0] += f"  {span:+.1f} V"
+    lines[row_of(limit)] += f"  +{limit:.0f} V limit"
+    lines[-1] += f"  {-span:+.1f} V"
+    left, right = math.degrees(angles[0]), math.degrees(angles[-1])
+    lines.append(f"{left:<.0f}°".ljust(width // 2) + f"{right:.0f}°".rjust(width - width // 2))
+    return "\n".join(lines)
+
+
+def plot_presets(presets: dict[str, dict], path: str, points: int = 2000) -> str:
+    """
+    Save torque-vs-angle curves for every preset to an image.
+
+    Stateless modes show the rest torque (dashed where the firmware clips);
+    inertia presets show the coupling torque over a ``flick()``.
+
+    Returns:
+        str: *path*.
+
+    Raises:
+        ImportError: matplotlib is not installed
+    """
+    if not HAS_MATPLOTLIB:
+        raise ImportError("plot_presets() needs matplotlib: pip install matplotlib")
+    fig, axes = plt.subplots(len(presets), 1, figsize=(8, 2.2 * len(presets)), squeeze=False)
+    for ax, (name, preset) in zip(axes[:, 0], presets.items()):
+        mode = preset.get("mode", "haptic")
+        params = HapticParams.from_preset(preset)
+        if mode == "inertia":
+            trace = simulate_inertia(flick(), params)
+            ax.plot(trace.t, trace.torque[0], ":", color="tab:red")
+            ax.plot(trace.t, trace.clipped[0], color="tab:blue")
+            ax.set_xlabel("time (s) — flick")
+        else:
+            angles = angle_grid(mode, params, points)
+            tau = torque(mode, angles, 0.0, params, clip=False)
+            ax.plot(np.degrees(angles), tau, ":", color="tab:red")
+            ax.plot(np.degrees(angles), np.clip(tau, -VOLTAGE_LIMIT, VOLTAGE_LIMIT), color="tab:blue")
+            ax.set_xlabel("angle (°)")
+        for level in (-VOLTAGE_LIMIT, VOLTAGE_LIMIT):
+            ax.axhline(level, color="grey", linewidth=0.5)
+        ax.set_title(f"{name} ({mode})", fontsize=9)
+        ax.set_ylabel("V")
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return path
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(points: int = ANGLE_POINTS, repeats: int = 20) -> dict:
+    """
+    Time the shipped presets: stateless laws over a *points* grid, a
+    batched 1 s inertia simulation, and the full ``preset_report()``.
+
+    Returns:
+        dict: Milliseconds per evaluation.
+    """
+    presets = load_presets()
+    stateless = [(p.get("mode", "haptic"), HapticParams.from_preset(p)) for p in presets.values()
+                 if p.get("mode", "haptic") != "inertia"]
+    inertia = [HapticParams.from_preset(p) for p in presets.values() if p.get("mode") == "inertia"]
+
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        for mode, params in stateless:
+            torque(mode, angle_grid(mode, params, points), 0.0, params)
+    grid_ms = (time.perf_counter() - t0) / repeats * 1e3
+
+    batch = 256
+    shafts = np.stack([flick(v) for v in np.linspace(1.0, 20.0, batch)])
+    stacked = HapticParams.stack((inertia * batch)[:batch]) if inertia else DEFAULT_PARAMS
+    t0 = time.perf_counter()
+    simulate_inertia(shafts, stacked)
+    inertia_ms = (time.perf_counter() - t0) * 1e3
+
+    t0 = time.perf_counter()
+    report = preset_report(presets, points)
+    report_ms = (time.perf_counter() - t0) * 1e3
+    return {
+        "presets": len(presets),
+        "points": points,
+        "grid_ms": grid_ms,
+        "inertia_batch": batch,
+        "inertia_steps": shafts.shape[1],
+        "inertia_ms": inertia_ms,
+        "report_ms": report_ms,
+        "report": report,
+    }
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    print(f"{r['presets']} presets, {r['points']}-point grid: stateless laws {r['grid_ms']:.2f} ms, "
+          f"full report {r['report_ms']:.1f} ms")
+    print(f"Inertia: {r['inertia_batch']} flicks × {r['inertia_steps']} steps in {r['inertia_ms']:.1f} ms")
+    presets = load_presets()
+    for row in r["report"]:
+        status = "; ".join(row["flags"]) or "ok"
+        print(f"  {row['name']:<16} {row['mode']:<8} peak {row['peak_v']:5.1f} V  "
+              f"dynamic {row['dynamic_peak_v']:5.1f} V  {status}")
+    zoom = HapticParams.from_preset(presets["ZOOM_DIAL"])
+    angles = angle_grid("spring", zoom)
+    print("\nZOOM_DIAL rest torque (# = clipped):")
+    print(ascii_curve(angles, torque("spring", angles, 0.0, zoom, clip=False)))
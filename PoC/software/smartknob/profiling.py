@@ -0,0 +1,415 @@
+"""Opt-in per-thread profiling of a running session.
+
+``cProfile`` started from the main script only sees the main thread; the
+``smartknob-reader`` thread, where lines are parsed and callbacks run, is
+invisible to it. ``Profiler`` covers every thread in one of two modes:
+
+    cprofile  Deterministic. A ``cProfile.Profile`` per thread — the thread
+              that calls ``start()`` (the Tk loop) directly, every thread
+              started afterwards through ``threading.setprofile``. Exact
+              call counts, but adds overhead to every Python call.
+              Python 3.12+ allows only one active profiler per process,
+              so there this mode falls back to sample.
+    sample    Statistical. A sampler thread reads ``sys._current_frames()``
+              every few milliseconds; profiled threads run unmodified, so
+              it also sees threads that were already running.
+
+Every ``interval_s`` and on ``stop()`` the profiler writes to its output
+directory, per thread name:
+
+    <thread>.prof     pstats file (cprofile mode; ``snakeviz``, ``pstats``)
+    <thread>.folded   collapsed stacks (sample mode; ``flamegraph.pl``,
+                      speedscope)
+    summary.txt       top functions by cumulative time, per thread
+
+Nothing is installed while the profiler is off: no hooks, no threads and
+no checks on any hot path.
+
+Usage:
+    profiler = profiling.start("profile-out", mode="sample")
+    ...
+    profiling.stop()
+
+    # or: SMARTKNOB_PROFILE=profile-out python -m smartknob_windows.gui.app
+    #     SMARTKNOB_PROFILE_MODE=cprofile SMARTKNOB_PROFILE_INTERVAL=10
+"""
+
+from __future__ import annotations
+
+import atexit
+import collections
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR: str = "SMARTKNOB_PROFILE"
+"""Environment variable holding the output directory; profiling is enabled when set."""
+
+ENV_MODE: str = "SMARTKNOB_PROFILE_MODE"
+"""``sample`` (default) or ``cprofile``."""
+
+ENV_INTERVAL: str = "SMARTKNOB_PROFILE_INTERVAL"
+"""Seconds between dumps (default ``DEFAULT_INTERVAL_S``)."""
+
+MODES: tuple[str, ...] = ("sample", "cprofile")
+
+DEFAULT_INTERVAL_S: float = 30.0
+"""Periodic dump interval."""
+
+DEFAULT_SAMPLE_INTERVAL_S: float = 0.005
+"""Time between stack samples in sample mode (200 Hz)."""
+
+TOP_FUNCTIONS: int = 20
+"""Rows per thread in ``summary.txt``."""
+
+_OWN_THREAD_PREFIX = "smartknob-profiler"
+
+_PER_THREAD_CPROFILE = sys.version_info < (3, 12)
+"""3.12+ (sys.monitoring) rejects a second enabled cProfile.Profile."""
+
+
+def _file_name(thread_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", thread_name).strip("_") or "thread"
+
+
+class _Snapshot:
+    """Stats holder ``pstats.Stats`` accepts without disabling the profiler."""
+
+    def __init__(self, profile: cProfile.Profile) -> None:
+        profile.snapshot_stats()  # Unlike create_stats(), keeps it enabled
+        self.stats = profile.stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class Profiler:
+    """Profiles all threads and dumps per-thread results periodically.
+
+    Args:
+        out_dir: Output directory (created if missing).
+        mode: ``"sample"`` or ``"cprofile"``.
+        interval_s: Seconds between dumps (0 = only on ``stop()``).
+        sample_interval_s: Sampling period in sample mode.
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        mode: str = "sample",
+        interval_s: float = DEFAULT_INTERVAL_S,
+        sample_interval_s: float = DEFAULT_SAMPLE_INTERVAL_S,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r} (expected one of {', '.join(MODES)})")
+        if mode == "cprofile" and not _PER_THREAD_CPROFILE:
+            logger.warning("Per-thread cprofile needs Python < 3.12; profiling in sample mode")
+            mode = "sample"
+        self.out_dir = out_dir
+        self.mode = mode
+        self.interval_s = interval_s
+        self.sample_interval_s = sample_interval_s
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._running = False
+        # cprofile: (thread name, profile) — a name can repeat (reader after reconnect)
+        self._profiles: list[tuple[str, cProfile.Profile]] = []
+        self._main_profile: Optional[cProfile.Profile] = None
+        # sample: thread name → collapsed stack → count
+        self._stacks: dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    # ------------------------------------------------------------------ #
+    #  Lifecycle
+    # ------------------------------------------------------------------ #
+
+    def start(self) -> Profiler:
+        """Start profiling. In cprofile mode, call from the thread to profile
+        directly (normally the main / Tk thread).
+
+        Returns:
+            Profiler: self, for chaining.
+        """
+        if self._running:
+            return self
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._stop.clear()
+        self._running = True
+        if self.mode == "sample":
+            self._spawn(self._sample_loop, "sampler")
+        if self.interval_s > 0:
+            self._spawn(self._dump_loop, "dump")
+        if self.mode == "cprofile":
+            # Own threads are already running, so they never see the hook
+            threading.setprofile(self._thread_hook)
+            self._main_profile = self._register(threading.current_thread().name)
+            self._main_profile.enable()
+        logger.info("Profiling (%s) to %s", self.mode, self.out_dir)
+        return self
+
+    def stop(self) -> str:
+        """Stop profiling and write the final dump.
+
+        In cprofile mode, threads started while profiling keep their
+        profiler until they exit (it can only be switched off from inside
+        the thread); their stats after this point are not dumped.
+
+        Returns:
+            str: Path of ``summary.txt``.
+        """
+        if not self._running:
+            return os.path.join(self.out_dir, "summary.txt")
+        self._running = False
+        if self.mode == "cprofile":
+            threading.setprofile(None)
+            if self._main_profile is not None:
+                self._main_profile.disable()
+        self._stop.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=2.0)
+        self._threads.clear()
+        return self.dump()
+
+    def _spawn(self, target, role: str) -> None:
+        thread = threading.Thread(target=target, daemon=True, name=f"{_OWN_THREAD_PREFIX}-{role}")
+        thread.start()
+        self._threads.append(thread)
+
+    # ------------------------------------------------------------------ #
+    #  cprofile mode
+    # ------------------------------------------------------------------ #
+
+    def _register(self, thread_name: str) -> cProfile.Profile:
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append((thread_name, profile))
+        return profile
+
+    def _thread_hook(self, frame, event, arg) -> None:
+        """First profile event of a new thread: swap in its own cProfile."""
+        sys.setprofile(None)
+        if not self._running:
+            return
+        try:
+            self._register(threading.current_thread().name).enable()
+        except Exception:
+            # Raising here would kill the thread being started
+            logger.exception("Could not profile thread %s", threading.current_thread().name)
+
+    def _cprofile_stats(self) -> dict[str, pstats.Stats]:
+        with self._lock:
+            profiles = list(self._profiles)
+        merged: dict[str, pstats.Stats] = {}
+        for name, profile in profiles:
+            snapshot = _Snapshot(profile)
+            if not snapshot.stats:
+                continue
+            if name in merged:
+                merged[name].add(snapshot)
+            else:
+                merged[name] = pstats.Stats(snapshot)
+        return merged
+
+    # ------------------------------------------------------------------ #
+    #  sample mode
+    # ------------------------------------------------------------------ #
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        names: dict[int, str] = {}
+        while not self._stop.wait(self.sample_interval_s):
+            frames = sys._current_frames()
+            if any(ident not in names for ident in frames):
+                names = {t.ident: t.name for t in threading.enumerate() if t.ident is not None}
+            with self._lock:
+                for ident, frame in frames.items():
+                    name = names.get(ident, str(ident))
+                    if ident == own or name.startswith(_OWN_THREAD_PREFIX):
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                        frame = frame.f_back
+                    self._stacks[name][";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def _sample_summary(self, name: str, stacks: collections.Counter, limit: int) -> str:
+        total = sum(stacks.values())
+        inclusive: collections.Counter = collections.Counter()
+        exclusive: collections.Counter = collections.Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            exclusive[frames[-1]] += count
+            for func in set(frames):  # Recursion counts once per sample
+                inclusive[func] += count
+        lines = [f"== {name}: {total} samples ({total * self.sample_interval_s:.2f} s) =="]
+        lines.append(f"{'cum %':>7} {'cum s':>8} {'self %':>7}  function")
+        for func, count in inclusive.most_common(limit):
+            lines.append(
+                f"{100 * count / total:6.1f}% {count * self.sample_interval_s:8.3f} "
+                f"{100 * exclusive[func] / total:6.1f}%  {func}"
+            )
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------ #
+    #  Output
+    # ------------------------------------------------------------------ #
+
+    def summary(self, limit: int = TOP_FUNCTIONS) -> str:
+        """Top *limit* functions by cumulative time for each thread."""
+        parts = [f"SmartKnob profile ({self.mode}), written {time.strftime('%Y-%m-%d %H:%M:%S')}"]
+        if self.mode == "cprofile":
+            for name, stats in sorted(self._cprofile_stats().items()):
+                buf = io.StringIO()
+                stats.stream = buf
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+                parts.append(f"== {name} ==\n{buf.getvalue().strip()}")
+        else:
+            with self._lock:
+                snapshot = {name: collections.Counter(c) for name, c in self._stacks.items()}
+            for name, stacks in sorted(snapshot.items()):
+                parts.append(self._sample_summary(name, stacks, limit))
+        return "\n\n".join(parts) + "\n"
+
+    def dump(self) -> str:
+        """Write per-thread files and ``summary.txt`` now.
+
+        Returns:
+            str: Path of ``summary.txt``.
+        """
+        if self.mode == "cprofile":
+            for name, stats in self._cprofile_stats().items():
+                stats.dump_stats(os.path.join(self.out_dir, f"{_file_name(name)}.prof"))
+        else:
+            with self._lock:
+                snapshot = {name: list(c.items()) for name, c in self._stacks.items()}
+            for name, stacks in snapshot.items():
+                with open(os.path.join(self.out_dir, f"{_file_name(name)}.folded"), "w", encoding="utf-8") as f:
+                    f.writelines(f"{stack} {count}\n" for stack, count in stacks)
+        path = os.path.join(self.out_dir, "summary.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.summary())
+        logger.debug("Profile written to %s", self.out_dir)
+        return path
+
+    def _dump_loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.dump()
+            except OSError as e:
+                logger.warning("Profile dump failed: %s", e)
+
+
+PROFILER: Optional[Profiler] = None
+"""The active profiler, or None when profiling is off."""
+
+
+def start(out_dir: str, mode: str = "sample", interval_s: float = DEFAULT_INTERVAL_S) -> Profiler:
+    """Start profiling all threads (stops any active profiler first)."""
+    global PROFILER
+    stop()
+    PROFILER = Profiler(out_dir, mode, interval_s).start()
+    return PROFILER
+
+
+def stop() -> Optional[str]:
+    """Stop the active profiler and write its final dump.
+
+    Returns:
+        Optional[str]: Path of ``summary.txt``, or None if profiling was off.
+    """
+    global PROFILER
+    profiler, PROFILER = PROFILER, None
+    return profiler.stop() if profiler is not None else None
+
+
+def start_from_env() -> Optional[Profiler]:
+    """Start profiling if ``SMARTKNOB_PROFILE`` is set; dump at exit.
+
+    Call from the main thread before the Tk loop starts so cprofile mode
+    covers it and every thread created later.
+
+    Returns:
+        Optional[Profiler]: The profiler, or None if the variable is unset.
+    """
+    out_dir = os.environ.get(ENV_VAR)
+    if not out_dir:
+        return None
+    interval = float(os.environ.get(ENV_INTERVAL, DEFAULT_INTERVAL_S))
+    profiler = start(out_dir, os.environ.get(ENV_MODE, "sample"), interval)
+    atexit.register(stop)
+    return profiler
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(lines: int = 300_000) -> dict:
+    """Measure profiling overhead on the reader-thread line path.
+
+    A worker thread feeds synthetic position lines through
+    ``SmartKnobDriver._process_line`` with profiling off, in sample mode
+    and in cprofile mode.
+
+    Returns:
+        dict: µs per line for each mode and the sample-mode summary.
+    """
+    import tempfile
+
+    from smartknob import profiling  # Not __main__ when run with -m
+    from smartknob.driver import SmartKnobDriver
+
+    knob = SmartKnobDriver()
+    knob.on_position = lambda angle: None
+    batch = [f"P{i * 0.01:.2f}" for i in range(lines)]
+
+    def feed(out: list) -> None:
+        t0 = time.perf_counter()
+        for line in batch:
+            knob._process_line(line)
+        out.append((time.perf_counter() - t0) / lines * 1e6)
+
+    def run() -> float:
+        out: list = []
+        worker = threading.Thread(target=feed, args=(out,), name="smartknob-reader")
+        worker.start()
+        worker.join()
+        return out[0]
+
+    result: dict = {"lines": lines, "off": run()}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in MODES:
+            profiling.start(os.path.join(tmp, mode), mode=mode, interval_s=0)
+            result[mode] = run()
+            summary_path = profiling.stop()
+            with open(summary_path, encoding="utf-8") as f:
+                result[f"{mode}_summary"] = f.read()
+    return result
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    print(f"_process_line, {r['lines']} lines on a worker thread:")
+    for mode in ("off",) + MODES:
+        print(f"  {mode:<9} {r[mode]:6.2f} µs/line")
+    for mode in MODES:
+        summary = r[f"{mode}_summary"]
+        print(f"\n[{mode}]")
+        print("\n".join(summary[summary.index("== smartknob-reader"):].splitlines()[:10]))
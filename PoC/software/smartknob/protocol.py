@@ -101,6 +101,22 @@ CMD_QUERY_STATE: str = "Q"
 CMD_SEEK: str = "Z"
 """Z<deg> — Seek to angle in degrees. Ack: A:Z<angle>, then A:SEEK_DONE on completion"""
 
+CMD_TRAJECTORY: str = "Y"
+"""Y<deg>[,<deg>] — Append trajectory waypoints TRAJ_PERIOD_S apart (first Y of a
+stream enters position control). Ack: A:Y<free waypoint slots>"""
+
+CMD_TRAJECTORY_END: str = "YE"
+"""YE — End of the waypoint stream. Ack: A:YE, then A:SEEK_DONE once settled at the last waypoint"""
+
+TRAJ_PERIOD_S: float = 0.01
+"""Time between streamed waypoints (TRAJ_PERIOD_MS)."""
+
+TRAJ_BUFFER_SIZE: int = 64
+"""Firmware waypoint ring capacity (TRAJ_BUFFER_SIZE)."""
+
+TRAJ_WAYPOINTS_PER_LINE: int = 2
+"""Waypoints per Y line; longer lines would overflow Commander's 20-byte buffer."""
+
 # Motor configuration
 CMD_MOTOR: str = "M"
 """M<sub><val> — Motor config subcommands (PP/PI/PD/VL)"""
@@ -117,17 +133,45 @@ CMD_MOTOR_PID_D: str = "MPD"
 CMD_MOTOR_VEL_LIMIT: str = "MVL"
 """MVL<float> — Maximum velocity in rad/s during seeks. Ack: A:MVL<value>"""
 
+# Clock sync
+CMD_TIME: str = "T"
+"""Sync ping. Response: T<micros> (firmware micros(), 32-bit, wraps ~71.6 min)"""
+
+CMD_TIMESTAMPS: str = "TS"
+"""TS<0|1> — Append @<micros> to position reports. Ack: A:TS<0|1>"""
+
+# Baud negotiation
+CMD_BAUD: str = "R"
+"""R<baud> — Switch rate (ack A:R<baud> at the old rate, A:R0 if unsupported).
+Bare R probes the current rate (response: R<baud>). The firmware reverts to
+BAUD_RATE unless probed at the new rate within BAUD_PROBE_TIMEOUT_S."""
+
+SUPPORTED_BAUD_RATES: tuple[int, ...] = (115200, 230400, 460800, 921600)
+"""Rates accepted by R<baud>, ascending."""
+
+BAUD_PROBE_TIMEOUT_S: float = 1.0
+"""Firmware reverts an unconfirmed switch after this long (BAUD_PROBE_TIMEOUT_MS)."""
+
 # ======================== Responses (STM32 → PC) ========================
 
 RESP_POSITION: str = "P"
-"""P<angle_deg> — Position update in degrees (float, 2 decimal places)"""
+"""P<angle_deg>[@<micros>] — Position update in degrees (float, 2 decimal places)"""
 
 RESP_ACK: str = "A:"
 """A:<command> — Command acknowledged. The text after A: identifies the command."""
 
+RESP_TIME: str = "T"
+"""T<micros> — Reply to a T sync ping"""
+
+RESP_BAUD: str = "R"
+"""R<baud> — Reply to a bare R probe"""
+
 RESP_SEEK_DONE: str = "A:SEEK_DONE"
 """Position seek completed. Motor has settled at target and returned to previous mode."""
 
+RESP_BANNER: str = "=== SmartKnob Simple ==="
+"""First line printed after the firmware boots. Every parameter is back at its default."""
+
 # ======================== Mode Parameters Reference ========================
 
 MODE_PARAMETERS: dict[str, list[str]] = {
@@ -156,6 +200,63 @@ MODE_PARAMETERS: dict[str, list[str]] = {
 }
 """Maps each mode to its adjustable parameters with command syntax."""
 
+# ======================== Presets ========================
+
+PRESET_MODES: dict[str, HapticMode] = {
+    "haptic": HapticMode.HAPTIC,
+    "inertia": HapticMode.INERTIA,
+    "spring": HapticMode.SPRING,
+    "bounded": HapticMode.BOUNDED,
+}
+"""presets.json ``"mode"`` value → HapticMode."""
+
+PRESET_COMMANDS: dict[str, tuple[str, str]] = {
+    "detent_count": (CMD_DETENT_COUNT, "d"),
+    "detent_strength": (CMD_DETENT_STRENGTH, ".2f"),
+    "inertia": (CMD_INERTIA_VAL, ".2f"),
+    "damping": (CMD_DAMPING, ".2f"),
+    "friction": (CMD_FRICTION, ".2f"),
+    "coupling": (CMD_COUPLING, ".2f"),
+    "spring_stiffness": (CMD_SPRING_STIFFNESS, ".2f"),
+    "spring_center": (CMD_SPRING_CENTER, ".1f"),
+    "spring_damping": (CMD_SPRING_DAMPING, ".2f"),
+    "bound_min": (CMD_LOWER_BOUND, ".1f"),
+    "bound_max": (CMD_UPPER_BOUND, ".1f"),
+    "wall_strength": (CMD_WALL_STRENGTH, ".2f"),
+}
+"""presets.json parameter key → (command, value format), as the driver's setters send them."""
+
+
+def preset_commands(preset: dict) -> list[str]:
+    """Firmware commands that apply a presets.json entry.
+
+    The mode comes first: entering SPRING re-centers the spring on the
+    current angle, so an explicit ``spring_center`` must follow it. Keys
+    without a command (``name``, ``curve``, ``filter``, ...) are ignored.
+
+    Args:
+        preset: One entry of presets.json ``"presets"``.
+
+    Returns:
+        list[str]: Command lines without newlines, e.g. ``["O", "S20", ...]``.
+
+    Raises:
+        ValueError: Unknown mode or a non-numeric parameter.
+    """
+    commands = []
+    mode = preset.get("mode")
+    if mode is not None:
+        if mode not in PRESET_MODES:
+            raise ValueError(f"Unknown preset mode {mode!r} (expected one of {', '.join(PRESET_MODES)})")
+        commands.append(PRESET_MODES[mode].value)
+    for key, (command, spec) in PRESET_COMMANDS.items():
+        if key in preset:
+            value = preset[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Preset {key} must be a number, got {value!r}")
+            commands.append(f"{command}{format(int(value) if spec == 'd' else float(value), spec)}")
+    return commands
+
 
 def print_help() -> None:
     """Print a human-readable summary of all commands, modes, and parameters.
@@ -184,6 +285,8 @@ def print_help() -> None:
     print(f"  {CMD_QUERY_POS}        — Query current angle (response: P<deg>)")
     print(f"  {CMD_QUERY_STATE}        — Query full device state (multi-line)")
     print(f"  {CMD_SEEK}<deg>   — Seek to angle (ack: A:Z, then A:SEEK_DONE)")
+    print(f"  {CMD_TRAJECTORY}<deg>,<deg> — Stream trajectory waypoints (ack: A:Y<free slots>)")
+    print(f"  {CMD_TRAJECTORY_END}       — End of stream (ack: A:YE, then A:SEEK_DONE)")
     print()
 
     print("Motor Config:")
@@ -193,6 +296,16 @@ def print_help() -> None:
     print(f"  {CMD_MOTOR_VEL_LIMIT}<val> — Velocity limit (rad/s)")
     print()
 
+    print("Clock Sync:")
+    print(f"  {CMD_TIME}          — Sync ping (response: T<micros>)")
+    print(f"  {CMD_TIMESTAMPS}<0|1>    — Timestamped positions P<deg>@<micros>")
+    print()
+
+    print("Baud Rate:")
+    print(f"  {CMD_BAUD}<baud>    — Switch to {'/'.join(map(str, SUPPORTED_BAUD_RATES))}")
+    print(f"  {CMD_BAUD}          — Probe current rate (response: R<baud>)")
+    print()
+
     print("Responses (STM32 → PC):")
     print(f"  P<angle>     — Position update (degrees, 2 dp)")
     print(f"  A:<command>  — Command acknowledged")
@@ -0,0 +1,630 @@
+"""SmartKnob pub/sub server — share one serial connection with many local apps.
+
+Only one process can own the serial port. ``PositionServer`` owns a
+``SmartKnobDriver`` and fans out its events to any number of local clients
+over a Unix or TCP socket; ``PositionClient`` connects to it and exposes the
+same callback attributes as the driver (``on_position``, ``on_ack``,
+``on_seek_done``, ``on_raw``) plus ``send_raw()``.
+
+Wire format (both directions): a 3-byte header ``<BH`` (message type,
+payload length) followed by the payload.
+
+    MSG_POSITION   <dd  angle_deg, host timestamp (time.perf_counter())
+    MSG_ACK        UTF-8 ack text (after "A:")
+    MSG_SEEK_DONE  empty
+    MSG_RAW        UTF-8 line
+    MSG_STATE      UTF-8 connection state ("connected", "lost", "reconnected", "closed")
+    MSG_COMMAND    UTF-8 command (client → server only)
+
+Each client has a bounded queue; when a slow client falls behind, the
+oldest frames are dropped (and counted) so it never blocks the reader
+thread or other clients. Client commands are forwarded to the firmware by
+the server loop thread only, one at a time, in arrival order.
+
+Usage:
+    from smartknob.server import PositionServer, PositionClient
+
+    server = PositionServer(knob, "tcp:127.0.0.1:7777")
+    server.start()
+
+    client = PositionClient("tcp:127.0.0.1:7777")
+    client.on_position = lambda angle_deg: print(angle_deg)
+    client.connect()
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADDRESS: str = "tcp:127.0.0.1:7777"
+"""Default listen/connect address."""
+
+DEFAULT_QUEUE_FRAMES: int = 1024
+"""Per-client queue bound. Oldest frames are dropped beyond this."""
+
+# ======================== Framing ========================
+
+HEADER = struct.Struct("<BH")
+POSITION = struct.Struct("<dd")
+
+MSG_POSITION = 1
+MSG_ACK = 2
+MSG_SEEK_DONE = 3
+MSG_RAW = 4
+MSG_STATE = 5
+MSG_COMMAND = 6
+
+
+def encode_frame(msg_type: int, payload: bytes = b"") -> bytes:
+    """Build one frame: header + payload."""
+    return HEADER.pack(msg_type, len(payload)) + payload
+
+
+def encode_position(angle_deg: float, timestamp: Optional[float] = None) -> bytes:
+    """Build a MSG_POSITION frame (timestamp defaults to now)."""
+    if timestamp is None:
+        timestamp = time.perf_counter()
+    return HEADER.pack(MSG_POSITION, POSITION.size) + POSITION.pack(angle_deg, timestamp)
+
+
+class FrameDecoder:
+    """Incremental decoder: feed() bytes, get back complete (type, payload) frames."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def feed(self, data: bytes) -> list[tuple[int, bytes]]:
+        self._buf += data
+        frames = []
+        buf = self._buf
+        offset = 0
+        while len(buf) - offset >= HEADER.size:
+            msg_type, length = HEADER.unpack_from(buf, offset)
+            end = offset + HEADER.size + length
+            if end > len(buf):
+                break
+            frames.append((msg_type, bytes(buf[offset + HEADER.size:end])))
+            offset = end
+        if offset:
+            del buf[:offset]
+        return frames
+
+
+def parse_address(address: str) -> tuple[int, object]:
+    """Split ``"tcp:host:port"`` / ``"unix:/path"`` into (family, sockaddr).
+
+    Raises:
+        ValueError: Unknown scheme or malformed address.
+    """
+    scheme, _, rest = address.partition(":")
+    if scheme == "tcp":
+        host, _, port = rest.rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    if scheme == "unix":
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not supported on this platform")
+        return socket.AF_UNIX, rest
+    raise ValueError(f"Unsupported address {address!r} (use tcp:host:port or unix:/path)")
+
+
+# ======================== Server ========================
+
+
+class _Client:
+    __slots__ = ("sock", "name", "queue", "outbuf", "decoder", "dropped")
+
+    def __init__(self, sock: socket.socket, name: str, max_frames: int) -> None:
+        self.sock = sock
+        self.name = name
+        self.queue: collections.deque[bytes] = collections.deque(maxlen=max_frames)
+        self.outbuf = b""
+        self.decoder = FrameDecoder()
+        self.dropped = 0
+
+
+class PositionServer:
+    """Fan out driver events to local socket clients.
+
+    Publishing happens on the caller's thread (normally the driver reader
+    thread) and only appends to per-client queues; all socket I/O runs on
+    the server's own loop thread.
+
+    Attributes:
+        commands_forwarded: Client commands passed to the driver.
+    """
+
+    def __init__(
+        self,
+        driver=None,
+        address: str = DEFAULT_ADDRESS,
+        max_queue_frames: int = DEFAULT_QUEUE_FRAMES,
+    ) -> None:
+        """
+        Args:
+            driver: ``SmartKnobDriver`` to publish from and forward commands
+                    to, or None to publish manually (benchmarks, tests).
+            address: ``"tcp:host:port"`` or ``"unix:/path"``.
+            max_queue_frames: Per-client queue bound (drop-oldest).
+        """
+        self.driver = driver
+        self.address = address
+        self.max_queue_frames = max_queue_frames
+
+        self._listener: Optional[socket.socket] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+        self._wake_pending = False
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Loop thread owns _clients; publishers read the immutable snapshot
+        self._clients: dict[socket.socket, _Client] = {}
+        self._snapshot: tuple[_Client, ...] = ()
+        self._commands: collections.deque[str] = collections.deque()
+
+        self._state = "closed"
+        self._last_angle: Optional[float] = None
+        self.commands_forwarded = 0
+
+        if driver is not None:
+            self._attach(driver)
+
+    # ------------------------------------------------------------------ #
+    #  Driver wiring
+    # ------------------------------------------------------------------ #
+
+    def _attach(self, driver) -> None:
+        """Subscribe to the driver's events (its ``on_*`` handlers are untouched)."""
+        def on_ack(ack_text: str) -> None:
+            if ack_text != "SEEK_DONE":  # Already published as MSG_SEEK_DONE
+                self.publish(MSG_ACK, ack_text.encode())
+
+        # Inline: publishing only queues frames for the loop thread
+        subscribe = driver.events.subscribe
+        subscribe("connection_state", lambda state: self.publish_state(str(getattr(state, "value", state))),
+                  name="server.connection_state")
+        subscribe("position", self.publish_position, name="server.position")
+        subscribe("ack", on_ack, name="server.ack")
+        subscribe("seek_done", lambda: self.publish(MSG_SEEK_DONE), name="server.seek_done")
+        subscribe("raw", lambda line: self.publish(MSG_RAW, line.encode()), name="server.raw")
+
+    # ------------------------------------------------------------------ #
+    #  Lifecycle
+    # ------------------------------------------------------------------ #
+
+    @property
+    def client_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._snapshot)
+
+    def start(self) -> None:
+        """Bind the listen socket and start the server loop thread."""
+        family, sockaddr = parse_address(self.address)
+        if family == getattr(socket, "AF_UNIX", None) and os.path.exists(sockaddr):
+            os.unlink(sockaddr)  # Stale socket from a previous run
+
+        listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(sockaddr)
+        listener.listen(64)
+        listener.setblocking(False)
+        if family == socket.AF_INET:
+            # Report the real port when binding to port 0
+            host, port = listener.getsockname()[:2]
+            self.address = f"tcp:{host}:{port}"
+
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(listener, selectors.EVENT_READ, "accept")
+        self._selector.register(self._wake_r, selectors.EVENT_READ, "wake")
+        self._listener = listener
+
+        if self.driver is not None and self.driver.is_connected:
+            self._state = "connected"
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._loop, daemon=True, name="smartknob-server"
+        )
+        self._thread.start()
+        logger.info("Serving on %s", self.address)
+
+    def stop(self) -> None:
+        """Close all clients and the listen socket."""
+        self._running = False
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+        for client in list(self._clients.values()):
+            client.sock.close()
+        self._clients.clear()
+        self._snapshot = ()
+
+        for sock in (self._listener, self._wake_r, self._wake_w):
+            if sock is not None:
+                sock.close()
+        if self._selector is not None:
+            self._selector.close()
+        family, sockaddr = parse_address(self.address)
+        if family == getattr(socket, "AF_UNIX", None) and os.path.exists(sockaddr):
+            os.unlink(sockaddr)
+        self._listener = self._wake_r = self._wake_w = self._selector = None
+        logger.info("Server stopped")
+
+    # ------------------------------------------------------------------ #
+    #  Publishing (any thread)
+    # ------------------------------------------------------------------ #
+
+    def publish_position(self, angle_deg: float, timestamp: Optional[float] = None) -> None:
+        """Fan out a position sample."""
+        self._last_angle = angle_deg
+        self._fan_out(encode_position(angle_deg, timestamp))
+
+    def publish(self, msg_type: int, payload: bytes = b"") -> None:
+        """Fan out an arbitrary frame."""
+        self._fan_out(encode_frame(msg_type, payload))
+
+    def publish_state(self, state: str) -> None:
+        """Record and fan out a connection-state change."""
+        self._state = state
+        self.publish(MSG_STATE, state.encode())
+
+    def _fan_out(self, frame: bytes) -> None:
+        clients = self._snapshot
+        if not clients:
+            return
+        for client in clients:
+            queue = client.queue
+            if len(queue) == queue.maxlen:
+                client.dropped += 1  # deque drops the oldest on append
+            queue.append(frame)
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._wake_pending or self._wake_w is None:
+            return
+        self._wake_pending = True
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def stats(self) -> dict:
+        """Per-client queue depth and drop counts, plus forwarded commands."""
+        return {
+            "clients": {
+                c.name: {"queued": len(c.queue), "dropped": c.dropped}
+                for c in self._snapshot
+            },
+            "commands_forwarded": self.commands_forwarded,
+        }
+
+    # ------------------------------------------------------------------ #
+    #  Server loop (loop thread only)
+    # ------------------------------------------------------------------ #
+
+    def _loop(self) -> None:
+        sel = self._selector
+        while self._running:
+            for key, events in sel.select(timeout=0.5):
+                if key.data == "accept":
+                    self._accept()
+                elif key.data == "wake":
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    # Clear after draining: frames queued before this point
+                    # are flushed below, later ones send a fresh wake byte
+                    self._wake_pending = False
+                else:
+                    client = key.data
+                    if events & selectors.EVENT_READ:
+                        self._read(client)
+                    if events & selectors.EVENT_WRITE and client.sock in self._clients:
+                        self._flush(client)
+
+            # Single writer: forward client commands in arrival order
+            while self._commands:
+                cmd = self._commands.popleft()
+                if self.driver is not None:
+                    self.driver.send_raw(cmd)
+                self.commands_forwarded += 1
+
+            for client in self._snapshot:
+                if client.queue or client.outbuf:
+                    self._flush(client)
+        logger.debug("Server loop exited")
+
+    def _accept(self) -> None:
+        try:
+            sock, addr = self._listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        if sock.family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        name = f"{addr[0]}:{addr[1]}" if isinstance(addr, tuple) else f"unix#{sock.fileno()}"
+        client = _Client(sock, name, self.max_queue_frames)
+
+        # Greet with current state and last position
+        client.queue.append(encode_frame(MSG_STATE, self._state.encode()))
+        if self._last_angle is not None:
+            client.queue.append(encode_position(self._last_angle))
+
+        self._clients[sock] = client
+        self._snapshot = tuple(self._clients.values())
+        self._selector.register(sock, selectors.EVENT_READ, client)
+        logger.debug("Client connected: %s", name)
+
+    def _read(self, client: _Client) -> None:
+        try:
+            data = client.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop_client(client)
+            return
+        for msg_type, payload in client.decoder.feed(data):
+            if msg_type == MSG_COMMAND:
+                cmd = payload.decode(errors="replace").strip()
+                if cmd:
+                    self._commands.append(cmd)
+
+    def _flush(self, client: _Client) -> None:
+        queue = client.queue
+        if queue:
+            parts = [client.outbuf]
+            size = len(client.outbuf)
+            while queue and size < 65536:
+                frame = queue.popleft()
+                parts.append(frame)
+                size += len(frame)
+            client.outbuf = b"".join(parts)
+
+        if client.outbuf:
+            try:
+                sent = client.sock.send(client.outbuf)
+                client.outbuf = client.outbuf[sent:]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._drop_client(client)
+                return
+
+        want = selectors.EVENT_READ
+        if client.outbuf or queue:
+            want |= selectors.EVENT_WRITE
+        if self._selector.get_key(client.sock).events != want:
+            self._selector.modify(client.sock, want, client)
+
+    def _drop_client(self, client: _Client) -> None:
+        if client.sock not in self._clients:
+            return
+        self._selector.unregister(client.sock)
+        client.sock.close()
+        del self._clients[client.sock]
+        self._snapshot = tuple(self._clients.values())
+        logger.debug("Client disconnected: %s (dropped %d frames)", client.name, client.dropped)
+
+
+# ======================== Client ========================
+
+
+class PositionClient:
+    """Subscriber for a ``PositionServer``.
+
+    Callbacks fire on the client's reader thread and mirror the driver's
+    callback attributes, so code written against ``SmartKnobDriver`` can
+    usually take a client instead.
+
+    Attributes:
+        on_position:  ``(angle_deg)`` for every position frame.
+        on_sample:    ``(angle_deg, server_timestamp)`` for every position frame.
+        on_ack:       ``(ack_text)`` for every ack frame.
+        on_seek_done: ``()`` on seek completion.
+        on_raw:       ``(line)`` for unrecognised firmware lines.
+        on_state:     ``(state)`` on server/driver connection-state changes.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS) -> None:
+        self.address = address
+        self._sock: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self.on_position: Optional[Callable[[float], None]] = None
+        self.on_sample: Optional[Callable[[float, float], None]] = None
+        self.on_ack: Optional[Callable[[str], None]] = None
+        self.on_seek_done: Optional[Callable[[], None]] = None
+        self.on_raw: Optional[Callable[[str], None]] = None
+        self.on_state: Optional[Callable[[str], None]] = None
+
+        self._current_angle = 0.0
+
+    @property
+    def current_angle(self) -> float:
+        """Last received angle in degrees."""
+        return self._current_angle
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the socket is open and the reader is running."""
+        return self._sock is not None and self._running
+
+    def connect(self) -> None:
+        """Connect to the server and start the reader thread.
+
+        Raises:
+            OSError: If the server is not reachable.
+        """
+        family, sockaddr = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.connect(sockaddr)
+        if family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._reader_loop, daemon=True, name="smartknob-client"
+        )
+        self._thread.start()
+
+    def disconnect(self) -> None:
+        """Close the connection and stop the reader thread."""
+        self._running = False
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._sock = None
+        self._thread = None
+
+    def send_raw(self, command: str) -> None:
+        """Ask the server to forward *command* to the firmware."""
+        with self._send_lock:
+            if self._sock is not None:
+                self._sock.sendall(encode_frame(MSG_COMMAND, command.encode()))
+
+    def _reader_loop(self) -> None:
+        decoder = FrameDecoder()
+        unpack_position = POSITION.unpack
+        while self._running:
+            try:
+                data = self._sock.recv(65536)
+            except OSError:
+                break
+            if not data:
+                break
+            for msg_type, payload in decoder.feed(data):
+                try:
+                    if msg_type == MSG_POSITION:
+                        angle, ts = unpack_position(payload)
+                        self._current_angle = angle
+                        if self.on_sample:
+                            self.on_sample(angle, ts)
+                        if self.on_position:
+                            self.on_position(angle)
+                    elif msg_type == MSG_ACK:
+                        if self.on_ack:
+                            self.on_ack(payload.decode(errors="replace"))
+                    elif msg_type == MSG_SEEK_DONE:
+                        if self.on_seek_done:
+                            self.on_seek_done()
+                        if self.on_ack:
+                            self.on_ack("SEEK_DONE")
+                    elif msg_type == MSG_RAW:
+                        if self.on_raw:
+                            self.on_raw(payload.decode(errors="replace"))
+                    elif msg_type == MSG_STATE:
+                        if self.on_state:
+                            self.on_state(payload.decode(errors="replace"))
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Client callback exception: %s", exc)
+        self._running = False
+        logger.debug("Client reader exited")
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark_fanout(
+    client_counts: tuple[int, ...] = (1, 5, 10, 25, 50),
+    samples: int = 500,
+    rate_hz: float = 1000.0,
+    address: str = "tcp:127.0.0.1:0",
+) -> list[dict]:
+    """Measure publish → client-callback latency for several client counts.
+
+    Publishes synthetic positions at *rate_hz* from this thread; each client
+    computes ``perf_counter() - frame timestamp`` on receipt.
+
+    Returns:
+        list[dict]: One row per client count with p50/p99/max latency (µs),
+                    received and dropped frame totals.
+    """
+    rows = []
+    for count in client_counts:
+        server = PositionServer(address=address)
+        server.start()
+        latencies: list[float] = []
+        lat_lock = threading.Lock()
+
+        def on_sample(angle: float, ts: float) -> None:
+            lat = time.perf_counter() - ts
+            with lat_lock:
+                latencies.append(lat)
+
+        clients = []
+        for _ in range(count):
+            c = PositionClient(server.address)
+            c.on_sample = on_sample
+            c.connect()
+            clients.append(c)
+        deadline = time.perf_counter() + 2.0
+        while server.client_count < count and time.perf_counter() < deadline:
+            time.sleep(0.005)
+
+        period = 1.0 / rate_hz
+        next_t = time.perf_counter()
+        for i in range(samples):
+            server.publish_position(float(i))
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        time.sleep(0.2)
+
+        dropped = sum(c["dropped"] for c in server.stats()["clients"].values())
+        for c in clients:
+            c.disconnect()
+        server.stop()
+
+        with lat_lock:
+            lat_us = sorted(x * 1e6 for x in latencies)
+        n = len(lat_us)
+        rows.append({
+            "clients": count,
+            "received": n,
+            "dropped": dropped,
+            "p50_us": lat_us[n // 2] if n else float("nan"),
+            "p99_us": lat_us[min(n - 1, int(n * 0.99))] if n else float("nan"),
+            "max_us": lat_us[-1] if n else float("nan"),
+        })
+    return rows
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    print("Fan-out latency (publish → client callback), 1 kHz positions")
+    for row in benchmark_fanout():
+        print(
+            f"  {row['clients']:3d} clients: p50 {row['p50_us']:7.0f} µs  "
+            f"p99 {row['p99_us']:7.0f} µs  max {row['max_us']:7.0f} µs  "
+            f"received {row['received']}  dropped {row['dropped']}"
+        )
@@ -0,0 +1,380 @@
+"""Shared-memory knob state for cross-process readers.
+
+``SharedStateWriter`` (owned by the driver) publishes every position sample
+into a ``multiprocessing.shared_memory`` segment; ``SharedStateReader``
+attaches to it from any local process and reads without syscalls — a
+read is a few ``struct.unpack_from`` calls on the mapped buffer.
+
+Segment layout (little-endian, 8-byte aligned):
+
+    offset  0   header   magic u32, version u32, capacity u32, pad u32
+    offset 16   latest   seq u64, angle f64, velocity f64, timestamp f64,
+                         mode u32, pad u32
+    offset 56   ring     write_count u64
+    offset 64   slots    capacity × (timestamp f64, angle f64, velocity f64)
+
+``latest`` is a seqlock: the writer makes ``seq`` odd, writes the fields,
+then makes it even again. Readers retry until they see the same even
+``seq`` before and after copying the fields.
+
+The ring is single-producer: the writer fills slot ``n % capacity`` and
+then publishes ``write_count = n + 1``. Each reader keeps its own cursor;
+a slot is accepted only if ``write_count`` shows it was not overwritten
+while being copied, and readers that fall more than ``capacity`` samples
+behind skip ahead (counted in ``overruns``).
+
+Usage:
+    # Producer (the process that owns the serial port)
+    knob.enable_shared_memory()
+
+    # Any other process
+    from smartknob.shm import SharedStateReader
+    reader = SharedStateReader()
+    sample = reader.latest()          # Sample(angle, velocity, mode, timestamp, seq)
+    for ts, angle, vel in reader.read_new():
+        ...
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional
+
+from smartknob.protocol import HapticMode
+
+DEFAULT_NAME: str = "smartknob_state"
+"""Default shared-memory segment name."""
+
+DEFAULT_CAPACITY: int = 4096
+"""Default ring size in samples (~4 s at 1 kHz)."""
+
+MAGIC = int.from_bytes(b"KNOB", "little")
+VERSION = 1
+
+_HEADER = struct.Struct("<IIII")
+_LATEST = struct.Struct("<QdddII")
+_SEQ = struct.Struct("<Q")
+_LATEST_FIELDS = struct.Struct("<dddI")
+_SLOT = struct.Struct("<ddd")
+
+_MODES = {ord(m.value): m for m in HapticMode}
+
+_LATEST_OFFSET = _HEADER.size                     # 16
+_COUNT_OFFSET = _LATEST_OFFSET + _LATEST.size     # 56
+_SLOTS_OFFSET = _COUNT_OFFSET + _SEQ.size         # 64
+
+
+class Sample(NamedTuple):
+    """Latest published knob state."""
+
+    angle: float
+    """Angle in degrees."""
+    velocity: float
+    """Angular velocity in degrees/second (finite difference over ``timestamp``;
+    held at the previous value when the timestamp does not advance)."""
+    mode: Optional[HapticMode]
+    """Last mode set through the driver, or None if unknown."""
+    timestamp: float
+    """Sample time on the host ``time.perf_counter()`` clock: the device
+    timestamp mapped through the driver's clock sync when device timestamps
+    are on and synced, else the arrival time of the read that delivered the
+    line (shared by all lines of one read)."""
+    seq: int
+    """Seqlock sequence number; increases by 2 per published sample."""
+
+
+def _segment_size(capacity: int) -> int:
+    return _SLOTS_OFFSET + capacity * _SLOT.size
+
+
+_created: set[str] = set()
+"""Segments created by writers in this process (tracked for unlinking)."""
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without letting this process unlink it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if sys.platform != "win32" and name not in _created:
+        # Before 3.13 the resource tracker unlinks attached segments at exit
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")  # noqa: SLF001
+    return shm
+
+
+class SharedStateWriter:
+    """Single producer for the shared state segment."""
+
+    def __init__(self, name: str = DEFAULT_NAME, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Args:
+            name: Segment name (an existing segment with this name is replaced).
+            capacity: Ring size in samples.
+
+        Raises:
+            ValueError: capacity < 1.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        try:
+            stale = shared_memory.SharedMemory(name=name)  # Left by a crashed writer
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=_segment_size(capacity))
+        _created.add(name)
+        self.name = name
+        self.capacity = capacity
+        self._buf = self._shm.buf
+        self._buf[:_SLOTS_OFFSET] = bytes(_SLOTS_OFFSET)
+        _HEADER.pack_into(self._buf, 0, MAGIC, VERSION, capacity, 0)
+
+        self._seq = 0
+        self._count = 0
+        self._mode = 0
+        self._last_angle: Optional[float] = None
+        self._last_ts = 0.0
+        self._velocity = 0.0
+
+    def set_mode(self, mode: Optional[HapticMode]) -> None:
+        """Record the current mode (published with the next sample)."""
+        self._mode = ord(mode.value) if mode is not None else 0
+
+    def write(self, angle_deg: float, timestamp: Optional[float] = None) -> None:
+        """Publish one sample to the latest block and the ring.
+
+        Args:
+            angle_deg: Angle in degrees.
+            timestamp: Sample time on the ``time.perf_counter()`` clock
+                       (default: now).
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if self._last_angle is None:
+            velocity = 0.0
+        elif timestamp <= self._last_ts:
+            velocity = self._velocity  # Same-burst arrival: no new rate information
+        else:
+            velocity = (angle_deg - self._last_angle) / (timestamp - self._last_ts)
+        self._velocity = velocity
+        self._last_angle = angle_deg
+        self._last_ts = timestamp
+
+        buf = self._buf
+        seq = self._seq
+        _SEQ.pack_into(buf, _LATEST_OFFSET, seq + 1)  # Odd: write in progress
+        _LATEST_FIELDS.pack_into(buf, _LATEST_OFFSET + 8, angle_deg, velocity, timestamp, self._mode)
+        _SEQ.pack_into(buf, _LATEST_OFFSET, seq + 2)
+        self._seq = seq + 2
+
+        n = self._count
+        _SLOT.pack_into(buf, _SLOTS_OFFSET + (n % self.capacity) * _SLOT.size,
+                        timestamp, angle_deg, velocity)
+        _SEQ.pack_into(buf, _COUNT_OFFSET, n + 1)
+        self._count = n + 1
+
+    def close(self, unlink: bool = True) -> None:
+        """Detach, and by default remove the segment."""
+        if self._buf is None:
+            return
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
+        if unlink:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            _created.discard(self.name)
+
+
+class SharedStateReader:
+    """Poll the shared state segment from any local process.
+
+    Attributes:
+        retries: Seqlock retries in latest() (writer was mid-update).
+        overruns: Samples skipped because read_new() fell behind the ring.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME) -> None:
+        """
+        Raises:
+            FileNotFoundError: No segment with this name (driver not publishing).
+            ValueError: Segment is not a SmartKnob state block.
+        """
+        self._shm = _attach(name)
+        self._buf = self._shm.buf
+        magic, version, capacity, _ = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{name!r} is not a SmartKnob v{VERSION} state segment")
+        self.name = name
+        self.capacity = capacity
+        self._cursor = _SEQ.unpack_from(self._buf, _COUNT_OFFSET)[0]
+        self.retries = 0
+        self.overruns = 0
+
+    def latest(self) -> Sample:
+        """Return the most recent sample (consistent snapshot)."""
+        buf = self._buf
+        unpack_latest = _LATEST.unpack_from
+        unpack_seq = _SEQ.unpack_from
+        while True:
+            seq, angle, velocity, ts, mode, _ = unpack_latest(buf, _LATEST_OFFSET)
+            if not seq & 1 and unpack_seq(buf, _LATEST_OFFSET)[0] == seq:
+                break
+            self.retries += 1
+        return Sample(angle, velocity, _MODES.get(mode), ts, seq)
+
+    @property
+    def write_count(self) -> int:
+        """Total samples published since the segment was created."""
+        return _SEQ.unpack_from(self._buf, _COUNT_OFFSET)[0]
+
+    def read_new(self, max_samples: Optional[int] = None) -> list[tuple[float, float, float]]:
+        """Return ring samples published since the previous call.
+
+        Args:
+            max_samples: Upper bound on samples returned (oldest first).
+
+        Returns:
+            list[tuple]: ``(timestamp, angle_deg, velocity)`` per sample.
+        """
+        buf = self._buf
+        cap = self.capacity
+        unpack_slot = _SLOT.unpack_from
+        count = _SEQ.unpack_from(buf, _COUNT_OFFSET)[0]
+        cursor = self._cursor
+        if count - cursor > cap:
+            self.overruns += count - cursor - cap
+            cursor = count - cap
+        end = count if max_samples is None else min(count, cursor + max_samples)
+
+        out = []
+        for n in range(cursor, end):
+            out.append(unpack_slot(buf, _SLOTS_OFFSET + (n % cap) * _SLOT.size))
+
+        # Discard anything the writer lapped while we were copying, including
+        # the slot it may be filling right now (sample number `after`)
+        after = _SEQ.unpack_from(buf, _COUNT_OFFSET)[0]
+        lapped = after + 1 - cap - cursor
+        if lapped > 0:
+            self.overruns += min(lapped, len(out))
+            out = out[lapped:]
+        self._cursor = end
+        return out
+
+    def close(self) -> None:
+        """Detach from the segment (never removes it)."""
+        if self._buf is None:
+            return
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
+
+
+# ======================== Benchmark ========================
+
+
+def _bench_writer(name: str, capacity: int, ready, done) -> None:
+    """Writer process: publish samples as fast as possible until *done*.
+
+    Fields are derived from one counter (angle = i, timestamp = 2i) so
+    readers can detect torn or reordered reads.
+    """
+    writer = SharedStateWriter(name, capacity)
+    writer.set_mode(HapticMode.HAPTIC)
+    ready.set()
+    i = 0
+    while not done.is_set():
+        for _ in range(1000):
+            i += 1
+            writer.write(float(i), 2.0 * i)
+    writer.close()
+
+
+def benchmark(reads: int = 500_000, ring_seconds: float = 1.0,
+              capacity: int = DEFAULT_CAPACITY) -> dict:
+    """Check consistency under a concurrent writer process and time reads.
+
+    Returns:
+        dict: latest_ns (per call, writer running flat out), latest_idle_ns
+              (writer stopped) and read_new_ns (per sample) costs,
+              torn read and ring ordering-error counts (must be 0),
+              seqlock retries and ring overruns.
+    """
+    import multiprocessing as mp
+
+    name = f"smartknob_bench_{mp.current_process().pid}"
+    ready, done = mp.Event(), mp.Event()
+    proc = mp.Process(target=_bench_writer, args=(name, capacity, ready, done))
+    proc.start()
+    ready.wait(10.0)
+    reader = SharedStateReader(name)
+
+    torn = 0
+    latest = reader.latest
+    t0 = time.perf_counter()
+    for _ in range(reads):
+        s = latest()
+        if s.timestamp != 2.0 * s.angle or (s.seq and s.mode is not HapticMode.HAPTIC):
+            torn += 1
+    latest_ns = (time.perf_counter() - t0) / reads * 1e9
+
+    errors = 0
+    ring_samples = 0
+    last = None
+    overruns = reader.overruns
+    read_time = 0.0
+    deadline = time.perf_counter() + ring_seconds
+    reader.read_new()  # Start from "now"
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        batch = reader.read_new()
+        read_time += time.perf_counter() - t0
+        if reader.overruns != overruns:
+            overruns, last = reader.overruns, None  # Gap is expected after an overrun
+        for ts, angle, _ in batch:
+            if ts != 2.0 * angle or (last is not None and angle != last + 1.0):
+                errors += 1
+            last = angle
+        ring_samples += len(batch)
+
+    done.set()
+    proc.join(10.0)
+
+    # Same reads with the writer stopped (the mapping outlives the unlink)
+    t0 = time.perf_counter()
+    for _ in range(reads):
+        latest()
+    idle_ns = (time.perf_counter() - t0) / reads * 1e9
+
+    result = {
+        "latest_ns": latest_ns,
+        "latest_idle_ns": idle_ns,
+        "latest_reads": reads,
+        "read_new_ns": read_time / max(ring_samples, 1) * 1e9,
+        "ring_samples": ring_samples,
+        "torn_reads": torn,
+        "ring_errors": errors,
+        "retries": reader.retries,
+        "overruns": reader.overruns,
+    }
+    reader.close()
+    return result
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    print(f"latest():   {r['latest_ns']:.0f} ns/read over {r['latest_reads']} reads "
+          f"({r['retries']} seqlock retries, {r['torn_reads']} torn)")
+    print(f"latest():   {r['latest_idle_ns']:.0f} ns/read with the writer idle")
+    print(f"read_new(): {r['read_new_ns']:.0f} ns/sample over {r['ring_samples']} samples "
+          f"({r['overruns']} overrun, {r['ring_errors']} ordering errors)")
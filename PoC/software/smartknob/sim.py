@@ -0,0 +1,646 @@
+"""Simulated SmartKnob firmware on a pseudo-terminal (Linux/macOS).
+
+``SimulatedKnob`` speaks the serial protocol of ``PoC/firmware`` on a pty,
+so ``SmartKnobDriver`` can connect to it like real hardware. It keeps the
+firmware's parameters, acks every command the same way comms.cpp does,
+reports position changes and runs seeks (``A:Z`` → motion → ``A:SEEK_DONE``)
+and streamed trajectories (``Y`` waypoints, interpolated like trajectory.cpp).
+
+By default a seek simply slews to the target at ``MVL``. Pass a
+``RotorParams`` as *rotor* and seeks instead run the firmware's angle
+cascade (with the current ``MPP``/``MPI``/``MPD``/``MVL``) against that
+rotor via ``smartknob.model`` (needs numpy), so gain changes overshoot,
+ring and settle the way they would on hardware.
+
+The device is reachable through a stable symlink (``port``), like
+``/dev/serial/by-id/...``. ``unplug()`` closes the pty and removes the
+symlink; ``replug()`` recreates both and "reboots" with default
+parameters and the boot banner, which is what a real USB drop looks like.
+
+Usage:
+    from smartknob.sim import SimulatedKnob
+
+    sim = SimulatedKnob()
+    sim.start()
+    knob.connect(sim.port)
+    sim.turn_to(30.0)       # Simulate the user turning the knob
+    sim.unplug(); sim.replug()
+    sim.stop()
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import select
+import tempfile
+import termios
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+from smartknob.protocol import (
+    BAUD_PROBE_TIMEOUT_S,
+    BAUD_RATE,
+    RESP_BANNER,
+    SUPPORTED_BAUD_RATES,
+    TRAJ_BUFFER_SIZE,
+    TRAJ_PERIOD_S,
+)
+
+if TYPE_CHECKING:
+    from smartknob.model import ClosedLoop, RotorParams
+
+logger = logging.getLogger(__name__)
+
+# Firmware defaults (PoC/firmware/src/config.h, config.cpp)
+DEFAULT_PARAMS: dict[str, float] = {
+    "S": 36,      # detent_count
+    "D": 1.5,     # detent_strength
+    "J": 5.0,     # virtual_inertia
+    "B": 1.0,     # inertia_damping
+    "F": 0.2,     # inertia_friction
+    "K": 40.0,    # coupling_K
+    "E": 0.0,     # spring_center (deg)
+    "W": 10.0,    # spring_stiffness
+    "G": 0.1,     # spring_damping
+    "L": -60.0,   # bound_min (deg)
+    "U": 60.0,    # bound_max (deg)
+    "A": 20.0,    # wall_strength
+    "MPP": 50.0,  # POS_PID_P
+    "MPI": 0.0,   # POS_PID_I
+    "MPD": 0.3,   # POS_PID_D
+    "MVL": 40.0,  # DEFAULT_VELOCITY_LIMIT (rad/s)
+}
+
+MODE_NAMES: dict[str, str] = {"H": "HAPTIC", "I": "INERTIA", "C": "SPRING", "O": "BOUNDED"}
+
+# Ack decimals per command (Serial.println(float) prints 2; angles use 1)
+_ONE_DECIMAL = {"E", "L", "U", "MVL"}
+
+REPORT_INTERVAL_S = 0.02      # DEFAULT_REPORT_INTERVAL_MS
+REPORT_THRESHOLD_DEG = 0.5    # DEFAULT_REPORT_THRESHOLD_DEG
+SEEK_TOLERANCE_DEG = 3.4      # seek_tolerance_rad
+SEEK_SETTLE_S = 0.2           # SEEK_SETTLE_MS
+SEEK_TIMEOUT_S = 10.0         # SEEK_TIMEOUT_MS
+TRAJ_SETTLE_S = 0.05          # TRAJ_SETTLE_MS
+TRAJ_SETTLE_VELOCITY_DPS = 28.6  # TRAJ_SETTLE_VELOCITY (0.5 rad/s)
+TRAJ_STARVE_TIMEOUT_S = 0.5   # TRAJ_STARVE_TIMEOUT_MS
+
+# termios speed constant → baud, to see the rate the host configured
+_TERMIOS_BAUD = {getattr(termios, f"B{r}"): r for r in SUPPORTED_BAUD_RATES if hasattr(termios, f"B{r}")}
+
+
+class SimulatedKnob:
+    """Firmware stand-in on a pty.
+
+    Attributes:
+        mode: Current mode letter ("H", "I", "C", "O"; "Z" while seeking).
+        params: Current parameter values keyed by command ("S", "MPP", ...).
+        angle: Simulated shaft angle in degrees.
+        received: ``(perf_counter, command)`` for every command line.
+        on_command: Optional hook ``(command)`` called after each command.
+        baud: Firmware UART rate. While the host's rate differs (or
+              exceeds ``max_reliable_baud``) input is lost and output
+              arrives as garbage, like a real mismatched UART.
+        max_reliable_baud: Fastest rate the simulated link carries cleanly.
+        rotor: Physical rotor that seeks drive, or None for ideal slewing.
+        traj_underruns: Times the waypoint ring ran dry mid-stream.
+    """
+
+    def __init__(
+        self,
+        link_path: Optional[str] = None,
+        report_interval_s: float = REPORT_INTERVAL_S,
+        report_threshold_deg: float = REPORT_THRESHOLD_DEG,
+        rotor: Optional[RotorParams] = None,
+    ) -> None:
+        """
+        Args:
+            link_path: Symlink to expose the pty under (default: a temp path).
+            report_interval_s: Minimum time between position reports.
+            report_threshold_deg: Minimum change before a position report.
+            rotor: Simulate seeks against this rotor (see module docstring).
+
+        Raises:
+            RuntimeError: Platform has no pseudo-terminals (Windows).
+        """
+        if not hasattr(os, "openpty"):
+            raise RuntimeError("SimulatedKnob needs pseudo-terminals (Linux/macOS)")
+        self.port = link_path or os.path.join(
+            tempfile.gettempdir(), f"smartknob-sim-{os.getpid()}-{id(self):x}"
+        )
+        self.report_interval_s = report_interval_s
+        self.report_threshold_deg = report_threshold_deg
+        self.rotor = rotor
+
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._rx = bytearray()
+
+        # Device clock: micros() = (host perf_counter × (1 + drift) + offset)
+        self.clock_offset_s = 0.0
+        self.clock_drift_ppm = 0.0
+        self.report_timestamps = False
+
+        self.max_reliable_baud = max(SUPPORTED_BAUD_RATES)
+
+        self.received: list[tuple[float, str]] = []
+        self.on_command: Optional[Callable[[str], None]] = None
+        self._handlers: dict[str, Callable[[str, str], None]] = {}
+        self._register_handlers()
+        self._reset()
+
+    # ------------------------------------------------------------------ #
+    #  Lifecycle
+    # ------------------------------------------------------------------ #
+
+    @property
+    def plugged(self) -> bool:
+        """True while the pty is open and the port symlink exists."""
+        return self._master is not None
+
+    def start(self) -> None:
+        """Open the pty and start the firmware loop thread."""
+        self._plug(banner=False)
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="smartknob-sim")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the loop thread and remove the pty."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.unplug()
+
+    def unplug(self) -> None:
+        """Simulate a USB drop: close the pty and remove the device node."""
+        with self._lock:
+            for fd in (self._master, self._slave):
+                if fd is not None:
+                    os.close(fd)
+            self._master = self._slave = None
+            self._rx.clear()
+        if os.path.lexists(self.port):
+            os.unlink(self.port)
+
+    def replug(self) -> float:
+        """Re-create the device node with a freshly booted firmware.
+
+        Returns:
+            float: ``time.perf_counter()`` when the node appeared.
+        """
+        self._reset()
+        return self._plug(banner=True)
+
+    def _plug(self, banner: bool) -> float:
+        import tty
+
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        tty.setraw(master)
+        attrs = termios.tcgetattr(slave)
+        attrs[4] = attrs[5] = termios.B115200  # ptys start at 38400
+        termios.tcsetattr(slave, termios.TCSANOW, attrs)
+        with self._lock:
+            self._master, self._slave = master, slave
+        if banner:
+            self._write(f"{RESP_BANNER}\nH = Haptic, I = Inertia, C = Spring\n\n")
+        if os.path.lexists(self.port):
+            os.unlink(self.port)
+        os.symlink(os.ttyname(slave), self.port)
+        return time.perf_counter()
+
+    def _reset(self) -> None:
+        """Power-on state."""
+        self.mode = "H"
+        self.report_timestamps = False
+        self.baud = BAUD_RATE
+        self._baud_deadline: Optional[float] = None
+        self.params: dict[str, float] = dict(DEFAULT_PARAMS)
+        self.angle = 0.0
+        self._previous_mode = "H"
+        self._seek_target: Optional[float] = None
+        self._seek_settle_at: Optional[float] = None
+        self._seek_started_at = 0.0
+        self._seek_loop: Optional[ClosedLoop] = None
+        self._seek_carry_s = 0.0
+        self._seek_streamed = False
+        self._velocity_dps = 0.0
+        self._traj: Optional[collections.deque] = None
+        self._traj_phase_s = 0.0
+        self._traj_ending = False
+        self._traj_starved_at: Optional[float] = None
+        self.traj_underruns = 0
+        self._last_report_angle = 0.0
+        self._last_report_t = 0.0
+        self._last_step_t = time.perf_counter()
+
+    # ------------------------------------------------------------------ #
+    #  Test controls
+    # ------------------------------------------------------------------ #
+
+    def turn_to(self, angle_deg: float) -> None:
+        """Move the simulated shaft (as if turned by hand)."""
+        self.angle = float(angle_deg)
+
+    def device_time(self, host_time: Optional[float] = None) -> float:
+        """Simulated device clock in seconds at host ``perf_counter()`` *host_time*."""
+        if host_time is None:
+            host_time = time.perf_counter()
+        return host_time * (1.0 + self.clock_drift_ppm * 1e-6) + self.clock_offset_s
+
+    def device_micros(self, host_time: Optional[float] = None) -> int:
+        """The firmware's ``micros()`` (32-bit, wrapping) at *host_time*."""
+        return int(self.device_time(host_time) * 1e6) % (1 << 32)
+
+    def host_baud(self) -> Optional[int]:
+        """Rate the host configured on its end of the pty (None if unknown)."""
+        slave = self._slave
+        if slave is None:
+            return None
+        try:
+            return _TERMIOS_BAUD.get(termios.tcgetattr(slave)[5])
+        except termios.error:
+            return None
+
+    def link_ok(self) -> bool:
+        """True when both ends agree on a rate the link can carry."""
+        return self.host_baud() == self.baud and self.baud <= self.max_reliable_baud
+
+    def state(self) -> dict:
+        """Snapshot of mode and parameters (for comparisons in tests)."""
+        return {"mode": self.mode, **self.params}
+
+    # ------------------------------------------------------------------ #
+    #  Firmware loop
+    # ------------------------------------------------------------------ #
+
+    def _loop(self) -> None:
+        while self._running:
+            master = self._master
+            if master is None:
+                time.sleep(0.005)
+                continue
+            try:
+                ready, _, _ = select.select([master], [], [], 0.002)
+                if ready:
+                    data = os.read(master, 4096)
+                    if self.link_ok():
+                        self._rx += data
+                    else:
+                        self._rx.clear()  # Framing errors: nothing usable
+            except OSError:
+                # Slave side not open yet, or unplugged mid-read
+                time.sleep(0.002)
+            while b"\n" in self._rx:
+                raw, _, rest = self._rx.partition(b"\n")
+                self._rx = bytearray(rest)
+                line = raw.decode(errors="replace").strip()
+                if line:
+                    self._command(line)
+            self._step(time.perf_counter())
+
+    def _write(self, text: str) -> None:
+        data = text.encode()
+        if self._master is not None and not self.link_ok():
+            data = b"\xff" * len(data)
+        with self._lock:
+            if self._master is None:
+                return
+            try:
+                os.write(self._master, data)
+            except OSError:
+                pass
+
+    def _step(self, now: float) -> None:
+        """Advance seek motion and emit position reports."""
+        dt = now - self._last_step_t
+        self._last_step_t = now
+
+        if self._baud_deadline is not None and now > self._baud_deadline:
+            self._baud_deadline = None  # checkBaudProbe(): no probe, back to boot rate
+            self.baud = BAUD_RATE
+
+        if self._traj is not None and not self._step_trajectory(dt, now):
+            self._traj = None
+            self._seek_started_at = now
+            self._seek_settle_at = None
+            self._seek_streamed = True
+
+        if self._seek_target is not None:
+            before = self.angle
+            if self._seek_loop is not None:
+                self._step_rotor(dt)
+            else:
+                max_step = self.params["MVL"] * 57.29578 * dt
+                error = self._seek_target - self.angle
+                self.angle += max(-max_step, min(max_step, error))
+            if dt > 0:
+                self._velocity_dps = (self.angle - before) / dt
+            timed_out = now - self._seek_started_at > SEEK_TIMEOUT_S
+            settled = abs(self._seek_target - self.angle) < SEEK_TOLERANCE_DEG and (
+                not self._seek_streamed or abs(self._velocity_dps) < TRAJ_SETTLE_VELOCITY_DPS)
+            settle_s = TRAJ_SETTLE_S if self._seek_streamed else SEEK_SETTLE_S
+            if self._traj is not None:
+                pass  # Still streaming: the target is moving
+            elif not (timed_out or settled):
+                self._seek_settle_at = None
+            elif self._seek_settle_at is None:
+                self._seek_settle_at = now
+            elif now - self._seek_settle_at > settle_s:
+                if self._seek_loop is None:
+                    self.angle = self._seek_target
+                self._seek_target = None
+                self._seek_settle_at = None
+                self._seek_loop = None
+                self.mode = self._previous_mode
+                self._write(
+                    f"A:SEEK_DONE\nFinal position: {self.angle:.1f}, returning to "
+                    f"{MODE_NAMES[self.mode]}\n"
+                )
+
+        if (now - self._last_report_t >= self.report_interval_s
+                and abs(self.angle - self._last_report_angle) >= self.report_threshold_deg):
+            if self.report_timestamps:
+                self._write(f"P{self.angle:.2f}@{self.device_micros(now)}\n")
+            else:
+                self._write(f"P{self.angle:.2f}\n")
+            self._last_report_angle = self.angle
+            self._last_report_t = now
+
+    def _step_trajectory(self, dt: float, now: float) -> bool:
+        """Advance the waypoint clock (updateTrajectory()); False once the stream finished."""
+        traj = self._traj
+        if not traj:
+            return not self._traj_ending
+        self._traj_phase_s += dt
+        while self._traj_phase_s >= TRAJ_PERIOD_S and len(traj) >= 2:
+            traj.popleft()
+            self._traj_phase_s -= TRAJ_PERIOD_S
+        if len(traj) >= 2:
+            target = traj[0] + (traj[1] - traj[0]) * (self._traj_phase_s / TRAJ_PERIOD_S)
+            self._traj_starved_at = None
+            finished = False
+        else:
+            target = traj[0]
+            self._traj_phase_s = 0.0
+            finished = self._traj_ending
+            if not finished and self._traj_starved_at is None:
+                self._traj_starved_at = now
+                self.traj_underruns += 1
+            elif not finished and now - self._traj_starved_at > TRAJ_STARVE_TIMEOUT_S:
+                finished = True
+        self._seek_target = target
+        if self._seek_loop is not None:
+            self._seek_loop.retarget(target / 57.29578)
+        return not finished
+
+    def _step_rotor(self, dt: float) -> None:
+        """Run the seek cascade in firmware-loop substeps covering *dt*."""
+        loop = self._seek_loop
+        self._seek_carry_s += dt
+        steps = int(self._seek_carry_s / loop.dt)
+        self._seek_carry_s -= steps * loop.dt
+        for _ in range(steps):
+            loop.step()
+        self.angle = float(loop.angle[0]) * 57.29578
+
+    # ------------------------------------------------------------------ #
+    #  Command handlers (mirror comms.cpp)
+    # ------------------------------------------------------------------ #
+
+    def _register_handlers(self) -> None:
+        for letter in MODE_NAMES:
+            self._handlers[letter] = self._do_mode
+        for letter in ("S", "D", "J", "B", "F", "K", "W", "E", "G", "L", "U", "A"):
+            self._handlers[letter] = self._do_param
+        self._handlers["M"] = self._do_motor
+        self._handlers["P"] = self._do_query_position
+        self._handlers["Q"] = self._do_query_state
+        self._handlers["Z"] = self._do_seek
+        self._handlers["Y"] = self._do_trajectory
+        self._handlers["T"] = self._do_time
+        self._handlers["R"] = self._do_baud
+
+    def _command(self, line: str) -> None:
+        self.received.append((time.perf_counter(), line))
+        handler = self._handlers.get(line[0])
+        if handler is None:
+            self._write(f"Unknown command: {line}\n")
+        else:
+            handler(line[0], line[1:])
+        if self.on_command:
+            self.on_command(line)
+
+    def _do_mode(self, letter: str, arg: str) -> None:
+        self.mode = letter
+        self._seek_target = None
+        self._seek_loop = None
+        self._traj = None
+        self._write(f"A:{letter}\nMode: {MODE_NAMES[letter]}\n")
+
+    def _do_param(self, letter: str, arg: str) -> None:
+        if letter == "E" and not arg:
+            value = self.angle
+        else:
+            try:
+                value = float(arg)
+            except ValueError:
+                value = 0.0
+        if letter == "S":
+            value = int(max(2, min(360, value)))
+            self.params[letter] = value
+            self._write(f"A:S{value}\n")
+            return
+        self.params[letter] = value
+        decimals = 1 if letter in _ONE_DECIMAL else 2
+        self._write(f"A:{letter}{value:.{decimals}f}\n")
+
+    def _do_motor(self, letter: str, arg: str) -> None:
+        key = "M" + arg[:2]
+        if key not in self.params:
+            p = self.params
+            self._write(f"PP={p['MPP']:.2f} PI={p['MPI']:.2f} PD={p['MPD']:.2f} VL={p['MVL']:.1f}\n")
+            return
+        try:
+            value = float(arg[2:])
+        except ValueError:
+            value = 0.0
+        self.params[key] = value
+        decimals = 1 if key in _ONE_DECIMAL else 2
+        self._write(f"A:{key}{value:.{decimals}f}\n")
+
+    def _do_query_position(self, letter: str, arg: str) -> None:
+        self._write(f"P{self.angle:.2f}\n")
+
+    def _do_query_state(self, letter: str, arg: str) -> None:
+        p = self.params
+        mode = "POSITION" if self.mode == "Z" else MODE_NAMES[self.mode]
+        self._write(
+            "=== State ===\n"
+            f"Mode: {mode}\n"
+            f"Position: {self.angle:.2f} deg\n"
+            f"Detent count: {p['S']}\n"
+            f"Detent strength: {p['D']:.2f}\n"
+        )
+
+    def _do_time(self, letter: str, arg: str) -> None:
+        if not arg:
+            self._write(f"T{self.device_micros()}\n")
+        elif arg[0] == "S":
+            self.report_timestamps = arg[1:2] == "1"
+            self._write(f"A:TS{int(self.report_timestamps)}\n")
+
+    def _do_baud(self, letter: str, arg: str) -> None:
+        if not arg:
+            self._baud_deadline = None
+            self._write(f"R{self.baud}\n")
+            return
+        try:
+            requested = int(arg)
+        except ValueError:
+            requested = 0
+        if requested not in SUPPORTED_BAUD_RATES:
+            self._write("A:R0\n")
+            return
+        self._write(f"A:R{requested}\n")
+        self._rx.clear()
+        self.baud = requested
+        self._baud_deadline = (
+            None if requested == BAUD_RATE else time.perf_counter() + BAUD_PROBE_TIMEOUT_S
+        )
+
+    def _do_seek(self, letter: str, arg: str) -> None:
+        if not arg:
+            self._write(f"Position: {self.angle:.2f}\n")
+            return
+        target = float(arg)
+        if self.mode != "Z":
+            self._previous_mode = self.mode
+        self.mode = "Z"
+        self._seek_target = target
+        self._seek_settle_at = None
+        self._seek_started_at = time.perf_counter()
+        self._seek_streamed = False
+        self._traj = None
+        if self.rotor is not None:
+            self._seek_loop = self._rotor_loop(target)
+        self._write(f"A:Z{target:.1f}\nSeeking to: {target:.2f} deg\n")
+
+    def _do_trajectory(self, letter: str, arg: str) -> None:
+        if arg == "E":
+            self._traj_ending = True
+            self._write("A:YE\n")
+            return
+        if arg:
+            if self.mode != "Z" or self._traj is None:
+                if self.mode != "Z":
+                    self._previous_mode = self.mode
+                self.mode = "Z"
+                self._traj = collections.deque()
+                self._traj_phase_s = 0.0
+                self._traj_ending = False
+                self._traj_starved_at = None
+                self._seek_target = self.angle
+                self._seek_settle_at = None
+                self._seek_streamed = False
+                if self.rotor is not None:
+                    self._seek_loop = self._rotor_loop(self.angle)
+            for text in arg.split(","):
+                if len(self._traj) < TRAJ_BUFFER_SIZE:
+                    try:
+                        self._traj.append(float(text))
+                    except ValueError:
+                        self._traj.append(0.0)  # atof()
+        free = TRAJ_BUFFER_SIZE - (len(self._traj) if self._traj is not None else 0)
+        self._write(f"A:Y{free}\n")
+
+    def _rotor_loop(self, target_deg: float) -> ClosedLoop:
+        from smartknob.model import ClosedLoop, SeekGains
+
+        p = self.params
+        gains = SeekGains(pos_p=p["MPP"], pos_i=p["MPI"], pos_d=p["MPD"], velocity_limit=p["MVL"])
+        velocity = float(self._seek_loop.velocity[0]) if self._seek_loop is not None else 0.0
+        self._seek_carry_s = 0.0
+        return ClosedLoop("position", self.angle / 57.29578, velocity, rotor=self.rotor, gains=gains,
+                          target=target_deg / 57.29578)
+
+
+# ======================== Benchmarks ========================
+
+
+def benchmark_reconnect(cycles: int = 10, down_s: float = 0.3) -> dict:
+    """Unplug/replug a simulated knob and time how long haptics take to return.
+
+    The driver is configured with a mode and several parameters, then the
+    device is unplugged for *down_s* and replugged with firmware defaults.
+    Time-to-restore runs from the device node reappearing until the
+    simulator's mode and parameters match the pre-unplug state again.
+
+    Returns:
+        dict: restore_ms list plus min/median/max, and reconnect states seen.
+    """
+    from smartknob.driver import SmartKnobDriver
+    from smartknob.protocol import HapticMode
+
+    sim = SimulatedKnob()
+    sim.start()
+    knob = SmartKnobDriver()
+    states: list[str] = []
+    knob.on_connection_state = lambda st: states.append(st.value)
+    knob.connect(sim.port)
+
+    knob.set_detent_count(24)
+    knob.set_detent_strength(2.5)
+    knob.set_lower_bound(-90.0)
+    knob.set_upper_bound(90.0)
+    knob.set_wall_strength(30.0)
+    knob.set_pid_p(40.0)
+    knob.set_mode(HapticMode.BOUNDED)
+    deadline = time.perf_counter() + 2.0
+    while sim.mode != "O" and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    expected = sim.state()
+
+    restore_ms = []
+    try:
+        for _ in range(cycles):
+            sim.unplug()
+            time.sleep(down_s)
+            t0 = sim.replug()
+            deadline = t0 + 5.0
+            while sim.state() != expected and time.perf_counter() < deadline:
+                time.sleep(0.0005)
+            if sim.state() == expected:
+                restore_ms.append((time.perf_counter() - t0) * 1e3)
+            time.sleep(0.05)
+    finally:
+        knob.disconnect()
+        sim.stop()
+
+    ordered = sorted(restore_ms)
+    n = len(ordered)
+    return {
+        "restore_ms": restore_ms,
+        "restored": n,
+        "cycles": cycles,
+        "min_ms": ordered[0] if n else float("nan"),
+        "median_ms": ordered[n // 2] if n else float("nan"),
+        "max_ms": ordered[-1] if n else float("nan"),
+        "states": states,
+    }
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark_reconnect()
+    print(f"Unplug/replug restored {r['restored']}/{r['cycles']}: "
+          f"min {r['min_ms']:.1f} ms, median {r['median_ms']:.1f} ms, max {r['max_ms']:.1f} ms")
+    print(f"States: {' → '.join(r['states'])}")
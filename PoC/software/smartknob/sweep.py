@@ -0,0 +1,435 @@
+"""Parallel parameter sweeps over the closed-loop haptic model.
+
+Tunes firmware parameters offline: every sample is a full closed-loop
+simulation (``model.simulate_closed_loop``) of one scenario, scored for
+overshoot, settle time, oscillation and peak voltage (``model.score``).
+
+Samples come from a parameter space — ``{name: [values]}`` for a grid
+axis, ``{name: (low, high)}`` for a sampled range:
+
+    grid(space)                     cartesian product of the value lists
+    random_samples(space, n, seed)  uniform in each range
+    latin_hypercube(space, n, seed) one sample per stratum of each range
+
+Names are ``HapticParams``, ``SeekGains`` or ``RotorParams`` fields
+(``coupling_K``, ``virtual_inertia``, ``pos_p``, ``velocity_limit``, ...).
+
+``Sweep`` splits the samples into chunks; each chunk is one vectorized
+simulation run in a worker process, so throughput scales with cores.
+Results are columnar and written per chunk, atomically, to the output
+directory::
+
+    sweep.json          scenario, chunk size, parameter names
+    samples.npz         one column per parameter
+    chunks/NNNNNN.npz   score columns for the chunk's sample range
+    results.npz         parameters + scores, merged by collect()
+
+Re-running a sweep on the same directory skips finished chunks, so an
+interrupted sweep resumes where it stopped.
+
+Usage:
+    space = {"pos_p": (5.0, 100.0), "pos_d": (0.0, 1.0), "velocity_limit": [20, 40, 60]}
+    sweep = Sweep("sweeps/seek", "seek", latin_hypercube(space, 2000))
+    results = sweep.run()
+    for i in rank(results, "settle_s", {"overshoot_pct": 10})[:5]: ...
+
+    # or: smartknob sweep sweeps/seek --scenario seek --range pos_p=5:100 --lhs 2000
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from smartknob.model import (
+    DEFAULT_GAINS,
+    DEFAULT_PARAMS,
+    DEFAULT_ROTOR,
+    HapticParams,
+    RotorParams,
+    SeekGains,
+    score,
+    simulate_closed_loop,
+)
+
+Space = dict[str, Union[list, tuple]]
+
+DEFAULT_CHUNK_SIZE: int = 256
+"""Samples per vectorized simulation (one worker task)."""
+
+SCORE_COLUMNS: tuple[str, ...] = (
+    "overshoot_deg", "overshoot_pct", "settle_s", "oscillations", "peak_v", "saturated_pct", "final_error_deg",
+)
+
+SCENARIOS: dict[str, dict] = {
+    "seek": {"mode": "position", "description": "Z seek from 0° to 90°", "duration_s": 1.5},
+    "spring_release": {"mode": "spring", "description": "Let go 60° from the spring center", "duration_s": 1.0},
+    "haptic_snap": {"mode": "haptic", "description": "Let go 40% of a detent away from one", "duration_s": 0.6},
+    "wall_release": {"mode": "bounded", "description": "Let go 10° past the upper bound", "duration_s": 1.0},
+    "inertia_flick": {"mode": "inertia", "description": "Let go at 10 rad/s, coast to rest", "duration_s": 5.0},
+}
+"""Closed-loop scenarios a sweep can score."""
+
+_GROUPS = {
+    "params": {f.name for f in fields(HapticParams)},
+    "gains": {f.name for f in fields(SeekGains)},
+    "rotor": {f.name for f in fields(RotorParams)},
+}
+
+
+# ======================== Sampling ========================
+
+
+def _check_space(space: Space) -> None:
+    known = set().union(*_GROUPS.values())
+    unknown = set(space) - known
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    for name, axis in space.items():
+        if isinstance(axis, tuple):
+            if len(axis) != 2 or not axis[0] <= axis[1]:
+                raise ValueError(f"{name}: range must be (low, high), got {axis!r}")
+        elif not isinstance(axis, list) or not axis:
+            raise ValueError(f"{name}: expected a non-empty list of values or a (low, high) range")
+
+
+def grid(space: Space) -> dict[str, np.ndarray]:
+    """
+    Cartesian product of list axes (a ``(low, high)`` range counts as its
+    two end points).
+
+    Returns:
+        dict: {name: column}, all columns the same length.
+    """
+    _check_space(space)
+    names = list(space)
+    axes = [list(space[n]) for n in names]
+    rows = np.array(list(itertools.product(*axes)), dtype=float).reshape(-1, len(names))
+    return {name: rows[:, i].copy() for i, name in enumerate(names)}
+
+
+def random_samples(space: Space, n: int, seed: int = 0) -> dict[str, np.ndarray]:
+    """*n* samples, uniform within ranges and uniform over list values."""
+    _check_space(space)
+    rng = np.random.default_rng(seed)
+    out = {}
+    for name, axis in space.items():
+        if isinstance(axis, tuple):
+            out[name] = rng.uniform(axis[0], axis[1], n)
+        else:
+            out[name] = rng.choice(np.asarray(axis, dtype=float), n)
+    return out
+
+
+def latin_hypercube(space: Space, n: int, seed: int = 0) -> dict[str, np.ndarray]:
+    """
+    *n* Latin-hypercube samples: each range is split into *n* strata and
+    every stratum is used exactly once. List axes are cycled evenly.
+    """
+    _check_space(space)
+    rng = np.random.default_rng(seed)
+    out = {}
+    for name, axis in space.items():
+        if isinstance(axis, tuple):
+            u = (rng.permutation(n) + rng.uniform(0.0, 1.0, n)) / n
+            out[name] = axis[0] + u * (axis[1] - axis[0])
+        else:
+            values = np.asarray(axis, dtype=float)
+            out[name] = rng.permutation(np.resize(values, n))
+    return out
+
+
+# ======================== Simulation ========================
+
+
+def evaluate(scenario: str, columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    Simulate and score one batch of samples.
+
+    Args:
+        scenario: Key of ``SCENARIOS``.
+        columns: {parameter: values}, all the same length.
+
+    Returns:
+        dict: One array per ``SCORE_COLUMNS`` entry.
+
+    Raises:
+        ValueError: Unknown scenario or parameter.
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario {scenario!r} (expected one of {', '.join(SCENARIOS)})")
+    spec = SCENARIOS[scenario]
+    groups: dict[str, dict] = {"params": {}, "gains": {}, "rotor": {}}
+    for name, values in columns.items():
+        group = next((g for g, names in _GROUPS.items() if name in names), None)
+        if group is None:
+            raise ValueError(f"Unknown parameter {name!r}")
+        groups[group][name] = np.asarray(values, dtype=float)
+    params = HapticParams(**{**vars(DEFAULT_PARAMS), **groups["params"]})
+    gains = SeekGains(**{**vars(DEFAULT_GAINS), **groups["gains"]})
+    rotor = RotorParams(**{**vars(DEFAULT_ROTOR), **groups["rotor"]})
+
+    mode = spec["mode"]
+    velocity0, target = 0.0, 0.0
+    if scenario == "seek":
+        angle0, target = 0.0, math.radians(90.0)
+    elif scenario == "spring_release":
+        target = np.asarray(params.spring_center)
+        angle0 = target + math.radians(60.0)
+    elif scenario == "haptic_snap":
+        angle0 = 0.4 * 2 * np.pi / np.asarray(params.detent_count, dtype=float)
+    elif scenario == "wall_release":
+        target = np.asarray(params.bound_max)
+        angle0 = target + math.radians(10.0)
+    else:
+        angle0, velocity0, target = 0.0, 10.0, None
+
+    trace = simulate_closed_loop(mode, angle0, velocity0, params, rotor, gains,
+                                 0.0 if target is None else target, spec["duration_s"])
+    return score(trace, target)
+
+
+def _run_chunk(out_dir: str, scenario: str, chunk: int, columns: dict[str, np.ndarray]) -> tuple[int, int, float]:
+    """Worker: evaluate one chunk and write it atomically."""
+    t0 = time.perf_counter()
+    scores = evaluate(scenario, columns)
+    path = _chunk_path(out_dir, chunk)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, **scores)
+    os.replace(tmp, path)
+    return chunk, len(next(iter(columns.values()))), time.perf_counter() - t0
+
+
+def _chunk_path(out_dir: str, chunk: int) -> str:
+    return os.path.join(out_dir, "chunks", f"{chunk:06d}.npz")
+
+
+# ======================== Sweep ========================
+
+
+class Sweep:
+    """A resumable sweep stored in *out_dir*.
+
+    Args:
+        out_dir: Output directory.
+        scenario: Key of ``SCENARIOS`` (None to reopen an existing sweep).
+        samples: {parameter: column} (None to reopen an existing sweep).
+        chunk_size: Samples per worker task.
+
+    Raises:
+        ValueError: *out_dir* holds a different sweep, nothing to reopen,
+                    or an unknown scenario / parameter.
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        scenario: Optional[str] = None,
+        samples: Optional[dict[str, np.ndarray]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.out_dir = out_dir
+        manifest_path = os.path.join(out_dir, "sweep.json")
+        existing = os.path.exists(manifest_path)
+        if existing:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            with np.load(os.path.join(out_dir, "samples.npz")) as data:
+                stored = {name: data[name] for name in manifest["parameters"]}
+            if samples is not None and (
+                scenario != manifest["scenario"]
+                or set(samples) != set(stored)
+                or any(not np.array_equal(np.asarray(samples[k], dtype=float), stored[k]) for k in stored)
+            ):
+                raise ValueError(f"{out_dir} holds a different sweep; use a new directory")
+            self.scenario = manifest["scenario"]
+            self.chunk_size = manifest["chunk_size"]
+            self.samples = stored
+        else:
+            if scenario is None or samples is None:
+                raise ValueError(f"No sweep in {out_dir} to resume")
+            if scenario not in SCENARIOS:
+                raise ValueError(f"Unknown scenario {scenario!r} (expected one of {', '.join(SCENARIOS)})")
+            _check_space({name: [0.0] for name in samples})
+            lengths = {len(v) for v in samples.values()}
+            if len(lengths) != 1:
+                raise ValueError("All sample columns must have the same length")
+            self.scenario = scenario
+            self.chunk_size = chunk_size
+            self.samples = {k: np.asarray(v, dtype=float) for k, v in samples.items()}
+            os.makedirs(os.path.join(out_dir, "chunks"), exist_ok=True)
+            np.savez(os.path.join(out_dir, "samples.npz"), **self.samples)
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump({"scenario": scenario, "chunk_size": chunk_size, "parameters": list(self.samples),
+                           "count": self.count}, f, indent=2)
+
+    @property
+    def count(self) -> int:
+        return len(next(iter(self.samples.values())))
+
+    @property
+    def chunks(self) -> int:
+        return math.ceil(self.count / self.chunk_size)
+
+    def pending(self) -> list[int]:
+        """Chunks without a result file."""
+        return [c for c in range(self.chunks) if not os.path.exists(_chunk_path(self.out_dir, c))]
+
+    def _columns(self, chunk: int) -> dict[str, np.ndarray]:
+        sl = slice(chunk * self.chunk_size, (chunk + 1) * self.chunk_size)
+        return {name: column[sl] for name, column in self.samples.items()}
+
+    def run(
+        self,
+        workers: Optional[int] = None,
+        max_chunks: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Optional[dict[str, np.ndarray]]:
+        """
+        Evaluate all pending chunks.
+
+        Args:
+            workers: Worker processes (default: CPU count; 0 = run inline).
+            max_chunks: Stop after this many chunks (the rest stay pending).
+            progress: Called as ``progress(done, total)`` after each chunk.
+
+        Returns:
+            dict | None: ``collect()`` result once every chunk is done,
+                         else None.
+        """
+        pending = self.pending()
+        if max_chunks is not None:
+            pending = pending[:max_chunks]
+        done = self.chunks - len(self.pending())
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 0:
+            for chunk in pending:
+                _run_chunk(self.out_dir, self.scenario, chunk, self._columns(chunk))
+                done += 1
+                if progress:
+                    progress(done, self.chunks)
+        elif pending:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                futures = [pool.submit(_run_chunk, self.out_dir, self.scenario, c, self._columns(c))
+                           for c in pending]
+                for future in as_completed(futures):
+                    future.result()
+                    done += 1
+                    if progress:
+                        progress(done, self.chunks)
+        return self.collect() if not self.pending() else None
+
+    def collect(self) -> dict[str, np.ndarray]:
+        """
+        Merge samples and chunk scores into ``results.npz``.
+
+        Returns:
+            dict: Parameter and score columns.
+
+        Raises:
+            RuntimeError: Chunks are still pending.
+        """
+        missing = self.pending()
+        if missing:
+            raise RuntimeError(f"{len(missing)} of {self.chunks} chunks still pending")
+        parts = []
+        for chunk in range(self.chunks):
+            with np.load(_chunk_path(self.out_dir, chunk)) as data:
+                parts.append({k: data[k] for k in SCORE_COLUMNS})
+        results = dict(self.samples)
+        for column in SCORE_COLUMNS:
+            results[column] = np.concatenate([p[column] for p in parts])
+        np.savez(os.path.join(self.out_dir, "results.npz"), **results)
+        return results
+
+
+def load_results(out_dir: str) -> dict[str, np.ndarray]:
+    """Columns of a finished sweep's ``results.npz``."""
+    with np.load(os.path.join(out_dir, "results.npz")) as data:
+        return {k: data[k] for k in data.files}
+
+
+def rank(
+    results: dict[str, np.ndarray],
+    by: str = "settle_s",
+    limits: Optional[dict[str, float]] = None,
+) -> np.ndarray:
+    """
+    Sample indices ordered best-first.
+
+    Args:
+        results: Columns from ``Sweep.run()`` / ``load_results()``.
+        by: Score column to minimise.
+        limits: Upper bounds that must hold, e.g. ``{"overshoot_pct": 10}``.
+
+    Returns:
+        np.ndarray: Indices of samples within the limits, best first.
+    """
+    ok = np.isfinite(results[by])
+    for column, bound in (limits or {}).items():
+        ok &= results[column] <= bound
+    candidates = np.flatnonzero(ok)
+    return candidates[np.argsort(results[by][candidates], kind="stable")]
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(samples: int = 2048, chunk_size: int = 128) -> dict:
+    """
+    Sweep seek gains with 1, 2, 4, ... workers up to the CPU count, then
+    check that an interrupted and resumed sweep matches a straight run.
+
+    Returns:
+        dict: Samples/s per worker count, resume check and the best gains.
+    """
+    import tempfile
+
+    space = {"pos_p": (5.0, 100.0), "pos_d": (0.0, 1.0), "velocity_limit": (10.0, 60.0)}
+    cols = latin_hypercube(space, samples, seed=1)
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, *[2 ** k for k in range(1, 8) if 2 ** k <= cpus], cpus})
+    result: dict = {"samples": samples, "cpus": cpus, "rates": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in counts:
+            t0 = time.perf_counter()
+            Sweep(os.path.join(tmp, f"w{workers}"), "seek", cols, chunk_size).run(workers=workers)
+            result["rates"][workers] = samples / (time.perf_counter() - t0)
+
+        straight = load_results(os.path.join(tmp, "w1"))
+        resumed_dir = os.path.join(tmp, "resumed")
+        Sweep(resumed_dir, "seek", cols, chunk_size).run(workers=1, max_chunks=5)  # "Interrupted"
+        reopened = Sweep(resumed_dir)
+        result["pending_after_interrupt"] = len(reopened.pending())
+        resumed = reopened.run(workers=1)
+        result["resume_matches"] = all(np.array_equal(straight[k], resumed[k]) for k in straight)
+
+    best = rank(straight, "settle_s", {"overshoot_pct": 5.0})
+    if len(best):
+        i = best[0]
+        result["best"] = {k: float(straight[k][i]) for k in (*space, "settle_s", "overshoot_pct", "peak_v")}
+    return result
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    r = benchmark()
+    base = r["rates"][1]
+    print(f"{r['samples']} seek simulations, {r['cpus']} CPUs:")
+    for workers, rate in r["rates"].items():
+        print(f"  {workers:3d} workers: {rate:7.0f} samples/s  (x{rate / base:.2f})")
+    print(f"Resume after interrupt ({r['pending_after_interrupt']} chunks left): "
+          f"{'identical' if r['resume_matches'] else 'MISMATCH'}")
+    if "best" in r:
+        b = r["best"]
+        print(f"Best (overshoot <= 5%): MPP={b['pos_p']:.1f} MPD={b['pos_d']:.2f} MVL={b['velocity_limit']:.0f} "
+              f"→ settle {b['settle_s'] * 1e3:.0f} ms, overshoot {b['overshoot_pct']:.1f}%, peak {b['peak_v']:.1f} V")
@@ -0,0 +1,85 @@
+"""Position traces for offline replays and benchmarks.
+
+A trace is a list of ``(time_s, angle_deg)`` samples, either recorded
+(``smartknob record`` writes CSV rows of ``time_s,angle_deg,...``) or
+generated from a shape function with sensor-like noise. The gesture
+recognizer, the integration jitter filter and ``smartknob replay`` all
+read the same format through this module.
+
+Usage:
+    trace = load_trace("session.csv")
+    traces = load_traces(sys.argv[1:])          # {file stem: trace}
+
+    rng = random.Random(1)
+    flick = synthesize(3.0, lambda t: 90.0 * ramp(t, 0.5, 0.8), 50.0, 0.15, rng)
+"""
+
+from __future__ import annotations
+
+import csv
+import random
+import time
+from pathlib import Path
+from typing import Callable, Sequence
+
+Trace = list[tuple[float, float]]
+"""``(time_s, angle_deg)`` samples in time order."""
+
+
+def load_trace(path: Path | str) -> Trace:
+    """
+    Read a recorded position trace: CSV rows of ``time_s,angle_deg``
+    (a header row and extra columns are ignored).
+    """
+    trace = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            try:
+                trace.append((float(row[0]), float(row[1])))
+            except (IndexError, ValueError):
+                continue
+    return trace
+
+
+def load_traces(paths: Sequence[Path | str]) -> dict[str, Trace]:
+    """``load_trace()`` each of *paths*, keyed by file stem (empty if none)."""
+    return {Path(p).stem: load_trace(p) for p in paths}
+
+
+def synthesize(
+    duration_s: float,
+    shape: Callable[[float], float],
+    rate_hz: float,
+    noise_deg: float,
+    rng: random.Random,
+) -> Trace:
+    """
+    Sample *shape(t)* at *rate_hz* with Gaussian noise, rounded to the
+    firmware's 2 decimals.
+    """
+    dt = 1.0 / rate_hz
+    n = int(duration_s * rate_hz)
+    return [(i * dt, round(shape(i * dt) + rng.gauss(0.0, noise_deg), 2)) for i in range(n)]
+
+
+def ramp(t: float, t0: float, t1: float) -> float:
+    """0 before *t0*, 1 after *t1*, linear in between."""
+    return min(max((t - t0) / (t1 - t0), 0.0), 1.0)
+
+
+def smooth(t: float, t0: float, t1: float) -> float:
+    """``ramp()`` eased in and out (smoothstep)."""
+    x = ramp(t, t0, t1)
+    return x * x * (3 - 2 * x)
+
+
+def timed(fn: Callable[[float, float], object], trace: Trace) -> tuple[list, float]:
+    """
+    Call ``fn(angle_deg, time_s)`` for every sample.
+
+    Returns:
+        tuple: (results in order, elapsed seconds)
+    """
+    t0 = time.perf_counter()
+    out = [fn(a, t) for t, a in trace]
+    return out, time.perf_counter() - t0
@@ -0,0 +1,295 @@
+"""Opt-in cross-thread timeline tracing in Chrome trace-event format.
+
+A knob-to-volume update crosses three threads: the serial reader parses
+the line and runs ``on_position``, the GUI re-schedules onto the Tk loop
+with ``root.after``, and the Tk loop runs ``process_position`` which may
+block on an OS call. ``Tracer`` records each step as a complete span
+("X" event) in a per-thread ring buffer, plus flow arrows ("s"/"f") for
+hand-offs between threads, and exports them as JSON that
+``chrome://tracing`` and https://ui.perfetto.dev open directly.
+
+Disabled by default. Instrumented code reads ``tracing.TRACER`` once and
+skips everything while it is None.
+
+Span names used by the package:
+    serial.read        reader thread: bytes returned by ser.read()
+    serial.line        reader thread: parse + dispatch of one line
+    callback.position  reader thread: on_position callback
+    callback.ack       reader thread: on_ack callback
+    serial.write       any thread: one command written
+    tk.after           flow from on_position to the Tk loop
+    tk.position        Tk loop: position display + link processing
+    process_position   WindowsLink → integration.process()
+    os.write / os.scroll / os.key   OS backend calls
+
+Usage:
+    tracing.enable()
+    ...
+    tracing.export("knob.trace.json")
+
+    # or: SMARTKNOB_TRACE=knob.trace.json python -m smartknob_windows.gui.app
+"""
+
+from __future__ import annotations
+
+import atexit
+import collections
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR: str = "SMARTKNOB_TRACE"
+"""Environment variable holding the output path; tracing is enabled when set."""
+
+DEFAULT_EVENTS_PER_THREAD: int = 200_000
+"""Ring size per thread; older events are dropped first."""
+
+
+class Tracer:
+    """Collects spans into per-thread ring buffers.
+
+    Times are ``time.perf_counter()`` seconds, the same clock the driver
+    uses for arrival times, so spans from every thread share one axis.
+    """
+
+    def __init__(self, max_events_per_thread: int = DEFAULT_EVENTS_PER_THREAD) -> None:
+        self.max_events_per_thread = max_events_per_thread
+        self.start_time = time.perf_counter()
+        self._local = threading.local()
+        self._buffers: list[tuple[int, str, collections.deque]] = []
+        self._lock = threading.Lock()
+        self._flow_ids = itertools.count(1)
+
+    def _buffer(self) -> collections.deque:
+        try:
+            return self._local.events
+        except AttributeError:
+            events: collections.deque = collections.deque(maxlen=self.max_events_per_thread)
+            self._local.events = events
+            thread = threading.current_thread()
+            with self._lock:
+                self._buffers.append((thread.ident or 0, thread.name, events))
+            return events
+
+    # ------------------------------------------------------------------ #
+    #  Recording
+    # ------------------------------------------------------------------ #
+
+    def complete(self, name: str, start: float, end: float, cat: str = "", args: Optional[dict] = None) -> None:
+        """Record a span that ran from *start* to *end* (perf_counter seconds)."""
+        self._buffer().append(("X", name, cat, start, end - start, args))
+
+    @contextmanager
+    def span(self, name: str, cat: str = "", args: Optional[dict] = None) -> Iterator[None]:
+        """Context manager recording the enclosed block as a span."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._buffer().append(("X", name, cat, start, time.perf_counter() - start, args))
+
+    def instant(self, name: str, cat: str = "", args: Optional[dict] = None) -> None:
+        """Record a point event."""
+        self._buffer().append(("i", name, cat, time.perf_counter(), 0.0, args))
+
+    def flow_start(self, name: str, cat: str = "flow") -> int:
+        """Start a cross-thread arrow (call inside the sending span).
+
+        Returns:
+            int: Flow id to pass to ``flow_end()`` on the receiving thread.
+        """
+        flow_id = next(self._flow_ids)
+        self._buffer().append(("s", name, cat, time.perf_counter(), 0.0, flow_id))
+        return flow_id
+
+    def flow_end(self, flow_id: int, name: str, cat: str = "flow") -> None:
+        """Finish an arrow (call inside the receiving span)."""
+        self._buffer().append(("f", name, cat, time.perf_counter(), 0.0, flow_id))
+
+    # ------------------------------------------------------------------ #
+    #  Export
+    # ------------------------------------------------------------------ #
+
+    def events(self) -> list[dict]:
+        """All recorded events as trace-event dicts (µs since tracer start)."""
+        pid = os.getpid()
+        t0 = self.start_time
+        out: list[dict] = [{"ph": "M", "name": "process_name", "pid": pid, "args": {"name": "smartknob"}}]
+        with self._lock:
+            buffers = list(self._buffers)
+        for tid, thread_name, events in buffers:
+            out.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid,
+                        "args": {"name": thread_name}})
+            for ph, name, cat, ts, dur, extra in list(events):
+                event = {"ph": ph, "name": name, "cat": cat or "smartknob", "pid": pid, "tid": tid,
+                         "ts": (ts - t0) * 1e6}
+                if ph == "X":
+                    event["dur"] = dur * 1e6
+                    if extra:
+                        event["args"] = extra
+                elif ph in ("s", "f"):
+                    event["id"] = extra
+                    if ph == "f":
+                        event["bp"] = "e"  # Bind to the enclosing span
+                else:
+                    event["s"] = "t"
+                    if extra:
+                        event["args"] = extra
+                out.append(event)
+        return out
+
+    def export(self, path: str) -> int:
+        """Write Chrome/Perfetto trace JSON to *path*.
+
+        Returns:
+            int: Number of events written.
+        """
+        events = self.events()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info("Wrote %d trace events to %s", len(events), path)
+        return len(events)
+
+    def durations(self, name: str) -> list[float]:
+        """Durations (seconds) of all spans called *name*, for quick summaries."""
+        with self._lock:
+            buffers = list(self._buffers)
+        return [e[4] for _, _, events in buffers for e in list(events) if e[0] == "X" and e[1] == name]
+
+
+TRACER: Optional[Tracer] = None
+"""The active tracer, or None when tracing is off."""
+
+
+def enable(max_events_per_thread: int = DEFAULT_EVENTS_PER_THREAD) -> Tracer:
+    """Start tracing (replaces any active tracer)."""
+    global TRACER
+    TRACER = Tracer(max_events_per_thread)
+    return TRACER
+
+
+def disable() -> Optional[Tracer]:
+    """Stop tracing; returns the tracer so it can still be exported."""
+    global TRACER
+    tracer, TRACER = TRACER, None
+    return tracer
+
+
+def export(path: str) -> int:
+    """Export the active tracer to *path* (0 events if tracing is off)."""
+    tracer = TRACER
+    return tracer.export(path) if tracer is not None else 0
+
+
+def enable_from_env() -> Optional[str]:
+    """Enable tracing if ``SMARTKNOB_TRACE`` is set; export there at exit.
+
+    Returns:
+        Optional[str]: The output path, or None if the variable is unset.
+    """
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return None
+    tracer = enable()
+    atexit.register(tracer.export, path)
+    logger.info("Tracing enabled, writing %s at exit", path)
+    return path
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(duration_s: float = 2.0, path: Optional[str] = None) -> dict:
+    """Trace a simulated knob driving the scroll integration.
+
+    The simulator spins at ~180°/s; positions go through a stand-in for the
+    GUI hand-off (a queue drained by a second thread, like ``root.after``)
+    into ``WindowsLink.process_position`` with a recording scroll backend.
+
+    Returns:
+        dict: Span cost (ns, enabled), event count and p50 / p99 (µs) per
+              span name.
+    """
+    import queue
+
+    from smartknob import tracing  # Not __main__: the instrumented modules read this one
+    from smartknob.driver import SmartKnobDriver
+    from smartknob.sim import SimulatedKnob
+    from smartknob_windows.integrations.scroll import RecordingBackend
+    from smartknob_windows.windows_link import WindowsLink
+
+    tracer = tracing.enable()
+    n = 100_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        tracer.complete("bench", 0.0, 0.0)
+    span_ns = (time.perf_counter() - t0) / n * 1e9
+    tracer = tracing.enable()  # Fresh buffers for the real run
+
+    sim = SimulatedKnob(report_interval_s=0.005, report_threshold_deg=0.1)
+    sim.start()
+    link = WindowsLink(scroll_backend=RecordingBackend())
+    link.link_scroll()
+    knob = SmartKnobDriver()
+    handoff: queue.Queue = queue.Queue()
+
+    def on_position(angle: float) -> None:
+        handoff.put((angle, tracer.flow_start("tk.after")))
+
+    def main_loop() -> None:
+        while True:
+            item = handoff.get()
+            if item is None:
+                return
+            angle, flow_id = item
+            with tracer.span("tk.position", "tk"):
+                tracer.flow_end(flow_id, "tk.after")
+                link.process_position(angle)
+
+    consumer = threading.Thread(target=main_loop, name="tk-mainloop (simulated)")
+    consumer.start()
+    knob.on_position = on_position
+    knob.connect(sim.port)
+    end = time.perf_counter() + duration_s
+    angle = 0.0
+    while time.perf_counter() < end:
+        angle += 1.0
+        sim.turn_to(angle)
+        time.sleep(0.005)
+    knob.disconnect()
+    handoff.put(None)
+    consumer.join()
+    link.unlink()
+    sim.stop()
+    tracing.disable()
+
+    result = {"span_ns": span_ns, "events": len(tracer.events())}
+    for name in ("serial.read", "serial.line", "callback.position", "tk.position",
+                 "process_position", "os.scroll"):
+        durations = sorted(tracer.durations(name))
+        if durations:
+            result[name] = (durations[len(durations) // 2] * 1e6,
+                            durations[min(len(durations) - 1, int(len(durations) * 0.99))] * 1e6)
+    if path:
+        tracer.export(path)
+    return result
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    import sys
+
+    out = sys.argv[1] if len(sys.argv) > 1 else None
+    r = benchmark(path=out)
+    print(f"Span cost: {r.pop('span_ns'):.0f} ns, {r.pop('events')} events")
+    for name, (p50, p99) in r.items():
+        print(f"  {name:<18} p50 {p50:7.1f} µs  p99 {p99:7.1f} µs")
+    if out:
+        print(f"Trace written to {out} — open in https://ui.perfetto.dev")
@@ -0,0 +1,323 @@
+"""Motion profiles for host-streamed seeks.
+
+A ``Z`` seek steps the firmware's angle target straight to the destination;
+the angle loop then slams into its velocity limit, overshoots and sits out
+the 200 ms settle. For long moves the driver can instead plan the motion
+here and stream it as ``Y`` waypoints ``TRAJ_PERIOD_S`` apart, which the
+firmware interpolates (see ``SmartKnobDriver.move_to()``):
+
+    trapezoid(start, end, v, a)     constant acceleration, cruise, constant
+                                    deceleration (triangular when too short
+                                    to reach v)
+    s_curve(start, end, v, a, j)    the trapezoid with jerk limited to j: its
+                                    acceleration ramps instead of stepping
+
+Angles are degrees; limits are °/s, °/s² and °/s³. Waypoints start at
+*start* and end exactly at *end*.
+
+Usage:
+    waypoints = plan(knob.current_angle, 180.0, "scurve")
+    knob.move_to(180.0, profile="scurve").result()
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Optional
+
+from smartknob.protocol import CMD_TRAJECTORY, CMD_TRAJECTORY_END, TRAJ_PERIOD_S, TRAJ_WAYPOINTS_PER_LINE
+
+PROFILES: tuple[str, ...] = ("trapezoid", "scurve")
+"""Profile names accepted by ``plan()`` and ``SmartKnobDriver.move_to()``."""
+
+DEFAULT_MAX_VELOCITY_DPS: float = 1440.0
+"""Cruise velocity limit (°/s); well under the default MVL of 40 rad/s."""
+
+DEFAULT_MAX_ACCEL_DPS2: float = 12000.0
+"""Acceleration limit (°/s²)."""
+
+DEFAULT_MAX_JERK_DPS3: float = 240000.0
+"""Jerk limit for ``s_curve`` (°/s³): acceleration ramps over 50 ms."""
+
+DEFAULT_LOOKAHEAD_S: float = 0.15
+"""How far ahead of the firmware's trajectory clock the host keeps the ring filled."""
+
+MAX_LINE_LENGTH: int = 19
+"""Longest ``Y`` line (without newline) the firmware's Commander buffer accepts."""
+
+
+# ======================== Profiles ========================
+
+
+def trapezoid(
+    start: float,
+    end: float,
+    max_velocity: float = DEFAULT_MAX_VELOCITY_DPS,
+    max_accel: float = DEFAULT_MAX_ACCEL_DPS2,
+    period_s: float = TRAJ_PERIOD_S,
+) -> list[float]:
+    """
+    Trapezoidal velocity profile sampled every *period_s*.
+
+    Returns:
+        list[float]: Positions from *start* to *end* inclusive.
+
+    Raises:
+        ValueError: Non-positive limits or period.
+    """
+    if max_velocity <= 0 or max_accel <= 0 or period_s <= 0:
+        raise ValueError("Velocity, acceleration and period must be positive")
+    distance = abs(end - start)
+    if distance == 0:
+        return [start, end]
+    sign = 1.0 if end > start else -1.0
+    if distance < max_velocity ** 2 / max_accel:
+        peak = math.sqrt(distance * max_accel)  # Triangular: never reaches max_velocity
+        t_accel, t_cruise = peak / max_accel, 0.0
+    else:
+        peak = max_velocity
+        t_accel = peak / max_accel
+        t_cruise = (distance - peak * t_accel) / peak
+    d_accel = 0.5 * max_accel * t_accel ** 2
+    total = 2 * t_accel + t_cruise
+    steps = max(1, math.ceil(total / period_s - 1e-9))
+
+    out = []
+    for i in range(steps):
+        t = i * period_s
+        if t < t_accel:
+            d = 0.5 * max_accel * t * t
+        elif t < t_accel + t_cruise:
+            d = d_accel + peak * (t - t_accel)
+        else:
+            remaining = max(0.0, total - t)
+            d = distance - 0.5 * max_accel * remaining * remaining
+        out.append(start + sign * d)
+    out.append(end)
+    return out
+
+
+def s_curve(
+    start: float,
+    end: float,
+    max_velocity: float = DEFAULT_MAX_VELOCITY_DPS,
+    max_accel: float = DEFAULT_MAX_ACCEL_DPS2,
+    max_jerk: float = DEFAULT_MAX_JERK_DPS3,
+    period_s: float = TRAJ_PERIOD_S,
+) -> list[float]:
+    """
+    Jerk-limited profile sampled every *period_s*.
+
+    Built as the trapezoid passed through a moving average
+    ``max_accel / max_jerk`` long: each acceleration step becomes a ramp of
+    slope ``max_jerk``, velocity and acceleration limits still hold, and
+    the move gets longer by the window.
+
+    Returns:
+        list[float]: Positions from *start* to *end* inclusive.
+
+    Raises:
+        ValueError: Non-positive limits or period.
+    """
+    if max_jerk <= 0:
+        raise ValueError("Jerk limit must be positive")
+    base = trapezoid(start, end, max_velocity, max_accel, period_s)
+    window = max(1, round(max_accel / max_jerk / period_s))
+    if window == 1:
+        return base
+    out = []
+    total = start * window
+    padded = base + [end] * (window - 1)
+    for i, x in enumerate(padded):
+        total += x - (padded[i - window] if i >= window else start)
+        out.append(total / window)
+    out[-1] = end
+    return out
+
+
+def plan(
+    start: float,
+    end: float,
+    profile: str = "scurve",
+    max_velocity: float = DEFAULT_MAX_VELOCITY_DPS,
+    max_accel: float = DEFAULT_MAX_ACCEL_DPS2,
+    max_jerk: float = DEFAULT_MAX_JERK_DPS3,
+    period_s: float = TRAJ_PERIOD_S,
+) -> list[float]:
+    """
+    Waypoints for *profile* ("trapezoid" or "scurve").
+
+    Raises:
+        ValueError: Unknown profile or bad limits.
+    """
+    if profile == "trapezoid":
+        return trapezoid(start, end, max_velocity, max_accel, period_s)
+    if profile == "scurve":
+        return s_curve(start, end, max_velocity, max_accel, max_jerk, period_s)
+    raise ValueError(f"Unknown profile {profile!r} (expected one of {', '.join(PROFILES)})")
+
+
+def waypoint_lines(waypoints: list[float]) -> list[tuple[str, int]]:
+    """
+    ``Y`` command lines for *waypoints*, up to ``TRAJ_WAYPOINTS_PER_LINE``
+    per line (fewer where the text would not fit ``MAX_LINE_LENGTH``).
+
+    Returns:
+        list[tuple[str, int]]: ``(line, waypoint count)`` pairs.
+    """
+    lines = []
+    i = 0
+    while i < len(waypoints):
+        chunk = waypoints[i:i + TRAJ_WAYPOINTS_PER_LINE]
+        text = CMD_TRAJECTORY + ",".join(f"{w:.2f}" for w in chunk)
+        while len(text) > MAX_LINE_LENGTH and len(chunk) > 1:
+            chunk = chunk[:-1]
+            text = CMD_TRAJECTORY + ",".join(f"{w:.2f}" for w in chunk)
+        lines.append((text, len(chunk)))
+        i += len(chunk)
+    return lines
+
+
+class TrajectoryStream:
+    """
+    Flow control for one streamed move (used by ``SmartKnobDriver``).
+
+    The firmware acks each ``Y`` line with its free ring slots. The stream
+    keeps the waypoints in flight (sent, not yet acked) so the free count
+    the firmware will have is ``last_free - in_flight``, and never sends
+    past it. Within that credit it sends only enough to keep
+    *lookahead_s* of motion buffered, estimating what the firmware has
+    consumed since the last ack from the waypoint period.
+    """
+
+    def __init__(self, waypoints: list[float], capacity: int, lookahead_s: float = DEFAULT_LOOKAHEAD_S,
+                 period_s: float = TRAJ_PERIOD_S) -> None:
+        self.lines = waypoint_lines(waypoints)
+        self.capacity = capacity
+        self.period_s = period_s
+        self.lookahead = max(2, min(capacity, math.ceil(lookahead_s / period_s)))
+        self.next_line = 0
+        self.free = capacity
+        self.free_at: Optional[float] = None
+        self.in_flight: list[int] = []
+        self.end_sent = False
+        self.end_acked = False
+        self.acks = 0
+        self.max_buffered = 0
+
+    @property
+    def finished_sending(self) -> bool:
+        """True once every waypoint line and ``YE`` have been sent."""
+        return self.end_sent
+
+    def buffered(self, now: float) -> float:
+        """Estimated waypoints queued in the firmware ring, including those in flight."""
+        queued = self.capacity - self.free
+        if self.free_at is not None:
+            queued = max(0.0, queued - (now - self.free_at) / self.period_s)
+        return queued + sum(self.in_flight)
+
+    def on_ack(self, free: int, now: float) -> None:
+        """An ``A:Y<free>`` arrived for the oldest line in flight."""
+        if self.in_flight:
+            self.in_flight.pop(0)
+        self.free, self.free_at = free, now
+        self.acks += 1
+
+    def next_batch(self, now: float) -> list[str]:
+        """Lines that can be sent now (``YE`` after the last waypoint line)."""
+        batch = []
+        credit = self.free - sum(self.in_flight)
+        buffered = self.buffered(now)
+        while self.next_line < len(self.lines):
+            text, count = self.lines[self.next_line]
+            if count > credit or (buffered + count > self.lookahead and buffered > 0):
+                break
+            batch.append(text)
+            self.in_flight.append(count)
+            credit -= count
+            buffered += count
+            self.next_line += 1
+        self.max_buffered = max(self.max_buffered, int(buffered))
+        if self.next_line == len(self.lines) and not self.end_sent:
+            batch.append(CMD_TRAJECTORY_END)
+            self.end_sent = True
+        return batch
+
+
+# ======================== Benchmark ========================
+
+
+def benchmark(distances: tuple[float, ...] = (90.0, 180.0, 360.0), tolerance_deg: float = 1.0) -> list[dict]:
+    """
+    Compare plain ``Z`` seeks with streamed trapezoid and S-curve moves on a
+    simulated rotor (``SimulatedKnob(rotor=...)``, needs numpy).
+
+    Each move starts at rest at 0°. Time-to-target is when the shaft
+    enters ±*tolerance_deg* of the target for good; done is ``A:SEEK_DONE``.
+
+    Returns:
+        list[dict]: One row per (distance, method) with ``target_ms``,
+                    ``done_ms``, ``overshoot_deg`` and stream statistics.
+    """
+    import threading
+
+    import numpy as np
+
+    from smartknob.autotune import StepTrace, step_metrics
+    from smartknob.driver import SmartKnobDriver
+    from smartknob.model import DEFAULT_GAINS, DEFAULT_ROTOR
+    from smartknob.sim import SimulatedKnob
+
+    sim = SimulatedKnob(report_interval_s=0.002, report_threshold_deg=0.05, rotor=DEFAULT_ROTOR)
+    sim.start()
+    knob = SmartKnobDriver()
+    lock = threading.Lock()
+    samples: list[tuple[float, float]] = []
+
+    def on_sample(sample) -> None:
+        with lock:
+            samples.append((sample.host_time, sample.angle_deg))
+
+    knob.on_sample = on_sample
+    rows = []
+    try:
+        knob.connect(sim.port)
+        for distance in distances:
+            for method in ("Z", "trapezoid", "scurve"):
+                knob.seek_and_wait(0.0)
+                time.sleep(0.3)
+                underruns = sim.traj_underruns
+                with lock:
+                    samples.clear()
+                if method == "Z":
+                    future = knob.seek(distance)
+                else:
+                    future = knob.move_to(distance, profile=method)
+                result = future.result(15.0)
+                with lock:
+                    kept = [(t - result.sent_at, a) for t, a in samples if t >= result.sent_at]
+                t, angle = np.array(kept).T
+                m = step_metrics(StepTrace(0.0, distance, t, angle, DEFAULT_GAINS, result.status), tolerance_deg)
+                rows.append({
+                    "distance": distance,
+                    "method": method,
+                    "status": result.status,
+                    "target_ms": m["settle_s"] * 1e3,
+                    "done_ms": result.total_ms,
+                    "overshoot_deg": m["overshoot_deg"],
+                    "underruns": sim.traj_underruns - underruns,
+                })
+    finally:
+        knob.disconnect()
+        sim.stop()
+    return rows
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    print(f"{'move':>6} {'method':<10} {'to target':>10} {'SEEK_DONE':>10} {'overshoot':>10} {'underruns':>9}")
+    for row in benchmark():
+        print(f"{row['distance']:5.0f}° {row['method']:<10} {row['target_ms']:8.0f} ms {row['done_ms']:8.0f} ms "
+              f"{row['overshoot_deg']:8.1f} ° {row['underruns']:9d}")
@@ -0,0 +1,743 @@
+"""
+Hot-reloadable presets and contexts.
+
+ConfigService parses presets.json and contexts.json once, validates them
+against each other and compiles them into an immutable ConfigSnapshot:
+
+- Preset: one presets.json entry with its firmware commands precomputed
+  (``commands``, and ``payload`` for SmartKnobDriver.send_commands() to
+  send in one write) and its curve/filter/gestures entries validated and
+  frozen.
+- ContextMatcher: the contexts.json rules compiled into an index. Rule keys
+  are process names, matched case-insensitively:
+
+      "Spotify.exe"   exact name: one dict lookup
+      "code*.exe"     glob (*, ?, [...]): bucketed by the literal text before
+      "*.scr"         the first or after the last wildcard, each bucket one
+                      compiled regex
+      "__default__"   anything no other rule matches
+
+  Exact names win over globs, earlier globs over later ones. Results are
+  memoized per process name (foreground apps repeat).
+
+A watcher thread swaps in a new snapshot whenever either file changes:
+inotify on Linux, mtime polling elsewhere or when inotify is unavailable.
+A file that fails to parse or validate is logged and the previous snapshot
+stays in use. The swap is one attribute assignment, so readers that take
+``service.snapshot`` once never see half a reload.
+
+contexts.json entries:
+
+    "Spotify.exe": {"integration": "volume", "preset": "VOLUME_KNOB"}
+
+``integration`` must be a registered integration; ``preset`` (optional)
+must exist in presets.json.
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import re
+import select
+import sys
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Mapping, NamedTuple
+
+from smartknob.gestures import validate_gestures
+from smartknob.protocol import PRESET_COMMANDS, PRESET_MODES, HapticMode, preset_commands
+from smartknob_windows.filtering import validate_filter
+from smartknob_windows.integrations import registry
+from smartknob_windows.mapping import CONFIG_DIR, curve_function
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTEXT = "__default__"
+"""contexts.json key of the fallback rule."""
+
+PRESET_KEYS = frozenset({"name", "mode", "curve", "filter", "gestures", *PRESET_COMMANDS})
+"""Keys a presets.json entry may have (anything else is reported as a typo)."""
+
+POLL_INTERVAL_S = 0.5
+"""mtime polling period when inotify is not available."""
+
+DEBOUNCE_S = 0.05
+"""Wait after a change before reading (editors write in several steps)."""
+
+MATCH_CACHE_SIZE = 4096
+"""Memoized process names per ContextMatcher before the memo is cleared."""
+
+_GLOB_CHARS = "*?["
+
+
+# ======================== Compiled Config ========================
+
+class Preset(NamedTuple):
+    """One compiled presets.json entry."""
+
+    key: str
+    """presets.json key, e.g. "VOLUME_KNOB"."""
+    name: str
+    """Display name (the key if none given)."""
+    mode: HapticMode | None
+    """Haptic mode, or None if the preset keeps the current one."""
+    commands: tuple[str, ...]
+    """Firmware commands, mode first (see protocol.preset_commands())."""
+    payload: bytes
+    """``commands`` as newline-terminated bytes, ready for one serial write."""
+    curve: Mapping | None
+    """Validated "curve" entry (read-only), or None."""
+    filter: Mapping | None
+    """Validated "filter" entry (read-only), or None."""
+    gestures: Mapping | None
+    """Validated "gestures" entry (read-only), or None."""
+
+
+class Context(NamedTuple):
+    """One compiled contexts.json rule."""
+
+    rule: str
+    """contexts.json key that matched (process name, glob or __default__)."""
+    integration: str
+    """Integration name (see integrations.registry)."""
+    preset: Preset | None
+    """Compiled preset to apply, or None."""
+
+
+def _frozen(value):
+    """Read-only deep copy of a JSON value (objects → mappingproxy, arrays → tuples)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _frozen(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+def compile_preset(key: str, entry: dict) -> Preset:
+    """
+    Validate one presets.json entry and precompute its commands.
+
+    Raises:
+        ValueError: Unknown key, bad mode/parameter, or an invalid curve,
+                    filter or gestures entry.
+    """
+    try:
+        if not isinstance(entry, dict):
+            raise ValueError(f"must be an object, got {entry!r}")
+        unknown = set(entry) - PRESET_KEYS
+        if unknown:
+            raise ValueError(f"unknown keys: {', '.join(sorted(unknown))}")
+        mode = entry.get("mode")
+        if mode is not None and not isinstance(mode, str):
+            raise ValueError(f"mode must be a string, got {mode!r}")
+        commands = tuple(preset_commands(entry))
+        curve, filt, gestures = entry.get("curve"), entry.get("filter"), entry.get("gestures")
+        if curve is not None:
+            if not isinstance(curve, dict):
+                raise ValueError(f"curve must be an object, got {curve!r}")
+            if not isinstance(curve.get("points", []), list):
+                raise ValueError(f"curve points must be a list, got {curve['points']!r}")
+            curve_function(curve)
+        if filt is not None:
+            validate_filter(filt)
+        if gestures is not None:
+            validate_gestures(gestures)
+    except (ValueError, TypeError) as e:
+        # TypeError: wrong JSON type inside a curve, e.g. "range_db": [40]
+        raise ValueError(f"Preset {key}: {e}") from None
+    return Preset(
+        key=key,
+        name=str(entry.get("name", key)),
+        mode=PRESET_MODES[mode] if mode is not None else None,
+        commands=commands,
+        payload="".join(f"{cmd}\n" for cmd in commands).encode(),
+        curve=_frozen(curve),
+        filter=_frozen(filt),
+        gestures=_frozen(gestures),
+    )
+
+
+def compile_presets(data: dict) -> Mapping[str, Preset]:
+    """
+    Compile a parsed presets.json document.
+
+    Returns:
+        Mapping: Read-only {key: Preset}.
+
+    Raises:
+        ValueError: Missing "presets" object or an invalid entry.
+    """
+    presets = data.get("presets") if isinstance(data, dict) else None
+    if not isinstance(presets, dict):
+        raise ValueError('presets.json needs a "presets" object')
+    return MappingProxyType({key: compile_preset(key, entry) for key, entry in presets.items()})
+
+
+class ContextMatcher:
+    """
+    Process name → Context index compiled from contexts.json rules.
+
+    Lookups are O(1) for exact names and memoized names; a new name costs
+    one dict lookup per distinct glob prefix/suffix length plus one regex
+    match per candidate bucket, independent of the number of rules (only
+    globs with no literal prefix or suffix, like "*", share one regex).
+    """
+
+    __slots__ = ("default", "rules", "_exact", "_prefixes", "_prefix_lengths",
+                 "_suffixes", "_suffix_lengths", "_rest", "_cache")
+
+    def __init__(self, rules: list[Context]):
+        """
+        Args:
+            rules: Compiled rules in file order.
+        """
+        self.rules = tuple(rules)
+        self.default: Context | None = None
+        self._exact: dict[str, Context] = {}
+        prefixed: dict[str, list[tuple[int, str, Context]]] = {}
+        suffixed: dict[str, list[tuple[int, str, Context]]] = {}
+        rest: list[tuple[int, str, Context]] = []
+        for order, ctx in enumerate(rules):
+            key = ctx.rule.casefold()
+            if ctx.rule == DEFAULT_CONTEXT:
+                self.default = ctx
+                continue
+            wild = [i for i, c in enumerate(key) if c in _GLOB_CHARS]
+            if not wild:
+                self._exact.setdefault(key, ctx)
+            elif wild[0] > 0:
+                # Bucket by the literal text before the first wildcard...
+                prefixed.setdefault(key[:wild[0]], []).append((order, key, ctx))
+            else:
+                # ...or, for "*.exe"-style rules, after the last one
+                tail = key[max(wild[-1], key.rfind("]")) + 1:]
+                (suffixed.setdefault(tail, []) if tail else rest).append((order, key, ctx))
+        self._prefixes = {prefix: self._combine(items) for prefix, items in prefixed.items()}
+        self._prefix_lengths = tuple(sorted({len(p) for p in self._prefixes}))
+        self._suffixes = {suffix: self._combine(items) for suffix, items in suffixed.items()}
+        self._suffix_lengths = tuple(sorted({len(s) for s in self._suffixes}))
+        self._rest = self._combine(rest) if rest else None
+        self._cache: dict[str, Context | None] = {}
+
+    @staticmethod
+    def _combine(items: list[tuple[int, str, Context]]) -> tuple:
+        # One alternation per bucket; match.lastgroup names the first glob
+        # (in file order) that matched, so each bucket yields its best rule in C
+        regex = re.compile("|".join(f"(?P<r{i}>{fnmatch.translate(key)})" for i, (_, key, _) in enumerate(items)))
+        return regex.match, tuple((order, ctx) for order, _, ctx in items)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, process_name: str) -> Context | None:
+        """Context for *process_name* (e.g. "chrome.exe"), or None without a default."""
+        try:
+            return self._cache[process_name]
+        except KeyError:
+            pass
+        ctx = self.lookup(process_name)
+        cache = self._cache
+        if len(cache) >= MATCH_CACHE_SIZE:
+            cache.clear()
+        cache[process_name] = ctx
+        return ctx
+
+    def lookup(self, process_name: str) -> Context | None:
+        """Uncached ``match()``."""
+        name = process_name.casefold()
+        ctx = self._exact.get(name)
+        if ctx is not None:
+            return ctx
+        best = None
+        prefixes = self._prefixes
+        for n in self._prefix_lengths:
+            if n > len(name):
+                break
+            bucket = prefixes.get(name[:n])
+            if bucket is not None:
+                best = self._first(bucket, name, best)
+        suffixes = self._suffixes
+        for n in self._suffix_lengths:
+            if n > len(name):
+                break
+            bucket = suffixes.get(name[-n:])
+            if bucket is not None:
+                best = self._first(bucket, name, best)
+        if self._rest is not None:
+            best = self._first(self._rest, name, best)
+        return best[1] if best is not None else self.default
+
+    @staticmethod
+    def _first(bucket: tuple, name: str, best: tuple | None) -> tuple | None:
+        match, rules = bucket
+        m = match(name)
+        if m is None:
+            return best
+        hit = rules[int(m.lastgroup[1:])]
+        return hit if best is None or hit[0] < best[0] else best
+
+
+def compile_contexts(data: dict, presets: Mapping[str, Preset]) -> ContextMatcher:
+    """
+    Compile a parsed contexts.json document against compiled presets.
+
+    Raises:
+        ValueError: Missing "contexts" object, unknown integration or
+                    preset, or a malformed rule.
+    """
+    contexts = data.get("contexts") if isinstance(data, dict) else None
+    if not isinstance(contexts, dict):
+        raise ValueError('contexts.json needs a "contexts" object')
+    integrations = set(registry.names())
+    rules = []
+    for rule, entry in contexts.items():
+        if not rule:
+            raise ValueError("Context rule keys must be non-empty")
+        if not isinstance(entry, dict):
+            raise ValueError(f"Context {rule}: must be an object, got {entry!r}")
+        unknown = set(entry) - {"integration", "preset"}
+        if unknown:
+            raise ValueError(f"Context {rule}: unknown keys: {', '.join(sorted(unknown))}")
+        integration = entry.get("integration")
+        if integration not in integrations:
+            raise ValueError(f"Context {rule}: unknown integration {integration!r} "
+                             f"(expected one of {', '.join(sorted(integrations))})")
+        preset = entry.get("preset")
+        if preset is not None and preset not in presets:
+            raise ValueError(f"Context {rule}: unknown preset {preset!r}")
+        rules.append(Context(rule, integration, presets[preset] if preset is not None else None))
+    return ContextMatcher(rules)
+
+
+class ConfigSnapshot(NamedTuple):
+    """Both files, compiled. Never modified; reloads replace it."""
+
+    presets: Mapping[str, Preset]
+    """Read-only {key: Preset}."""
+    contexts: ContextMatcher
+    """Compiled context rules."""
+    version: int
+    """1 for the first load, +1 per successful reload."""
+    loaded_at: float
+    """``time.time()`` of the load."""
+
+
+# ======================== Service ========================
+
+class _Inotify:
+    """Minimal inotify binding (Linux, via ctypes): finished writes and renames in directories."""
+
+    # <sys/inotify.h>
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+
+    def __init__(self, directories: set[Path]):
+        """
+        Raises:
+            OSError: inotify is not available (or a watch could not be added).
+        """
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is Linux-only")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        for directory in directories:
+            if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+                errno = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(errno, f"inotify_add_watch({directory}) failed")
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read_names(self) -> set[str]:
+        """File names with pending events (empty if none)."""
+        names = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset < len(buf):
+                # struct inotify_event { int wd; uint32_t mask, cookie, len; char name[len]; }
+                length = int.from_bytes(buf[offset + 12:offset + 16], sys.byteorder)
+                name = buf[offset + 16:offset + 16 + length].split(b"\0", 1)[0]
+                names.add(os.fsdecode(name))
+                offset += 16 + length
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class ConfigService:
+    """
+    Holds the current ConfigSnapshot and replaces it when the files change.
+
+    Attributes:
+        snapshot: Current ConfigSnapshot (take it once per use).
+        presets_path / contexts_path: Watched files.
+        watcher: "inotify", "poll", or None when not watching.
+        reloads / failures: Successful and rejected reloads.
+        last_error: Why the last reload was rejected (None after a success).
+        reload_s: Parse + compile time of the last successful (re)load.
+    """
+
+    def __init__(self, presets_path: Path | str | None = None, contexts_path: Path | str | None = None):
+        """
+        Load and compile both files.
+
+        Args:
+            presets_path: presets.json (default: package config/presets.json).
+            contexts_path: contexts.json (default: package config/contexts.json).
+
+        Raises:
+            OSError: A file can't be read.
+            ValueError: A file doesn't parse or validate.
+        """
+        self.presets_path = Path(presets_path) if presets_path is not None else CONFIG_DIR / "presets.json"
+        self.contexts_path = Path(contexts_path) if contexts_path is not None else CONFIG_DIR / "contexts.json"
+        self.watcher: str | None = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: str | None = None
+        self.reload_s = 0.0
+        self._listeners: tuple[Callable[[ConfigSnapshot], None], ...] = ()
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._signature = self._stat()
+        self.snapshot = self._load(1)
+
+    # ------------------------------------------------------------------ #
+    #  Lookups
+    # ------------------------------------------------------------------ #
+
+    def preset(self, key: str) -> Preset:
+        """
+        Compiled preset *key*.
+
+        Raises:
+            KeyError: No such preset.
+        """
+        return self.snapshot.presets[key]
+
+    def context_for(self, process_name: str) -> Context | None:
+        """Context rule for *process_name* (the default rule if none matches)."""
+        return self.snapshot.contexts.match(process_name)
+
+    # ------------------------------------------------------------------ #
+    #  Reloading
+    # ------------------------------------------------------------------ #
+
+    def add_listener(self, callback: Callable[[ConfigSnapshot], None]) -> None:
+        """Call *callback(snapshot)* after every successful reload (on the watcher thread)."""
+        self._listeners = self._listeners + (callback,)
+
+    def remove_listener(self, callback: Callable[[ConfigSnapshot], None]) -> None:
+        """Stop calling *callback*."""
+        self._listeners = tuple(c for c in self._listeners if c is not callback)
+
+    def reload(self) -> bool:
+        """
+        Re-read both files and swap in the new snapshot.
+
+        Returns:
+            bool: True if swapped; False if a file was invalid (the previous
+                  snapshot stays, see ``last_error``).
+        """
+        with self._reload_lock:
+            self._signature = self._stat()
+            try:
+                snapshot = self._load(self.snapshot.version + 1)
+            except (OSError, ValueError) as e:
+                self.failures += 1
+                self.last_error = str(e)
+                logger.warning("Config reload rejected, keeping version %d: %s", self.snapshot.version, e)
+                return False
+            except Exception as e:  # noqa: BLE001 — a validation gap must not end the watcher
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.exception("Config reload failed, keeping version %d", self.snapshot.version)
+                return False
+            self.snapshot = snapshot
+            self.reloads += 1
+            self.last_error = None
+        logger.info("Config version %d loaded in %.1f ms", snapshot.version, self.reload_s * 1e3)
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Config listener raised: %s", exc)
+        return True
+
+    def _load(self, version: int) -> ConfigSnapshot:
+        t0 = time.perf_counter()
+        with open(self.presets_path, encoding="utf-8") as f:
+            presets = compile_presets(json.load(f))
+        with open(self.contexts_path, encoding="utf-8") as f:
+            contexts = compile_contexts(json.load(f), presets)
+        self.reload_s = time.perf_counter() - t0
+        return ConfigSnapshot(presets, contexts, version, time.time())
+
+    def _stat(self) -> tuple:
+        signature = []
+        for path in (self.presets_path, self.contexts_path):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    # ------------------------------------------------------------------ #
+    #  Watching
+    # ------------------------------------------------------------------ #
+
+    def start(self, poll_interval_s: float = POLL_INTERVAL_S, use_inotify: bool = True) -> str:
+        """
+        Watch both files and reload on change.
+
+        Args:
+            poll_interval_s: mtime polling period (polling mode only).
+            use_inotify: Try inotify first (Linux).
+
+        Returns:
+            str: "inotify" or "poll".
+        """
+        if self._thread is not None:
+            return self.watcher
+        inotify = None
+        if use_inotify:
+            try:
+                inotify = _Inotify({self.presets_path.parent, self.contexts_path.parent})
+            except (OSError, AttributeError) as e:
+                logger.debug("inotify unavailable (%s), polling every %.2f s", e, poll_interval_s)
+        self.watcher = "inotify" if inotify is not None else "poll"
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch_inotify if inotify is not None else self._watch_poll,
+            args=(inotify,) if inotify is not None else (poll_interval_s,),
+            daemon=True,
+            name="smartknob-config",
+        )
+        self._thread.start()
+        return self.watcher
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.watcher = None
+
+    def _changed(self) -> bool:
+        return self._stat() != self._signature
+
+    def _reload_safely(self) -> None:
+        """reload() from the watcher thread, which must survive anything."""
+        try:
+            self.reload()
+        except Exception:  # noqa: BLE001
+            logger.exception("Config watcher: reload raised, keeping version %d", self.snapshot.version)
+
+    def _watch_poll(self, interval_s: float) -> None:
+        while not self._stop.wait(interval_s):
+            if self._changed() and not self._stop.wait(DEBOUNCE_S):
+                self._reload_safely()
+
+    def _watch_inotify(self, inotify: _Inotify) -> None:
+        names = {self.presets_path.name, self.contexts_path.name}
+        try:
+            while not self._stop.is_set():
+                # Short timeout so stop() is noticed without a wake-up pipe
+                readable, _, _ = select.select([inotify], [], [], 0.2)
+                if not readable or not inotify.read_names() & names:
+                    continue
+                if self._stop.wait(DEBOUNCE_S):
+                    break
+                inotify.read_names()  # Coalesce the rest of the burst
+                if self._changed():
+                    self._reload_safely()
+        finally:
+            inotify.close()
+
+    def stats(self) -> dict:
+        """Version, sizes, reload counts/time and watcher mode."""
+        snapshot = self.snapshot
+        return {
+            "version": snapshot.version,
+            "presets": len(snapshot.presets),
+            "contexts": len(snapshot.contexts),
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "reload_ms": self.reload_s * 1e3,
+            "watcher": self.watcher,
+        }
+
+
+# ======================== Benchmark ========================
+
+def generate_config(presets: int, exact: int, globs: int, seed: int = 0) -> tuple[dict, dict]:
+    """
+    Synthetic presets.json / contexts.json documents.
+
+    Contexts: *exact* process names ("app00042.exe"), *globs* prefixed
+    globs ("tool0042*.exe") of which every tenth is prefix-less
+    ("*-0042.exe"), and a default. Each rule uses a random preset.
+
+    Returns:
+        tuple: (presets document, contexts document)
+    """
+    import random
+
+    rng = random.Random(seed)
+    modes = list(PRESET_MODES)
+    preset_docs = {}
+    for i in range(presets):
+        preset_docs[f"P{i:05d}"] = {
+            "name": f"Preset {i}",
+            "mode": rng.choice(modes),
+            "detent_count": rng.randint(2, 72),
+            "detent_strength": round(rng.uniform(0.5, 4.0), 2),
+            "spring_stiffness": round(rng.uniform(1.0, 20.0), 2),
+            "filter": {"min_cutoff": 1.0, "beta": round(rng.uniform(0.0, 0.5), 2)},
+        }
+    keys = list(preset_docs)
+    integrations = ["volume", "scroll", "zoom", "slides"]
+    contexts = {}
+    for i in range(exact):
+        contexts[f"app{i:05d}.exe"] = {"integration": rng.choice(integrations), "preset": rng.choice(keys)}
+    for i in range(globs):
+        rule = f"*-{i:04d}.exe" if i % 10 == 0 else f"tool{i:04d}*.exe"
+        contexts[rule] = {"integration": rng.choice(integrations), "preset": rng.choice(keys)}
+    contexts[DEFAULT_CONTEXT] = {"integration": "scroll", "preset": keys[0]}
+    return {"presets": preset_docs}, {"contexts": contexts}
+
+
+def benchmark(sizes: tuple = ((6, 7, 0), (100, 1_000, 100), (1_000, 10_000, 1_000), (2_000, 50_000, 5_000)),
+              lookups: int = 20_000) -> list[dict]:
+    """
+    Reload time and lookup cost on generated rule sets, plus the time
+    from a file write to the new snapshot (inotify and polling).
+
+    Lookups are timed on exact names, prefixed globs, prefix-less globs
+    and misses (default rule): memoized, uncached (``lookup()``), and a
+    linear scan over precompiled rules for comparison (also used to check
+    the matcher's answers).
+
+    Returns:
+        list[dict]: One row per size.
+    """
+    import random
+    import tempfile
+
+    rng = random.Random(1)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        presets_path, contexts_path = Path(tmp) / "presets.json", Path(tmp) / "contexts.json"
+        for n_presets, n_exact, n_globs in sizes:
+            presets_doc, contexts_doc = generate_config(n_presets, n_exact, n_globs)
+            presets_path.write_text(json.dumps(presets_doc))
+            contexts_path.write_text(json.dumps(contexts_doc))
+            service = ConfigService(presets_path, contexts_path)
+            reload_s = service.reload_s
+            for _ in range(2):
+                service.reload()
+                reload_s = min(reload_s, service.reload_s)
+            matcher = service.snapshot.contexts
+
+            names = [f"app{rng.randrange(n_exact):05d}.exe" for _ in range(lookups // 4)] if n_exact else []
+            if n_globs:
+                names += [f"tool{rng.randrange(1, n_globs):04d}-beta.exe" for _ in range(lookups // 4)]
+                names += [f"x-{rng.randrange(0, n_globs, 10):04d}.exe" for _ in range(lookups // 4)]
+            names += [f"other{i}.exe" for i in range(lookups - len(names))]
+            rng.shuffle(names)
+
+            def timed(fn, items) -> float:
+                t0 = time.perf_counter()
+                for name in items:
+                    fn(name)
+                return (time.perf_counter() - t0) / len(items) * 1e9
+
+            uncached_ns = timed(matcher.lookup, names)
+            timed(matcher.match, names[:MATCH_CACHE_SIZE])
+            cached_ns = timed(matcher.match, names[:MATCH_CACHE_SIZE])
+            # Baseline: one pass over precompiled rules, same priority
+            rules = [(ctx.rule.casefold(), re.compile(fnmatch.translate(ctx.rule.casefold())).match, ctx)
+                     for ctx in matcher.rules if ctx.rule != DEFAULT_CONTEXT]
+
+            def naive(name: str):
+                name = name.casefold()
+                first = None
+                for key, match, ctx in rules:
+                    if key == name:
+                        return ctx
+                    if first is None and match(name):
+                        first = ctx
+                return first or matcher.default
+
+            sample = names[:max(20, min(2000, 2_000_000 // max(1, len(rules))))]
+            mismatches = [n for n in sample if naive(n) is not matcher.lookup(n)]
+            if mismatches:
+                raise AssertionError(f"ContextMatcher disagrees with a linear scan for {mismatches[:5]}")
+            rows.append({
+                "presets": n_presets,
+                "rules": len(matcher),
+                "reload_ms": reload_s * 1e3,
+                "uncached_ns": uncached_ns,
+                "cached_ns": cached_ns,
+                "naive_ns": timed(naive, sample),
+            })
+
+        # File write → new snapshot, per watcher
+        for mode in ("inotify", "poll"):
+            presets_doc, contexts_doc = generate_config(6, 7, 0)
+            presets_path.write_text(json.dumps(presets_doc))
+            contexts_path.write_text(json.dumps(contexts_doc))
+            service = ConfigService(presets_path, contexts_path)
+            if service.start(poll_interval_s=0.1, use_inotify=mode == "inotify") != mode:
+                service.stop()
+                rows.append({"watcher": mode, "latency_ms": None})
+                continue
+            swapped = threading.Event()
+            service.add_listener(lambda snapshot: swapped.set())
+            latencies = []
+            for i in range(5):
+                swapped.clear()
+                presets_doc["presets"]["P00000"]["detent_count"] = 10 + i
+                t0 = time.perf_counter()
+                tmp_path = presets_path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(presets_doc))
+                os.replace(tmp_path, presets_path)  # Atomic save, as most editors do
+                if swapped.wait(2.0):
+                    latencies.append((time.perf_counter() - t0) * 1e3)
+                time.sleep(0.05)
+            service.stop()
+            rows.append({"watcher": mode, "latency_ms": sum(latencies) / len(latencies) if latencies else None,
+                         "reloads": service.reloads})
+    return rows
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    for row in benchmark():
+        if "watcher" in row:
+            latency = f"{row['latency_ms']:.1f} ms" if row["latency_ms"] is not None else "unavailable"
+            print(f"{row['watcher']:>7}: write → new snapshot {latency}")
+            continue
+        print(f"{row['presets']:5d} presets, {row['rules']:6d} rules: reload {row['reload_ms']:7.1f} ms  "
+              f"lookup {row['uncached_ns']:5.0f} ns ({row['cached_ns']:3.0f} ns memoized, "
+              f"linear scan {row['naive_ns'] / 1e3:7.1f} µs)")
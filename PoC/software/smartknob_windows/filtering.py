@@ -0,0 +1,371 @@
+"""
+Adaptive jitter filtering between the driver and the integrations.
+
+Sensor noise around a detent or the spring center turns into a stream of
+tiny OS updates, and makes threshold decisions (zoom hold vs. move) flicker.
+Each linked integration gets an AngleFilter built from its preset:
+
+- OneEuroFilter: a low-pass whose cutoff rises with speed — heavy smoothing
+  while the knob is (nearly) still, almost no lag while it turns.
+- Backlash:      a dead band the input must push through before the output
+  moves ("minimum delta" with hysteresis: jitter smaller than the band
+  never moves the output, real motion passes through 1:1).
+- Threshold:     a Schmitt trigger for integration thresholds such as the
+  zoom dead zone (enter below level - band, leave above level + band).
+
+Every stage is O(1) time and memory per sample: a few floats, no history.
+
+Filter configs come from the "filter" entry of a preset in presets.json:
+
+    "ZOOM_DIAL": { ..., "filter": {"min_cutoff": 1.0, "beta": 0.1, "hysteresis_deg": 1.0} }
+
+Keys (all optional):
+    min_cutoff      Hz, cutoff while still (lower = smoother, more lag)
+    beta            Hz per °/s, how fast the cutoff rises with speed
+    d_cutoff        Hz, cutoff of the speed estimate
+    deadband_deg    Backlash width in degrees (0 = off)
+    hysteresis_deg  Band around integration thresholds in degrees
+"""
+
+import json
+import math
+from pathlib import Path
+
+from smartknob.traces import load_traces, ramp, synthesize, timed
+from smartknob_windows.mapping import CONFIG_DIR
+
+NO_FILTER: dict = {}
+"""Filter config used when a preset defines no filter (pass-through)."""
+
+FILTER_KEYS = {
+    "min_cutoff": 1.0,
+    "beta": 0.0,
+    "d_cutoff": 1.0,
+    "deadband_deg": 0.0,
+    "hysteresis_deg": 0.0,
+}
+"""Known filter config keys and their defaults."""
+
+SETTLE_S = 0.1
+"""Quiet time after which the GUI calls WindowsLink.settle() (reports stop when the knob stops)."""
+
+
+# ======================== Stages ========================
+
+class OneEuroFilter:
+    """
+    Speed-adaptive exponential smoothing (Casiez et al., "1€ Filter").
+
+    cutoff = min_cutoff + beta * |smoothed speed|, alpha = 1 / (1 + tau / dt)
+    with tau = 1 / (2π cutoff).
+    """
+
+    __slots__ = ("min_cutoff", "beta", "d_cutoff", "_x", "_dx", "_t")
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.0, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the state; the next sample passes through unchanged."""
+        self._x = None
+        self._dx = 0.0
+        self._t = 0.0
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+    def __call__(self, x: float, t: float) -> float:
+        """Filter sample *x* taken at time *t* (seconds)."""
+        prev = self._x
+        if prev is None:
+            self._x = x
+            self._t = t
+            return x
+        dt = t - self._t
+        if dt <= 0.0:
+            return prev
+        self._t = t
+
+        a_d = self._alpha(self.d_cutoff, dt)
+        self._dx += a_d * ((x - prev) / dt - self._dx)
+        a = self._alpha(self.min_cutoff + self.beta * abs(self._dx), dt)
+        self._x = prev + a * (x - prev)
+        return self._x
+
+    def snap(self, x: float) -> float:
+        """Jump the output to *x* (the input has been still — nothing left to smooth)."""
+        self._x = x
+        self._dx = 0.0
+        return x
+
+
+class Backlash:
+    """
+    Dead band: the output only moves once the input is more than *width*
+    away from it, and then trails the input by exactly *width*.
+
+    Jitter narrower than the band is removed entirely; a direction reversal
+    costs 2 * width of travel before the output follows.
+    """
+
+    __slots__ = ("width", "_y")
+
+    def __init__(self, width: float = 0.0):
+        self.width = width
+        self._y = None
+
+    def reset(self) -> None:
+        self._y = None
+
+    def __call__(self, x: float) -> float:
+        y = self._y
+        if y is None:
+            self._y = x
+            return x
+        if x > y + self.width:
+            y = x - self.width
+        elif x < y - self.width:
+            y = x + self.width
+        self._y = y
+        return y
+
+
+class Threshold:
+    """
+    Schmitt trigger around *level*: becomes True above level + band,
+    False again below level - band.
+    """
+
+    __slots__ = ("level", "band", "state")
+
+    def __init__(self, level: float, band: float = 0.0, state: bool = False):
+        self.level = level
+        self.band = band
+        self.state = state
+
+    def update(self, x: float) -> bool:
+        """Feed *x*; return the (possibly unchanged) state."""
+        if self.state:
+            if x < self.level - self.band:
+                self.state = False
+        elif x > self.level + self.band:
+            self.state = True
+        return self.state
+
+
+class AngleFilter:
+    """
+    One Euro smoothing followed by a backlash dead band, built from a
+    preset "filter" config.
+
+    Attributes:
+        hysteresis_deg: Band for integration thresholds (see Threshold).
+    """
+
+    __slots__ = ("euro", "backlash", "hysteresis_deg", "_raw")
+
+    def __init__(self, config: dict | None = None):
+        """
+        Args:
+            config: Filter config (see module docstring); None = pass-through.
+
+        Raises:
+            ValueError: Unknown key or negative / non-numeric value
+        """
+        params = validate_filter(config or NO_FILTER)
+        self.euro = None
+        if config and ("beta" in config or "min_cutoff" in config):
+            self.euro = OneEuroFilter(params["min_cutoff"], params["beta"], params["d_cutoff"])
+        self.backlash = Backlash(params["deadband_deg"]) if params["deadband_deg"] > 0.0 else None
+        self.hysteresis_deg = params["hysteresis_deg"]
+        self._raw = None
+
+    def reset(self) -> None:
+        """Forget the state (call on link: the knob may have been seeked)."""
+        if self.euro is not None:
+            self.euro.reset()
+        if self.backlash is not None:
+            self.backlash.reset()
+        self._raw = None
+
+    def __call__(self, angle_deg: float, now: float) -> float:
+        """Filter one position sample taken at *now* (seconds)."""
+        self._raw = angle_deg
+        if self.euro is not None:
+            angle_deg = self.euro(angle_deg, now)
+        if self.backlash is not None:
+            angle_deg = self.backlash(angle_deg)
+        return angle_deg
+
+    def settle(self) -> float | None:
+        """
+        Output for a knob that has stopped reporting.
+
+        The firmware only reports changes, so after the last sample the
+        smoothed value would stay short of it. Snap the smoothing to the
+        last raw sample (the backlash band still applies).
+
+        Returns:
+            float | None: Settled angle, or None before the first sample.
+        """
+        angle_deg = self._raw
+        if angle_deg is None:
+            return None
+        if self.euro is not None:
+            angle_deg = self.euro.snap(angle_deg)
+        if self.backlash is not None:
+            angle_deg = self.backlash(angle_deg)
+        return angle_deg
+
+
+def validate_filter(config: dict) -> dict:
+    """
+    Check a filter config and fill in defaults.
+
+    Returns:
+        dict: All FILTER_KEYS with numeric values.
+
+    Raises:
+        ValueError: Unknown key, non-numeric or out-of-range value
+    """
+    if not isinstance(config, dict):
+        raise ValueError(f"Filter config must be an object, got {config!r}")
+    unknown = set(config) - set(FILTER_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown filter keys: {', '.join(sorted(unknown))}")
+    params = dict(FILTER_KEYS)
+    for key, value in config.items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"Filter {key} must be a non-negative number, got {value!r}")
+        params[key] = float(value)
+    if params["min_cutoff"] <= 0.0 or params["d_cutoff"] <= 0.0:
+        raise ValueError("Filter min_cutoff and d_cutoff must be > 0")
+    return params
+
+
+def load_preset_filters(path: Path | str | None = None) -> dict[str, dict]:
+    """
+    Read filter configs from presets.json.
+
+    Args:
+        path: presets.json location (default: package config/presets.json).
+
+    Returns:
+        dict: {preset_name: filter_config} for presets with a "filter" entry.
+              Invalid configs are reported as ValueError.
+    """
+    path = Path(path) if path is not None else CONFIG_DIR / "presets.json"
+    with open(path, encoding="utf-8") as f:
+        presets = json.load(f).get("presets", {})
+
+    filters = {}
+    for name, preset in presets.items():
+        config = preset.get("filter")
+        if config is None:
+            continue
+        validate_filter(config)
+        filters[name] = config
+    return filters
+
+
+# ======================== Traces & Benchmark ========================
+
+def synthetic_traces(rate_hz: float = 50.0, seed: int = 1) -> dict[str, list[tuple[float, float]]]:
+    """
+    Noisy traces shaped like the firmware's 50 Hz reports (2 decimals).
+
+    - rest: resting on a detent with sensor noise and snap ringing
+    - slow_turn: 60° over 6 s
+    - spring_edge: spring mode hovering at the zoom dead-zone edge
+    - flick: fast 90° flick, then rest
+    """
+    import random
+
+    rng = random.Random(seed)
+
+    def trace(duration_s, shape, noise_deg):
+        return synthesize(duration_s, shape, rate_hz, noise_deg, rng)
+
+    return {
+        "rest": trace(5.0, lambda t: 12.0 + 0.4 * math.exp(-3 * (t % 1.0)) * math.sin(40 * t), 0.15),
+        "slow_turn": trace(8.0, lambda t: 60.0 * ramp(t, 1.0, 7.0), 0.15),
+        "spring_edge": trace(5.0, lambda t: 5.0 + 0.3 * math.sin(2 * t), 0.3),
+        "flick": trace(3.0, lambda t: 90.0 * ramp(t, 0.5, 0.8), 0.15),
+    }
+
+
+def _count_events(angles, dead_zone: float, band: float) -> dict:
+    """Output events the integrations would produce for an angle sequence."""
+    volume = zoom = scroll = 0
+    last_pct = None
+    last_angle = None
+    moving = Threshold(dead_zone, band)
+    last_moving = False
+    for a in angles:
+        pct = int(round((max(-60.0, min(60.0, a)) + 60.0) / 120.0 * 100))
+        if pct != last_pct:
+            volume += last_pct is not None
+            last_pct = pct
+        m = moving.update(abs(a))
+        zoom += m != last_moving
+        last_moving = m
+        if last_angle is not None and a != last_angle:
+            scroll += 1
+        last_angle = a
+    return {"volume": volume, "zoom": zoom, "scroll": scroll}
+
+
+def benchmark(traces: dict | None = None, config: dict | None = None, dead_zone: float = 5.0) -> dict:
+    """
+    Count output events with and without filtering.
+
+    Events: volume writes (1% steps over -60..60°), zoom hold/move flips at
+    *dead_zone*, and scroll feeds with a non-zero delta.
+
+    Args:
+        traces: {name: [(t, angle), ...]} (default: synthetic_traces();
+                recorded traces via smartknob.traces.load_trace()).
+        config: Filter config (default: one euro + 0.2° dead band + 1° hysteresis).
+
+    Returns:
+        dict: {trace: {"raw": {...}, "filtered": {...}, "max_lag_deg": float}}
+              plus "ns_per_sample".
+    """
+    traces = traces or synthetic_traces()
+    config = config or {"min_cutoff": 1.0, "beta": 0.1, "deadband_deg": 0.2, "hysteresis_deg": 1.0}
+    results = {}
+    samples = 0
+    elapsed = 0.0
+    for name, trace in traces.items():
+        filt = AngleFilter(config)
+        filtered, seconds = timed(filt, trace)
+        elapsed += seconds
+        samples += len(trace)
+        settled = filt.settle()
+        raw = [a for _, a in trace]
+        results[name] = {
+            "raw": _count_events(raw, dead_zone, 0.0),
+            "filtered": _count_events(filtered + [settled], dead_zone, filt.hysteresis_deg),
+            "max_lag_deg": max(abs(r - f) for r, f in zip(raw, filtered)),
+            "settle_error_deg": abs(raw[-1] - settled),
+        }
+    results["ns_per_sample"] = elapsed / max(samples, 1) * 1e9
+    return results
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    import sys
+
+    traces = load_traces(sys.argv[1:]) or None
+    r = benchmark(traces)
+    print(f"Filter cost: {r.pop('ns_per_sample'):.0f} ns/sample")
+    for name, x in r.items():
+        raw, filt = x["raw"], x["filtered"]
+        cols = "  ".join(f"{k} {raw[k]:4d} → {filt[k]:4d}" for k in raw)
+        print(f"{name:>12}: {cols}  | max lag {x['max_lag_deg']:.2f}°, "
+              f"settled within {x['settle_error_deg']:.2f}°")
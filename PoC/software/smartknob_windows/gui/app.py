@@ -8,10 +8,13 @@ This file is pure GUI: widgets, layout, and event wiring.
 import tkinter as tk
 from tkinter import ttk
 
-from smartknob.driver import SmartKnobDriver
+from smartknob import profiling, tracing
+from smartknob.driver import ConnectionState, SmartKnobDriver
 from smartknob.protocol import HapticMode
 
 try:
+    from smartknob_windows.config_service import ConfigService
+    from smartknob_windows.filtering import SETTLE_S
     from smartknob_windows.windows_link import WindowsLink
     WINDOWS_LINK_AVAILABLE = True
 except ImportError:
@@ -27,20 +30,31 @@ class SmartKnobGUI:
         self.driver = SmartKnobDriver()
         self.driver.on_position = self._on_driver_position
         self.driver.on_ack = self._on_driver_ack
-        self.driver.on_seek_done = self._on_driver_seek_done
         self.driver.on_raw = self._on_driver_raw
+        self.driver.on_connection_state = self._on_driver_connection_state
 
         self.current_angle = 0.0
-        self._pending_zoom_data: dict | None = None  # Tracks pending zoom link
+        self._zoom_seek = None  # Future of the seek that completes a zoom link
+        self._settle_job = None  # after() id that settles the link filter once reports stop
         
         # Windows integration
+        self.config = None
+        config_error = None
         if WINDOWS_LINK_AVAILABLE:
-            self.windows_link = WindowsLink()
+            # presets.json / contexts.json, reloaded when edited
+            try:
+                self.config = ConfigService()
+                self.config.start()
+            except (OSError, ValueError) as e:
+                config_error = e
+            self.windows_link = WindowsLink(config=self.config)
         else:
             self.windows_link = None
         self.mode_buttons = []  # Store mode radio buttons for disable/enable
         
         self._build_ui()
+        if config_error is not None:
+            self._log(f"Config not reloadable, using presets.json as is: {config_error}")
     
     def _build_ui(self):
         # === Scrollable Container ===
@@ -335,7 +349,7 @@ class SmartKnobGUI:
         ttk.Label(link_frame, text="Windows Function:").grid(row=0, column=0, sticky="w")
         self.win_function_var = tk.StringVar(value="System Volume")
         self.win_function_combo = ttk.Combobox(link_frame, textvariable=self.win_function_var,
-                                                values=["System Volume", "Display Brightness", "Mouse Scroll", "Lens Zoom", "None"], 
+                                                values=["System Volume", "Display Brightness", "Mouse Scroll", "Lens Zoom", "Slides", "None"], 
                                                 state="readonly", width=17)
         self.win_function_combo.grid(row=0, column=1, columnspan=2, padx=5, sticky="w")
         
@@ -376,6 +390,8 @@ class SmartKnobGUI:
                 lower = float(self.bound_lower_var.get())
                 upper = float(self.bound_upper_var.get())
                 self.windows_link.update_bounds(lower, upper)
+                # Quantize volume to the bounded-mode detents
+                self.windows_link.update_detents(int(self.detent_count_var.get()))
                 
                 # Get current volume and calculate target angle
                 target_angle = self.windows_link.link_volume()
@@ -383,9 +399,10 @@ class SmartKnobGUI:
                 
                 self._log(f"Linking to volume (currently {current_val}%)")
                 
-                # Switch to Bounded mode and seek to current volume position
+                # Switch to Bounded mode and glide to current volume position
+                # (streamed S-curve: no overshoot past the synced value)
                 self.driver.set_mode(HapticMode.BOUNDED)
-                self.driver.seek(target_angle)
+                self.driver.move_to(target_angle)
                 
                 # Update UI
                 self.win_link_status.config(text="● Volume", foreground="green")
@@ -421,9 +438,9 @@ class SmartKnobGUI:
                 
                 self._log(f"Linking to brightness (currently {current_val}%)")
                 
-                # Switch to Bounded mode and seek to current brightness position
+                # Switch to Bounded mode and glide to current brightness position
                 self.driver.set_mode(HapticMode.BOUNDED)
-                self.driver.seek(target_angle)
+                self.driver.move_to(target_angle)
                 
                 # Update UI
                 self.win_link_status.config(text="● Brightness", foreground="green")
@@ -485,27 +502,65 @@ class SmartKnobGUI:
                 for btn in self.mode_buttons:
                     btn.config(state="disabled")
                 
-                # Store zoom data — on_seek_done will complete the link
-                self._pending_zoom_data = {"zoom_percent": current_zoom}
-                
-                # Seek to 0°; on_seek_done callback will finish setup
-                self.driver.seek_zero()
+                # Seek to 0°; the seek's future finishes setup
+                self._zoom_seek = self.driver.seek_zero()
+                self._zoom_seek.add_done_callback(
+                    lambda f, z=current_zoom: self._on_zoom_seek_finished(f, z)
+                )
                 self._log("Seeking to 0°...")
                 self.win_link_status.config(text="○ Seeking...", foreground="orange")
                 self.win_volume_label.config(text="Target: 0°")
                 
             except Exception as e:
                 self._log(f"Lens zoom link failed: {e}")
-                self._pending_zoom_data = None
+                self._zoom_seek = None
+                self.windows_link.unlink()
+        
+        else:
+            # Any other registered integration: link by name, switch to its mode
+            name = func.lower()
+            try:
+                if not self.windows_link.is_available(name):
+                    self._log(f"{func} control not available")
+                    return
+                
+                self.windows_link.update_detents(int(self.detent_count_var.get()))
+                target_angle = self.windows_link.link(name)
+                integration = self.windows_link.active_integration
+                
+                if integration.mode is not None:
+                    self.driver.set_mode(integration.mode)
+                if target_angle is not None:
+                    self.driver.move_to(target_angle)
+                
+                # Update UI
+                self.win_link_status.config(text=f"● {func}", foreground="green")
+                self.win_volume_label.config(text="")
+                self.link_btn.config(state="disabled")
+                self.unlink_btn.config(state="normal")
+                
+                # Disable mode buttons
+                for btn in self.mode_buttons:
+                    btn.config(state="disabled")
+                
+                self._log(f"Linked to {func}")
+                
+            except Exception as e:
+                self._log(f"{func} link failed: {e}")
                 self.windows_link.unlink()
     
     def _unlink_windows(self):
         """Unlink motor from Windows function."""
         if self.windows_link:
             self.windows_link.unlink()
+            for func, stats in self.windows_link.output_stats().items():
+                self._log(f"{func}: {stats['avoided']} of {stats['requested']} OS calls avoided")
         
         # Cancel any pending zoom link
-        self._pending_zoom_data = None
+        # (cleared first: cancel_seek() resolves the future synchronously)
+        zoom_seek, self._zoom_seek = self._zoom_seek, None
+        if zoom_seek is not None and not zoom_seek.done():
+            self.driver.cancel_seek()
         
         # Update UI
         self.win_link_status.config(text="○ Not Linked", foreground="gray")
@@ -519,6 +574,21 @@ class SmartKnobGUI:
         
         self._log("Windows link disconnected")
     
+    def _on_zoom_seek_finished(self, future, current_zoom) -> None:
+        """Zoom-link seek resolved (reader thread, or immediately if offline)."""
+        result = future.result()
+        if result.status == "done":
+            self.root.after(0, lambda: self._complete_zoom_link(current_zoom))
+        elif self._zoom_seek is future:
+            self.root.after(0, lambda: self._abort_zoom_link(future, result.status))
+
+    def _abort_zoom_link(self, future, status: str) -> None:
+        """Zoom-link seek failed or timed out — unlink (Tk thread)."""
+        if self._zoom_seek is not future:
+            return  # Already unlinked or relinked meanwhile
+        self._log(f"Zoom link seek {status}")
+        self._unlink_windows()
+
     def _complete_zoom_link(self, current_zoom):
         """Called when motor has reached 0° — activate spring mode for zoom."""
         self.driver.set_mode(HapticMode.SPRING)
@@ -531,7 +601,7 @@ class SmartKnobGUI:
         self._log("Seek done! Spring mode active. Turn to zoom")
 
     def _toggle_connect(self):
-        if self.driver.is_connected:
+        if self.driver.is_connected or self.driver.is_reconnecting:
             self._disconnect()
         else:
             self._connect()
@@ -563,56 +633,87 @@ class SmartKnobGUI:
     def _on_driver_position(self, angle_deg: float) -> None:
         """Handle position update from driver (reader thread)."""
         self.current_angle = angle_deg
-        self.root.after(0, lambda a=angle_deg: self._update_position_display(a))
+        tr = tracing.TRACER
+        if tr is None:
+            self.root.after(0, lambda a=angle_deg: self._update_position_display(a))
+        else:
+            flow_id = tr.flow_start("tk.after", "tk")
+            self.root.after(0, lambda a=angle_deg, f=flow_id: self._traced_position_display(a, f))
+    
+    def _traced_position_display(self, angle, flow_id):
+        """_update_position_display() inside a "tk.position" span joined to its flow."""
+        tr = tracing.TRACER
+        if tr is None:
+            self._update_position_display(angle)
+            return
+        with tr.span("tk.position", "tk"):
+            tr.flow_end(flow_id, "tk.after", "tk")
+            self._update_position_display(angle)
 
     def _on_driver_ack(self, ack_text: str) -> None:
         """Handle acknowledgment from driver (reader thread)."""
         self._log(f"ACK: {ack_text}")
 
-    def _on_driver_seek_done(self) -> None:
-        """Handle seek completion from driver (reader thread)."""
-        if self._pending_zoom_data:
-            zoom_pct = self._pending_zoom_data["zoom_percent"]
-            self._pending_zoom_data = None
-            self.root.after(0, lambda: self._complete_zoom_link(zoom_pct))
-
     def _on_driver_raw(self, line: str) -> None:
         """Handle unrecognised serial line from driver (reader thread)."""
         self._log(f"RX: {line}")
+
+    def _on_driver_connection_state(self, state: ConnectionState) -> None:
+        """Handle link drop / restore from driver (reader or reconnect thread)."""
+        if state == ConnectionState.LOST:
+            self.root.after(0, lambda: self.status_label.config(text="Reconnecting…", foreground="orange"))
+            self._log("Connection lost — reconnecting")
+        elif state == ConnectionState.RECONNECTED:
+            self.root.after(0, lambda: self.status_label.config(text="Connected", foreground="green"))
+            self._log("Reconnected — mode and parameters restored")
     
     def _update_position_display(self, angle):
         """Update position display and process Windows link if active."""
         self.angle_label.config(text=f"{angle:.1f}°")
         
-        # Process Windows link if active
+        # Process Windows link if active (status is only returned on change)
+        if self.windows_link and self.windows_link.is_linked:
+            self._show_link_status(self.windows_link.process_position(angle))
+            # Reports stop when the knob stops: settle the jitter filter then
+            if self._settle_job is not None:
+                self.root.after_cancel(self._settle_job)
+            self._settle_job = self.root.after(int(SETTLE_S * 1000), self._settle_windows_link)
+    
+    def _settle_windows_link(self):
+        """Let the link's jitter filter catch up with the last reported angle."""
+        self._settle_job = None
         if self.windows_link and self.windows_link.is_linked:
-            result = self.windows_link.process_position(angle)
-            if result and hasattr(self, 'win_volume_label'):
-                func = result.get("function")
-                percent = result.get("percent", 0)
-                if func == "volume":
-                    self.win_volume_label.config(text=f"Volume: {percent}%")
-                elif func == "brightness":
-                    self.win_volume_label.config(text=f"Brightness: {percent}%")
-                elif func == "scroll":
-                    units = result.get("units", 0)
-                    direction = result.get("direction", "none")
-                    if units != 0:
-                        arrow = "↑" if direction == "up" else "↓"
-                        # Show approximate lines (120 units = 1 line)
-                        lines = abs(units) / 120
-                        if lines >= 1:
-                            self.win_volume_label.config(text=f"Scroll: {arrow} {lines:.1f} lines")
-                        else:
-                            self.win_volume_label.config(text=f"Scroll: {arrow}")
-                elif func == "zoom":
-                    action = result.get("action", "hold")
-                    if action == "zoom_in":
-                        self.win_volume_label.config(text=f"Zoom: {percent}% 🔍+")
-                    elif action == "zoom_out":
-                        self.win_volume_label.config(text=f"Zoom: {percent}% 🔍-")
+            self._show_link_status(self.windows_link.settle())
+    
+    def _show_link_status(self, status):
+        """Show a changed integration status (None = unchanged)."""
+        if status is not None and hasattr(self, 'win_volume_label'):
+            func = status.function
+            percent = status.percent
+            if func == "volume":
+                self.win_volume_label.config(text=f"Volume: {percent}%")
+            elif func == "brightness":
+                self.win_volume_label.config(text=f"Brightness: {percent}%")
+            elif func == "scroll":
+                units = status.units
+                if units != 0:
+                    arrow = "↑" if status.action == "up" else "↓"
+                    # Show approximate lines (120 units = 1 line)
+                    lines = abs(units) / 120
+                    if lines >= 1:
+                        self.win_volume_label.config(text=f"Scroll: {arrow} {lines:.1f} lines")
                     else:
-                        self.win_volume_label.config(text=f"Zoom: {percent}%")
+                        self.win_volume_label.config(text=f"Scroll: {arrow}")
+            elif func == "slides":
+                self.win_volume_label.config(text=f"Slide: {status.units:+d}")
+            elif func == "zoom":
+                action = status.action
+                if action == "zoom_in":
+                    self.win_volume_label.config(text=f"Zoom: {percent}% 🔍+")
+                elif action == "zoom_out":
+                    self.win_volume_label.config(text=f"Zoom: {percent}% 🔍-")
+                else:
+                    self.win_volume_label.config(text=f"Zoom: {percent}%")
     
     def _log(self, msg):
         def _append():
@@ -718,6 +819,8 @@ class SmartKnobGUI:
 
 
 if __name__ == "__main__":
+    tracing.enable_from_env()  # SMARTKNOB_TRACE=out.json
+    profiling.start_from_env()  # SMARTKNOB_PROFILE=out-dir
     root = tk.Tk()
     app = SmartKnobGUI(root)
     root.mainloop()
@@ -4,6 +4,11 @@ SmartKnob Windows integrations.
 Control modules for Windows system functions:
 - volume: System volume via Core Audio API
 - brightness: Display brightness via WMI
-- scroll: Mouse wheel via SendInput
+- scroll: Mouse wheel via SendInput (pluggable injection backends)
+- scroll_engine: Frame-batched scroll output with acceleration and momentum
 - zoom: Screen magnification via Magnification API
+- slides: Next/previous slide via keyboard SendInput
+- output: Quantized, change-only, rate-limited value writers
+- base: Integration interface and slotted IntegrationStatus
+- registry: Lazy name → Integration lookup (built-ins + entry points)
 """
@@ -0,0 +1,209 @@
+"""
+Common interface for knob integrations.
+
+Every integration (volume, brightness, scroll, zoom, slides, ...) subclasses
+Integration and is looked up by name through the registry, so WindowsLink
+never needs editing to add one.
+
+Lifecycle:
+    link(**options)   → prepare; may return an angle the knob should seek to
+    process(angle)    → called per position sample; returns the integration's
+                        IntegrationStatus only when it changed, else None
+    unlink()          → release resources / restore OS state
+    status_changed()  → hook fired with the (preallocated) status on change
+"""
+
+from typing import Callable, Optional
+
+from smartknob.protocol import HapticMode
+from smartknob_windows.integrations.output import QuantizedOutput
+
+
+class IntegrationStatus:
+    """
+    Mutable, slotted status snapshot owned by one integration.
+
+    The same object is updated in place and returned on every change, so
+    the per-sample path allocates nothing. Copy it (as_dict()) if you need
+    to keep a value across samples.
+
+    Attributes:
+        function: Integration name, e.g. "volume".
+        percent: Current value in percent (volume, brightness, zoom), or 0.
+        units: Integration-specific amount (e.g. scroll units, slide steps).
+        action: Short state word: "hold", "up", "down", "zoom_in", ...
+    """
+
+    __slots__ = ("function", "percent", "units", "action")
+
+    def __init__(self, function: str):
+        self.function = function
+        self.percent = 0
+        self.units = 0
+        self.action = "none"
+
+    def as_dict(self) -> dict:
+        """Copy the status into a plain dict."""
+        return {
+            "function": self.function,
+            "percent": self.percent,
+            "units": self.units,
+            "action": self.action,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"IntegrationStatus(function={self.function!r}, percent={self.percent}, "
+            f"units={self.units}, action={self.action!r})"
+        )
+
+
+StatusCallback = Callable[[IntegrationStatus], None]
+"""Called with the integration's status object whenever it changes."""
+
+
+class Integration:
+    """
+    Base class for a knob → OS function binding.
+
+    Subclasses set name/mode and implement process(); the others are
+    optional. The host (WindowsLink) provides shared settings such as the
+    bounded range, mapping curves and detent count.
+
+    Attributes:
+        name: Registry name ("volume", "scroll", ...).
+        mode: Haptic mode the firmware should be in while linked.
+        status: Preallocated IntegrationStatus returned by process().
+        on_status_changed: Optional callback for status changes.
+    """
+
+    name: str = ""
+    mode: Optional[HapticMode] = None
+
+    def __init__(self, host):
+        """
+        Args:
+            host: The WindowsLink that owns this integration.
+        """
+        self.host = host
+        self.status = IntegrationStatus(self.name)
+        self.on_status_changed: Optional[StatusCallback] = None
+        self.linked = False
+
+    @property
+    def available(self) -> bool:
+        """True if the OS function can be controlled on this system."""
+        return True
+
+    def link(self, **options) -> Optional[float]:
+        """
+        Prepare the integration for position updates.
+
+        Returns:
+            Optional[float]: Angle (degrees) the knob should seek to first,
+                             or None if no seek is needed.
+        """
+        self.linked = True
+        return None
+
+    def process(self, angle_deg: float) -> Optional[IntegrationStatus]:
+        """
+        Apply a position sample.
+
+        Returns:
+            IntegrationStatus if anything changed, otherwise None.
+        """
+        raise NotImplementedError
+
+    def unlink(self) -> None:
+        """Stop reacting to positions and release resources."""
+        self.linked = False
+
+    def status_changed(self, status: IntegrationStatus) -> None:
+        """Hook called after *status* changed. Default: forward to on_status_changed."""
+        if self.on_status_changed:
+            self.on_status_changed(status)
+
+    def _publish(self, percent: int = 0, units: int = 0, action: str = "none") -> Optional[IntegrationStatus]:
+        """Update the status in place; return it only if a field changed."""
+        st = self.status
+        if st.percent == percent and st.units == units and st.action == action:
+            return None
+        st.percent = percent
+        st.units = units
+        st.action = action
+        self.status_changed(st)
+        return st
+
+
+class BoundedIntegration(Integration):
+    """
+    Base for integrations that map the bounded range to a 0.0-1.0 value.
+
+    The angle is mapped through the host's compiled curve table for this
+    integration and written through a QuantizedOutput, so unchanged values
+    never reach the OS.
+
+    Subclasses implement _create_controller(), read_value() and
+    write_value(), and may override _configure_output() to set the
+    output resolution.
+    """
+
+    mode = HapticMode.BOUNDED
+    MIN_INTERVAL_S = 0.0
+    """Minimum time between OS writes; > 0 makes writes asynchronous."""
+
+    def __init__(self, host):
+        super().__init__(host)
+        self._controller = None
+        self.output: Optional[QuantizedOutput] = None
+
+    @property
+    def controller(self):
+        """The OS controller, created on first use."""
+        if self._controller is None:
+            self._controller = self._create_controller()
+        return self._controller
+
+    def _create_controller(self):
+        raise NotImplementedError
+
+    def read_value(self) -> float:
+        """Current OS value, 0.0-1.0."""
+        raise NotImplementedError
+
+    def write_value(self, value: float) -> None:
+        """Set the OS value, 0.0-1.0."""
+        raise NotImplementedError
+
+    def _configure_output(self) -> None:
+        """Set self.output's resolution. Default: 1% steps."""
+        self.output.set_resolution(steps=100)
+
+    def link(self, **options) -> float:
+        """
+        Prime the output with the current OS value.
+
+        Returns:
+            float: Angle matching the current value (inverse curve lookup).
+        """
+        value = self.read_value()
+        if self.output is None:
+            self.output = QuantizedOutput(
+                self.write_value, min_interval_s=self.MIN_INTERVAL_S, name=self.name
+            )
+        self._configure_output()
+        self.output.prime(value)
+        self.status.percent = int(round(value * 100))
+        super().link()
+        return self.host.curve_table(self.name).angle(value)
+
+    def process(self, angle_deg: float) -> Optional[IntegrationStatus]:
+        value = self.output.apply(self.host.curve_table(self.name).value(angle_deg))
+        return self._publish(percent=int(round(value * 100)), action="set")
+
+    def unlink(self) -> None:
+        # Let a pending rate-limited write land on its final value
+        if self.output is not None:
+            self.output.close()
+        super().unlink()
@@ -11,6 +11,8 @@ External monitors usually don't support software brightness control.
 
 import wmi
 
+from smartknob_windows.integrations.base import BoundedIntegration
+
 
 class BrightnessController:
     """Controls Windows display brightness via WMI."""
@@ -51,6 +53,25 @@ class BrightnessController:
         except Exception:
             return -1
     
+    def get_levels(self) -> list[int]:
+        """
+        Get the brightness levels the panel actually supports.
+        
+        Many panels expose fewer than 101 steps; writes between two supported
+        levels are rounded by the driver and change nothing visible.
+        
+        Returns:
+            list[int]: Supported levels 0-100 (ascending), or [] if unknown
+        """
+        if not self._available:
+            return []
+        
+        try:
+            levels = self._wmi.WmiMonitorBrightness()[0].Level
+            return sorted(set(int(v) for v in levels))
+        except Exception:
+            return []
+    
     def set_brightness(self, level: int) -> bool:
         """
         Set display brightness.
@@ -94,12 +115,46 @@ class BrightnessController:
         return self.set_brightness(int(round(level * 100)))
 
 
+class BrightnessIntegration(BoundedIntegration):
+    """Bounded knob → display brightness, quantized to supported WMI levels."""
+    
+    name = "brightness"
+    MIN_INTERVAL_S = 0.05  # WMI calls take tens of ms — write async
+    
+    def _create_controller(self) -> BrightnessController:
+        return BrightnessController()
+    
+    @property
+    def available(self) -> bool:
+        return self.controller.available
+    
+    def read_value(self) -> float:
+        return self.controller.get_brightness_float()
+    
+    def write_value(self, value: float) -> None:
+        self.controller.set_brightness_float(value)
+    
+    def _configure_output(self) -> None:
+        levels = self.controller.get_levels()
+        self.output.set_resolution(levels=[lv / 100.0 for lv in levels])
+    
+    def link(self, **options) -> float:
+        """
+        Raises:
+            RuntimeError: If brightness control is not available
+        """
+        if not self.available:
+            raise RuntimeError("Brightness control not available on this system")
+        return super().link(**options)
+
+
 # Quick test when run directly
 if __name__ == "__main__":
     bc = BrightnessController()
     if bc.available:
         print(f"Brightness control available")
         print(f"Current brightness: {bc.get_brightness()}%")
+        print(f"Supported levels: {bc.get_levels()}")
     else:
         print("Brightness control not available on this system")
         print("(This typically only works on laptops with built-in displays)")
@@ -0,0 +1,277 @@
+"""
+Quantized, change-only output for bounded-mode integrations.
+
+Volume and brightness used to be written on every position update, even
+when the resulting value was identical. QuantizedOutput sits between
+WindowsLink and a controller's setter and:
+
+- snaps the requested value to the integration's real resolution
+  (detent positions, or the WMI brightness levels the panel supports),
+- skips writes that would not change anything,
+- optionally rate-limits slow backends on a worker thread, coalescing
+  intermediate targets but always landing on the final one,
+- counts how many OS calls were avoided.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Sequence
+
+from smartknob import tracing
+
+
+class QuantizedOutput:
+    """
+    Change-only writer for a normalized (0.0-1.0) output value.
+
+    With min_interval_s == 0 the writer runs synchronously on the caller's
+    thread. With min_interval_s > 0 writes go to a daemon worker that keeps
+    only the newest target and waits at least min_interval_s between calls.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[float], object],
+        levels: Sequence[float] | None = None,
+        steps: int = 100,
+        min_interval_s: float = 0.0,
+        name: str = "output",
+    ):
+        """
+        Args:
+            writer: Function performing the OS call with a 0.0-1.0 value.
+            levels: Explicit allowed values in 0.0-1.0 (e.g. supported WMI
+                    brightness levels / 100). Overrides steps.
+            steps: Uniform resolution when levels is None (100 = 1% steps).
+            min_interval_s: Minimum time between OS calls. > 0 enables the
+                            asynchronous rate-limited worker.
+            name: Label used for the worker thread and stats.
+        """
+        self._writer = writer
+        self.name = name
+        self.min_interval_s = min_interval_s
+        self._levels: tuple[float, ...] = ()
+        self._steps = 100
+        self.set_resolution(levels=levels, steps=steps)
+
+        self._last_written: float | None = None
+        self._target: float | None = None
+
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+        # Optional smartknob.metrics Histogram timing each OS call
+        self.write_seconds = None
+
+        # Counters
+        self.requested = 0     # apply() calls
+        self.written = 0       # OS calls actually made
+        self.skipped_noop = 0  # Same quantized value as last write/target
+        self.coalesced = 0     # Superseded by a newer target before writing
+
+    # ------------------------------------------------------------------ #
+    #  Resolution
+    # ------------------------------------------------------------------ #
+
+    def set_resolution(self, levels: Sequence[float] | None = None, steps: int = 100) -> None:
+        """
+        Change the output resolution.
+
+        Args:
+            levels: Explicit allowed values (any order, 0.0-1.0), or None.
+            steps: Number of uniform intervals when levels is None.
+                   For N detents spanning the range, pass N - 1.
+        """
+        if levels:
+            self._levels = tuple(sorted(set(max(0.0, min(1.0, v)) for v in levels)))
+        else:
+            self._levels = ()
+        self._steps = max(1, int(steps))
+
+    def quantize(self, value: float) -> float:
+        """Snap *value* to the nearest representable output level."""
+        value = max(0.0, min(1.0, value))
+        levels = self._levels
+        if not levels:
+            return round(value * self._steps) / self._steps
+
+        i = bisect.bisect_left(levels, value)
+        if i == 0:
+            return levels[0]
+        if i == len(levels):
+            return levels[-1]
+        lo, hi = levels[i - 1], levels[i]
+        return lo if value - lo <= hi - value else hi
+
+    # ------------------------------------------------------------------ #
+    #  Writing
+    # ------------------------------------------------------------------ #
+
+    @property
+    def value(self) -> float | None:
+        """Most recent quantized target (written or pending)."""
+        target = self._target
+        return target if target is not None else self._last_written
+
+    def prime(self, value: float) -> None:
+        """Record *value* as already applied (e.g. the level read at link time)."""
+        q = self.quantize(value)
+        with self._cond:
+            self._last_written = q
+            self._target = None
+
+    def apply(self, value: float) -> float:
+        """
+        Request an output value.
+
+        Args:
+            value: Desired value, 0.0-1.0 (clamped).
+
+        Returns:
+            float: The quantized value that is (or will be) applied.
+        """
+        q = self.quantize(value)
+        self.requested += 1
+
+        if self.min_interval_s <= 0.0:
+            if q == self._last_written:
+                self.skipped_noop += 1
+                return q
+            self._write(q)
+            self._last_written = q
+            self.written += 1
+            return q
+
+        with self._cond:
+            current = self._target if self._target is not None else self._last_written
+            if q == current:
+                self.skipped_noop += 1
+                return q
+            if self._target is not None:
+                self.coalesced += 1
+            self._target = q
+            self._ensure_worker()
+            self._cond.notify()
+        return q
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """
+        Wait until any pending target has been written.
+
+        Returns:
+            bool: True if nothing is pending when the call returns.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._target is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Stop the worker thread. Pending targets are still written first."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._closed = False
+
+    def _write(self, value: float) -> None:
+        hist = self.write_seconds
+        tr = tracing.TRACER
+        if hist is None and tr is None:
+            self._writer(value)
+            return
+        t0 = time.perf_counter()
+        try:
+            self._writer(value)
+        finally:
+            t1 = time.perf_counter()
+            if hist is not None:
+                hist.record(t1 - t0)
+            if tr is not None:
+                tr.complete("os.write", t0, t1, "os", {"output": self.name, "value": value})
+
+    def _ensure_worker(self) -> None:
+        """Start the rate-limit worker if needed (caller holds _cond)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name=f"smartknob-{self.name}"
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        last_call = 0.0
+        while True:
+            with self._cond:
+                while self._target is None and not self._closed:
+                    self._cond.wait()
+                if self._target is None:
+                    return  # Closed and idle
+
+                wait = self.min_interval_s - (time.monotonic() - last_call)
+                if wait > 0 and not self._closed:
+                    # Newer targets may replace this one while we wait
+                    self._cond.wait(wait)
+                    continue
+
+                value = self._target
+
+            try:
+                self._write(value)
+            finally:
+                last_call = time.monotonic()
+                with self._cond:
+                    self._last_written = value
+                    self.written += 1
+                    if self._target == value:
+                        self._target = None
+                    self._cond.notify_all()
+
+    # ------------------------------------------------------------------ #
+    #  Stats
+    # ------------------------------------------------------------------ #
+
+    @property
+    def avoided(self) -> int:
+        """OS calls saved compared with writing on every request."""
+        return self.requested - self.written
+
+    def stats(self) -> dict:
+        """Counter snapshot: requested, written, skipped_noop, coalesced, avoided."""
+        return {
+            "requested": self.requested,
+            "written": self.written,
+            "skipped_noop": self.skipped_noop,
+            "coalesced": self.coalesced,
+            "avoided": self.avoided,
+        }
+
+    def reset_stats(self) -> None:
+        """Zero all counters."""
+        self.requested = self.written = self.skipped_noop = self.coalesced = 0
+
+
+# Quick test when run directly
+if __name__ == "__main__":
+    calls = []
+
+    def slow_writer(v: float) -> None:
+        time.sleep(0.03)  # Roughly one WMI brightness call
+        calls.append(v)
+
+    out = QuantizedOutput(slow_writer, levels=[i / 10 for i in range(11)],
+                          min_interval_s=0.05, name="demo")
+    for i in range(500):
+        out.apply(i / 499)
+        time.sleep(0.001)
+    out.flush()
+    print(f"Final written value: {calls[-1]:.2f}")
+    print(f"Stats: {out.stats()}")
+    out.close()
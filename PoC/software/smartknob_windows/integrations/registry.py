@@ -0,0 +1,211 @@
+"""
+Integration registry.
+
+Maps integration names (as used by WindowsLink and contexts.json) to
+Integration subclasses. Classes are imported lazily, so platform-specific
+dependencies (pycaw, wmi, ...) are only loaded when that integration is
+actually used.
+
+Third-party packages can add integrations through the entry point group
+"smartknob.integrations":
+
+    [project.entry-points."smartknob.integrations"]
+    media = "my_package.media:MediaIntegration"
+"""
+
+import importlib
+from importlib.metadata import entry_points
+
+from smartknob_windows.integrations.base import Integration
+
+ENTRY_POINT_GROUP = "smartknob.integrations"
+
+_BUILTIN: dict[str, str] = {
+    "volume": "smartknob_windows.integrations.volume:VolumeIntegration",
+    "brightness": "smartknob_windows.integrations.brightness:BrightnessIntegration",
+    "scroll": "smartknob_windows.integrations.scroll_engine:ScrollIntegration",
+    "zoom": "smartknob_windows.integrations.zoom:ZoomIntegration",
+    "slides": "smartknob_windows.integrations.slides:SlidesIntegration",
+}
+
+# name → "module:Class" string or an already-resolved class
+_registry: dict[str, object] = dict(_BUILTIN)
+_entry_points_loaded = False
+
+
+def register(name: str, target) -> None:
+    """
+    Register an integration.
+
+    Args:
+        name: Lookup name, e.g. "media".
+        target: Integration subclass, or "package.module:ClassName" to
+                import lazily on first use.
+    """
+    _registry[name] = target
+
+
+def _load_entry_points() -> None:
+    """Add entry-point integrations once (built-ins and register() win)."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        _registry.setdefault(ep.name, ep.value)
+
+
+def get(name: str) -> type[Integration]:
+    """
+    Resolve an integration class by name, importing it if necessary.
+
+    Raises:
+        KeyError: Unknown integration name.
+        ImportError: The integration's module (or its OS dependency) is
+                     not importable on this system.
+    """
+    target = _registry.get(name)
+    if target is None:
+        _load_entry_points()
+        target = _registry.get(name)
+    if target is None:
+        raise KeyError(f"Unknown integration: {name!r}")
+
+    if isinstance(target, str):
+        module_name, _, attr = target.partition(":")
+        target = getattr(importlib.import_module(module_name), attr)
+        if not (isinstance(target, type) and issubclass(target, Integration)):
+            raise TypeError(f"{name!r} does not resolve to an Integration subclass")
+        _registry[name] = target
+    return target
+
+
+def names() -> list[str]:
+    """All registered integration names (including entry points), sorted."""
+    _load_entry_points()
+    return sorted(_registry)
+
+
+def benchmark_dispatch(samples: int = 200_000) -> dict:
+    """
+    Compare per-sample dispatch cost of the pre-registry WindowsLink and
+    the current one, on the volume path with the OS call stubbed out.
+
+    - legacy: the old process_position() if-chain into _process_volume()
+      (reproduced as it was, since it no longer exists), building a fresh
+      dict and writing the volume on every sample.
+    - registry: WindowsLink.process_position() itself, dispatching to a
+      registered BoundedIntegration (curve table, QuantizedOutput,
+      preallocated status) whose controller is a stub.
+
+    Returns:
+        dict: legacy_ns / registry_ns per sample, how many samples produced
+              an update, and how many OS writes each path made.
+    """
+    import time
+
+    # The imported module, not __main__, is the registry WindowsLink uses
+    from smartknob_windows.integrations import registry
+    from smartknob_windows.integrations.base import BoundedIntegration
+    from smartknob_windows.windows_link import WindowsLink
+
+    class _StubVolume:
+        def __init__(self):
+            self.level = 0.5
+            self.writes = 0
+
+        def get_volume(self):
+            return self.level
+
+        def set_volume(self, level):
+            self.level = level
+            self.writes += 1
+
+    class _LegacyLink:
+        BOUND_MIN_DEG = -60.0
+        BOUND_MAX_DEG = 60.0
+        ANGLE_RANGE = BOUND_MAX_DEG - BOUND_MIN_DEG
+
+        def __init__(self):
+            self.active_function = "volume"
+            self._volume_ctrl = None
+
+        def _ensure_volume_controller(self):
+            if self._volume_ctrl is None:
+                self._volume_ctrl = _StubVolume()
+            return self._volume_ctrl
+
+        def process_position(self, angle_deg):
+            if self.active_function == "volume":
+                return self._process_volume(angle_deg)
+            elif self.active_function == "brightness":
+                return None
+            elif self.active_function == "scroll":
+                return None
+            elif self.active_function == "zoom":
+                return None
+            return None
+
+        def _process_volume(self, angle_deg):
+            angle = max(self.BOUND_MIN_DEG, min(self.BOUND_MAX_DEG, angle_deg))
+            volume = (angle - self.BOUND_MIN_DEG) / self.ANGLE_RANGE
+            vc = self._ensure_volume_controller()
+            vc.set_volume(volume)
+            return {"function": "volume", "percent": int(round(volume * 100))}
+
+    class _BenchVolume(BoundedIntegration):
+        name = "_bench_volume"
+
+        def _create_controller(self):
+            return _StubVolume()
+
+        def read_value(self):
+            return self.controller.get_volume()
+
+        def write_value(self, value):
+            self.controller.set_volume(value)
+
+    angles = [-60.0 + (i % 12000) * 0.01 for i in range(samples)]
+
+    legacy = _LegacyLink()
+    process = legacy.process_position
+    t0 = time.perf_counter()
+    for a in angles:
+        process(a)
+    legacy_ns = (time.perf_counter() - t0) / samples * 1e9
+
+    registry.register(_BenchVolume.name, _BenchVolume)
+    try:
+        link = WindowsLink()
+        link.link(_BenchVolume.name)
+        process = link.process_position
+        updates = 0
+        t0 = time.perf_counter()
+        for a in angles:
+            if process(a, 0.0) is not None:
+                updates += 1
+        registry_ns = (time.perf_counter() - t0) / samples * 1e9
+        registry_writes = link.active_integration.controller.writes
+        link.unlink()
+    finally:
+        registry._registry.pop(_BenchVolume.name, None)
+
+    return {
+        "legacy_ns": legacy_ns,
+        "registry_ns": registry_ns,
+        "legacy_updates": samples,
+        "registry_updates": updates,
+        "legacy_writes": legacy._volume_ctrl.writes,
+        "registry_writes": registry_writes,
+    }
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    print(f"Registered integrations: {', '.join(names())}")
+    result = benchmark_dispatch()
+    print("Volume dispatch, OS call stubbed:")
+    print(f"  Legacy WindowsLink if-chain:  {result['legacy_ns']:.0f} ns/sample, "
+          f"{result['legacy_updates']} updates, {result['legacy_writes']} writes")
+    print(f"  WindowsLink + registry:       {result['registry_ns']:.0f} ns/sample, "
+          f"{result['registry_updates']} updates, {result['registry_writes']} writes")
@@ -3,11 +3,16 @@ scroll_control.py
 
 Scrolls mouse wheel via simulated input events with Windows API (ctypes).
 
-Cross-platform fallback available via subprocess/clip (not implemented here).
+Injection goes through a pluggable ScrollBackend so the same scroll engine
+can drive Windows (SendInput), Linux (uinput via python-evdev) or, when
+passed explicitly, a RecordingBackend used for benchmarks and tests.
 """
 
 import ctypes
+import sys
+import time
 from ctypes import wintypes
+from typing import Sequence
 
 
 # Windows constants for SendInput
@@ -97,10 +102,169 @@ def scroll_smooth(delta: int) -> None:
     scroll(delta)
 
 
+def scroll_batch(deltas: Sequence[int]) -> int:
+    """
+    Send several wheel events in a single SendInput call.
+
+    One INPUT structure is built per delta and the whole array is handed to
+    SendInput at once, so a frame's worth of scroll output costs one
+    user/kernel transition instead of one per event.
+
+    Args:
+        deltas: Raw scroll units per event. Zero entries are skipped.
+
+    Returns:
+        int: Number of events injected.
+    """
+    deltas = [d for d in deltas if d != 0]
+    if not deltas:
+        return 0
+
+    extra = ctypes.pointer(ctypes.c_ulong(0))
+    inputs = (INPUT * len(deltas))()
+    for i, delta in enumerate(deltas):
+        inputs[i].type = INPUT_MOUSE
+        inputs[i].mi = MOUSEINPUT(0, 0, delta, MOUSEEVENTF_WHEEL, 0, extra)
+
+    return ctypes.windll.user32.SendInput(len(deltas), inputs, ctypes.sizeof(INPUT))
+
+
+# ======================== Injection Backends ========================
+
+class ScrollBackend:
+    """
+    Destination for scroll events produced by the scroll engine.
+
+    Subclasses implement send(), which receives every event of one frame
+    and should inject them as a single batch.
+    """
+
+    name = "base"
+
+    def send(self, deltas: Sequence[int]) -> int:
+        """
+        Inject a batch of wheel events.
+
+        Args:
+            deltas: Raw scroll units per event (120 = 1 line).
+
+        Returns:
+            int: Number of events injected.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any OS resources held by the backend."""
+
+
+class SendInputBackend(ScrollBackend):
+    """Windows backend: one SendInput call per frame."""
+
+    name = "sendinput"
+
+    def send(self, deltas: Sequence[int]) -> int:
+        return scroll_batch(deltas)
+
+
+class UinputBackend(ScrollBackend):
+    """
+    Linux backend: virtual wheel device via /dev/uinput.
+
+    Uses REL_WHEEL_HI_RES, which shares the 120-units-per-notch convention
+    with Windows, and synthesises legacy REL_WHEEL notches from the
+    remainder. Requires: pip install evdev
+    """
+
+    name = "uinput"
+
+    def __init__(self, device_name: str = "smartknob-scroll"):
+        """Create the virtual device. Raises ImportError/OSError if unavailable."""
+        from evdev import UInput, ecodes
+
+        self._ecodes = ecodes
+        self._ui = UInput(
+            {ecodes.EV_REL: [ecodes.REL_WHEEL, ecodes.REL_WHEEL_HI_RES]},
+            name=device_name,
+        )
+        self._notch_remainder = 0
+
+    def send(self, deltas: Sequence[int]) -> int:
+        ec = self._ecodes
+        count = 0
+        for delta in deltas:
+            if delta == 0:
+                continue
+            self._ui.write(ec.EV_REL, ec.REL_WHEEL_HI_RES, delta)
+            self._notch_remainder += delta
+            notches = int(self._notch_remainder / WHEEL_DELTA)
+            if notches:
+                self._ui.write(ec.EV_REL, ec.REL_WHEEL, notches)
+                self._notch_remainder -= notches * WHEEL_DELTA
+            count += 1
+        if count:
+            self._ui.syn()
+        return count
+
+    def close(self) -> None:
+        self._ui.close()
+
+
+class RecordingBackend(ScrollBackend):
+    """
+    In-memory backend that records every batch with a timestamp.
+
+    Used to benchmark events per second and frame-to-frame smoothness
+    without touching the OS.
+    """
+
+    name = "recording"
+
+    def __init__(self):
+        self.batches: list[tuple[float, list[int]]] = []
+
+    def send(self, deltas: Sequence[int]) -> int:
+        batch = [d for d in deltas if d != 0]
+        if batch:
+            self.batches.append((time.perf_counter(), batch))
+        return len(batch)
+
+    @property
+    def total_units(self) -> int:
+        """Sum of all recorded scroll units."""
+        return sum(sum(b) for _, b in self.batches)
+
+    @property
+    def event_count(self) -> int:
+        """Number of individual wheel events recorded."""
+        return sum(len(b) for _, b in self.batches)
+
+    def clear(self) -> None:
+        """Forget all recorded batches."""
+        self.batches.clear()
+
+
+def default_backend() -> ScrollBackend:
+    """
+    Pick the injection backend for the current platform.
+
+    Returns:
+        ScrollBackend: SendInputBackend on Windows, UinputBackend on Linux
+                       when evdev and /dev/uinput are usable.
+
+    Raises:
+        ImportError: No way to inject scroll events on this system
+                     (pass a RecordingBackend explicitly for tests/benchmarks).
+    """
+    if sys.platform == "win32":
+        return SendInputBackend()
+    try:
+        return UinputBackend()
+    except (ImportError, OSError) as e:
+        raise ImportError(f"No scroll injection backend available: {e}") from e
+
+
 # Quick test
 if __name__ == "__main__":
-    import time
-    
     print("Scroll control test")
     print(f"WHEEL_DELTA = {WHEEL_DELTA} (standard line scroll)")
     print()
@@ -0,0 +1,455 @@
+"""
+Frame-batched scroll engine.
+
+Turns knob rotation into scroll output on a fixed display-rate tick instead
+of one injection per position update:
+
+- Position deltas are converted to fractional scroll units and accumulated.
+- A velocity-based AccelerationCurve scales fast spins.
+- Each tick drains part of the accumulator (sub-line smoothing) and hands
+  the whole frame to a ScrollBackend as one batch.
+- Optional Momentum keeps the page coasting after the knob stops, decaying
+  with the same drag/friction law as the firmware's inertia flywheel.
+
+The engine is platform-neutral; the backend decides where events go.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from smartknob import tracing
+from smartknob.protocol import HapticMode
+from smartknob_windows.integrations.base import Integration, IntegrationStatus
+from smartknob_windows.integrations.scroll import (
+    WHEEL_DELTA,
+    ScrollBackend,
+    default_backend,
+)
+
+
+@dataclass
+class AccelerationCurve:
+    """
+    Velocity-based scroll gain.
+
+    Below threshold_dps the gain is 1.0 (precise, 1:1 scrolling). Above it,
+    gain grows as ((v - threshold) / scale) ** exponent, capped at max_gain.
+
+    Attributes:
+        threshold_dps: Knob speed (deg/s) where acceleration starts.
+        scale_dps: Speed above threshold that adds +1.0 gain (at exponent 1).
+        exponent: Curve shape. 1.0 = linear, >1 = gentle start, steep end.
+        max_gain: Upper limit on the multiplier.
+    """
+
+    threshold_dps: float = 90.0
+    scale_dps: float = 180.0
+    exponent: float = 1.5
+    max_gain: float = 6.0
+
+    def gain(self, speed_dps: float) -> float:
+        """Return the unit multiplier for an absolute knob speed in deg/s."""
+        excess = speed_dps - self.threshold_dps
+        if excess <= 0.0:
+            return 1.0
+        return min(self.max_gain, 1.0 + (excess / self.scale_dps) ** self.exponent)
+
+
+NO_ACCELERATION = AccelerationCurve(threshold_dps=math.inf)
+"""Curve that always returns 1.0 — plain proportional scrolling."""
+
+
+@dataclass
+class Momentum:
+    """
+    Coast parameters mirroring the firmware inertia mode.
+
+    After the knob has been idle for idle_s, the last scroll velocity keeps
+    being emitted and decays per the firmware flywheel law with the coupling
+    spring removed:  dv/dt = -(damping / inertia) * v - friction * sign(v).
+
+    Attributes:
+        inertia: Virtual mass (firmware J, preset "inertia").
+        damping: Drag coefficient (firmware B, preset "damping").
+        friction: Static friction (firmware F).
+        idle_s: Input silence before coasting starts.
+        stop_units_per_s: Coast ends below this speed.
+    """
+
+    inertia: float = 5.0
+    damping: float = 1.0
+    friction: float = 0.2
+    idle_s: float = 0.05
+    stop_units_per_s: float = 30.0
+
+    def decay(self, velocity: float, dt: float, units_per_rad: float) -> float:
+        """
+        Advance a coast velocity by *dt* seconds.
+
+        Args:
+            velocity: Current coast speed in scroll units/s.
+            dt: Time step in seconds.
+            units_per_rad: Scroll units per radian, to express the firmware's
+                           friction (rad/s^2) in units/s^2.
+
+        Returns:
+            float: New velocity in units/s (0.0 once friction wins).
+        """
+        if self.inertia > 0.0:
+            velocity *= math.exp(-(self.damping / self.inertia) * dt)
+        step = self.friction * dt * units_per_rad
+        if abs(velocity) <= step:
+            return 0.0
+        return velocity - math.copysign(step, velocity)
+
+
+class ScrollEngine:
+    """
+    Accumulates knob rotation and emits batched scroll frames.
+
+    feed() is called from whatever thread receives positions; tick() runs on
+    the engine's own thread (start()/stop()) or can be driven manually with
+    an explicit clock for deterministic benchmarks.
+    """
+
+    def __init__(
+        self,
+        units_per_degree: float = WHEEL_DELTA / 6.0,
+        backend: ScrollBackend | None = None,
+        tick_hz: float = 60.0,
+        smoothing_s: float = 0.025,
+        acceleration: AccelerationCurve | None = None,
+        momentum: Momentum | None = None,
+        max_units_per_event: int = WHEEL_DELTA,
+    ):
+        """
+        Args:
+            units_per_degree: Scroll units per degree of rotation at gain 1.0.
+            backend: Event destination (default: platform default_backend()).
+            tick_hz: Frame rate for emitting scroll output.
+            smoothing_s: Time constant for draining the accumulator.
+                         0 = emit everything on the next tick.
+            acceleration: Velocity-based gain curve (default: none).
+            momentum: Coast parameters, or None to stop dead on release.
+            max_units_per_event: Larger frame totals are split into several
+                                 events sent in the same batch.
+        """
+        self.units_per_degree = units_per_degree
+        self.backend = backend if backend is not None else default_backend()
+        self.tick_hz = tick_hz
+        self.smoothing_s = smoothing_s
+        self.acceleration = acceleration or NO_ACCELERATION
+        self.momentum = momentum
+        self.max_units_per_event = max(1, int(max_units_per_event))
+
+        self._lock = threading.Lock()
+        self._pending = 0.0          # Units waiting to be emitted (fractional)
+        self._last_angle = None
+        self._last_feed_time = None
+        self._velocity = 0.0         # Smoothed input velocity, units/s
+        self._last_tick_time = None
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+        # Optional smartknob.metrics Histogram timing each backend batch
+        self.send_seconds = None
+
+        # Counters
+        self.frames_sent = 0
+        self.events_sent = 0
+        self.units_sent = 0
+
+    # ------------------------------------------------------------------ #
+    #  Input
+    # ------------------------------------------------------------------ #
+
+    def feed(self, angle_deg: float, now: float | None = None) -> float:
+        """
+        Add a position sample.
+
+        Args:
+            angle_deg: Absolute knob angle in degrees (unbounded).
+            now: Sample time in seconds (default: time.perf_counter()).
+
+        Returns:
+            float: Scroll units queued by this sample (after acceleration).
+        """
+        if now is None:
+            now = time.perf_counter()
+
+        with self._lock:
+            if self._last_angle is None:
+                self._last_angle = angle_deg
+                self._last_feed_time = now
+                return 0.0
+
+            delta = angle_deg - self._last_angle
+            dt = now - self._last_feed_time
+            self._last_angle = angle_deg
+            self._last_feed_time = now
+
+            speed_dps = abs(delta) / dt if dt > 0.0 else 0.0
+            units = delta * self.units_per_degree * self.acceleration.gain(speed_dps)
+            self._pending += units
+
+            if dt > 0.0:
+                # Light EMA so a single late report doesn't spike the coast speed
+                self._velocity = 0.5 * self._velocity + 0.5 * (units / dt)
+            return units
+
+    def reset(self) -> None:
+        """Drop queued output, velocity and the angle reference."""
+        with self._lock:
+            self._pending = 0.0
+            self._last_angle = None
+            self._last_feed_time = None
+            self._velocity = 0.0
+
+    # ------------------------------------------------------------------ #
+    #  Output
+    # ------------------------------------------------------------------ #
+
+    def tick(self, now: float | None = None) -> int:
+        """
+        Emit one frame.
+
+        Args:
+            now: Frame time in seconds (default: time.perf_counter()).
+
+        Returns:
+            int: Scroll units sent this frame.
+        """
+        if now is None:
+            now = time.perf_counter()
+
+        with self._lock:
+            dt = 0.0 if self._last_tick_time is None else now - self._last_tick_time
+            self._last_tick_time = now
+
+            if (
+                self.momentum is not None
+                and self._last_feed_time is not None
+                and now - self._last_feed_time >= self.momentum.idle_s
+                and self._velocity != 0.0
+            ):
+                self._pending += self._velocity * dt
+                self._velocity = self.momentum.decay(
+                    self._velocity, dt, math.degrees(self.units_per_degree)
+                )
+                if abs(self._velocity) < self.momentum.stop_units_per_s:
+                    self._velocity = 0.0
+
+            if self.smoothing_s > 0.0 and dt > 0.0:
+                share = 1.0 - math.exp(-dt / self.smoothing_s)
+                want = self._pending * share
+                # Never let a small remainder linger forever
+                if abs(self._pending) < 1.5:
+                    want = self._pending
+            else:
+                want = self._pending
+
+            units = int(want)
+            if units == 0:
+                return 0
+            self._pending -= units
+
+        deltas = self._split(units)
+        hist = self.send_seconds
+        tr = tracing.TRACER
+        if hist is None and tr is None:
+            self.backend.send(deltas)
+        else:
+            t0 = time.perf_counter()
+            self.backend.send(deltas)
+            t1 = time.perf_counter()
+            if hist is not None:
+                hist.record(t1 - t0)
+            if tr is not None:
+                tr.complete("os.scroll", t0, t1, "os", {"units": units, "events": len(deltas)})
+        self.frames_sent += 1
+        self.events_sent += len(deltas)
+        self.units_sent += units
+        return units
+
+    def _split(self, units: int) -> list[int]:
+        """Split a frame total into events no larger than max_units_per_event."""
+        limit = self.max_units_per_event
+        sign = 1 if units > 0 else -1
+        remaining = abs(units)
+        deltas = []
+        while remaining > limit:
+            deltas.append(sign * limit)
+            remaining -= limit
+        deltas.append(sign * remaining)
+        return deltas
+
+    # ------------------------------------------------------------------ #
+    #  Tick thread
+    # ------------------------------------------------------------------ #
+
+    @property
+    def is_running(self) -> bool:
+        """True while the tick thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start emitting frames at tick_hz on a daemon thread."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._last_tick_time = None
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="smartknob-scroll"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the tick thread and discard anything still queued."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self.reset()
+
+    def _run(self) -> None:
+        period = 1.0 / self.tick_hz
+        next_frame = time.perf_counter()
+        while not self._stop_event.is_set():
+            self.tick()
+            next_frame += period
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                # Fell behind (e.g. system stall) — resync instead of bursting
+                next_frame = time.perf_counter()
+
+
+class ScrollIntegration(Integration):
+    """
+    Inertia knob → smooth mouse wheel.
+
+    Rotation deltas (infinite rotation) are queued into a ScrollEngine that
+    emits batched frames at TICK_HZ. The status reports the units queued by
+    the latest sample.
+    """
+
+    name = "scroll"
+    mode = HapticMode.INERTIA
+
+    # Degrees per WHEEL_DELTA (120 units = 1 line). Lower = more sensitive.
+    # 6° means 60 lines per revolution (360/6)
+    DEGREES_PER_LINE = 6.0
+    # Scroll output is batched per frame at this rate (display refresh)
+    TICK_HZ = 60.0
+
+    def __init__(self, host):
+        """
+        Raises:
+            ImportError: No scroll injection backend on this system.
+        """
+        super().__init__(host)
+        self.degrees_per_line = self.DEGREES_PER_LINE
+        self.engine = ScrollEngine(
+            backend=getattr(host, "scroll_backend", None), tick_hz=self.TICK_HZ
+        )
+
+    @property
+    def units_per_degree(self) -> float:
+        """Scroll units per degree of rotation at gain 1.0."""
+        return WHEEL_DELTA / self.degrees_per_line
+
+    def link(
+        self,
+        sensitivity: float | None = None,
+        acceleration: AccelerationCurve | None = None,
+        momentum: Momentum | None = None,
+        **options,
+    ) -> None:
+        """
+        Start the scroll frame tick.
+
+        Args:
+            sensitivity: Degrees per line (default: 6.0 = 60 lines/rev).
+            acceleration: Velocity-based gain curve (default: none).
+            momentum: Coast parameters matching the preset's inertia
+                      settings, or None to stop when the knob stops.
+        """
+        if sensitivity is not None:
+            self.degrees_per_line = sensitivity
+
+        engine = self.engine
+        engine.stop()  # Also resets accumulated state
+        engine.units_per_degree = self.units_per_degree
+        engine.acceleration = acceleration or NO_ACCELERATION
+        engine.momentum = momentum
+        engine.start()
+        return super().link()
+
+    def process(self, angle_deg: float) -> IntegrationStatus | None:
+        units = int(round(self.engine.feed(angle_deg)))
+        action = "up" if units > 0 else ("down" if units < 0 else "none")
+        return self._publish(units=units, action=action)
+
+    def unlink(self) -> None:
+        # Stop the frame tick (drops anything still queued)
+        self.engine.stop()
+        super().unlink()
+
+
+def benchmark(duration_s: float = 2.0, report_hz: float = 100.0, tick_hz: float = 60.0) -> dict:
+    """
+    Simulate a steady spin into a RecordingBackend and report output quality.
+
+    Runs on a synthetic clock, so results are deterministic and the call
+    returns immediately regardless of duration_s.
+
+    Returns:
+        dict: events_per_s, frames_per_s, units_per_frame mean and stdev
+              (lower stdev = smoother), and total units.
+    """
+    from smartknob_windows.integrations.scroll import RecordingBackend
+
+    backend = RecordingBackend()
+    engine = ScrollEngine(backend=backend, tick_hz=tick_hz)
+
+    frame_units = []
+    next_report = 0.0
+    next_tick = 0.0
+    angle = 0.0
+    t = 0.0
+    step = 1e-4
+    while t < duration_s:
+        if t >= next_report:
+            engine.feed(angle, now=t)
+            angle += 90.0 / report_hz  # 90 deg/s steady spin
+            next_report += 1.0 / report_hz
+        if t >= next_tick:
+            frame_units.append(engine.tick(now=t))
+            next_tick += 1.0 / tick_hz
+        t += step
+
+    sent = [u for u in frame_units if u]
+    mean = sum(sent) / len(sent) if sent else 0.0
+    var = sum((u - mean) ** 2 for u in sent) / len(sent) if sent else 0.0
+    return {
+        "events_per_s": engine.events_sent / duration_s,
+        "frames_per_s": engine.frames_sent / duration_s,
+        "units_per_frame_mean": mean,
+        "units_per_frame_stdev": math.sqrt(var),
+        "total_units": backend.total_units,
+    }
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    for hz in (30.0, 60.0, 120.0):
+        result = benchmark(tick_hz=hz)
+        print(
+            f"tick {hz:5.0f} Hz: {result['events_per_s']:6.1f} events/s, "
+            f"{result['units_per_frame_mean']:5.1f} ± {result['units_per_frame_stdev']:4.1f} units/frame, "
+            f"total {result['total_units']}"
+        )
@@ -0,0 +1,128 @@
+"""
+Presentation slides control.
+
+Each detent step on the knob (haptic mode) presses Right/Left arrow, which
+PowerPoint, browsers and most PDF viewers treat as next/previous slide.
+Keystrokes are injected with SendInput (ctypes).
+"""
+
+import ctypes
+import sys
+import time
+from ctypes import wintypes
+from typing import Callable
+
+from smartknob import tracing
+from smartknob.protocol import HapticMode
+from smartknob_windows.integrations.base import Integration, IntegrationStatus
+from smartknob_windows.integrations.scroll import MOUSEINPUT
+
+
+# Windows constants for keyboard SendInput
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+VK_LEFT = 0x25
+VK_RIGHT = 0x27
+
+
+class KEYBDINPUT(ctypes.Structure):
+    """Structure for keyboard input events."""
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong)),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    # MOUSEINPUT is the largest member; it sets the size SendInput expects
+    _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+
+class KEYINPUT(ctypes.Structure):
+    """INPUT structure carrying a keyboard event."""
+    _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+
+def press_key(vk: int, count: int = 1) -> int:
+    """
+    Tap a virtual key *count* times in a single SendInput call.
+
+    Args:
+        vk: Virtual-key code, e.g. VK_RIGHT.
+        count: Number of press/release pairs.
+
+    Returns:
+        int: Number of input events injected.
+    """
+    if count <= 0:
+        return 0
+    extra = ctypes.pointer(ctypes.c_ulong(0))
+    inputs = (KEYINPUT * (2 * count))()
+    for i in range(count):
+        for j, flags in enumerate((0, KEYEVENTF_KEYUP)):
+            inp = inputs[2 * i + j]
+            inp.type = INPUT_KEYBOARD
+            inp.u.ki = KEYBDINPUT(vk, 0, flags, 0, extra)
+    return ctypes.windll.user32.SendInput(len(inputs), inputs, ctypes.sizeof(KEYINPUT))
+
+
+class SlidesIntegration(Integration):
+    """
+    Haptic detent knob → next/previous slide.
+
+    Steps are counted per detent with hysteresis, so jitter at a detent
+    boundary cannot produce double presses.
+    """
+
+    name = "slides"
+    mode = HapticMode.HAPTIC
+
+    DEFAULT_DETENTS = 12  # CLICKY_SELECTOR preset
+    HYSTERESIS = 0.2  # Fraction of a detent beyond the midpoint before stepping
+
+    def __init__(self, host, key_sender: Callable[[int, int], object] = press_key):
+        super().__init__(host)
+        self._send_key = key_sender
+        self._spacing = 360.0 / self.DEFAULT_DETENTS
+        self._index = None
+
+    @property
+    def available(self) -> bool:
+        return sys.platform == "win32"
+
+    def link(self, **options) -> None:
+        detents = getattr(self.host, "detent_count", None) or self.DEFAULT_DETENTS
+        self._spacing = 360.0 / detents
+        self._index = None
+        self.status.units = 0
+        self.status.action = "hold"
+        return super().link()
+
+    def process(self, angle_deg: float) -> IntegrationStatus | None:
+        position = angle_deg / self._spacing
+        if self._index is None:
+            self._index = round(position)
+            return None
+
+        offset = position - self._index
+        limit = 0.5 + self.HYSTERESIS
+        if -limit < offset < limit:
+            return None
+
+        # Fast spins can cross several detents between two reports
+        steps = round(offset)
+        self._index += steps
+        tr = tracing.TRACER
+        t0 = time.perf_counter() if tr is not None else 0.0
+        if steps > 0:
+            self._send_key(VK_RIGHT, steps)
+            action = "next"
+        else:
+            self._send_key(VK_LEFT, -steps)
+            action = "prev"
+        if tr is not None:
+            tr.complete("os.key", t0, time.perf_counter(), "os", {"steps": steps})
+        return self._publish(units=self.status.units + steps, action=action)
@@ -7,6 +7,8 @@ Requires: pip install pycaw comtypes
 
 from pycaw.pycaw import AudioUtilities
 
+from smartknob_windows.integrations.base import BoundedIntegration
+
 
 class VolumeController:
     """Controls Windows system volume via Core Audio API."""
@@ -84,6 +86,36 @@ class VolumeController:
         return new_state
 
 
+class VolumeIntegration(BoundedIntegration):
+    """Bounded knob → system volume, quantized per detent."""
+    
+    name = "volume"
+    STEPS = 100  # 1% steps when the detent count is unknown
+    
+    def _create_controller(self) -> VolumeController:
+        return VolumeController()
+    
+    def read_value(self) -> float:
+        return self.controller.get_volume()
+    
+    def write_value(self, value: float) -> None:
+        self.controller.set_volume(value)
+    
+    def _configure_output(self) -> None:
+        """Quantize volume to detent positions when the count is known."""
+        detents = self.host.detent_count
+        if detents and detents >= 2:
+            # One level per detent angle, taken through the mapping curve:
+            # uniform value steps would merge the low detents of a dB curve
+            table = self.host.curve_table(self.name)
+            step = (table.upper_deg - table.lower_deg) / (detents - 1)
+            self.output.set_resolution(
+                levels=[table.value(table.lower_deg + i * step) for i in range(detents)]
+            )
+        else:
+            self.output.set_resolution(steps=self.STEPS)
+
+
 # Quick test when run directly
 if __name__ == "__main__":
     vc = VolumeController()
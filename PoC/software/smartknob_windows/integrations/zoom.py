@@ -9,6 +9,10 @@ The Magnification API (Magnification.dll) provides smooth zoom from 1.0x to 8.0x
 import ctypes
 from ctypes import wintypes
 
+from smartknob.protocol import HapticMode
+from smartknob_windows.filtering import Threshold
+from smartknob_windows.integrations.base import Integration, IntegrationStatus
+
 
 # Load User32 for cursor position and screen dimensions
 user32 = ctypes.WinDLL("user32", use_last_error=True)
@@ -298,6 +302,111 @@ class ZoomController:
                 pass
 
 
+class ZoomIntegration(Integration):
+    """
+    Spring knob → fullscreen magnifier zoom rate.
+    
+    Displacement from the spring center controls zoom rate:
+    - Center (within dead zone): Hold current zoom
+    - CW (positive): Zoom in, rate proportional to displacement
+    - CCW (negative): Zoom out, rate proportional to displacement (stops at 100%)
+    """
+    
+    name = "zoom"
+    mode = HapticMode.SPRING
+    
+    DEAD_ZONE = 5.0  # Degrees - no zoom change within this range
+    DEAD_ZONE_HYSTERESIS = 0.0  # Degrees either side of the edge; preset "hysteresis_deg" overrides
+    MAX_DISPLACEMENT = 45.0  # Full deflection = fastest zoom
+    MAX_RATE = 0.05  # Zoom factor change per update at max displacement
+    
+    def __init__(self, host):
+        super().__init__(host)
+        self._controller = None
+        self._current_zoom = 1.0  # Track as factor (1.0 = 100%)
+        self._outside = Threshold(self.DEAD_ZONE, self.DEAD_ZONE_HYSTERESIS)
+    
+    @property
+    def controller(self) -> ZoomController:
+        """The Magnification API controller, created on first use."""
+        if self._controller is None:
+            self._controller = ZoomController()
+        return self._controller
+    
+    @property
+    def available(self) -> bool:
+        return self.controller.available
+    
+    def link(self, **options) -> float:
+        """
+        Initialize the Magnification API and read the current zoom.
+        
+        Returns:
+            float: 0.0 — the knob should seek to the spring center first.
+        
+        Raises:
+            RuntimeError: If zoom is unavailable or the API fails to initialize
+        """
+        zc = self.controller
+        if not zc.available:
+            raise RuntimeError("Zoom control not available on this system")
+        
+        # Initialize the Magnification API
+        if not zc.initialize():
+            raise RuntimeError("Failed to initialize Magnification API")
+        
+        # Get current zoom level (as factor 1.0-8.0)
+        self._current_zoom = zc.get_zoom()
+        self.status.percent = int(round(self._current_zoom * 100))
+        self.status.action = "hold"
+        
+        # Hold/move decision with hysteresis so noise at the edge can't flicker it
+        band = self.host.filter_config(self.name).get("hysteresis_deg", self.DEAD_ZONE_HYSTERESIS)
+        self._outside = Threshold(self.DEAD_ZONE, band)
+        super().link()
+        return 0.0
+    
+    def process(self, angle_deg: float) -> IntegrationStatus | None:
+        # Apply dead zone at center
+        if not self._outside.update(abs(angle_deg)):
+            return self._publish(percent=int(round(self._current_zoom * 100)), action="hold")
+        
+        # Calculate displacement beyond dead zone (0 inside the hysteresis band)
+        beyond = max(0.0, abs(angle_deg) - self.DEAD_ZONE)
+        displacement = beyond if angle_deg > 0 else -beyond
+        
+        # Normalize displacement to [-1, 1] range
+        normalized = displacement / (self.MAX_DISPLACEMENT - self.DEAD_ZONE)
+        normalized = max(-1.0, min(1.0, normalized))
+        
+        # Calculate zoom rate (factor change per update)
+        rate = normalized * self.MAX_RATE
+        
+        # Apply smooth zoom change, clamped: can't go below 100%, max at 800%
+        new_zoom = max(MIN_ZOOM, min(MAX_ZOOM, self._current_zoom + rate))
+        
+        # Only update if changed significantly
+        if abs(new_zoom - self._current_zoom) > 0.001:
+            self.controller.set_zoom(new_zoom)
+            self._current_zoom = new_zoom
+        
+        # Determine action string
+        if rate > 0.001:
+            action = "zoom_in"
+        elif rate < -0.001:
+            action = "zoom_out"
+        else:
+            action = "hold"
+        
+        return self._publish(percent=int(round(self._current_zoom * 100)), action=action)
+    
+    def unlink(self) -> None:
+        """Reset zoom to 100% and close the magnifier."""
+        if self.linked and self._controller is not None:
+            self._controller.reset()  # Resets to 100% and uninitializes
+        super().unlink()
+
+
 # Quick test
 if __name__ == "__main__":
     import time
@@ -0,0 +1,263 @@
+"""
+Mapping curves from knob angle to integration value.
+
+Bounded-mode integrations (volume, brightness) map an angle between the
+lower and upper wall to a 0.0-1.0 value. The mapping is rarely linear in
+perception, so each integration can use a curve:
+
+- linear:    y = x
+- db:        y = 10 ** (range_db * (x - 1) / 20), 0 at the bottom (mute)
+- log:       y = log(1 + k * x) / log(1 + k)
+- gamma:     y = x ** gamma
+- piecewise: straight lines between user control points [[x, y], ...]
+
+Curves are compiled once into a CurveTable: a dense lookup table indexed by
+quantized angle plus an inverse table indexed by quantized value, so both
+angle → value (every sample) and value → angle (seek-to-current-value when
+linking) are O(1) lookups with no per-sample math or clamping of floats.
+
+Curve configs come from the "curve" entry of a preset in presets.json:
+
+    "VOLUME_KNOB": { ..., "curve": {"type": "db", "range_db": 40.0} }
+"""
+
+import bisect
+import json
+import math
+from pathlib import Path
+from typing import Callable
+
+CONFIG_DIR = Path(__file__).parent / "config"
+"""Directory holding presets.json and contexts.json."""
+
+LINEAR = {"type": "linear"}
+"""Curve config used when a preset defines no curve."""
+
+ANGLE_RESOLUTION_DEG = 0.01
+"""Forward table step. Matches the firmware's 2-decimal position reports."""
+
+INVERSE_STEPS = 1000
+"""Inverse table entries across 0.0-1.0 (0.1% value resolution)."""
+
+
+# ======================== Curve Functions ========================
+
+def _linear(x: float) -> float:
+    return x
+
+
+def _make_db(range_db: float) -> Callable[[float], float]:
+    def curve(x: float) -> float:
+        if x <= 0.0:
+            return 0.0
+        return 10.0 ** (range_db * (x - 1.0) / 20.0)
+    return curve
+
+
+def _make_log(k: float) -> Callable[[float], float]:
+    denom = math.log1p(k)
+
+    def curve(x: float) -> float:
+        return math.log1p(k * x) / denom
+    return curve
+
+
+def _make_gamma(gamma: float) -> Callable[[float], float]:
+    def curve(x: float) -> float:
+        return x ** gamma
+    return curve
+
+
+def _make_piecewise(points: list) -> Callable[[float], float]:
+    pts = sorted((float(x), float(y)) for x, y in points)
+    if len(pts) < 2:
+        raise ValueError("piecewise curve needs at least 2 control points")
+    xs = [p[0] for p in pts]
+    ys = [p[1] for p in pts]
+
+    def curve(x: float) -> float:
+        if x <= xs[0]:
+            return ys[0]
+        if x >= xs[-1]:
+            return ys[-1]
+        i = bisect.bisect_right(xs, x)
+        x0, x1, y0, y1 = xs[i - 1], xs[i], ys[i - 1], ys[i]
+        return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+    return curve
+
+
+def curve_function(config: dict | None) -> Callable[[float], float]:
+    """
+    Build the normalized curve function described by *config*.
+
+    Args:
+        config: Curve config dict, e.g. ``{"type": "gamma", "gamma": 2.2}``.
+                None means linear.
+
+    Returns:
+        Callable mapping 0.0-1.0 → 0.0-1.0.
+
+    Raises:
+        ValueError: Unknown curve type or invalid parameters.
+    """
+    config = config or LINEAR
+    kind = config.get("type", "linear")
+
+    if kind == "linear":
+        return _linear
+    if kind == "db":
+        range_db = float(config.get("range_db", 40.0))
+        if range_db <= 0:
+            raise ValueError("db curve needs range_db > 0")
+        return _make_db(range_db)
+    if kind == "log":
+        k = float(config.get("k", 9.0))
+        if k <= 0:
+            raise ValueError("log curve needs k > 0")
+        return _make_log(k)
+    if kind == "gamma":
+        gamma = float(config.get("gamma", 2.2))
+        if gamma <= 0:
+            raise ValueError("gamma curve needs gamma > 0")
+        return _make_gamma(gamma)
+    if kind == "piecewise":
+        return _make_piecewise(config.get("points", []))
+    raise ValueError(f"Unknown curve type: {kind!r}")
+
+
+# ======================== Compiled Tables ========================
+
+class CurveTable:
+    """
+    A curve compiled against a fixed angle range.
+
+    Attributes:
+        lower_deg: Angle mapped to curve(0).
+        upper_deg: Angle mapped to curve(1).
+    """
+
+    __slots__ = (
+        "lower_deg", "upper_deg", "_table", "_last", "_inv_step",
+        "_inverse", "_inv_last",
+    )
+
+    def __init__(
+        self,
+        config: dict | None,
+        lower_deg: float,
+        upper_deg: float,
+        resolution_deg: float = ANGLE_RESOLUTION_DEG,
+    ):
+        """
+        Args:
+            config: Curve config (see curve_function()).
+            lower_deg: Lower wall angle.
+            upper_deg: Upper wall angle (must be > lower_deg).
+            resolution_deg: Forward table step in degrees.
+
+        Raises:
+            ValueError: Empty range, invalid config, or a curve that is not
+                        monotonically non-decreasing (no inverse).
+        """
+        span = upper_deg - lower_deg
+        if span <= 0:
+            raise ValueError("upper_deg must be greater than lower_deg")
+
+        fn = curve_function(config)
+        n = max(1, int(math.ceil(span / resolution_deg)))
+        table = [min(1.0, max(0.0, fn(i / n))) for i in range(n + 1)]
+        for a, b in zip(table, table[1:]):
+            if b < a - 1e-12:
+                raise ValueError("mapping curve must be non-decreasing")
+
+        self.lower_deg = lower_deg
+        self.upper_deg = upper_deg
+        self._table = table
+        self._last = n
+        self._inv_step = n / span
+
+        # Inverse: for each value step, the lowest angle reaching that value
+        step_deg = span / n
+        inverse = []
+        for k in range(INVERSE_STEPS + 1):
+            j = bisect.bisect_left(table, k / INVERSE_STEPS - 1e-12)
+            inverse.append(lower_deg + min(j, n) * step_deg)
+        self._inverse = inverse
+        self._inv_last = INVERSE_STEPS
+
+    def value(self, angle_deg: float) -> float:
+        """Map an angle to a 0.0-1.0 value (angles outside the walls saturate)."""
+        i = int((angle_deg - self.lower_deg) * self._inv_step + 0.5)
+        if i < 0:
+            i = 0
+        elif i > self._last:
+            i = self._last
+        return self._table[i]
+
+    def angle(self, value: float) -> float:
+        """Map a 0.0-1.0 value back to the angle that produces it."""
+        k = int(value * self._inv_last + 0.5)
+        if k < 0:
+            k = 0
+        elif k > self._inv_last:
+            k = self._inv_last
+        return self._inverse[k]
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+# ======================== Preset Loading ========================
+
+def load_preset_curves(path: Path | str | None = None) -> dict[str, dict]:
+    """
+    Read curve configs from presets.json.
+
+    Args:
+        path: presets.json location (default: package config/presets.json).
+
+    Returns:
+        dict: {preset_name: curve_config} for presets with a "curve" entry.
+              Invalid curves are reported as ValueError.
+    """
+    path = Path(path) if path is not None else CONFIG_DIR / "presets.json"
+    with open(path, encoding="utf-8") as f:
+        presets = json.load(f).get("presets", {})
+
+    curves = {}
+    for name, preset in presets.items():
+        config = preset.get("curve")
+        if config is None:
+            continue
+        curve_function(config)  # Validate early
+        curves[name] = config
+    return curves
+
+
+# Quick benchmark when run directly
+if __name__ == "__main__":
+    import time
+
+    lower, upper = -60.0, 60.0
+    angles = [lower - 5 + (i % 1300) * 0.1 for i in range(200_000)]
+
+    t0 = time.perf_counter()
+    for a in angles:
+        c = max(lower, min(upper, a))
+        _ = (c - lower) / (upper - lower)
+    formula_ns = (time.perf_counter() - t0) / len(angles) * 1e9
+
+    t0 = time.perf_counter()
+    table = CurveTable({"type": "db", "range_db": 40.0}, lower, upper)
+    compile_ms = (time.perf_counter() - t0) * 1e3
+
+    t0 = time.perf_counter()
+    for a in angles:
+        _ = table.value(a)
+    lut_ns = (time.perf_counter() - t0) / len(angles) * 1e9
+
+    print(f"Compile db curve ({len(table)} entries): {compile_ms:.1f} ms")
+    print(f"Linear formula + clamp: {formula_ns:.0f} ns/sample")
+    print(f"db curve table lookup:  {lut_ns:.0f} ns/sample")
+    for v in (0.0, 0.1, 0.5, 1.0):
+        print(f"  value {v:.1f} → angle {table.angle(v):6.2f}° → value {table.value(table.angle(v)):.3f}")
@@ -5,21 +5,27 @@ Manages the connection between SmartKnob motor position and Windows system funct
 """
 
 import time
-from smartknob_windows.integrations.volume import VolumeController
-from smartknob_windows.integrations.brightness import BrightnessController
-from smartknob_windows.integrations.scroll import scroll_smooth, WHEEL_DELTA
-from smartknob_windows.integrations.zoom import ZoomController, MIN_ZOOM, MAX_ZOOM
+
+from smartknob import tracing
+from smartknob.gestures import load_preset_gestures
+from smartknob_windows.filtering import NO_FILTER, AngleFilter, load_preset_filters, validate_filter
+from smartknob_windows.integrations import registry
+from smartknob_windows.integrations.base import Integration, IntegrationStatus
+from smartknob_windows.integrations.scroll import ScrollBackend
+from smartknob_windows.mapping import CONFIG_DIR, LINEAR, CurveTable, curve_function, load_preset_curves
 
 
 class WindowsLink:
     """
     Links motor position to Windows functions.
     
-    Supports:
-    - System Volume: Maps bounded mode (-60° to +60°) to volume (0-100%)
-    - Display Brightness: Maps bounded mode (-60° to +60°) to brightness (0-100%)
-    - Mouse Scroll: Maps inertia mode rotation to smooth scroll (infinite rotation)
-    - Screen Zoom: Maps spring mode displacement to zoom rate (100-800%)
+    Each function is an Integration looked up by name in the integration
+    registry (built-ins, entry points, or register()). Built-ins:
+    - volume: Maps bounded mode (-60° to +60°) to volume (0-100%) via a preset curve
+    - brightness: Maps bounded mode (-60° to +60°) to brightness (0-100%) via a preset curve
+    - scroll: Maps inertia mode rotation to smooth scroll (infinite rotation)
+    - zoom: Maps spring mode displacement to zoom rate (100-800%)
+    - slides: Maps haptic mode detent steps to next/previous slide
     """
     
     # Angle bounds for bounded mode (must match firmware defaults)
@@ -27,67 +33,141 @@ class WindowsLink:
     BOUND_MAX_DEG = 60.0
     ANGLE_RANGE = BOUND_MAX_DEG - BOUND_MIN_DEG  # 120°
     
-    # Smooth scroll: degrees per WHEEL_DELTA (120 units = 1 line)
-    # Lower value = more sensitive. 6° means 60 lines per revolution (360/6)
-    SCROLL_DEGREES_PER_LINE = 6.0  # ~60 lines per revolution
-    # Convert to units per degree for smooth scrolling
-    SCROLL_UNITS_PER_DEGREE = WHEEL_DELTA / SCROLL_DEGREES_PER_LINE  # 20 units/deg
-    
-    # Zoom: displacement-to-rate mapping (Spring mode)
-    # Smooth zoom using Magnification API
-    ZOOM_DEAD_ZONE = 5.0  # Degrees - no zoom change within this range
-    ZOOM_MAX_DISPLACEMENT = 45.0  # Full deflection = fastest zoom
-    ZOOM_MAX_RATE = 0.05  # Zoom factor change per update at max displacement
-    
-    def __init__(self):
-        """Initialize with no active link."""
-        self.active_function = None  # "volume", "brightness", "scroll", "zoom", or None
-        self._volume_ctrl = None
-        self._brightness_ctrl = None
-        self._zoom_ctrl = None
-        
-        # Scroll tracking state
-        self._last_angle = None
-        self._scroll_accumulator = 0.0
-        self._last_time = None
-        
-        # Zoom tracking state
-        self._current_zoom = 1.0  # Track as factor (1.0 = 100%)
-        self._current_zoom = 100  # Track as percentage
-        self._last_zoom_time = 0.0  # For rate limiting
-    
-    def _ensure_volume_controller(self) -> VolumeController:
-        """Lazy initialization of volume controller."""
-        if self._volume_ctrl is None:
-            self._volume_ctrl = VolumeController()
-        return self._volume_ctrl
-    
-    def _ensure_brightness_controller(self) -> BrightnessController:
-        """Lazy initialization of brightness controller."""
-        if self._brightness_ctrl is None:
-            self._brightness_ctrl = BrightnessController()
-        return self._brightness_ctrl
-    
-    def _ensure_zoom_controller(self) -> ZoomController:
-        """Lazy initialization of zoom controller."""
-        if self._zoom_ctrl is None:
-            self._zoom_ctrl = ZoomController()
-        return self._zoom_ctrl
+    # Preset whose "curve" entry (presets.json) shapes each bounded integration
+    CURVE_PRESETS = {"volume": "VOLUME_KNOB", "brightness": "BRIGHTNESS_KNOB"}
+    
+    # Preset whose "filter" entry (presets.json) smooths each integration's input
+    FILTER_PRESETS = {
+        "volume": "VOLUME_KNOB",
+        "brightness": "BRIGHTNESS_KNOB",
+        "scroll": "SMOOTH_SCROLL",
+        "zoom": "ZOOM_DIAL",
+        "slides": "CLICKY_SELECTOR",
+    }
+    
+    # Preset whose "gestures" entry (presets.json) sets each integration's gesture thresholds
+    GESTURE_PRESETS = {
+        "scroll": "SMOOTH_SCROLL",
+        "zoom": "ZOOM_DIAL",
+        "slides": "CLICKY_SELECTOR",
+    }
+    
+    def __init__(self, scroll_backend: ScrollBackend | None = None, config=None):
+        """
+        Initialize with no active link.
+        
+        Args:
+            scroll_backend: Injection backend for scroll output
+                            (default: SendInput on Windows, uinput on Linux).
+            config: ConfigService to take curves, filters and gestures from,
+                    following its reloads (default: read presets.json once).
+        """
+        self.scroll_backend = scroll_backend
+        self.detent_count = None  # Bounded/haptic detents, if known
+        self.config = config
+        
+        # Integration instances by name (created on first use) and the active one
+        self._integrations: dict[str, Integration] = {}
+        self._active: Integration | None = None
+        
+        # set_curve()/set_filter() overrides, kept across config reloads
+        self._curve_overrides: dict[str, dict] = {}
+        self._filter_overrides: dict[str, dict] = {}
+        
+        if config is not None:
+            self._on_config(config.snapshot)
+            config.add_listener(self._on_config)
+        else:
+            loaded = []
+            for load in (load_preset_curves, load_preset_filters,
+                         lambda: load_preset_gestures(CONFIG_DIR / "presets.json")):
+                try:
+                    loaded.append(load())
+                except (OSError, ValueError):
+                    loaded.append({})
+            self._use_presets(*loaded)
+        self._filter: AngleFilter | None = None  # Active integration's, see link()
+        
+        # Optional smartknob.metrics registry (see enable_metrics())
+        self._metrics = None
+        self._process_hist = None
+        self._changes = None
+    
+    # ------------------------------------------------------------------ #
+    #  Registry access
+    # ------------------------------------------------------------------ #
+    
+    def integration(self, name: str) -> Integration:
+        """
+        Get the integration instance for *name*, creating it on first use.
+        
+        Raises:
+            KeyError: Unknown integration name
+            ImportError: Integration not supported on this system
+        """
+        integ = self._integrations.get(name)
+        if integ is None:
+            integ = registry.get(name)(self)
+            self._integrations[name] = integ
+        return integ
+    
+    def is_available(self, name: str) -> bool:
+        """Check if integration *name* can be used on this system."""
+        try:
+            return self.integration(name).available
+        except (KeyError, ImportError, OSError, AttributeError, TypeError):
+            # AttributeError: ctypes.WinDLL / windll missing off Windows
+            # TypeError: ctypes argtypes/restype setup rejected by this platform
+            return False
     
     def is_brightness_available(self) -> bool:
         """Check if brightness control is available on this system."""
-        bc = self._ensure_brightness_controller()
-        return bc.available
+        return self.is_available("brightness")
     
     def is_zoom_available(self) -> bool:
         """Check if zoom control is available on this system."""
-        zc = self._ensure_zoom_controller()
-        return zc.available
+        return self.is_available("zoom")
+    
+    @property
+    def active_function(self) -> str | None:
+        """Name of the linked integration, or None."""
+        return self._active.name if self._active is not None else None
+    
+    @property
+    def active_integration(self) -> Integration | None:
+        """The linked Integration instance, or None."""
+        return self._active
     
     @property
     def is_linked(self) -> bool:
         """Check if any Windows function is currently linked."""
-        return self.active_function is not None
+        return self._active is not None
+    
+    # ------------------------------------------------------------------ #
+    #  Linking
+    # ------------------------------------------------------------------ #
+    
+    def link(self, name: str, **options) -> float | None:
+        """
+        Link the knob to integration *name*, unlinking any previous one.
+        
+        Args:
+            name: Registered integration name, e.g. "volume" or "slides"
+            **options: Passed to the integration's link()
+        
+        Returns:
+            float | None: Angle the motor should seek to before switching to
+                          the integration's haptic mode, or None.
+        """
+        integ = self.integration(name)
+        if self._active is not None:
+            self.unlink()
+        target = integ.link(**options)
+        self._filter = AngleFilter(self.filter_config(name))
+        self._active = integ
+        if self._metrics is not None:
+            self._instrument(integ)
+        return target
     
     def link_volume(self) -> float:
         """
@@ -97,14 +177,7 @@ class WindowsLink:
             float: Target angle (degrees) matching current volume.
                    Motor should seek to this position before entering bounded mode.
         """
-        vc = self._ensure_volume_controller()
-        volume = vc.get_volume()  # 0.0 to 1.0
-        
-        # Calculate angle that represents current volume
-        angle = self.BOUND_MIN_DEG + (volume * self.ANGLE_RANGE)
-        
-        self.active_function = "volume"
-        return angle
+        return self.link("volume")
     
     def link_brightness(self) -> float:
         """
@@ -117,39 +190,23 @@ class WindowsLink:
         Raises:
             RuntimeError: If brightness control is not available
         """
-        bc = self._ensure_brightness_controller()
-        if not bc.available:
-            raise RuntimeError("Brightness control not available on this system")
-        
-        brightness = bc.get_brightness_float()  # 0.0 to 1.0
-        
-        # Calculate angle that represents current brightness
-        angle = self.BOUND_MIN_DEG + (brightness * self.ANGLE_RANGE)
-        
-        self.active_function = "brightness"
-        return angle
+        return self.link("brightness")
     
-    def link_scroll(self, sensitivity: float = None) -> None:
+    def link_scroll(self, sensitivity: float = None, acceleration=None, momentum=None) -> None:
         """
         Link to mouse scroll wheel (smooth scrolling mode).
         
-        Uses Inertia mode - maps rotation delta directly to scroll events.
-        Sends high-resolution scroll units for smooth continuous scrolling.
+        Uses Inertia mode - rotation deltas are accumulated as high-resolution
+        scroll units and emitted in batches on a display-rate frame tick.
         
         Args:
             sensitivity: Degrees per line (default: 6.0 = 60 lines/rev).
                          Lower = more sensitive.
+            acceleration: Velocity-based AccelerationCurve (default: none).
+            momentum: Momentum coast parameters matching the preset's
+                      inertia settings, or None to stop when the knob stops.
         """
-        if sensitivity is not None:
-            self.SCROLL_DEGREES_PER_LINE = sensitivity
-            self.SCROLL_UNITS_PER_DEGREE = WHEEL_DELTA / sensitivity
-        
-        # Reset scroll tracking state
-        self._last_angle = None
-        self._scroll_accumulator = 0.0
-        self._last_time = time.time()
-        
-        self.active_function = "scroll"
+        self.link("scroll", sensitivity=sensitivity, acceleration=acceleration, momentum=momentum)
     
     def link_zoom(self) -> None:
         """
@@ -162,28 +219,18 @@ class WindowsLink:
         
         Smooth zoom using the Magnification API.
         """
-        zc = self._ensure_zoom_controller()
-        if not zc.available:
-            raise RuntimeError("Zoom control not available on this system")
-        
-        # Initialize the Magnification API
-        if not zc.initialize():
-            raise RuntimeError("Failed to initialize Magnification API")
-        
-        # Get current zoom level (as factor 1.0-8.0)
-        self._current_zoom = zc.get_zoom()
-        
-        self.active_function = "zoom"
+        self.link("zoom")
     
     def unlink(self) -> None:
         """Disconnect from Windows function and clean up."""
-        # Reset zoom to 100% and close magnifier if zoom was active
-        if self.active_function == "zoom" and self._zoom_ctrl is not None:
-            self._zoom_ctrl.reset()  # Resets to 100% and uninitializes
-        
-        self.active_function = None
-        self._last_angle = None
-        self._scroll_accumulator = 0.0
+        active, self._active = self._active, None
+        self._filter = None
+        if active is not None:
+            active.unlink()
+    
+    # ------------------------------------------------------------------ #
+    #  Current OS values
+    # ------------------------------------------------------------------ #
     
     def get_current_volume_percent(self) -> int:
         """
@@ -193,8 +240,7 @@ class WindowsLink:
             int: Volume 0-100, or -1 if not available
         """
         try:
-            vc = self._ensure_volume_controller()
-            return vc.get_volume_percent()
+            return self.integration("volume").controller.get_volume_percent()
         except Exception:
             return -1
     
@@ -206,8 +252,7 @@ class WindowsLink:
             int: Brightness 0-100, or -1 if not available
         """
         try:
-            bc = self._ensure_brightness_controller()
-            return bc.get_brightness()
+            return self.integration("brightness").controller.get_brightness()
         except Exception:
             return -1
     
@@ -219,8 +264,7 @@ class WindowsLink:
             int: Zoom percent (100 = normal, 200 = 2x), or -1 if not available
         """
         try:
-            zc = self._ensure_zoom_controller()
-            return zc.get_zoom_percent()
+            return self.integration("zoom").controller.get_zoom_percent()
         except Exception:
             return -1
     
@@ -232,207 +276,247 @@ class WindowsLink:
             bool: True if successful
         """
         try:
-            zc = self._ensure_zoom_controller()
-            return zc.reset()
+            return self.integration("zoom").controller.reset()
         except Exception:
             return False
     
-    def process_position(self, angle_deg: float) -> dict | None:
+    # ------------------------------------------------------------------ #
+    #  Position processing
+    # ------------------------------------------------------------------ #
+    
+    def process_position(self, angle_deg: float, now: float | None = None) -> IntegrationStatus | None:
         """
         Process a motor position update.
         
-        If linked to a Windows function, updates that function based on angle.
+        If linked to a Windows function, passes the angle through the
+        integration's jitter filter and updates that function.
         
         Args:
             angle_deg: Current motor position in degrees
+            now: Sample time in seconds (default: time.perf_counter())
         
         Returns:
-            dict with function-specific info, or None if not linked.
-            For volume: {"function": "volume", "percent": int}
-            For brightness: {"function": "brightness", "percent": int}
-            For scroll: {"function": "scroll", "units": int, "direction": str}
-            For zoom: {"function": "zoom", "percent": int, "action": str}
-        """
-        if self.active_function == "volume":
-            return self._process_volume(angle_deg)
-        elif self.active_function == "brightness":
-            return self._process_brightness(angle_deg)
-        elif self.active_function == "scroll":
-            return self._process_scroll(angle_deg)
-        elif self.active_function == "zoom":
-            return self._process_zoom(angle_deg)
-        return None
-    
-    def _process_volume(self, angle_deg: float) -> dict:
-        """
-        Convert angle to volume and set Windows volume.
+            The active integration's IntegrationStatus when it changed, or
+            None if nothing changed or nothing is linked. The status object
+            is reused between calls — copy it (as_dict()) to keep it.
+        """
+        active = self._active
+        if active is None:
+            return None
+        if self._filter is not None:
+            angle_deg = self._filter(angle_deg, time.perf_counter() if now is None else now)
+        return self._dispatch(active, angle_deg)
+    
+    def settle(self) -> IntegrationStatus | None:
+        """
+        Catch up with a knob that stopped moving.
         
-        Args:
-            angle_deg: Motor position in degrees
+        The firmware stops reporting when the knob stops, leaving the
+        smoothed angle just short of the last sample. Call this once
+        reports have been quiet for filtering.SETTLE_S.
         
         Returns:
-            dict: {"function": "volume", "percent": int}
+            Same as process_position().
         """
-        # Clamp angle to bounds
-        angle = max(self.BOUND_MIN_DEG, min(self.BOUND_MAX_DEG, angle_deg))
-        
-        # Convert angle to volume (0.0 to 1.0)
-        volume = (angle - self.BOUND_MIN_DEG) / self.ANGLE_RANGE
+        active, filt = self._active, self._filter
+        if active is None or filt is None:
+            return None
+        angle_deg = filt.settle()
+        if angle_deg is None:
+            return None
+        return self._dispatch(active, angle_deg)
+    
+    def _dispatch(self, active: Integration, angle_deg: float) -> IntegrationStatus | None:
+        """Hand a filtered angle to *active*, timed/traced when enabled."""
+        hist = self._process_hist
+        tr = tracing.TRACER
+        if hist is None and tr is None:
+            return active.process(angle_deg)
+        t0 = time.perf_counter()
+        status = active.process(angle_deg)
+        t1 = time.perf_counter()
+        if hist is not None:
+            hist.record(t1 - t0)
+            if status is not None:
+                self._changes.inc()
+        if tr is not None:
+            tr.complete("process_position", t0, t1, "link",
+                        {"integration": active.name, "changed": status is not None})
+        return status
+    
+    # ------------------------------------------------------------------ #
+    #  Shared settings for integrations
+    # ------------------------------------------------------------------ #
+    
+    def update_bounds(self, lower_deg: float, upper_deg: float) -> None:
+        """
+        Update angle bounds to match motor configuration.
         
-        # Set Windows volume
-        vc = self._ensure_volume_controller()
-        vc.set_volume(volume)
+        Call this if user changes bounded mode limits in the GUI.
         
-        return {
-            "function": "volume",
-            "percent": int(round(volume * 100))
-        }
+        Args:
+            lower_deg: Lower bound in degrees
+            upper_deg: Upper bound in degrees
+        """
+        self.BOUND_MIN_DEG = lower_deg
+        self.BOUND_MAX_DEG = upper_deg
+        self.ANGLE_RANGE = upper_deg - lower_deg
+        self._curve_tables.clear()  # Recompiled against the new range
     
-    def _process_brightness(self, angle_deg: float) -> dict:
+    def update_detents(self, detent_count: int | None) -> None:
         """
-        Convert angle to brightness and set display brightness.
+        Set the detent count so bounded integrations quantize per detent.
         
-        Args:
-            angle_deg: Motor position in degrees
+        Takes effect on the next link.
         
-        Returns:
-            dict: {"function": "brightness", "percent": int}
+        Args:
+            detent_count: Detents between the bounds (firmware S<n>), or None
+                          for plain 1% resolution.
         """
-        # Clamp angle to bounds
-        angle = max(self.BOUND_MIN_DEG, min(self.BOUND_MAX_DEG, angle_deg))
-        
-        # Convert angle to brightness (0.0 to 1.0)
-        brightness = (angle - self.BOUND_MIN_DEG) / self.ANGLE_RANGE
+        self.detent_count = detent_count
+    
+    def _use_presets(self, curves: dict, filters: dict, gestures: dict) -> None:
+        """Take curve/filter/gesture configs from {preset: config} dicts (overrides win)."""
+        # Angle → value curves, compiled to lookup tables on first use
+        self._curve_configs = {
+            **{func: curves.get(preset, LINEAR) for func, preset in self.CURVE_PRESETS.items()},
+            **self._curve_overrides,
+        }
+        self._curve_tables: dict[str, CurveTable] = {}
         
-        # Set display brightness
-        bc = self._ensure_brightness_controller()
-        bc.set_brightness_float(brightness)
+        # Jitter filter per integration; the active one sits in front of process()
+        self._filter_configs = {
+            **{func: filters.get(preset, NO_FILTER) for func, preset in self.FILTER_PRESETS.items()},
+            **self._filter_overrides,
+        }
         
-        return {
-            "function": "brightness",
-            "percent": int(round(brightness * 100))
+        # Gesture thresholds per integration (for SmartKnobDriver.enable_gestures())
+        self._gesture_configs = {
+            func: gestures[preset]
+            for func, preset in self.GESTURE_PRESETS.items()
+            if preset in gestures
         }
     
-    def _process_scroll(self, angle_deg: float) -> dict:
+    def _on_config(self, snapshot) -> None:
+        """Swap in the configs of a new ConfigService snapshot (curves apply at once, filters on the next link)."""
+        presets = snapshot.presets
+        self._use_presets(
+            {key: dict(p.curve) for key, p in presets.items() if p.curve is not None},
+            {key: dict(p.filter) for key, p in presets.items() if p.filter is not None},
+            {key: dict(p.gestures) for key, p in presets.items() if p.gestures is not None},
+        )
+    
+    def set_curve(self, function: str, config: dict | None) -> None:
         """
-        Convert rotation delta to smooth scroll events.
-        
-        Sends high-resolution scroll units directly proportional to rotation.
-        This provides smooth, continuous scrolling in supporting applications.
+        Override the mapping curve for a bounded integration.
         
         Args:
-            angle_deg: Current motor position in degrees
+            function: "volume" or "brightness"
+            config: Curve config, e.g. {"type": "gamma", "gamma": 2.2},
+                    or None for linear
         
-        Returns:
-            dict: {"function": "scroll", "units": int, "direction": str}
-        """
-        # Initialize on first call
-        if self._last_angle is None:
-            self._last_angle = angle_deg
-            return {"function": "scroll", "units": 0, "direction": "none"}
-        
-        # Calculate delta (supports infinite rotation)
-        delta = angle_deg - self._last_angle
-        self._last_angle = angle_deg
-        
-        # Skip tiny movements
-        if abs(delta) < 0.1:
-            return {"function": "scroll", "units": 0, "direction": "none"}
-        
-        # Convert degrees to scroll units (smooth, fractional accumulation)
-        self._scroll_accumulator += delta * self.SCROLL_UNITS_PER_DEGREE
-        
-        # Get integer units to send (keep remainder for smooth accumulation)
-        units = int(self._scroll_accumulator)
-        
-        if units != 0:
-            # Fire smooth scroll event
-            scroll_smooth(units)
-            
-            # Remove sent units from accumulator (keep fraction)
-            self._scroll_accumulator -= units
-        
-        return {
-            "function": "scroll",
-            "units": units,
-            "direction": "up" if units > 0 else ("down" if units < 0 else "none")
-        }
+        Raises:
+            ValueError: If the curve config is invalid
+        """
+        curve_function(config)  # Validate before accepting
+        self._curve_overrides[function] = self._curve_configs[function] = config or LINEAR
+        self._curve_tables.pop(function, None)
     
-    def _process_zoom(self, angle_deg: float) -> dict:
+    def set_filter(self, function: str, config: dict | None) -> None:
         """
-        Convert spring displacement to smooth zoom rate.
+        Override the jitter filter for an integration.
         
-        Displacement from center controls zoom rate:
-        - Center (within dead zone): Hold current zoom
-        - CW (positive): Zoom in, rate proportional to displacement
-        - CCW (negative): Zoom out, rate proportional to displacement
+        Takes effect on the next link.
         
         Args:
-            angle_deg: Current motor position in degrees (0 = spring center)
-        
-        Returns:
-            dict: {"function": "zoom", "percent": int, "action": str}
-        """
-        # Apply dead zone at center
-        if abs(angle_deg) < self.ZOOM_DEAD_ZONE:
-            return {
-                "function": "zoom",
-                "percent": int(round(self._current_zoom * 100)),
-                "action": "hold"
-            }
-        
-        # Calculate displacement beyond dead zone
-        if angle_deg > 0:
-            displacement = angle_deg - self.ZOOM_DEAD_ZONE
-        else:
-            displacement = angle_deg + self.ZOOM_DEAD_ZONE
+            function: Integration name, e.g. "zoom"
+            config: Filter config, e.g. {"min_cutoff": 1.0, "beta": 0.1},
+                    or None for no filtering
         
-        # Normalize displacement to [-1, 1] range
-        normalized = displacement / (self.ZOOM_MAX_DISPLACEMENT - self.ZOOM_DEAD_ZONE)
-        normalized = max(-1.0, min(1.0, normalized))
-        
-        # Calculate zoom rate (factor change per update)
-        rate = normalized * self.ZOOM_MAX_RATE
-        
-        # Apply smooth zoom change
-        new_zoom = self._current_zoom + rate
-        
-        # Clamp: can't go below 100%, max at 800%
-        new_zoom = max(MIN_ZOOM, min(MAX_ZOOM, new_zoom))
-        
-        # Only update if changed significantly
-        if abs(new_zoom - self._current_zoom) > 0.001:
-            zc = self._ensure_zoom_controller()
-            zc.set_zoom(new_zoom)
-            self._current_zoom = new_zoom
-        
-        # Determine action string
-        if rate > 0.001:
-            action = "zoom_in"
-        elif rate < -0.001:
-            action = "zoom_out"
-        else:
-            action = "hold"
-        
-        return {
-            "function": "zoom",
-            "percent": int(round(self._current_zoom * 100)),
-            "action": action
-        }
-    
-    def update_bounds(self, lower_deg: float, upper_deg: float) -> None:
+        Raises:
+            ValueError: If the filter config is invalid
         """
-        Update angle bounds to match motor configuration.
-        
-        Call this if user changes bounded mode limits in the GUI.
+        validate_filter(config or NO_FILTER)
+        self._filter_overrides[function] = self._filter_configs[function] = config or NO_FILTER
+    
+    def filter_config(self, function: str) -> dict:
+        """Filter config for *function* (NO_FILTER if none)."""
+        return self._filter_configs.get(function, NO_FILTER)
+    
+    def gesture_config(self, function: str) -> dict:
+        """Gesture thresholds for *function* (empty = recognizer defaults)."""
+        return self._gesture_configs.get(function, {})
+    
+    def curve_table(self, function: str) -> CurveTable:
+        """Get (compiling once per bounds/config change) the curve table for *function*."""
+        tables = self._curve_tables  # Replaced, not cleared, on config reload
+        table = tables.get(function)
+        if table is None:
+            table = CurveTable(
+                self._curve_configs.get(function, LINEAR),
+                self.BOUND_MIN_DEG,
+                self.BOUND_MAX_DEG,
+            )
+            tables[function] = table
+        return table
+    
+    def enable_metrics(self, registry=None) -> None:
+        """
+        Time process_position() and OS calls per integration.
         
         Args:
-            lower_deg: Lower bound in degrees
-            upper_deg: Upper bound in degrees
+            registry: smartknob.metrics.MetricsRegistry (default: the
+                      process-wide REGISTRY, shared with the driver).
         """
-        self.BOUND_MIN_DEG = lower_deg
-        self.BOUND_MAX_DEG = upper_deg
-        self.ANGLE_RANGE = upper_deg - lower_deg
+        from smartknob import metrics
+        
+        self._metrics = registry if registry is not None else metrics.REGISTRY
+        if self._active is not None:
+            self._instrument(self._active)
+    
+    def disable_metrics(self) -> None:
+        """Stop recording (instruments keep their totals)."""
+        self._metrics = None
+        self._process_hist = None
+        self._changes = None
+        for integ in self._integrations.values():
+            self._attach_os_timer(integ, None)
+    
+    def _instrument(self, integ: Integration) -> None:
+        registry = self._metrics
+        name = integ.name
+        self._process_hist = registry.histogram(
+            "smartknob_process_seconds", "WindowsLink.process_position duration", integration=name)
+        self._changes = registry.counter(
+            "smartknob_status_changes_total", "Integration status changes", integration=name)
+        self._attach_os_timer(integ, registry.histogram(
+            "smartknob_os_call_seconds", "OS call duration (volume/brightness write, scroll batch)",
+            integration=name))
+    
+    @staticmethod
+    def _attach_os_timer(integ: Integration, hist) -> None:
+        output = getattr(integ, "output", None)
+        if output is not None:
+            output.write_seconds = hist
+        engine = getattr(integ, "engine", None)
+        if engine is not None:
+            engine.send_seconds = hist
+    
+    def output_stats(self) -> dict:
+        """
+        OS-call counters for the change-only output writers.
+        
+        Returns:
+            dict: {"volume": {...}, "brightness": {...}} with requested,
+                  written, skipped_noop, coalesced and avoided counts
+                  (only for integrations that have been linked).
+        """
+        stats = {}
+        for name, integ in self._integrations.items():
+            output = getattr(integ, "output", None)
+            if output is not None:
+                stats[name] = output.stats()
+        return stats
 
 
 # Quick test when run directly
@@ -465,7 +549,8 @@ if __name__ == "__main__":
     # Test scroll (smooth mode)
     print(f"\nTesting smooth scroll link...")
     link.link_scroll()
-    print(f"Linked to smooth scroll: {link.SCROLL_DEGREES_PER_LINE}°/line ({link.SCROLL_UNITS_PER_DEGREE:.1f} units/°)")
+    scroll = link.integration("scroll")
+    print(f"Linked to smooth scroll: {scroll.degrees_per_line}°/line ({scroll.units_per_degree:.1f} units/°)")
     
     # Simulate rotation
     result = link.process_position(0.0)
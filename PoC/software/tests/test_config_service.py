@@ -0,0 +1,68 @@
+"""ConfigService reload and watcher behaviour on invalid files."""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from smartknob_windows.config_service import ConfigService, compile_preset
+
+GOOD_PRESETS = {"presets": {"VOLUME_KNOB": {"mode": "bounded", "detent_count": 20,
+                                            "curve": {"type": "db", "range_db": 40.0}}}}
+CONTEXTS = {"contexts": {"__default__": {"integration": "volume", "preset": "VOLUME_KNOB"}}}
+
+
+def _write(path, doc):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(doc))
+    os.replace(tmp, path)
+
+
+@pytest.fixture
+def files(tmp_path):
+    presets, contexts = tmp_path / "presets.json", tmp_path / "contexts.json"
+    _write(presets, GOOD_PRESETS)
+    _write(contexts, CONTEXTS)
+    return presets, contexts
+
+
+@pytest.mark.parametrize("entry", [
+    {"curve": "db"},
+    {"curve": {"type": "piecewise", "points": "x"}},
+    {"curve": {"type": "db", "range_db": [40]}},
+    {"mode": ["bounded"]},
+])
+def test_compile_preset_rejects_wrong_types(entry):
+    with pytest.raises(ValueError, match="Preset K"):
+        compile_preset("K", entry)
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_survives_bad_file(files, use_inotify):
+    presets, contexts = files
+    service = ConfigService(presets, contexts)
+    service.start(poll_interval_s=0.05, use_inotify=use_inotify)
+    swapped = threading.Event()
+    service.add_listener(lambda snapshot: swapped.set())
+    try:
+        bad = {"presets": {"VOLUME_KNOB": {"mode": "bounded", "curve": "db"}}}
+        _write(presets, bad)
+        for _ in range(100):
+            if service.failures:
+                break
+            time.sleep(0.02)
+        assert service.failures == 1
+        assert service.snapshot.version == 1
+        assert "curve must be an object" in service.last_error
+
+        good = json.loads(json.dumps(GOOD_PRESETS))
+        good["presets"]["VOLUME_KNOB"]["detent_count"] = 24
+        _write(presets, good)
+        assert swapped.wait(2.0)
+        assert service.snapshot.version == 2
+        assert service.last_error is None
+        assert "S24" in service.preset("VOLUME_KNOB").commands
+    finally:
+        service.stop()